@@ -14,6 +14,8 @@ from src.data_loader import DataLoader
 from src.backtester import Backtester
 from src.strategy import Strategy
 from src.database import DBManager
+from src.simulation_jobs import get_simulation_job_manager
+from src.prepared_cache import get_prepared_cache
 
 # Import UI Modules
 from src.ui.styles import apply_styles
@@ -21,7 +23,7 @@ from src.ui.overview import render_overview
 from src.ui.portfolio import render_portfolio
 from src.ui.analysis import render_analysis
 from src.ui.logs import render_logs
-from src.ui.etf_analysis import render_etf_analysis
+from src.ui.etf_analysis import render_etf_analysis, render_lookthrough
 
 # Initialize DB Manager
 db = DBManager()
@@ -86,34 +88,67 @@ def get_data_loader(start_date, end_date):
 def get_strategy(params):
     return Strategy(**params)
 
-def run_simulation(start_date, end_date, strategy_params, universe_params):
+def get_job_manager():
+    return get_simulation_job_manager(db)
+
+def format_eta(seconds):
+    if seconds is None:
+        return "estimating..."
+    minutes, sec = divmod(int(seconds), 60)
+    return f"{minutes}m {sec:02d}s" if minutes else f"{sec}s"
+
+def load_simulation_into_session(simulation_id):
+    _, equity, trades = db.get_simulation(simulation_id)
+    st.session_state.sim_equity = equity
+    st.session_state.sim_trades = trades
+    st.session_state.sim_portfolio = db.get_simulation_portfolio(simulation_id)
+    st.session_state.sim_id = simulation_id
+
+def clear_sim_job():
+    st.session_state.sim_job_id = None
+    if 'job' in st.query_params:
+        del st.query_params['job']
+
+@st.fragment(run_every=1.0)
+def render_job_status(job_id):
     """
-    Run backtest with given parameters and save to DB.
+    백그라운드 백테스트 진행률 폴링 (이 영역만 1초마다 다시 그림)
     """
-    loader = DataLoader(start_date=start_date, end_date=end_date)
-    backtester = Backtester(
-        data_loader=loader,
-        start_date=start_date, 
-        end_date=end_date,
-        strategy_params=strategy_params,
-        universe_params=universe_params
-    )
-    
-    with st.spinner("Running Simulation... (This may take a moment)"):
-        result_df = backtester.run()
-        
-    trades_df = pd.DataFrame(backtester.trade_log)
-    
-    # Save Results to DB
-    sim_config = {
-        'start_date': start_date,
-        'end_date': end_date,
-        **strategy_params,
-        **universe_params
-    }
-    db.save_simulation(sim_config, result_df, trades_df)
-    
-    return result_df, trades_df, backtester.portfolio
+    job = get_job_manager().get_status(job_id)
+    if job is None:
+        clear_sim_job()
+        return
+
+    if job['status'] == 'DONE':
+        load_simulation_into_session(job['simulation_id'])
+        clear_sim_job()
+        st.rerun()
+    elif job['status'] == 'FAILED':
+        st.error(f"Simulation failed: {job['error']}")
+        if st.button("Dismiss", key="dismiss_job"):
+            clear_sim_job()
+            st.rerun()
+    else:
+        if job['total']:
+            text = f"{job['stage']}: {job['done']:,}/{job['total']:,} days · ETA {format_eta(job['eta_sec'])}"
+        else:
+            text = f"{job['stage']}..."
+        st.progress(job['progress'], text=text)
+        st.caption("The simulation runs in the background. You can keep using the app or refresh the page.")
+
+VIEWS = ["Overview", "Portfolio", "Analysis", "ETF Analysis", "Logs"]
+
+def render_view_selector():
+    """
+    탭 대신 화면 선택기 (선택은 URL ?view=... 에도 남겨 새로고침 시 유지)
+    """
+    if 'active_view' not in st.session_state:
+        view = st.query_params.get('view')
+        st.session_state.active_view = view if view in VIEWS else VIEWS[0]
+
+    active_view = st.radio("View", VIEWS, horizontal=True, key="active_view", label_visibility="collapsed")
+    st.query_params['view'] = active_view
+    return active_view
 
 # -----------------------------------------------------------------------------
 # Main Application
@@ -150,10 +185,12 @@ def main():
             
             if market_mode == "STOCK":
                 st.caption("Market Cap Ranking Filter")
-                kospi_n = st.slider("KOSPI Top N", 50, 500, config.get('kospi_n', 200), 10)
-                kosdaq_n = st.slider("KOSDAQ Top N", 10, 200, config.get('kosdaq_n', 50), 10)
+                full_market = st.checkbox("Full Market (All KRX Listings)", value=config.get('full_market', False), help="Backtest every listed KOSPI/KOSDAQ stock (memory-bounded panel mode)")
+                kospi_n = st.slider("KOSPI Top N", 50, 500, config.get('kospi_n', 200), 10, disabled=full_market)
+                kosdaq_n = st.slider("KOSDAQ Top N", 10, 200, config.get('kosdaq_n', 50), 10, disabled=full_market)
             else:
                 st.info("📊 ETF Mode: TIGER Whitelist (Total 23 items)")
+                full_market = False
                 kospi_n = 0
                 kosdaq_n = 0
 
@@ -185,6 +222,7 @@ def main():
     with st.sidebar.expander("Data Management", expanded=False):
         if st.button("Clear Market Data Cache (DB)"):
             db.clear_market_data()
+            get_prepared_cache().clear()
             st.success("Market Data Cleared from DB!")
 
     # 6. Strategy Guide (Popup)
@@ -249,6 +287,10 @@ def main():
         st.session_state.sim_equity = None
         st.session_state.sim_trades = None
         st.session_state.sim_portfolio = None
+        st.session_state.sim_id = None
+    if 'sim_job_id' not in st.session_state:
+        # 새로고침 후에도 실행 중인 작업을 이어서 표시 (URL ?job=...)
+        st.session_state.sim_job_id = st.query_params.get('job')
 
     if run_btn:
         # Save New Config
@@ -262,6 +304,7 @@ def main():
             'market_mode': market_mode,
             'kospi_n': kospi_n,
             'kosdaq_n': kosdaq_n,
+            'full_market': full_market,
             'slope_lookback': slope_lookback,
             'use_trend_break': use_trend_break
         }
@@ -279,24 +322,29 @@ def main():
         universe_params = {
             'mode': market_mode,
             'kospi_n': kospi_n,
-            'kosdaq_n': kosdaq_n
+            'kosdaq_n': kosdaq_n,
+            'full_market': full_market
         }
         
-        equity, trades, portfolio = run_simulation(str(start_dt), str(end_dt), params, universe_params)
-        st.session_state.sim_equity = equity
-        st.session_state.sim_trades = trades
-        st.session_state.sim_portfolio = portfolio
-        st.rerun() 
+        job_id = get_job_manager().submit(str(start_dt), str(end_dt), params, universe_params)
+        st.session_state.sim_job_id = job_id
+        st.query_params['job'] = job_id
+
+    if st.session_state.sim_job_id:
+        render_job_status(st.session_state.sim_job_id)
     
     # Determine which data to show
     if st.session_state.sim_equity is None:
         last_config, equity, trades = db.get_latest_simulation()
-        portfolio = None 
+        latest = db.list_simulations(limit=1)
+        simulation_id = int(latest['id'].iloc[0]) if not latest.empty else None
+        portfolio = db.get_simulation_portfolio(simulation_id) if simulation_id is not None else None
         data_source = "Latest DB Record"
     else:
         equity = st.session_state.sim_equity
         trades = st.session_state.sim_trades
         portfolio = st.session_state.sim_portfolio
+        simulation_id = st.session_state.get('sim_id')
         data_source = "Simulation Result"
 
     if equity is None or equity.empty:
@@ -305,58 +353,46 @@ def main():
 
     st.caption(f"Showing Data Source: **{data_source}**")
 
-    # Tabs
-    tab_overview, tab_portfolio, tab_analysis, tab_etf, tab_logs = st.tabs([
-        "Overview", 
-        "Portfolio", 
-        "Analysis", 
-        "ETF Analysis",
-        "Logs"
-    ])
-
-    # 1. Overview Tab
-    with tab_overview:
+    # Views: 선택된 화면만 실행 (st.tabs는 숨겨진 탭까지 매 rerun마다 모두 실행함)
+    current_strategy_params = {
+        'ma_short': ma_short,
+        'ma_long': ma_long,
+        'sell_slope_multiplier': sell_slope_mult,
+        'rs_weights': (w3, w6, w12, w1),
+        'slope_lookback': slope_lookback,
+        'use_trend_break': use_trend_break
+    }
+    active_view = render_view_selector()
+
+    # 1. Overview
+    if active_view == "Overview":
         render_overview(equity, trades, start_dt, end_dt)
 
-    # 2. Portfolio Tab
-    sel_ticker = None
-    sel_name = None
-    with tab_portfolio:
+    # 2. Portfolio
+    elif active_view == "Portfolio":
         # Pass cached loader
         loader_p = get_data_loader(str(start_dt), str(end_dt))
         sel_ticker, sel_name = render_portfolio(portfolio, trades, end_dt, loader_p)
+        if sel_ticker:
+            # Analysis 화면에서 이어서 사용
+            st.session_state.portfolio_selection = (sel_ticker, sel_name)
 
-    # 3. Analysis Tab
-    with tab_analysis:
-        # Reconstruct current strategy params for Visualization
-        current_strategy_params = {
-            'ma_short': ma_short,
-            'ma_long': ma_long,
-            'sell_slope_multiplier': sell_slope_mult,
-            'rs_weights': (w3, w6, w12, w1),
-            'slope_lookback': slope_lookback,
-            'use_trend_break': use_trend_break
-        }
+    # 3. Analysis
+    elif active_view == "Analysis":
+        sel_ticker, sel_name = st.session_state.get('portfolio_selection', (None, None))
         # Pass cached loader
         loader_a = get_data_loader(str(start_dt), str(end_dt))
-        render_analysis(trades, portfolio, start_dt, end_dt, current_strategy_params, sel_ticker, sel_name, loader_a)
+        render_analysis(trades, portfolio, start_dt, end_dt, current_strategy_params, sel_ticker, sel_name, loader_a, simulation_id=simulation_id)
 
-    # 4. ETF Analysis Tab
-    with tab_etf:
-        current_strategy_params = {
-            'ma_short': ma_short,
-            'ma_long': ma_long,
-            'sell_slope_multiplier': sell_slope_mult,
-            'rs_weights': (w3, w6, w12, w1),
-            'slope_lookback': slope_lookback,
-            'use_trend_break': use_trend_break
-        }
+    # 4. ETF Analysis
+    elif active_view == "ETF Analysis":
         loader_etf = get_data_loader(str(start_dt), str(end_dt))
         strategy_etf = get_strategy(current_strategy_params)
         render_etf_analysis(loader_etf, strategy_etf)
+        render_lookthrough(db, equity, trades)
 
-    # 5. Logs Tab
-    with tab_logs:
+    # 5. Logs
+    elif active_view == "Logs":
         render_logs(trades)
 
 if __name__ == "__main__":
@@ -0,0 +1,323 @@
+import os
+import json
+import time
+import hashlib
+import logging
+import threading
+import concurrent.futures
+from collections import deque
+from datetime import datetime, timedelta
+
+import requests
+from requests.adapters import HTTPAdapter
+
+logger = logging.getLogger("kis-mcp-server")
+
+REAL_BASE_URL = "https://openapi.koreainvestment.com:9443"
+VIRTUAL_BASE_URL = "https://openapivts.koreainvestment.com:29443"
+
+# KIS REST 초당 호출 한도 (실전 20건, 모의 2건)
+REAL_RATE_LIMIT = 20
+VIRTUAL_RATE_LIMIT = 2
+# 송신 시각과 서버 도착 시각의 차이로 경계에서 한도를 넘지 않도록 윈도우를 조금 길게 잡음
+RATE_WINDOW = 1.1
+
+# 응답 오류 코드
+MSG_RATE_LIMITED = "EGW00201"   # 초당 거래건수 초과
+MSG_TOKEN_EXPIRED = "EGW00123"  # 기간이 만료된 token
+MSG_TOKEN_INVALID = "EGW00121"  # 유효하지 않은 token
+
+TR_INQUIRE_PRICE = "FHKST01010100"
+TR_INQUIRE_BALANCE = {True: "VTTC8434R", False: "TTTC8434R"}  # 모의 / 실전
+
+
+class KisApiError(Exception):
+    def __init__(self, msg_cd, message, status=None):
+        super().__init__(f"[{msg_cd}] {message}")
+        self.msg_cd = msg_cd
+        self.status = status
+
+
+class RateLimiter:
+    def __init__(self, max_calls, period=1.0):
+        """
+        슬라이딩 윈도우 호출 제한 (스레드 안전). period 안의 호출이 max_calls를 넘지 않도록 대기.
+        :param max_calls: period당 최대 호출 수
+        :param period: 윈도우 길이 (초)
+        """
+        self.max_calls = max_calls
+        self.period = period
+        self._calls = deque()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                while self._calls and now - self._calls[0] >= self.period:
+                    self._calls.popleft()
+                if len(self._calls) < self.max_calls:
+                    self._calls.append(now)
+                    return
+                wait = self.period - (now - self._calls[0])
+            time.sleep(max(wait, 0.001))
+
+
+class TokenCache:
+    def __init__(self, path=None, refresh_margin=600):
+        """
+        OAuth 접근 토큰 캐시. 만료 refresh_margin초 전부터는 새로 발급하도록 None 반환.
+        KIS는 토큰 재발급을 1분 1회로 제한하므로 path를 주면 파일에도 저장하여 재시작 시 재사용.
+        :param path: 토큰 저장 JSON 경로 (None이면 메모리만)
+        :param refresh_margin: 만료 전 갱신 여유 (초)
+        """
+        self.path = path
+        self.refresh_margin = refresh_margin
+        self._tokens = {}
+        self._lock = threading.Lock()
+        if path and os.path.exists(path):
+            try:
+                with open(path, encoding='utf-8') as f:
+                    self._tokens = json.load(f)
+            except (OSError, ValueError):
+                self._tokens = {}
+
+    def get(self, key):
+        with self._lock:
+            entry = self._tokens.get(key)
+        if not entry:
+            return None
+        if datetime.fromisoformat(entry['expires_at']) - timedelta(seconds=self.refresh_margin) <= datetime.now():
+            return None
+        return entry['access_token']
+
+    def set(self, key, access_token, expires_at):
+        with self._lock:
+            self._tokens[key] = {'access_token': access_token, 'expires_at': expires_at.isoformat(timespec='seconds')}
+            if self.path:
+                tmp = f"{self.path}.tmp"
+                with open(tmp, 'w', encoding='utf-8') as f:
+                    json.dump(self._tokens, f)
+                os.replace(tmp, self.path)
+
+
+class KisClient:
+    def __init__(self, app_key, app_secret, account_no="", is_virtual=True, base_url=None,
+                 rate_limit=None, token_cache=None, max_workers=8, request_timeout=5, max_retries=3):
+        """
+        한국투자증권 Open API REST 클라이언트.
+        - 토큰: TokenCache로 재사용, 만료 전 자동 재발급 (동시 요청 시 1회만 발급)
+        - HTTP: keep-alive 커넥션 풀을 가진 requests.Session 하나를 공유
+        - 호출 제한: RateLimiter로 초당 한도 이하로 송신, 한도 초과 응답은 백오프 후 재시도
+        :param account_no: 계좌번호 (8자리 + 상품코드 2자리, '-' 허용)
+        :param base_url: API 주소 (기본: 실전/모의 도메인, 로컬 스텁 서버 테스트 시 지정)
+        :param rate_limit: 초당 호출 수 (기본: 실전 20, 모의 2)
+        :param max_workers: get_current_prices 동시 요청 수
+        """
+        self.app_key = app_key
+        self.app_secret = app_secret
+        self.account_no = account_no.replace('-', '')
+        self.is_virtual = is_virtual
+        self.base_url = (base_url or (VIRTUAL_BASE_URL if is_virtual else REAL_BASE_URL)).rstrip('/')
+        self.rate_limiter = RateLimiter(rate_limit or (VIRTUAL_RATE_LIMIT if is_virtual else REAL_RATE_LIMIT), period=RATE_WINDOW)
+        self.token_cache = token_cache if token_cache is not None else TokenCache()
+        self.max_workers = max_workers
+        self.request_timeout = request_timeout
+        self.max_retries = max_retries
+        self._token_lock = threading.Lock()
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max_workers)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        self.session.headers.update({'content-type': 'application/json; charset=utf-8'})
+
+    @classmethod
+    def from_env(cls, **kwargs):
+        """
+        환경 변수(KIS_APP_KEY, KIS_APP_SECRET, KIS_ACCOUNT, KIS_VIRTUAL, KIS_BASE_URL,
+        KIS_RATE_LIMIT, KIS_TOKEN_CACHE)로 생성
+        """
+        rate_limit = os.getenv("KIS_RATE_LIMIT")
+        token_path = os.getenv("KIS_TOKEN_CACHE", os.path.join(os.path.dirname(os.path.abspath(__file__)), ".kis_token.json"))
+        return cls(
+            app_key=os.getenv("KIS_APP_KEY", ""),
+            app_secret=os.getenv("KIS_APP_SECRET", ""),
+            account_no=os.getenv("KIS_ACCOUNT", ""),
+            is_virtual=os.getenv("KIS_VIRTUAL", "true").lower() == "true",
+            base_url=os.getenv("KIS_BASE_URL") or None,
+            rate_limit=int(rate_limit) if rate_limit else None,
+            token_cache=TokenCache(token_path),
+            **kwargs
+        )
+
+    def close(self):
+        self.session.close()
+
+    # --- 토큰 ---
+    def _token_key(self):
+        # 앱키 원문을 파일에 남기지 않음
+        return hashlib.sha256(f"{self.base_url}|{self.app_key}".encode()).hexdigest()[:16]
+
+    def get_token(self, rejected=None):
+        """
+        유효한 접근 토큰 (캐시에 없거나 곧 만료되면 발급)
+        :param rejected: 서버가 만료/무효로 거절한 토큰 (캐시에 남아 있어도 재발급)
+        """
+        key = self._token_key()
+        token = self.token_cache.get(key)
+        if token and token != rejected:
+            return token
+
+        with self._token_lock:
+            # 대기 중 다른 스레드가 이미 발급했으면 재사용
+            token = self.token_cache.get(key)
+            if token and token != rejected:
+                return token
+
+            resp = self.session.post(f"{self.base_url}/oauth2/tokenP", timeout=self.request_timeout, json={
+                'grant_type': 'client_credentials', 'appkey': self.app_key, 'appsecret': self.app_secret
+            })
+            data = resp.json()
+            if resp.status_code != 200 or 'access_token' not in data:
+                raise KisApiError(data.get('error_code', str(resp.status_code)), data.get('error_description', resp.text), resp.status_code)
+
+            expired = data.get('access_token_token_expired')
+            if expired:
+                expires_at = datetime.strptime(expired, "%Y-%m-%d %H:%M:%S")
+            else:
+                expires_at = datetime.now() + timedelta(seconds=int(data.get('expires_in', 86400)))
+            self.token_cache.set(key, data['access_token'], expires_at)
+            logger.info(f"KIS access token issued (expires {expires_at})")
+            return data['access_token']
+
+    def get_approval_key(self):
+        """
+        실시간 웹소켓 접속키 (/oauth2/Approval). 토큰과 같은 캐시에 24시간 보관.
+        """
+        key = f"{self._token_key()}:ws"
+        approval_key = self.token_cache.get(key)
+        if approval_key:
+            return approval_key
+        with self._token_lock:
+            approval_key = self.token_cache.get(key)
+            if approval_key:
+                return approval_key
+            resp = self.session.post(f"{self.base_url}/oauth2/Approval", timeout=self.request_timeout, json={
+                'grant_type': 'client_credentials', 'appkey': self.app_key, 'secretkey': self.app_secret
+            })
+            data = resp.json()
+            if resp.status_code != 200 or 'approval_key' not in data:
+                raise KisApiError(data.get('error_code', str(resp.status_code)), data.get('error_description', resp.text), resp.status_code)
+            self.token_cache.set(key, data['approval_key'], datetime.now() + timedelta(hours=24))
+            return data['approval_key']
+
+    # --- 공통 요청 ---
+    def request(self, method, path, tr_id, params=None):
+        """
+        인증 헤더를 붙여 호출. 한도 초과는 백오프 후 재시도, 토큰 만료는 재발급 후 1회 재시도.
+        Returns: 응답 JSON (rt_cd == '0')
+        """
+        refreshed = False
+        for attempt in range(self.max_retries + 1):
+            token = self.get_token()
+            headers = {
+                'authorization': f"Bearer {token}",
+                'appkey': self.app_key,
+                'appsecret': self.app_secret,
+                'tr_id': tr_id,
+                'custtype': 'P',
+            }
+            self.rate_limiter.acquire()
+            resp = self.session.request(method, f"{self.base_url}{path}", headers=headers, params=params, timeout=self.request_timeout)
+            try:
+                data = resp.json()
+            except ValueError:
+                raise KisApiError(str(resp.status_code), resp.text[:200], resp.status_code)
+
+            if data.get('rt_cd') == '0':
+                return data
+
+            msg_cd = data.get('msg_cd', '')
+            if msg_cd == MSG_RATE_LIMITED and attempt < self.max_retries:
+                # 서버 윈도우가 비워질 때까지 대기 (재시도마다 늘림)
+                time.sleep(self.rate_limiter.period * (attempt + 1) / 2)
+                continue
+            if msg_cd in (MSG_TOKEN_EXPIRED, MSG_TOKEN_INVALID) and not refreshed:
+                refreshed = True
+                self.get_token(rejected=token)
+                continue
+            raise KisApiError(msg_cd, data.get('msg1', ''), resp.status_code)
+        raise KisApiError(MSG_RATE_LIMITED, "rate limit retries exhausted")
+
+    # --- 시세 ---
+    def get_current_price(self, ticker):
+        """
+        주식 현재가 (inquire-price)
+        Returns: {'ticker', 'price', 'change', 'change_pct', 'open', 'high', 'low', 'volume', 'amount'}
+        """
+        data = self.request('GET', '/uapi/domestic-stock/v1/quotations/inquire-price', TR_INQUIRE_PRICE, params={
+            'FID_COND_MRKT_DIV_CODE': 'J', 'FID_INPUT_ISCD': ticker
+        })
+        out = data.get('output', {})
+        return {
+            'ticker': ticker,
+            'price': int(out.get('stck_prpr', 0)),
+            'change': int(out.get('prdy_vrss', 0)),
+            'change_pct': float(out.get('prdy_ctrt', 0)),
+            'open': int(out.get('stck_oprc', 0)),
+            'high': int(out.get('stck_hgpr', 0)),
+            'low': int(out.get('stck_lwpr', 0)),
+            'volume': int(out.get('acml_vol', 0)),
+            'amount': int(out.get('acml_tr_pbmn', 0)),
+        }
+
+    def get_current_prices(self, tickers):
+        """
+        여러 종목 현재가를 동시에 조회 (커넥션 풀 + 호출 제한 공유)
+        Returns: ({ticker: quote}, {ticker: 오류 메시지})
+        """
+        tickers = list(dict.fromkeys(tickers))
+        quotes, errors = {}, {}
+        if not tickers:
+            return quotes, errors
+        with concurrent.futures.ThreadPoolExecutor(max_workers=min(self.max_workers, len(tickers))) as executor:
+            futures = {executor.submit(self.get_current_price, t): t for t in tickers}
+            for future in concurrent.futures.as_completed(futures):
+                ticker = futures[future]
+                try:
+                    quotes[ticker] = future.result()
+                except (KisApiError, requests.RequestException) as e:
+                    errors[ticker] = str(e)
+        # 입력 순서 유지
+        return {t: quotes[t] for t in tickers if t in quotes}, errors
+
+    # --- 계좌 ---
+    def get_account_balance(self, account_no=None):
+        """
+        주식 잔고 조회 (inquire-balance)
+        Returns: {'cash', 'total_eval', 'holdings': [{'ticker', 'name', 'qty', 'avg_price', 'price', 'eval_amount', 'profit_pct'}]}
+        """
+        account = (account_no or self.account_no).replace('-', '')
+        if len(account) != 10:
+            raise ValueError("계좌번호는 8자리 + 상품코드 2자리여야 합니다.")
+        data = self.request('GET', '/uapi/domestic-stock/v1/trading/inquire-balance', TR_INQUIRE_BALANCE[self.is_virtual], params={
+            'CANO': account[:8], 'ACNT_PRDT_CD': account[8:], 'AFHR_FLPR_YN': 'N', 'OFL_YN': '',
+            'INQR_DVSN': '02', 'UNPR_DVSN': '01', 'FUND_STTL_ICLD_YN': 'N', 'FNCG_AMT_AUTO_RDPT_YN': 'N',
+            'PRCS_DVSN': '00', 'CTX_AREA_FK100': '', 'CTX_AREA_NK100': ''
+        })
+        summary = (data.get('output2') or [{}])[0]
+        holdings = [{
+            'ticker': row.get('pdno', ''),
+            'name': row.get('prdt_name', ''),
+            'qty': int(row.get('hldg_qty', 0)),
+            'avg_price': float(row.get('pchs_avg_pric', 0)),
+            'price': int(row.get('prpr', 0)),
+            'eval_amount': int(row.get('evlu_amt', 0)),
+            'profit_pct': float(row.get('evlu_pfls_rt', 0)),
+        } for row in data.get('output1', []) if int(row.get('hldg_qty', 0)) > 0]
+        return {
+            'cash': int(summary.get('dnca_tot_amt', 0)),
+            'total_eval': int(summary.get('tot_evlu_amt', 0)),
+            'holdings': holdings,
+        }
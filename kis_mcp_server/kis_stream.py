@@ -0,0 +1,173 @@
+import json
+import asyncio
+import logging
+import threading
+from datetime import datetime, time as dtime
+
+from tick_buffer import TickStore
+
+logger = logging.getLogger("kis-mcp-server")
+
+REAL_WS_URL = "ws://ops.koreainvestment.com:21000"
+VIRTUAL_WS_URL = "ws://ops.koreainvestment.com:31000"
+
+TR_REALTIME_TRADE = "H0STCNT0"  # 국내주식 실시간 체결가
+TRADE_FIELD_COUNT = 46           # H0STCNT0 레코드당 필드 수
+# H0STCNT0 필드 위치: 종목코드, 체결시각(HHMMSS), 현재가, 체결거래량
+F_TICKER, F_TIME, F_PRICE, F_VOLUME = 0, 1, 2, 12
+
+
+def subscribe_message(approval_key, ticker, subscribe=True, tr_id=TR_REALTIME_TRADE):
+    return json.dumps({
+        'header': {'approval_key': approval_key, 'custtype': 'P', 'tr_type': '1' if subscribe else '2', 'content-type': 'utf-8'},
+        'body': {'input': {'tr_id': tr_id, 'tr_key': ticker}},
+    })
+
+
+def tick_timestamp(hhmmss, day=None):
+    """
+    체결시각(HHMMSS)을 해당 일자(기본: 오늘)의 epoch 초로 변환
+    """
+    t = dtime(int(hhmmss[:2]), int(hhmmss[2:4]), int(hhmmss[4:6]))
+    return datetime.combine(day or datetime.now().date(), t).timestamp()
+
+
+def parse_trade_frame(message, day=None):
+    """
+    실시간 체결 데이터 프레임 파싱: '0|H0STCNT0|003|필드^필드^...'
+    한 프레임에 여러 체결이 올 수 있음 (건수 x 46필드).
+    Returns: [(ticker, ts, price, volume)] (체결 데이터가 아니면 [])
+    """
+    if not message or message[0] not in '01':
+        return []
+    parts = message.split('|', 3)
+    if len(parts) < 4 or parts[1] != TR_REALTIME_TRADE:
+        return []
+    if parts[0] == '1':
+        # 암호화 데이터 (체결 통보 등) - 시세에는 사용하지 않음
+        return []
+    fields = parts[3].split('^')
+    ticks = []
+    for i in range(int(parts[2])):
+        record = fields[i * TRADE_FIELD_COUNT:(i + 1) * TRADE_FIELD_COUNT]
+        if len(record) < F_VOLUME + 1:
+            break
+        ticks.append((record[F_TICKER], tick_timestamp(record[F_TIME], day), float(record[F_PRICE]), int(record[F_VOLUME])))
+    return ticks
+
+
+class KisPriceStream:
+    def __init__(self, approval_key_fn, ws_url, store=None, reconnect_delay=1.0, max_reconnect_delay=30.0):
+        """
+        KIS 실시간 체결가 웹소켓 구독. 별도 스레드의 asyncio 루프에서 수신하여 TickStore에 기록.
+        연결이 끊기면 지수 백오프로 재접속하고 구독 종목을 다시 등록함.
+        :param approval_key_fn: 웹소켓 접속키를 돌려주는 함수 (KisClient.get_approval_key)
+        :param ws_url: 웹소켓 주소 (실전/모의 또는 로컬 리플레이 서버)
+        :param store: 틱 저장소 (기본: 새 TickStore)
+        """
+        self.approval_key_fn = approval_key_fn
+        self.ws_url = ws_url
+        self.store = store if store is not None else TickStore()
+        self.reconnect_delay = reconnect_delay
+        self.max_reconnect_delay = max_reconnect_delay
+        self.subscribed = set()
+        self.connected = threading.Event()
+        self._loop = None
+        self._ws = None
+        self._thread = None
+        self._stopping = False
+        self._lock = threading.Lock()
+
+    def start(self):
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return self
+            self._stopping = False
+            self._loop = asyncio.new_event_loop()
+            self._thread = threading.Thread(target=self._loop.run_until_complete, args=(self._run(),), daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self, timeout=5):
+        self._stopping = True
+        if self._loop is not None and self._ws is not None:
+            asyncio.run_coroutine_threadsafe(self._ws.close(), self._loop)
+        if self._thread is not None:
+            self._thread.join(timeout)
+        self.connected.clear()
+
+    def subscribe(self, tickers):
+        """
+        종목 구독 추가 (연결 전이면 접속 시 등록). Returns: 새로 추가된 종목
+        """
+        added = [t for t in dict.fromkeys(tickers) if t not in self.subscribed]
+        self.subscribed.update(added)
+        self.start()
+        self._send_all(added, subscribe=True)
+        return added
+
+    def unsubscribe(self, tickers):
+        removed = [t for t in dict.fromkeys(tickers) if t in self.subscribed]
+        self.subscribed.difference_update(removed)
+        self._send_all(removed, subscribe=False)
+        return removed
+
+    def _send_all(self, tickers, subscribe):
+        if not tickers or self._ws is None or not self.connected.is_set():
+            return
+        asyncio.run_coroutine_threadsafe(self._send_subscriptions(self._ws, tickers, subscribe), self._loop)
+
+    async def _send_subscriptions(self, ws, tickers, subscribe=True):
+        approval_key = await asyncio.to_thread(self.approval_key_fn)
+        for ticker in tickers:
+            await ws.send(subscribe_message(approval_key, ticker, subscribe))
+
+    async def _run(self):
+        from websockets.asyncio.client import connect
+        from websockets.exceptions import ConnectionClosed
+
+        delay = self.reconnect_delay
+        while not self._stopping:
+            try:
+                async with connect(self.ws_url, ping_interval=None) as ws:
+                    self._ws = ws
+                    await self._send_subscriptions(ws, sorted(self.subscribed))
+                    self.connected.set()
+                    delay = self.reconnect_delay
+                    async for message in ws:
+                        self._handle(ws, message)
+            except (OSError, ConnectionClosed, asyncio.TimeoutError) as e:
+                if not self._stopping:
+                    logger.warning(f"KIS stream disconnected: {e}. Reconnecting in {delay:.1f}s")
+            except Exception as e:
+                # 접속키 발급 실패(KisApiError/requests), 핸드셰이크 거부(InvalidStatus) 등도 스레드를 죽이지 않고 재접속
+                if not self._stopping:
+                    logger.exception(f"KIS stream error: {type(e).__name__}: {e}. Reconnecting in {delay:.1f}s")
+            finally:
+                self._ws = None
+                self.connected.clear()
+            if self._stopping:
+                break
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, self.max_reconnect_delay)
+
+    def _handle(self, ws, message):
+        if isinstance(message, bytes):
+            message = message.decode('utf-8')
+        if message[:1] in '01':
+            for ticker, ts, price, volume in parse_trade_frame(message):
+                self.store.add_tick(ticker, ts, price, volume)
+            return
+
+        # JSON 제어 메시지: PINGPONG은 그대로 돌려보내고, 구독 응답은 로그만
+        try:
+            data = json.loads(message)
+        except ValueError:
+            return
+        header = data.get('header', {})
+        if header.get('tr_id') == 'PINGPONG':
+            asyncio.ensure_future(ws.send(message))
+            return
+        body = data.get('body', {})
+        if body.get('rt_cd') not in (None, '0'):
+            logger.warning(f"KIS stream {header.get('tr_key')}: {body.get('msg1')}")
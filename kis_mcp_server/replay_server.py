@@ -0,0 +1,147 @@
+"""
+오프라인 테스트용 KIS 실시간 체결가 웹소켓 리플레이 서버.
+기록된 체결 틱(CSV: ticker,time,price,volume)을 구독한 종목에 한해 H0STCNT0 프레임 형식으로 재생합니다.
+
+    python replay_server.py ticks.csv --port 8766 --interval 0.01
+    KIS_WS_URL=ws://127.0.0.1:8766 python server.py
+"""
+import csv
+import json
+import asyncio
+import argparse
+import threading
+
+from kis_stream import TR_REALTIME_TRADE, TRADE_FIELD_COUNT, F_TICKER, F_TIME, F_PRICE, F_VOLUME
+
+
+def load_ticks(path):
+    """
+    CSV(ticker,time,price,volume) -> [(ticker, 'HHMMSS', price, volume)] (파일 순서 = 재생 순서)
+    """
+    with open(path, newline='', encoding='utf-8') as f:
+        return [(row['ticker'], row['time'], float(row['price']), int(row['volume'])) for row in csv.DictReader(f)]
+
+
+def trade_frame(ticks):
+    """
+    같은 종목 체결 여러 건을 한 프레임으로: '0|H0STCNT0|건수|필드^...'
+    """
+    fields = []
+    for ticker, hhmmss, price, volume in ticks:
+        record = ['0'] * TRADE_FIELD_COUNT
+        record[F_TICKER], record[F_TIME], record[F_PRICE], record[F_VOLUME] = ticker, hhmmss, f"{price:g}", str(volume)
+        fields.extend(record)
+    return f"0|{TR_REALTIME_TRADE}|{len(ticks):03d}|{'^'.join(fields)}"
+
+
+class ReplayServer:
+    def __init__(self, ticks, host='127.0.0.1', port=0, interval=0.0, batch=1, start_delay=0.2):
+        """
+        :param ticks: [(ticker, 'HHMMSS', price, volume)] 재생할 체결 (순서대로)
+        :param port: 0이면 임의의 빈 포트
+        :param interval: 프레임 간 대기 (초)
+        :param batch: 같은 종목 연속 체결을 한 프레임에 묶는 최대 건수
+        :param start_delay: 첫 구독 후 재생 시작까지 대기 (초, 나머지 구독 요청을 받을 시간)
+        """
+        self.ticks = list(ticks)
+        self.host = host
+        self.port = port
+        self.interval = interval
+        self.batch = batch
+        self.start_delay = start_delay
+        self.sent_ticks = 0
+        self.subscribe_messages = 0
+        self.finished = threading.Event()
+        self._ready = threading.Event()
+        self._loop = None
+        self._server = None
+        self._thread = None
+
+    @property
+    def url(self):
+        return f"ws://{self.host}:{self.port}"
+
+    def start(self):
+        self._thread = threading.Thread(target=self._serve, daemon=True)
+        self._thread.start()
+        self._ready.wait(10)
+        return self
+
+    def stop(self):
+        if self._loop is not None and self._server is not None:
+            self._loop.call_soon_threadsafe(self._server.close)
+        if self._thread is not None:
+            self._thread.join(5)
+
+    def _serve(self):
+        self._loop = asyncio.new_event_loop()
+        self._loop.run_until_complete(self._main())
+
+    async def _main(self):
+        from websockets.asyncio.server import serve
+        async with serve(self._handler, self.host, self.port) as server:
+            self._server = server
+            self.port = server.sockets[0].getsockname()[1]
+            self._ready.set()
+            await server.wait_closed()
+
+    async def _handler(self, ws):
+        subscribed = set()
+        replay = None
+        try:
+            async for message in ws:
+                data = json.loads(message)
+                header, body = data.get('header', {}), data.get('body', {}).get('input', {})
+                if header.get('tr_id') == 'PINGPONG':
+                    continue
+                ticker = body.get('tr_key', '')
+                self.subscribe_messages += 1
+                if not header.get('approval_key'):
+                    await ws.send(json.dumps({'header': {'tr_id': body.get('tr_id'), 'tr_key': ticker},
+                                              'body': {'rt_cd': '1', 'msg_cd': 'OPSP8996', 'msg1': 'invalid approval'}}))
+                    continue
+                if header.get('tr_type') == '1':
+                    subscribed.add(ticker)
+                    msg1 = 'SUBSCRIBE SUCCESS'
+                else:
+                    subscribed.discard(ticker)
+                    msg1 = 'UNSUBSCRIBE SUCCESS'
+                await ws.send(json.dumps({'header': {'tr_id': body.get('tr_id'), 'tr_key': ticker, 'encrypt': 'N'},
+                                          'body': {'rt_cd': '0', 'msg_cd': 'OPSP0000', 'msg1': msg1}}))
+                if replay is None:
+                    replay = asyncio.ensure_future(self._replay(ws, subscribed))
+        finally:
+            if replay is not None:
+                replay.cancel()
+
+    async def _replay(self, ws, subscribed):
+        await asyncio.sleep(self.start_delay)
+        await ws.send(json.dumps({'header': {'tr_id': 'PINGPONG', 'datetime': '20240101090000'}}))
+        i = 0
+        while i < len(self.ticks):
+            # 같은 종목 연속 체결은 batch 건까지 한 프레임으로 묶음
+            j = i + 1
+            while j < len(self.ticks) and j - i < self.batch and self.ticks[j][0] == self.ticks[i][0]:
+                j += 1
+            chunk = self.ticks[i:j]
+            i = j
+            if chunk[0][0] not in subscribed:
+                continue
+            await ws.send(trade_frame(chunk))
+            self.sent_ticks += len(chunk)
+            if self.interval:
+                await asyncio.sleep(self.interval)
+            else:
+                await asyncio.sleep(0)
+        self.finished.set()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Replay recorded KIS trade ticks over websocket")
+    parser.add_argument('ticks_csv')
+    parser.add_argument('--port', type=int, default=8766)
+    parser.add_argument('--interval', type=float, default=0.01)
+    args = parser.parse_args()
+    server = ReplayServer(load_ticks(args.ticks_csv), port=args.port, interval=args.interval).start()
+    print(f"KIS replay server listening on {server.url}")
+    server._thread.join()
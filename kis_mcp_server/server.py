@@ -1,7 +1,13 @@
 import os
 import logging
+import threading
+from datetime import datetime
+import requests
 from fastmcp import FastMCP
 from dotenv import load_dotenv
+from kis_client import KisClient, KisApiError
+from kis_stream import KisPriceStream, REAL_WS_URL, VIRTUAL_WS_URL
+from tick_buffer import TickStore
 
 # 로깅 설정
 logging.basicConfig(
@@ -16,13 +22,23 @@ load_dotenv()
 # MCP 서버 초기화
 mcp = FastMCP("kis-mcp")
 
-# KIS API 관련 상수 (환경 변수에서 로드 예정)
-APP_KEY = os.getenv("KIS_APP_KEY", "")
-APP_SECRET = os.getenv("KIS_APP_SECRET", "")
-ACCOUNT_NO = os.getenv("KIS_ACCOUNT", "")
-IS_VIRTUAL = os.getenv("KIS_VIRTUAL", "true").lower() == "true"
+# KIS API 클라이언트 (환경 변수: KIS_APP_KEY, KIS_APP_SECRET, KIS_ACCOUNT, KIS_VIRTUAL, KIS_BASE_URL)
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_client():
+    # 첫 도구 호출 시 생성하여 토큰/커넥션 풀/호출 제한을 모든 도구가 공유
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = KisClient.from_env()
+        return _client
+
+
+def format_quote(q):
+    return f"{q['ticker']}: {q['price']:,}원 ({q['change']:+,}원, {q['change_pct']:+.2f}%) 거래량 {q['volume']:,}"
 
-BASE_URL = "https://openapivts.koreainvestment.com:29443" if IS_VIRTUAL else "https://openapi.koreainvestment.com:9443"
 
 @mcp.tool()
 def get_account_balance(account_number: str = "") -> str:
@@ -32,20 +48,30 @@ def get_account_balance(account_number: str = "") -> str:
     Args:
         account_number: 조회할 계좌번호 (기본값: 환경변수 설정값)
     """
-    target_acc = account_number if account_number else ACCOUNT_NO
+    client = get_client()
+    target_acc = account_number if account_number else client.account_no
     logger.info(f"Checking balance for account: {target_acc}")
-    
-    # [Mocking Mode] 실제 API 연결 전 테스트용
-    return f"""
-    [MOCK Data] 계좌 잔고 조회 결과
-    --------------------------------
-    계좌번호: {target_acc}
-    예수금: 10,000,000 원
-    총 평가 금액: 10,000,000 원
-    보유 종목: 없음
-    --------------------------------
-    (현재는 API 연결 테스트를 위한 가짜 데이터입니다.)
-    """
+
+    try:
+        balance = client.get_account_balance(target_acc)
+    except (KisApiError, ValueError, requests.RequestException) as e:
+        logger.error(f"Balance inquiry failed: {e}")
+        return f"잔고 조회 실패: {e}"
+
+    lines = [
+        "계좌 잔고 조회 결과",
+        "--------------------------------",
+        f"계좌번호: {target_acc}",
+        f"예수금: {balance['cash']:,} 원",
+        f"총 평가 금액: {balance['total_eval']:,} 원",
+    ]
+    if balance['holdings']:
+        lines.append("보유 종목:")
+        for h in balance['holdings']:
+            lines.append(f"  {h['name']}({h['ticker']}) {h['qty']:,}주 @ {h['avg_price']:,.0f} -> {h['price']:,}원 ({h['profit_pct']:+.2f}%)")
+    else:
+        lines.append("보유 종목: 없음")
+    return "\n".join(lines)
 
 @mcp.tool()
 def get_current_price(ticker: str) -> str:
@@ -56,10 +82,108 @@ def get_current_price(ticker: str) -> str:
         ticker: 종목 코드 (예: 005930)
     """
     logger.info(f"Checking price for ticker: {ticker}")
+    try:
+        return format_quote(get_client().get_current_price(ticker))
+    except (KisApiError, requests.RequestException) as e:
+        logger.error(f"Price inquiry failed for {ticker}: {e}")
+        return f"종목 {ticker} 현재가 조회 실패: {e}"
+
+@mcp.tool()
+def get_current_prices(tickers: list[str]) -> str:
+    """
+    여러 종목의 현재가를 한 번에 조회합니다. (동시 요청, 초당 호출 한도 준수)
     
-    # [Mocking Mode]
-    mock_price = "70,000" if ticker == "005930" else "15,000"
-    return f"종목 {ticker}의 현재가(Mock): {mock_price} 원"
+    Args:
+        tickers: 종목 코드 목록 (예: ["005930", "000660"])
+    """
+    logger.info(f"Checking prices for {len(tickers)} tickers")
+    quotes, errors = get_client().get_current_prices(tickers)
+    lines = [format_quote(q) for q in quotes.values()]
+    lines += [f"{t}: 조회 실패 ({msg})" for t, msg in errors.items()]
+    return "\n".join(lines) if lines else "조회할 종목이 없습니다."
+
+# --- 실시간 체결가 구독 (웹소켓 -> 종목별 틱 링버퍼) ---
+_stream = None
+_stream_lock = threading.Lock()
+
+
+def get_stream():
+    # 환경 변수 KIS_WS_URL로 로컬 리플레이 서버 지정 가능
+    global _stream
+    with _stream_lock:
+        if _stream is None:
+            client = get_client()
+            ws_url = os.getenv("KIS_WS_URL") or (VIRTUAL_WS_URL if client.is_virtual else REAL_WS_URL)
+            _stream = KisPriceStream(client.get_approval_key, ws_url, TickStore(
+                capacity=int(os.getenv("KIS_TICK_CAPACITY", "4096")), bar_seconds=int(os.getenv("KIS_BAR_SECONDS", "60"))))
+        return _stream
+
+
+def format_bar(bar):
+    start = datetime.fromtimestamp(bar['start']).strftime('%H:%M:%S')
+    return f"{start} O {bar['open']:,.0f} H {bar['high']:,.0f} L {bar['low']:,.0f} C {bar['close']:,.0f} V {bar['volume']:,} ({bar['ticks']} ticks)"
+
+
+@mcp.tool()
+def subscribe_prices(tickers: list[str]) -> str:
+    """
+    종목들의 실시간 체결가를 구독합니다. 수신한 틱은 종목별 메모리 버퍼에 쌓입니다.
+    
+    Args:
+        tickers: 종목 코드 목록 (예: ["005930", "000660"])
+    """
+    stream = get_stream()
+    added = stream.subscribe(tickers)
+    return f"구독 추가 {len(added)}종목, 현재 구독 {len(stream.subscribed)}종목: {', '.join(sorted(stream.subscribed))}"
+
+@mcp.tool()
+def unsubscribe_prices(tickers: list[str]) -> str:
+    """
+    실시간 체결가 구독을 해제합니다. (버퍼에 쌓인 틱은 유지)
+    
+    Args:
+        tickers: 종목 코드 목록
+    """
+    stream = get_stream()
+    removed = stream.unsubscribe(tickers)
+    return f"구독 해제 {len(removed)}종목, 현재 구독 {len(stream.subscribed)}종목"
+
+@mcp.tool()
+def get_latest_bars(tickers: list[str] | None = None) -> str:
+    """
+    구독 종목의 진행 중인 최신 봉(기본 1분)과 직전 완성 봉을 조회합니다.
+    
+    Args:
+        tickers: 종목 코드 목록 (기본값: 수신 중인 전체 종목)
+    """
+    store = get_stream().store
+    lines = []
+    for ticker in (tickers or store.tickers()):
+        bars = store.latest_bar(ticker)
+        if bars is None:
+            lines.append(f"{ticker}: 수신된 체결 없음")
+            continue
+        lines.append(f"{ticker}: {format_bar(bars['current'])}")
+        if bars['previous']:
+            lines.append(f"  prev {format_bar(bars['previous'])}")
+    return "\n".join(lines) if lines else "수신된 체결이 없습니다. subscribe_prices로 먼저 구독하세요."
+
+@mcp.tool()
+def get_tick_snapshot(ticker: str, n: int = 20) -> str:
+    """
+    종목의 최근 체결 틱을 조회합니다.
+    
+    Args:
+        ticker: 종목 코드
+        n: 조회할 최근 틱 수 (기본값: 20)
+    """
+    snap = get_stream().store.snapshot(ticker, n)
+    if snap is None:
+        return f"{ticker}: 수신된 체결 없음"
+    lines = [f"{ticker} 최근 {len(snap['price'])}틱 (누적 {snap['total']:,}틱)"]
+    for ts, price, volume in zip(snap['ts'], snap['price'], snap['volume']):
+        lines.append(f"  {datetime.fromtimestamp(ts).strftime('%H:%M:%S')} {price:,.0f} x {volume:,}")
+    return "\n".join(lines)
 
 if __name__ == "__main__":
     logger.info("Starting KIS MCP Server...")
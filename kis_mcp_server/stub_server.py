@@ -0,0 +1,191 @@
+"""
+오프라인 테스트용 로컬 KIS REST 스텁 서버.
+토큰/웹소켓 접속키 발급, 현재가, 잔고 조회 엔드포인트를 KIS 응답 형식으로 흉내 내고,
+초당 호출 한도 초과(EGW00201)와 토큰 만료(EGW00123)도 재현합니다.
+
+    python stub_server.py --port 8765
+    KIS_BASE_URL=http://127.0.0.1:8765 python server.py
+"""
+import json
+import time
+import argparse
+import threading
+from collections import deque
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+
+def stub_price(ticker):
+    # 종목코드로 정해지는 결정적 가격 (테스트 검증용)
+    return 1000 + (int(ticker) % 9000) * 10 if ticker.isdigit() else 0
+
+
+class StubKisServer:
+    def __init__(self, host='127.0.0.1', port=0, rate_limit=20, token_ttl=86400, latency=0.0, holdings=None):
+        """
+        :param port: 0이면 임의의 빈 포트
+        :param rate_limit: 초당 허용 호출 수 (초과 시 EGW00201 응답)
+        :param token_ttl: 발급 토큰 유효 시간 (초)
+        :param latency: 시세 응답 지연 (초, 동시 요청 효과 확인용)
+        :param holdings: 잔고 조회 시 돌려줄 [{'ticker', 'name', 'qty', 'avg_price'}]
+        """
+        self.rate_limit = rate_limit
+        self.token_ttl = token_ttl
+        self.latency = latency
+        self.holdings = holdings or []
+        self.token_requests = 0
+        self.approval_requests = 0
+        self.quote_requests = 0
+        self.rate_limited = 0
+        self.connections = 0
+        self.valid_tokens = set()
+        self._calls = deque()
+        self._lock = threading.Lock()
+        self.httpd = ThreadingHTTPServer((host, port), self._handler_class())
+        self.httpd.daemon_threads = True
+        self._thread = None
+
+    @property
+    def base_url(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def expire_tokens(self):
+        """
+        발급된 토큰을 모두 무효화 (클라이언트 캐시는 유효해 보이는 상태에서 서버가 만료 응답)
+        """
+        with self._lock:
+            self.valid_tokens.clear()
+
+    def _issue_token(self):
+        with self._lock:
+            self.token_requests += 1
+            token = f"stub-token-{self.token_requests}"
+            self.valid_tokens.add(token)
+        expires_at = datetime.now() + timedelta(seconds=self.token_ttl)
+        return {
+            'access_token': token,
+            'token_type': 'Bearer',
+            'expires_in': self.token_ttl,
+            'access_token_token_expired': expires_at.strftime("%Y-%m-%d %H:%M:%S"),
+        }
+
+    def _check_call(self, headers):
+        """
+        Returns: 오류 응답 dict 또는 None
+        """
+        token = headers.get('authorization', '').replace('Bearer ', '')
+        with self._lock:
+            if token not in self.valid_tokens:
+                return {'rt_cd': '1', 'msg_cd': 'EGW00123', 'msg1': '기간이 만료된 token 입니다.'}
+            now = time.monotonic()
+            while self._calls and now - self._calls[0] >= 1.0:
+                self._calls.popleft()
+            if len(self._calls) >= self.rate_limit:
+                self.rate_limited += 1
+                return {'rt_cd': '1', 'msg_cd': 'EGW00201', 'msg1': '초당 거래건수를 초과하였습니다.'}
+            self._calls.append(now)
+            self.quote_requests += 1
+        return None
+
+    def _quote(self, ticker):
+        price = stub_price(ticker)
+        return {
+            'rt_cd': '0', 'msg_cd': 'MCA00000', 'msg1': '정상처리 되었습니다.',
+            'output': {
+                'stck_prpr': str(price), 'prdy_vrss': str(price // 100), 'prdy_ctrt': '1.00',
+                'stck_oprc': str(price - 10), 'stck_hgpr': str(price + 20), 'stck_lwpr': str(price - 20),
+                'acml_vol': '100000', 'acml_tr_pbmn': str(price * 100000),
+            }
+        }
+
+    def _balance(self):
+        output1 = []
+        total = 0
+        for h in self.holdings:
+            price = stub_price(h['ticker'])
+            eval_amount = price * h['qty']
+            total += eval_amount
+            output1.append({
+                'pdno': h['ticker'], 'prdt_name': h['name'], 'hldg_qty': str(h['qty']),
+                'pchs_avg_pric': str(h['avg_price']), 'prpr': str(price), 'evlu_amt': str(eval_amount),
+                'evlu_pfls_rt': f"{(price / h['avg_price'] - 1) * 100:.2f}",
+            })
+        cash = 10_000_000
+        return {'rt_cd': '0', 'msg_cd': 'MCA00000', 'msg1': '정상처리 되었습니다.', 'output1': output1,
+                'output2': [{'dnca_tot_amt': str(cash), 'tot_evlu_amt': str(cash + total)}]}
+
+    def _handler_class(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'  # keep-alive
+
+            def setup(self):
+                super().setup()
+                with stub._lock:
+                    stub.connections += 1
+
+            def log_message(self, format, *args):
+                pass
+
+            def _send(self, status, body):
+                payload = json.dumps(body, ensure_ascii=False).encode('utf-8')
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json; charset=utf-8')
+                self.send_header('Content-Length', str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def do_POST(self):
+                length = int(self.headers.get('Content-Length', 0))
+                self.rfile.read(length)
+                path = urlparse(self.path).path
+                if path == '/oauth2/tokenP':
+                    self._send(200, stub._issue_token())
+                elif path == '/oauth2/Approval':
+                    with stub._lock:
+                        stub.approval_requests += 1
+                        approval_key = f"stub-approval-{stub.approval_requests}"
+                    self._send(200, {'approval_key': approval_key})
+                else:
+                    self._send(404, {'rt_cd': '1', 'msg_cd': 'NOT_FOUND', 'msg1': self.path})
+
+            def do_GET(self):
+                url = urlparse(self.path)
+                query = {k: v[0] for k, v in parse_qs(url.query, keep_blank_values=True).items()}
+                error = stub._check_call(self.headers)
+                if error:
+                    self._send(500 if error['msg_cd'] == 'EGW00201' else 401, error)
+                    return
+                if url.path == '/uapi/domestic-stock/v1/quotations/inquire-price':
+                    if stub.latency:
+                        time.sleep(stub.latency)
+                    self._send(200, stub._quote(query.get('FID_INPUT_ISCD', '')))
+                elif url.path == '/uapi/domestic-stock/v1/trading/inquire-balance':
+                    self._send(200, stub._balance())
+                else:
+                    self._send(404, {'rt_cd': '1', 'msg_cd': 'NOT_FOUND', 'msg1': url.path})
+
+        return Handler
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Local KIS REST stub server")
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--rate-limit', type=int, default=20)
+    args = parser.parse_args()
+    server = StubKisServer(port=args.port, rate_limit=args.rate_limit,
+                           holdings=[{'ticker': '005930', 'name': '삼성전자', 'qty': 10, 'avg_price': 70000.0}])
+    print(f"KIS stub server listening on {server.base_url}")
+    server.httpd.serve_forever()
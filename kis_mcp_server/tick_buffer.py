@@ -0,0 +1,106 @@
+import threading
+import numpy as np
+
+
+class TickRingBuffer:
+    def __init__(self, capacity=4096):
+        """
+        고정 크기 배열 기반 체결 틱 링버퍼 (가득 차면 가장 오래된 틱부터 덮어씀).
+        틱마다 객체를 만들지 않으므로 장중 내내 메모리가 일정함.
+        :param capacity: 보관할 최대 틱 수
+        """
+        self.capacity = capacity
+        self.ts = np.zeros(capacity, dtype=np.float64)      # epoch 초
+        self.price = np.zeros(capacity, dtype=np.float64)
+        self.volume = np.zeros(capacity, dtype=np.int64)    # 체결 수량
+        self.count = 0      # 보관 중인 틱 수
+        self.total = 0      # 누적 수신 틱 수
+        self._head = 0      # 다음에 쓸 위치
+
+    def append(self, ts, price, volume):
+        i = self._head
+        self.ts[i] = ts
+        self.price[i] = price
+        self.volume[i] = volume
+        self._head = (i + 1) % self.capacity
+        self.count = min(self.count + 1, self.capacity)
+        self.total += 1
+
+    def snapshot(self, n=None):
+        """
+        최근 n개 틱 (시간순 복사본)
+        Returns: (ts, price, volume) 배열
+        """
+        n = self.count if n is None else max(0, min(n, self.count))
+        idx = (self._head - n + np.arange(n)) % self.capacity
+        return self.ts[idx], self.price[idx], self.volume[idx]
+
+
+class TickStore:
+    def __init__(self, capacity=4096, bar_seconds=60):
+        """
+        종목별 틱 링버퍼 + 최신 봉 집계 (스트림 수신 스레드와 조회 스레드가 공유)
+        :param capacity: 종목당 보관 틱 수
+        :param bar_seconds: 봉 길이 (초, 기본 1분봉)
+        """
+        self.capacity = capacity
+        self.bar_seconds = bar_seconds
+        self._buffers = {}
+        self._bars = {}     # ticker -> [진행 중 봉, 직전 완성 봉]
+        self._lock = threading.Lock()
+
+    def add_tick(self, ticker, ts, price, volume):
+        start = ts - ts % self.bar_seconds
+        with self._lock:
+            buffer = self._buffers.get(ticker)
+            if buffer is None:
+                buffer = self._buffers[ticker] = TickRingBuffer(self.capacity)
+            buffer.append(ts, price, volume)
+
+            bars = self._bars.setdefault(ticker, [None, None])
+            bar = bars[0]
+            if bar is None or start > bar['start']:
+                bars[1] = bar
+                bars[0] = {'start': start, 'open': price, 'high': price, 'low': price, 'close': price, 'volume': volume, 'ticks': 1}
+            elif start == bar['start']:
+                bar['high'] = max(bar['high'], price)
+                bar['low'] = min(bar['low'], price)
+                bar['close'] = price
+                bar['volume'] += volume
+                bar['ticks'] += 1
+            # 이전 봉 구간의 늦은 틱은 버퍼에만 남기고 봉에는 반영하지 않음
+
+    def tickers(self):
+        with self._lock:
+            return list(self._buffers)
+
+    def snapshot(self, ticker, n=None):
+        """
+        최근 n개 틱. Returns: {'ts', 'price', 'volume': list, 'total': 누적 틱 수} 또는 None
+        """
+        with self._lock:
+            buffer = self._buffers.get(ticker)
+            if buffer is None:
+                return None
+            ts, price, volume = buffer.snapshot(n)
+            total = buffer.total
+        return {'ts': ts.tolist(), 'price': price.tolist(), 'volume': volume.tolist(), 'total': total}
+
+    def latest_bar(self, ticker):
+        """
+        진행 중인 최신 봉과 직전 완성 봉. Returns: {'current', 'previous'} 또는 None
+        """
+        with self._lock:
+            bars = self._bars.get(ticker)
+            if bars is None:
+                return None
+            return {'current': dict(bars[0]), 'previous': dict(bars[1]) if bars[1] else None}
+
+    def clear(self, ticker=None):
+        with self._lock:
+            if ticker is None:
+                self._buffers.clear()
+                self._bars.clear()
+            else:
+                self._buffers.pop(ticker, None)
+                self._bars.pop(ticker, None)
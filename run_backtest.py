@@ -1,73 +1,105 @@
+"""
+헤드리스 백테스트 CLI (streamlit 없이 실행, 결과는 stdout에 JSON).
+
+사용법:
+    python run_backtest.py                                          # 기본 설정 (2019-01-01 ~ 2024-12-20, KOSPI 200 + KOSDAQ 50)
+    python run_backtest.py --config user_config.json --ma-long 60    # 설정 파일 + 플래그로 덮어쓰기
+    python run_backtest.py --config sweep.json --jobs 4             # 여러 설정을 프로세스 4개로 병렬 실행
+    python run_backtest.py --profile cprofile --profile-dir profiles # 프로파일링 (저장 결과 재사용 안 함)
+
+설정 파일: 실행 1건 객체, 실행 목록, 또는 {"runs": [...], 공통 키...}.
+키는 user_config.json 이름(sell_slope_mult, weights, market_mode)과 엔진 파라미터 이름 모두 사용 가능.
+"""
 import sys
 import os
-import pandas as pd
-import numpy as np
-import matplotlib.pyplot as plt
-
-# src 폴더를 모듈 검색 경로에 추가
-sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
-sys.path.append(os.path.join(os.path.dirname(__file__)))
-
-from src.data_loader import DataLoader
-from src.backtester import Backtester
-from src.utils import save_csv_safe
-
-def calculate_mdd(equity_series):
-    """MDD(Maximum Drawdown) 계산"""
-    peak = equity_series.cummax()
-    drawdown = (equity_series - peak) / peak
-    return drawdown.min() * 100
-
-def run():
-    print("=== 김진 작가 주도주 전략 백테스트 시작 ===")
-    
-    # 1. 설정 (기간 확대: 2019년 ~ 2024년)
-    start_date = '2019-01-01'
-    end_date = '2024-12-20'
-    
-    # 2. 초기화
-    loader = DataLoader(start_date=start_date, end_date=end_date)
-    backtester = Backtester(loader, start_date=start_date, end_date=end_date)
-    
-    # 3. 실행
-    result = backtester.run()
-    
-    if result.empty:
-        print("[Error] 백테스트 결과가 없습니다.")
-        return
-
-    # 4. 결과 분석
-    initial_val = backtester.initial_balance
-    final_val = result['TotalValue'].iloc[-1]
-    total_return = (final_val - initial_val) / initial_val * 100
-    
-    days = (pd.to_datetime(end_date) - pd.to_datetime(start_date)).days
-    cagr = (final_val / initial_val) ** (365 / days) - 1
-    cagr *= 100
-    
-    mdd = calculate_mdd(result['TotalValue'])
-    
-    print("\n" + "="*30)
-    print(f" [백테스트 결과] {start_date} ~ {end_date}")
-    print(f" 초기 자본: {initial_val:,.0f} 원")
-    print(f" 최종 자본: {final_val:,.0f} 원")
-    print(f" 총 수익률: {total_return:.2f} %")
-    print(f" 연환산수익률(CAGR): {cagr:.2f} %")
-    print(f" MDD: {mdd:.2f} %")
-    print("="*30 + "\n")
-    
-    # 5. 로그 저장
-    # logs 폴더 생성
-    if not os.path.exists('logs'):
-        os.makedirs('logs')
-        
-    log_df = pd.DataFrame(backtester.trade_log)
-    if not log_df.empty:
-        save_path = save_csv_safe(log_df, 'logs/trade_log.csv')
-        print(f"[Save] 매매 로그 저장 완료: {save_path} ({len(log_df)}건)")
-    
-    save_path_equity = save_csv_safe(result.reset_index(), 'logs/equity_curve.csv')
-    print(f"[Save] 자산 곡선 저장 완료: {save_path_equity}")
+import json
+import argparse
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from src.batch_runner import normalize_config, load_run_configs, run_many, DEFAULT_START_DATE, DEFAULT_END_DATE
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Headless backtest runner (JSON metrics on stdout)")
+    run = parser.add_argument_group('run')
+    run.add_argument('--config', action='append', default=[], help="실행 설정 JSON (여러 번 지정 가능)")
+    run.add_argument('--start', default=None, help=f"시작일 (기본: {DEFAULT_START_DATE})")
+    run.add_argument('--end', default=None, help=f"종료일 (기본: {DEFAULT_END_DATE})")
+    run.add_argument('--jobs', type=int, default=1, help="동시에 실행할 설정 수 (프로세스)")
+    run.add_argument('--fresh', action='store_true', help="저장된 결과를 재사용하지 않고 실행 (결과 저장 안 함)")
+    run.add_argument('--profile', choices=['cprofile', 'pyinstrument'], default=None, help="프로파일링 (--fresh 포함)")
+    run.add_argument('--profile-dir', default='profiles')
+    run.add_argument('--db', default='storage.db')
+    run.add_argument('--log-dir', default=None, help="거래 내역/자산 곡선 CSV 저장 폴더")
+    run.add_argument('--output', default=None, help="JSON 결과 파일 (기본: stdout)")
+
+    strategy = parser.add_argument_group('strategy (Strategy 파라미터)')
+    strategy.add_argument('--ma-short', type=int, default=None)
+    strategy.add_argument('--ma-long', type=int, default=None)
+    strategy.add_argument('--sell-slope-multiplier', type=float, default=None)
+    strategy.add_argument('--rs-weights', type=float, nargs=4, default=None, metavar=('W1', 'W2', 'W3', 'W4'))
+    strategy.add_argument('--slope-lookback', type=int, default=None)
+    strategy.add_argument('--use-trend-break', dest='use_trend_break', action='store_true', default=None)
+    strategy.add_argument('--no-trend-break', dest='use_trend_break', action='store_false')
+
+    universe = parser.add_argument_group('universe (universe_params)')
+    universe.add_argument('--mode', choices=['STOCK', 'ETF'], default=None)
+    universe.add_argument('--kospi-n', type=int, default=None)
+    universe.add_argument('--kosdaq-n', type=int, default=None)
+    universe.add_argument('--full-market', action='store_true', default=None, help="KRX 전 종목 (STOCK 모드)")
+    universe.add_argument('--tickers', default=None, help="종목 코드 목록 (쉼표 구분, 리스팅 조회 생략)")
+    universe.add_argument('--lazy', action='store_true', default=None, help="지연 로딩 (대형 유니버스)")
+    universe.add_argument('--chunk-size', type=int, default=None)
+    universe.add_argument('--frame-cache-mb', type=float, default=None)
+    universe.add_argument('--memory-policy', choices=['none', 'safe', 'compact'], default=None)
+    universe.add_argument('--download-timeout', type=float, default=None)
+    return parser.parse_args(argv)
+
+
+# CLI 플래그 -> 설정 키 (값이 None이면 설정 파일 값 유지)
+FLAG_KEYS = (
+    'ma_short', 'ma_long', 'sell_slope_multiplier', 'rs_weights', 'slope_lookback', 'use_trend_break',
+    'mode', 'kospi_n', 'kosdaq_n', 'full_market', 'tickers', 'lazy', 'chunk_size', 'frame_cache_mb',
+    'memory_policy', 'download_timeout',
+)
+
+
+def build_runs(args):
+    """
+    설정 파일(없으면 기본 설정 1건) + 플래그 덮어쓰기 -> 정규화된 실행 목록
+    """
+    configs = []
+    for path in args.config:
+        configs.extend(load_run_configs(path))
+    if not configs:
+        configs = [{'kospi_n': 200, 'kosdaq_n': 50}]
+
+    overrides = normalize_config({key: getattr(args, key) for key in FLAG_KEYS if getattr(args, key) is not None})
+    runs = []
+    for config in configs:
+        run = normalize_config(config)
+        run['strategy_params'].update(overrides['strategy_params'])
+        run['universe_params'].update(overrides['universe_params'])
+        run['start_date'] = args.start or run['start_date']
+        run['end_date'] = args.end or run['end_date']
+        runs.append(run)
+    return runs
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    runs = build_runs(args)
+    results = run_many(runs, jobs=args.jobs, db_path=args.db, fresh=args.fresh, profile=args.profile,
+                       profile_dir=args.profile_dir, log_dir=args.log_dir)
+    payload = json.dumps(results if len(results) > 1 else results[0], ensure_ascii=False, indent=2, default=str)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(payload + "\n")
+    else:
+        print(payload)
+    return 1 if any('error' in r for r in results) else 0
+
 
 if __name__ == "__main__":
-    run()
+    sys.exit(main())
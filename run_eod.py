@@ -0,0 +1,91 @@
+"""
+장 마감 후 일괄 처리 (EOD Pipeline): 누락분 다운로드 -> 증분 지표 -> 랭킹 -> 신호 스캔 -> 리포트/스냅샷.
+
+사용법:
+    python run_eod.py                                       # 지금 1회 실행 (KOSPI 200 + KOSDAQ 50)
+    python run_eod.py --portfolio portfolio.json            # 보유 종목 매도 신호 포함
+    python run_eod.py --full-market --workers 16            # KRX 전 종목
+    python run_eod.py --at 16:10                            # 데몬: 평일 16:10마다 실행
+"""
+import sys
+import os
+import json
+import time
+import argparse
+import traceback
+from datetime import datetime, timedelta
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from src.data_loader import DataLoader
+from src.eod_pipeline import EODPipeline
+from src.scanner import load_portfolio_file
+from run_scanner import strategy_params_from_config
+
+
+def next_run_time(at, now=None):
+    """
+    다음 평일 at(HH:MM) 시각
+    """
+    now = now or datetime.now()
+    hour, minute = (int(x) for x in at.split(':'))
+    candidate = now.replace(hour=hour, minute=minute, second=0, microsecond=0)
+    if candidate <= now:
+        candidate += timedelta(days=1)
+    while candidate.weekday() >= 5:
+        candidate += timedelta(days=1)
+    return candidate
+
+
+def run_once(args, config):
+    today = datetime.now().strftime('%Y-%m-%d')
+    loader = DataLoader(start_date=today, end_date=today)
+    universe_params = {
+        'mode': args.mode or config.get('market_mode', 'STOCK'),
+        'kospi_n': args.kospi_n, 'kosdaq_n': args.kosdaq_n, 'full_market': args.full_market,
+    }
+    portfolio = load_portfolio_file(args.portfolio) if args.portfolio else {}
+    pipeline = EODPipeline(loader, strategy_params=strategy_params_from_config(config), universe_params=universe_params,
+                           portfolio=portfolio, report_dir=args.report_dir, max_workers=args.workers)
+    result = pipeline.run(as_of=args.as_of)
+    if result['report_path']:
+        print(f"[EOD] report: {result['report_path']}")
+    return result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="End-of-day update/scan pipeline")
+    parser.add_argument('--config', help="전략 설정 JSON (user_config.json 형식)")
+    parser.add_argument('--mode', default=None, choices=['STOCK', 'ETF'])
+    parser.add_argument('--kospi-n', type=int, default=200)
+    parser.add_argument('--kosdaq-n', type=int, default=50)
+    parser.add_argument('--full-market', action='store_true', help="KRX 전 종목 (STOCK 모드)")
+    parser.add_argument('--portfolio', help="보유 종목 파일 (JSON 또는 CSV)")
+    parser.add_argument('--as-of', default=None, help="기준일 (기본: 오늘)")
+    parser.add_argument('--report-dir', default='reports')
+    parser.add_argument('--workers', type=int, default=8, help="동시 다운로드 수")
+    parser.add_argument('--at', default=None, help="데몬 모드: 평일 HH:MM마다 실행")
+    args = parser.parse_args(argv)
+
+    config = {}
+    if args.config:
+        with open(args.config, encoding='utf-8') as f:
+            config = json.load(f)
+
+    if not args.at:
+        run_once(args, config)
+        return
+
+    while True:
+        run_at = next_run_time(args.at)
+        print(f"[EOD] next run at {run_at:%Y-%m-%d %H:%M}")
+        time.sleep(max(0.0, (run_at - datetime.now()).total_seconds()))
+        try:
+            run_once(args, config)
+        except Exception:
+            # 하루 실패해도 데몬은 다음 실행을 기다림
+            traceback.print_exc()
+
+
+if __name__ == "__main__":
+    main()
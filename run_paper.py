@@ -0,0 +1,68 @@
+"""
+페이퍼 트레이딩: storage.db의 계좌 상태에서 이어서 새 거래일만 처리 (체결/평가액은 DB에 기록).
+
+사용법:
+    python run_paper.py --start 2024-01-02                 # 새 계좌: 지정일부터 저장된 마지막 거래일까지 처리
+    python run_paper.py                                    # 이후 매일: 새로 저장된 거래일만 처리
+    python run_paper.py --account etf --mode ETF --config user_config.json
+    python run_paper.py --status                           # 처리 없이 계좌 상태만 출력
+"""
+import sys
+import os
+import json
+import time
+import argparse
+import pandas as pd
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from src.database import DBManager
+from src.paper_trading import PaperTrader
+from run_scanner import strategy_params_from_config, print_table
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Incremental paper trading with persisted account state")
+    parser.add_argument('--account', default='default', help="계좌 이름")
+    parser.add_argument('--start', default=None, help="새 계좌의 첫 처리일 (기본: 다음 새 거래일부터)")
+    parser.add_argument('--until', default=None, help="마지막 처리일 (기본: 저장된 마지막 거래일)")
+    parser.add_argument('--config', help="새 계좌의 전략 설정 JSON (user_config.json 형식)")
+    parser.add_argument('--mode', default=None, choices=['STOCK', 'ETF'], help="새 계좌의 유동성 기준")
+    parser.add_argument('--db', default='storage.db')
+    parser.add_argument('--status', action='store_true', help="처리 없이 계좌 상태만 출력")
+    parser.add_argument('--reset', action='store_true', help="계좌 기록을 지우고 새로 시작")
+    args = parser.parse_args(argv)
+
+    db = DBManager(db_path=args.db)
+    if args.reset:
+        db.delete_paper_account(args.account)
+    if args.status and db.get_paper_account(args.account) is None:
+        # PaperTrader는 없는 계좌를 새로 만들므로 조회만 할 때는 먼저 확인
+        parser.error(f"paper account '{args.account}' does not exist")
+
+    strategy_params = universe_params = None
+    if args.config:
+        with open(args.config, encoding='utf-8') as f:
+            config = json.load(f)
+        strategy_params = strategy_params_from_config(config)
+        universe_params = {'mode': args.mode or config.get('market_mode', 'STOCK')}
+    elif args.mode:
+        universe_params = {'mode': args.mode}
+
+    trader = PaperTrader(db, args.account, strategy_params, universe_params, start_date=args.start)
+    if not args.status:
+        t0 = time.perf_counter()
+        result = trader.run(until=args.until)
+        elapsed = time.perf_counter() - t0
+        print(f"[Paper] {result['days']}거래일 처리, 체결 {len(result['fills'])}건 ({elapsed:.2f}s)")
+        print_table("FILLS", result['fills'])
+
+    status = trader.status()
+    positions = pd.DataFrame.from_dict(status['portfolio'], orient='index', columns=['qty', 'avg_price', 'buy_date', 'cost'])
+    print(f"\n=== Paper Account '{status['account']}' @ {status['last_date'].date()} ===")
+    print(f"평가액 {status['total_value']:,.0f}원 (현금 {status['balance']:,.0f}원, 초기 {trader.initial_balance:,.0f}원)")
+    print_table("POSITIONS", positions)
+
+
+if __name__ == "__main__":
+    main()
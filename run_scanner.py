@@ -0,0 +1,75 @@
+"""
+일일 신호 스캐너: 저장된 시세(DB) 기준 마지막 거래일에 백테스터가 무엇을 사고 팔지 출력.
+
+사용법:
+    python run_scanner.py                                  # 전체 저장 종목, 보유 없음
+    python run_scanner.py --portfolio portfolio.json       # 보유 종목 매도 신호 포함
+    python run_scanner.py --config user_config.json --json # 앱 설정의 전략 파라미터, JSON 출력
+"""
+import sys
+import os
+import json
+import time
+import argparse
+import pandas as pd
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from src.database import DBManager
+from src.scanner import SignalScanner, load_portfolio_file, scan_result_to_dict
+
+
+def strategy_params_from_config(config):
+    """
+    user_config.json(앱 사이드바 설정) -> Strategy 파라미터
+    """
+    mapping = {'ma_short': 'ma_short', 'ma_long': 'ma_long', 'sell_slope_mult': 'sell_slope_multiplier',
+               'weights': 'rs_weights', 'slope_lookback': 'slope_lookback', 'use_trend_break': 'use_trend_break'}
+    params = {dst: config[src] for src, dst in mapping.items() if src in config}
+    if 'rs_weights' in params:
+        params['rs_weights'] = tuple(params['rs_weights'])
+    return params
+
+
+def print_table(title, df):
+    print(f"\n[{title}] {len(df)}건")
+    if not df.empty:
+        print(df.to_string(float_format=lambda v: f"{v:,.2f}"))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Daily buy/sell signal scanner")
+    parser.add_argument('--portfolio', help="보유 종목 파일 (JSON 또는 CSV: ticker, qty, avg_price, buy_date)")
+    parser.add_argument('--config', help="전략 설정 JSON (user_config.json 형식)")
+    parser.add_argument('--mode', default=None, choices=['STOCK', 'ETF'], help="유동성 기준 (기본: 설정값 또는 STOCK)")
+    parser.add_argument('--as-of', default=None, help="기준일 (기본: 저장된 마지막 거래일)")
+    parser.add_argument('--db', default='storage.db')
+    parser.add_argument('--json', action='store_true', help="JSON으로 출력")
+    args = parser.parse_args(argv)
+
+    config = {}
+    if args.config:
+        with open(args.config, encoding='utf-8') as f:
+            config = json.load(f)
+    mode = args.mode or config.get('market_mode', 'STOCK')
+    portfolio = load_portfolio_file(args.portfolio) if args.portfolio else {}
+
+    t0 = time.perf_counter()
+    scanner = SignalScanner(DBManager(db_path=args.db), strategy_params_from_config(config), {'mode': mode})
+    result = scanner.scan(portfolio, as_of=args.as_of)
+    elapsed = time.perf_counter() - t0
+
+    if args.json:
+        print(json.dumps({**scan_result_to_dict(result), 'elapsed': round(elapsed, 3)}, ensure_ascii=False, indent=2))
+        return
+
+    print(f"=== Signal Scan {pd.Timestamp(result['as_of']).date()} ({mode}) ===")
+    print(f"RS 상위 {len(result['ranking'])}종목, 보유 {len(portfolio)}종목, 매도 후 빈 슬롯 {result['slots']}개")
+    print_table("SELL", result['sell'])
+    print_table("HOLD", result['hold'])
+    print_table("BUY", result['buy'])
+    print(f"\n(elapsed {elapsed:.2f}s)")
+
+
+if __name__ == "__main__":
+    main()
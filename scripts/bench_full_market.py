@@ -0,0 +1,133 @@
+"""
+Full-Market 모드 벤치마크: 합성 KRX 전 종목(기본 2,500종목 x 10년)을 임시 DB에 만들고
+Backtester(full_market=True) 실행 시간과 최대 메모리(RSS)를 측정.
+
+사용법:
+    python scripts/bench_full_market.py                     # 2,500종목 x 10년
+    python scripts/bench_full_market.py --tickers 300 --years 3
+"""
+import os
+import sys
+import time
+import argparse
+import resource
+import tempfile
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.database import DBManager
+from src.backtester import Backtester
+from src.utils import ConsoleProgress
+from tests.market_fixtures import FakeLoader
+
+
+def peak_rss_mb():
+    # Linux: KB, macOS: bytes
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 1024**2 if sys.platform == 'darwin' else peak / 1024
+
+
+def build_synthetic_db(db, n_tickers, dates, seed=0):
+    """
+    종목별 랜덤워크 OHLCV 저장. 약 30%는 거래대금 100억 미만(사전 필터 대상),
+    일부는 기간 중 신규 상장.
+    """
+    rng = np.random.default_rng(seed)
+    n_days = len(dates)
+    date_strs = dates.strftime('%Y-%m-%d').tolist()
+    tickers = [f"{i:06d}" for i in range(1, n_tickers + 1)]
+
+    conn = db.get_connection()
+    try:
+        for i, ticker in enumerate(tickers):
+            listed = int(rng.integers(0, n_days // 2)) if rng.random() < 0.1 else 0
+            n = n_days - listed
+            close = np.round(rng.uniform(5_000, 200_000) * np.exp(np.cumsum(rng.normal(0.0003, 0.025, n))))
+            volume = np.round(rng.lognormal(np.log(300_000), 1.2) * rng.uniform(0.5, 1.5, n))
+            high = np.round(close * (1 + rng.uniform(0, 0.03, n)))
+            low = np.round(close * (1 - rng.uniform(0, 0.03, n)))
+            open_ = np.round((high + low) / 2)
+            amount = close * volume
+            change = np.concatenate([[0.0], close[1:] / close[:-1] - 1])
+            rows = zip([ticker] * n, date_strs[listed:], open_.tolist(), high.tolist(), low.tolist(),
+                       close.tolist(), volume.tolist(), amount.tolist(), change.tolist())
+            conn.executemany('''
+                INSERT INTO market_data (ticker, date, open, high, low, close, volume, amount, change)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ''', rows)
+            if (i + 1) % 250 == 0:
+                conn.commit()
+                print(f"  ... {i + 1}/{n_tickers} tickers written")
+        conn.commit()
+    finally:
+        conn.close()
+    return tickers
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Full-Market backtest benchmark")
+    parser.add_argument('--tickers', type=int, default=2500)
+    parser.add_argument('--years', type=int, default=10)
+    parser.add_argument('--end', default='2024-12-30')
+    parser.add_argument('--frame-cache-mb', type=float, default=256)
+    parser.add_argument('--memory-policy', default='compact', choices=['none', 'safe', 'compact'])
+    parser.add_argument('--db', default=None, help="기존 벤치마크 DB 경로 (없으면 임시 DB 생성)")
+    args = parser.parse_args()
+
+    end = pd.Timestamp(args.end)
+    start = end - pd.DateOffset(years=args.years)
+    # 지표 계산용 1년 선행 데이터 포함
+    dates = pd.bdate_range(start - pd.DateOffset(years=1), end)
+
+    tmp = None
+    if args.db is None:
+        tmp = tempfile.TemporaryDirectory()
+        db_path = os.path.join(tmp.name, 'bench.db')
+    else:
+        db_path = args.db
+
+    try:
+        db = DBManager(db_path=db_path)
+        if db.get_market_data_coverage():
+            tickers = sorted(db.get_market_data_coverage())
+            print(f"[Bench] Reusing {len(tickers)} tickers from {db_path}")
+        else:
+            print(f"[Bench] Writing {args.tickers} tickers x {len(dates)} days to {db_path}")
+            t0 = time.perf_counter()
+            tickers = build_synthetic_db(db, args.tickers, dates)
+            print(f"[Bench] Data generation: {time.perf_counter() - t0:,.1f}s")
+
+        loader = FakeLoader(db, tickers, start, end)
+        backtester = Backtester(
+            loader, start_date=str(start.date()), end_date=str(end.date()),
+            universe_params={
+                'mode': 'STOCK', 'full_market': True,
+                'frame_cache_mb': args.frame_cache_mb, 'memory_policy': args.memory_policy
+            }
+        )
+
+        rss_before = peak_rss_mb()
+        t0 = time.perf_counter()
+        result = backtester.run(progress_callback=ConsoleProgress())
+        elapsed = time.perf_counter() - t0
+
+        universe = backtester.lazy_universe
+        print()
+        print("=== Full-Market Benchmark ===")
+        print(f"Tickers (listed / liquid) : {len(tickers)} / {len(universe) if universe is not None else 0}")
+        print(f"Trading days              : {len(result)}")
+        print(f"Trades                    : {len(backtester.trade_log)}")
+        print(f"Elapsed                   : {elapsed:,.1f}s")
+        print(f"Peak RSS                  : {peak_rss_mb():,.0f}MB (before run {rss_before:,.0f}MB)")
+        if universe is not None:
+            print(f"Resident universe         : {universe.memory_bytes() / 1024**2:,.1f}MB "
+                  f"(frame LRU hits {universe.frames.hits}, misses {universe.frames.misses})")
+    finally:
+        if tmp is not None:
+            tmp.cleanup()
+
+
+if __name__ == '__main__':
+    main()
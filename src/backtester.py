@@ -1,11 +1,23 @@
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
-from tqdm import tqdm
 from .strategy import Strategy
+from .memory_policy import MemoryPolicy, MemoryReport, frame_nbytes
+from .prepared_cache import PreparedUniverse
+from .fingerprint import universe_digest
 
 class Backtester:
-    def __init__(self, data_loader, start_date='2023-01-01', end_date='2024-06-30', strategy_params=None, universe_params=None):
+    INITIAL_BALANCE = 100_000_000 # 1억 원
+    MAX_POSITIONS = 10 # 최대 보유 종목 수
+    TOP_N = 50 # 매일 매수 후보로 보는 RS 상위 종목 수
+    # 유동성 기준 (20일 평균 거래대금): 개별종목 100억, ETF 10억
+    MIN_AMOUNT = {'STOCK': 10_000_000_000, 'ETF': 1_000_000_000}
+
+    def __init__(self, data_loader, start_date='2023-01-01', end_date='2024-06-30', strategy_params=None, universe_params=None, prepared_cache=None):
+        """
+        :param prepared_cache: PreparedUniverseCache (선택). 지정하면 같은 유니버스/기간/데이터 버전/지표 파라미터의
+                               지표 계산 결과를 다른 실행과 공유 (src.prepared_cache 참고)
+        """
         self.loader = data_loader
         # Strategy Param Injection
         if strategy_params is None:
@@ -18,33 +30,133 @@ class Backtester:
         self.start_date = pd.to_datetime(start_date)
         self.end_date = pd.to_datetime(end_date)
         
-        self.initial_balance = 100_000_000 # 1억 원
+        self.initial_balance = self.INITIAL_BALANCE
         self.balance = self.initial_balance
         self.portfolio = {} # {ticker: {'qty': 0, 'avg_price': 0, 'buy_date': date}}
         
         self.universe_data = {} # {ticker: DataFrame}
         self.universe_names = {} # {ticker: name}
+        self._universe_resolved = False
         self.trade_log = []
         self.equity_curve = []
         
         # 유니버스 캐싱 (매월 갱신)
         self.target_universe = [] # 현재 월의 관심 종목 (RS 상위)
 
-    def prepare_data(self):
+        # Lazy Universe 모드 (universe_params['lazy']=True)
+        self.lazy_universe = None
+
+        # 메모리 정책 (universe_params['memory_policy']: 'none' | 'safe' | 'compact')
+        self.memory_policy = MemoryPolicy.from_name(self.universe_params.get('memory_policy', 'none'))
+        self.memory_report = MemoryReport()
+
+        self.prepared_cache = prepared_cache
+        self._prepared_entry = None
+        # 이 실행이 사용하는 데이터 스냅샷 (take_data_snapshot, 결과 재사용 조회와 저장에 같은 값 사용)
+        self.data_snapshot = None
+
+    # 지표 계산 결과에 영향을 주는 전략 파라미터 (매도 배수/추세 이탈 옵션은 제외)
+    INDICATOR_PARAMS = ('ma_short', 'ma_long', 'rs_weights', 'slope_lookback')
+    # 로드되는 데이터/상주 형태에 영향을 주는 유니버스 파라미터
+    PREPARED_UNIVERSE_PARAMS = ('mode', 'kospi_n', 'kosdaq_n', 'full_market', 'lazy', 'chunk_size', 'frame_cache_mb', 'memory_policy')
+
+    def prepared_key(self, tickers):
         """
-        백테스트 시작 전 모든 데이터 로드 (속도 향상)
+        PreparedUniverseCache 키: (유니버스 파라미터, 티커 목록, 기간, 데이터 스냅샷 digest, 지표 파라미터)
+        (다른 종목이나 기간 밖 데이터가 바뀌어도 재사용됨)
         """
-        print("[Backtester] 전체 유니버스 데이터 로딩 시작...")
+        from .cache import make_key
+        universe = {k: self.universe_params.get(k) for k in self.PREPARED_UNIVERSE_PARAMS}
+        indicators = {k: getattr(self.strategy, k) for k in self.INDICATOR_PARAMS}
+        return make_key(
+            'prepared_universe', universe, list(tickers), str(self.start_date.date()), str(self.end_date.date()),
+            self.data_snapshot['digest'], indicators
+        )
+
+    def _full_market(self):
+        # Full-Market 모드: KRX 상장 전 종목 (n=None)
+        return self.universe_params.get('mode', 'STOCK') == 'STOCK' and self.universe_params.get('full_market', False)
+
+    def resolve_universe(self):
+        """
+        유니버스 리스팅 {ticker: name} (처음 한 번만 조회)
+        """
+        if self._universe_resolved:
+            return self.universe_names
         # Tickers extraction based on mode
         mode = self.universe_params.get('mode', 'STOCK')
         kospi_n = self.universe_params.get('kospi_n', 200)
         kosdaq_n = self.universe_params.get('kosdaq_n', 50)
-        
-        tickers_dict = self.loader.get_universe_tickers(kospi_n=kospi_n, kosdaq_n=kosdaq_n, mode=mode)
+        if self._full_market():
+            kospi_n, kosdaq_n = None, None
+
+        if self.universe_params.get('tickers'):
+            # 명시적 종목 목록 (CLI 배치 평가 등): 리스팅 조회 없이 그대로 사용
+            tickers_dict = {t: t for t in self.universe_params['tickers']}
+        else:
+            tickers_dict = self.loader.get_universe_tickers(kospi_n=kospi_n, kosdaq_n=kosdaq_n, mode=mode)
         self.universe_names = tickers_dict
-        tickers = list(tickers_dict.keys())
-        
-        tickers = list(tickers_dict.keys())
+        self._universe_resolved = True
+        return tickers_dict
+
+    def take_data_snapshot(self):
+        """
+        이 실행이 의존하는 데이터의 스냅샷: 유니버스 종목의 로드 기간(웜업 포함) 데이터 digest + 유니버스 리스팅 digest.
+        다른 종목이나 기간 밖 봉이 새로 저장되어도 바뀌지 않음 (결과 재사용 fingerprint 기준).
+        누락/오래된 종목 다운로드를 먼저 마쳐서 이후 로드가 읽을 데이터 기준으로 계산. prepare_data는 이미 찍은 스냅샷을 그대로 사용
+        Returns: get_data_snapshot() 결과 + {'universe_digest'}
+        """
+        names = self.resolve_universe()
+        self.loader.ensure_market_data(list(names), timeout=self.universe_params.get('download_timeout', 30))
+        snapshot = self.loader.db.get_data_snapshot(list(names), self.loader.data_start_date, self.loader.end_date)
+        snapshot['universe_digest'] = universe_digest(names)
+        self.data_snapshot = snapshot
+        return snapshot
+
+    def prepare_data(self):
+        """
+        백테스트 시작 전 모든 데이터 로드 (속도 향상)
+        """
+        print("[Backtester] 전체 유니버스 데이터 로딩 시작...")
+        full_market = self._full_market()
+        tickers = list(self.resolve_universe())
+        if self.data_snapshot is None:
+            self.take_data_snapshot()
+
+        if self.prepared_cache is None:
+            self._load_universe(tickers, full_market)
+            return
+
+        built = []
+        def build():
+            built.append(True)
+            self._load_universe(tickers, full_market)
+            return PreparedUniverse(self.universe_data, self.lazy_universe)
+
+        self._prepared_entry = self.prepared_cache.acquire(self.prepared_key(tickers), build)
+        prepared = self._prepared_entry.value
+        self.universe_data = prepared.universe_data
+        self.lazy_universe = prepared.lazy_universe
+        if not built:
+            count = len(self.lazy_universe) if self.lazy_universe is not None else len(self.universe_data)
+            print(f"[Backtester] 지표 계산된 유니버스 재사용 ({count}개 종목)")
+
+    def release_prepared(self):
+        """
+        공유 PreparedUniverse 참조 반환 (run() 종료 시 자동 호출)
+        """
+        if self._prepared_entry is not None:
+            self.prepared_cache.release(self._prepared_entry)
+            self._prepared_entry = None
+
+    def _load_universe(self, tickers, full_market=False):
+        if full_market:
+            self._prepare_full_market(tickers)
+            return
+
+        if self.universe_params.get('lazy', False):
+            self._prepare_lazy_universe(tickers)
+            return
         
         # 1. Concurrent Preload
         # Returns dict {ticker: DataFrame}
@@ -55,11 +167,139 @@ class Backtester:
         count = 0
         for ticker, df in loaded_data.items():
             if df is not None and not df.empty:
-                self.strategy.prepare_indicators(df)
-                self.universe_data[ticker] = df
+                self.universe_data[ticker] = self._prepare_frame(ticker, df)
                 count += 1
         
         print(f"[Backtester] 데이터 로드 및 지표 계산 완료. 총 {count}개 종목 확보.")
+        if self.memory_policy is not None:
+            print(self.memory_report.summary())
+
+    def _prepare_frame(self, ticker, df, record=True):
+        """
+        지표 계산 후 메모리 정책 적용
+        """
+        self.strategy.prepare_indicators(df)
+        if self.memory_policy is None:
+            return df
+        before = frame_nbytes(df) if record else 0
+        df = self.memory_policy.apply(df)
+        if record:
+            self.memory_report.record(ticker, before, frame_nbytes(df))
+        return df
+
+    def _prepare_lazy_universe(self, tickers):
+        """
+        Lazy Universe 모드: 청크 단위로 로드/지표 계산 후 랭킹용 패널(RS, Amount_MA20, Close)만 상주.
+        전체 DataFrame은 보유/후보 종목에 한해 LRU(frame_cache_mb)로 필요할 때 다시 로드.
+        """
+        from .lazy_universe import LazyUniverse
+
+        chunk_size = self.universe_params.get('chunk_size', 200)
+        frame_cache_mb = self.universe_params.get('frame_cache_mb', 256)
+        self.lazy_universe = LazyUniverse(
+            self._load_ticker_frame, self.strategy.compute_buy_signal_series, frame_cache_mb=frame_cache_mb
+        )
+
+        def frames_iter():
+            for i in range(0, len(tickers), chunk_size):
+                loaded_data = self.loader.preload_data_concurrently(tickers[i:i + chunk_size])
+                for ticker, df in loaded_data.items():
+                    if df is not None and not df.empty:
+                        yield ticker, self._prepare_frame(ticker, df)
+
+        print("[Backtester] Calculating Indicators (Lazy Universe)...")
+        count = self.lazy_universe.build(frames_iter())
+        print(f"[Backtester] Lazy Universe 준비 완료. 총 {count}개 종목, 상주 메모리 {self.lazy_universe.memory_bytes() / 1024**2:,.1f}MB")
+        if self.memory_policy is not None:
+            print(self.memory_report.summary())
+
+    def _prepare_full_market(self, tickers):
+        """
+        Full-Market 모드 (KRX 전 종목 x 장기간):
+        1. DB 저장 구간만 확인하여 누락분 다운로드 (전체 데이터를 메모리로 읽지 않음)
+        2. SQL 윈도우 함수로 유동성 사전 필터 (한 번도 기준을 넘지 못하는 종목 제외)
+        3. 종가/거래대금만 청크 단위 컬럼형 로드 -> 패널 단위 벡터화 지표/랭킹 계산
+        4. 보유/후보 종목의 전체 DataFrame은 Lazy Universe LRU로 필요 시 로드
+        """
+        from .lazy_universe import LazyUniverse
+        from .panel import compute_panel_indicators, precompute_rankings
+
+        min_amount = self._min_amount()
+        tickers = self.loader.ensure_market_data(tickers, timeout=self.universe_params.get('download_timeout', 30))
+        liquid = self.loader.db.filter_liquid_tickers(
+            tickers, self.loader.data_start_date, self.loader.end_date, min_amount, from_date=self.start_date
+        )
+        print(f"[Backtester] Full-Market: {len(tickers)}종목 중 유동성 사전 필터 통과 {len(liquid)}종목")
+
+        print("[Backtester] Calculating Indicators (Full-Market Panel)...")
+        panels = self.loader.db.load_market_panel(liquid, self.loader.data_start_date, self.loader.end_date)
+        close = panels['close']
+        indicators = compute_panel_indicators(self.strategy, close, panels['amount'])
+        del panels
+
+        rs, amount_ma20 = indicators['RS_Score_Pre'], indicators['Amount_MA20']
+        if self.memory_policy is not None and self.memory_policy.float32_indicators:
+            rs, amount_ma20 = rs.astype('float32'), amount_ma20.astype('float32')
+
+        self.lazy_universe = LazyUniverse(
+            self._load_ticker_frame, self.strategy.compute_buy_signal_series,
+            frame_cache_mb=self.universe_params.get('frame_cache_mb', 256)
+        )
+        count = self.lazy_universe.build_from_panels(close, rs, amount_ma20, indicators['Buy_Signal'])
+        self.lazy_universe.set_rankings(precompute_rankings(rs, amount_ma20, min_amount, top_n=self.TOP_N), min_amount, self.TOP_N)
+        print(f"[Backtester] Full-Market 준비 완료. 총 {count}개 종목, 상주 메모리 {self.lazy_universe.memory_bytes() / 1024**2:,.1f}MB")
+
+    def _min_amount(self):
+        # Liquidity Threshold based on mode
+        return self.MIN_AMOUNT.get(self.universe_params.get('mode', 'STOCK'), self.MIN_AMOUNT['ETF'])
+
+    def _load_ticker_frame(self, ticker):
+        # LRU miss 시 DB에서 다시 읽어 지표 재계산 (prepare_data와 동일한 구간)
+        df = self.loader.db.load_market_data(ticker, self.loader.data_start_date, self.loader.end_date)
+        if df is None or df.empty:
+            return None
+        return self._prepare_frame(ticker, df, record=False)
+
+    def has_ticker(self, ticker):
+        if self.lazy_universe is not None:
+            return ticker in self.lazy_universe
+        return ticker in self.universe_data
+
+    def get_ticker_frame(self, ticker):
+        """
+        지표 포함 전체 DataFrame (Lazy 모드에서는 LRU 경유)
+        """
+        if self.lazy_universe is not None:
+            return self.lazy_universe.get_frame(ticker)
+        return self.universe_data.get(ticker)
+
+    # 시뮬레이션과 함께 저장하는 종목별 차트/신호 컬럼 (Analysis 화면에서 그대로 사용)
+    SIGNAL_COLUMNS = ('Open', 'High', 'Low', 'Close', 'Volume', 'MA_Short', 'MA_Long', 'Slope_Pct', 'Max_Slope_60d', 'RS_Score_Pre')
+
+    def get_signal_frames(self, tickers=None):
+        """
+        엔진이 사용한 지표와 매수/매도 신호 (백테스트 기간만)
+        :param tickers: 대상 종목 (기본: 거래했거나 보유 중인 종목)
+        Returns: {ticker: DataFrame[SIGNAL_COLUMNS + MA_Slope, Buy_Signal, Sell_Signal, Sell_Threshold]}
+        """
+        if tickers is None:
+            tickers = {trade['Ticker'] for trade in self.trade_log} | set(self.portfolio)
+
+        frames = {}
+        for ticker in sorted(tickers):
+            df = self.get_ticker_frame(ticker) if self.has_ticker(ticker) else None
+            if df is None or df.empty:
+                continue
+            out = df[[c for c in self.SIGNAL_COLUMNS if c in df.columns]].copy()
+            # warm-up 구간을 포함한 전체 데이터로 계산한 뒤 기간만 잘라냄
+            if 'MA_Short' in df.columns:
+                out['MA_Slope'] = df['MA_Short'].diff()
+                out['Buy_Signal'] = self.strategy.compute_buy_signal_series(df)
+            out['Sell_Signal'] = self.strategy.compute_sell_signal_series(df)
+            if 'Max_Slope_60d' in df.columns:
+                out['Sell_Threshold'] = -(df['Max_Slope_60d'] * self.strategy.sell_slope_multiplier)
+            frames[ticker] = out[(out.index >= self.start_date) & (out.index <= self.end_date)]
+        return frames
 
     def calculate_atr(self, df: pd.DataFrame, window=14) -> float:
         """
@@ -80,16 +320,24 @@ class Backtester:
         atr = tr.rolling(window=window).mean().iloc[-1]
         return atr
 
-    def run(self):
+    def run(self, progress_callback=None):
         """
         백테스트 실행 메인 루프
+        :param progress_callback: progress_callback(done_days, total_days) - 데이터 준비 후 0부터 매 거래일 호출
         """
-        if not self.universe_data:
+        if not self.universe_data and self.lazy_universe is None:
             self.prepare_data()
-            
+        try:
+            return self._run_days(progress_callback)
+        finally:
+            self.release_prepared()
+
+    def _run_days(self, progress_callback=None):
         # 날짜 인덱스 생성 (전체 유니버스의 거래일 합집합 사용)
         # 특정 종목(첫번째 키)만 쓰면 그 종목이 늦게 상장된 경우 과거 기간이 통째로 날아감
         full_dates = pd.Index([])
+        if self.lazy_universe is not None:
+            full_dates = self.lazy_universe.trading_days()
         for df in self.universe_data.values():
             if full_dates.empty:
                 full_dates = df.index
@@ -101,58 +349,78 @@ class Backtester:
         # 백테스트 기간 내의 거래일만 필터링
         trading_days = full_dates[(full_dates >= self.start_date) & (full_dates <= self.end_date)]
         
-        current_month = -1
-        
-        for today in tqdm(trading_days, desc="Running Backtest"):
-            today_str = today.strftime('%Y-%m-%d')
-            
-            # --- 1. 유니버스 갱신 (Daily Rebalancing) ---
-            # 주도주 전략은 '그 날'의 강세 종목을 바로 잡아야 하므로 매일 갱신
-            self.update_universe(today)
-            
-            # --- 2. 매도 (Sell) 체크 ---
-            # 보유 종목에 대해 전략 확인
-            # (Dictionary 크기가 변하므로 리스트로 복사해서 순회)
-            for ticker in list(self.portfolio.keys()):
-                # 오늘 데이터 확인
-                if ticker not in self.universe_data: continue
-                
-                df_full = self.universe_data[ticker]
-                # 미래 데이터 참조 방지 (오늘까지 슬라이싱)
+        total_days = len(trading_days)
+
+        for day_idx, today in enumerate(trading_days):
+            if progress_callback is not None:
+                progress_callback(day_idx, total_days)
+            self.step(today)
+
+        if progress_callback is not None:
+            progress_callback(total_days, total_days)
+        return self.get_result_df()
+
+    def step(self, today):
+        """
+        거래일 하루 처리: 유니버스 갱신 -> 매도 -> 매수 -> 자산 평가
+        (run()의 일별 루프와 페이퍼 트레이딩(src.paper_trading)이 같은 경로를 사용)
+        """
+        # --- 1. 유니버스 갱신 (Daily Rebalancing) ---
+        # 주도주 전략은 '그 날'의 강세 종목을 바로 잡아야 하므로 매일 갱신
+        self.update_universe(today)
+
+        # --- 2. 매도 (Sell) 체크 ---
+        # 보유 종목에 대해 전략 확인
+        # (Dictionary 크기가 변하므로 리스트로 복사해서 순회)
+        for ticker in list(self.portfolio.keys()):
+            # 오늘 데이터 확인
+            if not self.has_ticker(ticker): continue
+
+            df_full = self.get_ticker_frame(ticker)
+            if df_full is None: continue
+            # 미래 데이터 참조 방지 (오늘까지 슬라이싱)
+            df_slice = df_full.loc[:today]
+
+            if df_slice.empty: continue
+
+            curr_price = float(df_slice['Close'].iloc[-1])
+            buy_price = self.portfolio[ticker]['avg_price']
+
+            # 매도 시그널 확인
+            is_sell, reason = self.strategy.check_sell_signal(df_slice, buy_price=buy_price)
+            if is_sell:
+                self.sell(ticker, today, curr_price, reason)
+
+        # --- 3. 매수 (Buy) 체크 ---
+        # 보유 종목 10개 미만일 때만
+        if len(self.portfolio) < self.MAX_POSITIONS:
+            # RS 점수 상위 종목 순으로 확인
+            for ticker in self.target_universe:
+                if len(self.portfolio) >= self.MAX_POSITIONS: break
+                if ticker in self.portfolio: continue # 이미 보유중
+                # 매수 신호가 없는 후보는 전체 DataFrame을 로드하지 않음 (Lazy/페이퍼 모드)
+                if not self.may_have_buy_signal(ticker, today): continue
+                if not self.has_ticker(ticker): continue
+
+                df_full = self.get_ticker_frame(ticker)
+                if df_full is None: continue
                 df_slice = df_full.loc[:today]
-                
+
                 if df_slice.empty: continue
-                
-                curr_price = df_slice['Close'].iloc[-1]
-                buy_price = self.portfolio[ticker]['avg_price']
-                
-                # 매도 시그널 확인
-                is_sell, reason = self.strategy.check_sell_signal(df_slice, buy_price=buy_price)
-                if is_sell:
-                    self.sell(ticker, today, curr_price, reason)
-                
-            
-            # --- 3. 매수 (Buy) 체크 ---
-            # 보유 종목 10개 미만일 때만
-            if len(self.portfolio) < 10:
-                # RS 점수 상위 종목 순으로 확인
-                for ticker in self.target_universe:
-                    if len(self.portfolio) >= 10: break
-                    if ticker in self.portfolio: continue # 이미 보유중
-                    if ticker not in self.universe_data: continue
-                    
-                    df_full = self.universe_data[ticker]
-                    df_slice = df_full.loc[:today]
-                    
-                    if df_slice.empty: continue
-                    
-                    if self.strategy.check_buy_signal(df_slice):
-                        self.buy(ticker, today, df_slice)
 
-            # --- 4. 자산 평가 (Mark-to-Market) ---
-            self.update_equity(today)
+                if self.strategy.check_buy_signal(df_slice):
+                    self.buy(ticker, today, df_slice)
 
-        return self.get_result_df()
+        # --- 4. 자산 평가 (Mark-to-Market) ---
+        self.update_equity(today)
+
+    def may_have_buy_signal(self, ticker, today):
+        """
+        매수 후보 사전 필터 (False면 check_buy_signal 생략). 기본은 항상 True
+        """
+        if self.lazy_universe is not None:
+            return self.lazy_universe.has_buy_signal(ticker, today)
+        return True
 
     def update_universe(self, today):
         """
@@ -161,6 +429,11 @@ class Backtester:
         2. RS 점수 계산 및 정렬 (Optimized: Pre-calculated RS_Score_Pre)
         3. 상위 종목 선정 -> self.target_universe 갱신
         """
+        if self.lazy_universe is not None:
+            self.target_universe = self.lazy_universe.rank(today, self._min_amount(), top_n=self.TOP_N)
+            return
+
+        min_amount = self._min_amount()
         candidates = []
         
         # Optimize: Loop through dict items is fast, but operations inside were slow
@@ -176,10 +449,6 @@ class Backtester:
 
                 avg_amount = df_full.at[today, 'Amount_MA20']
                 
-                # Liquidity Threshold based on mode
-                mode = self.universe_params.get('mode', 'STOCK')
-                min_amount = 10_000_000_000 if mode == 'STOCK' else 1_000_000_000
-                
                 # Check for NaN (not enough data) or Low Liquidity
                 if pd.isna(avg_amount) or avg_amount < min_amount:
                     continue
@@ -201,13 +470,14 @@ class Backtester:
         # RS 점수 역순 정렬
         candidates.sort(key=lambda x: x[1], reverse=True)
         
-        # 상위 50개 등 적당히 선정하여 타겟 풀로 지정
-        self.target_universe = [x[0] for x in candidates[:50]]
+        # 상위 TOP_N개를 타겟 풀로 지정
+        self.target_universe = [x[0] for x in candidates[:self.TOP_N]]
         # print(f"[{today.date()}] Monthly Universe Updated: {len(self.target_universe)} candidates")
 
     def buy(self, ticker, date, df_slice):
-        curr_price = df_slice['Close'].iloc[-1]
-        atr = self.calculate_atr(df_slice)
+        # float32로 저장된 가격도 잔고 계산은 float64로 (memory_policy)
+        curr_price = float(df_slice['Close'].iloc[-1])
+        atr = float(self.calculate_atr(df_slice))
         
         # 자금 관리: ATR(변동성) 역비례 비중
         # 기본 1% Risk Rule: (Total_Equity * 0.01) / ATR = 주식 수
@@ -263,10 +533,15 @@ class Backtester:
     def update_equity(self, date):
         equity = self.balance
         for ticker, info in self.portfolio.items():
-            if ticker in self.universe_data:
+            if self.lazy_universe is not None:
+                curr_price = float(self.lazy_universe.close_at(ticker, date))
+                if pd.isna(curr_price):
+                    curr_price = info['avg_price']
+                equity += info['qty'] * curr_price
+            elif ticker in self.universe_data:
                 # 오늘 종가 가져오기
                 try:
-                    curr_price = self.universe_data[ticker].loc[date]['Close']
+                    curr_price = float(self.universe_data[ticker].loc[date]['Close'])
                     equity += info['qty'] * curr_price
                 except KeyError:
                     # 오늘 데이터가 없는 경우(정지 등) 어제 가격 유지 또는 매입가 활용
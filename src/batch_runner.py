@@ -0,0 +1,226 @@
+import os
+import sys
+import json
+import time
+import inspect
+import contextlib
+import concurrent.futures
+import pandas as pd
+from .strategy import Strategy
+from .database import summarize_equity
+
+# user_config.json(앱 사이드바 설정) 키 -> Strategy 파라미터
+APP_STRATEGY_KEYS = {'sell_slope_mult': 'sell_slope_multiplier', 'weights': 'rs_weights'}
+# user_config.json 키 -> universe_params
+APP_UNIVERSE_KEYS = {'market_mode': 'mode'}
+
+STRATEGY_PARAMS = tuple(p for p in inspect.signature(Strategy.__init__).parameters if p != 'self')
+UNIVERSE_PARAMS = ('mode', 'kospi_n', 'kosdaq_n', 'full_market', 'tickers', 'lazy', 'chunk_size',
+                   'frame_cache_mb', 'memory_policy', 'download_timeout')
+RUN_KEYS = ('name', 'start_date', 'end_date')
+
+# 설정 파일이 없을 때 기간 기본값 (이전 run_backtest.py와 동일)
+DEFAULT_START_DATE = '2019-01-01'
+DEFAULT_END_DATE = '2024-12-20'
+
+
+def normalize_config(config, strict=True):
+    """
+    실행 설정 1건 정규화 -> {'name', 'start_date', 'end_date', 'strategy_params', 'universe_params'}
+    지원 형식:
+    - user_config.json (앱 설정): ma_short, sell_slope_mult, weights, market_mode, kospi_n, ...
+    - 엔진 파라미터 이름 그대로: sell_slope_multiplier, rs_weights, mode, lazy, memory_policy, ...
+    - 중첩: {'strategy_params': {...}, 'universe_params': {...}}
+    :param strict: 모르는 키가 있으면 ValueError (오타로 기본값이 조용히 쓰이는 것 방지)
+    """
+    config = dict(config)
+    strategy_params = dict(config.pop('strategy_params', None) or {})
+    universe_params = dict(config.pop('universe_params', None) or {})
+    run = {key: config.pop(key, None) for key in RUN_KEYS}
+
+    unknown = []
+    for key, value in config.items():
+        key = APP_STRATEGY_KEYS.get(key, APP_UNIVERSE_KEYS.get(key, key))
+        if key in STRATEGY_PARAMS:
+            strategy_params[key] = value
+        elif key in UNIVERSE_PARAMS:
+            universe_params[key] = value
+        else:
+            unknown.append(key)
+    if unknown and strict:
+        raise ValueError(f"Unknown config keys: {sorted(unknown)}")
+
+    if 'rs_weights' in strategy_params:
+        strategy_params['rs_weights'] = tuple(strategy_params['rs_weights'])
+    if 'tickers' in universe_params and isinstance(universe_params['tickers'], str):
+        universe_params['tickers'] = [t.strip() for t in universe_params['tickers'].split(',') if t.strip()]
+    return {
+        'name': run['name'],
+        'start_date': str(run['start_date'] or DEFAULT_START_DATE),
+        'end_date': str(run['end_date'] or DEFAULT_END_DATE),
+        'strategy_params': strategy_params,
+        'universe_params': universe_params,
+    }
+
+
+def load_run_configs(path):
+    """
+    설정 파일 -> 실행 설정 목록 (정규화 전 dict)
+    - 객체 1개: 실행 1건
+    - 리스트: 실행 여러 건
+    - {'runs': [...], 나머지 키}: 나머지 키를 공통값으로 각 실행에 병합
+    """
+    with open(path, encoding='utf-8') as f:
+        data = json.load(f)
+    if isinstance(data, list):
+        return data
+    if 'runs' in data:
+        base = {k: v for k, v in data.items() if k != 'runs'}
+        return [_merge(base, run) for run in data['runs']]
+    return [data]
+
+
+def _merge(base, override):
+    merged = dict(base)
+    for key in ('strategy_params', 'universe_params'):
+        if key in base or key in override:
+            merged[key] = {**base.get(key, {}), **override.get(key, {})}
+    merged.update({k: v for k, v in override.items() if k not in ('strategy_params', 'universe_params')})
+    return merged
+
+
+def _profiled(kind, path, fn):
+    """
+    fn() 실행을 프로파일링하여 path에 저장. Returns: (fn 결과, 저장 경로)
+    - cprofile: .prof (pstats/snakeviz로 열기) + 누적 시간 상위 25개를 stderr에 출력
+    - pyinstrument: .html
+    """
+    if kind == 'cprofile':
+        import cProfile
+        import pstats
+        profiler = cProfile.Profile()
+        result = profiler.runcall(fn)
+        path = path + '.prof'
+        profiler.dump_stats(path)
+        pstats.Stats(profiler, stream=sys.stderr).sort_stats('cumulative').print_stats(25)
+        return result, path
+
+    try:
+        from pyinstrument import Profiler
+    except ImportError:
+        raise RuntimeError("pyinstrument is not installed (pip install pyinstrument) - use --profile cprofile")
+    profiler = Profiler()
+    profiler.start()
+    try:
+        result = fn()
+    finally:
+        profiler.stop()
+    path = path + '.html'
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(profiler.output_html())
+    sys.stderr.write(profiler.output_text(unicode=True, color=False))
+    return result, path
+
+
+def run_config(run, db_path='storage.db', fresh=False, profile=None, profile_dir='profiles', index=0, log_dir=None):
+    """
+    정규화된 실행 설정 1건 실행 -> JSON 직렬화 가능한 지표 dict.
+    엔진 로그(print)는 stdout(JSON 출력)과 섞이지 않도록 stderr로 보냄.
+    :param fresh: True면 저장된 결과를 재사용하지 않고 실행하며 결과도 저장하지 않음 (성능 측정용)
+    :param profile: None | 'cprofile' | 'pyinstrument' (fresh 실행으로 강제)
+    :param log_dir: 지정하면 거래 내역/자산 곡선 CSV 저장
+    """
+    from .database import DBManager
+    from .data_loader import DataLoader
+    from .backtester import Backtester
+    from .simulation_jobs import execute_simulation
+
+    db = DBManager(db_path=db_path)
+    loader_factory = lambda start, end: DataLoader(start_date=start, end_date=end, db=db)
+    start_date, end_date = run['start_date'], run['end_date']
+    fresh = fresh or profile is not None
+    marks = {}
+
+    def on_progress(done, total):
+        # 첫 호출 = 데이터 준비 완료 시점
+        if done == 0:
+            marks['prepared'] = time.perf_counter()
+
+    def execute():
+        if not fresh:
+            simulation_id, equity, trades, _ = execute_simulation(
+                db, start_date, end_date, run['strategy_params'], run['universe_params'],
+                progress_callback=on_progress, loader_factory=loader_factory
+            )
+            snapshot = db.get_simulation_snapshot(simulation_id) if simulation_id is not None else None
+            return simulation_id, equity, trades, snapshot
+        backtester = Backtester(loader_factory(start_date, end_date), start_date, end_date,
+                                run['strategy_params'], run['universe_params'])
+        equity = backtester.run(progress_callback=on_progress)
+        return None, equity, pd.DataFrame(backtester.trade_log), backtester.data_snapshot
+
+    t0 = time.perf_counter()
+    profile_path = None
+    with contextlib.redirect_stdout(sys.stderr):
+        if profile:
+            os.makedirs(profile_dir, exist_ok=True)
+            (simulation_id, equity, trades, snapshot), profile_path = _profiled(
+                profile, os.path.join(profile_dir, f"run{index}_{run['name'] or 'config'}"), execute)
+        else:
+            simulation_id, equity, trades, snapshot = execute()
+    elapsed = time.perf_counter() - t0
+
+    metrics = summarize_equity(equity, trades)
+    days = (pd.to_datetime(end_date) - pd.to_datetime(start_date)).days
+    if metrics['final_value'] is not None and days > 0:
+        metrics['cagr'] = ((metrics['final_value'] / float(equity['TotalValue'].iloc[0])) ** (365 / days) - 1) * 100
+    else:
+        metrics['cagr'] = None
+
+    timings = {'total': elapsed}
+    if 'prepared' in marks:
+        timings['prepare'] = marks['prepared'] - t0
+        timings['backtest'] = elapsed - timings['prepare']
+
+    if log_dir and not equity.empty:
+        from .utils import save_csv_safe
+        os.makedirs(log_dir, exist_ok=True)
+        prefix = os.path.join(log_dir, f"{run['name'] or 'run'}{index}")
+        save_csv_safe(trades, prefix + '_trades.csv')
+        save_csv_safe(equity.reset_index(), prefix + '_equity.csv')
+
+    return {
+        'name': run['name'],
+        'start_date': start_date,
+        'end_date': end_date,
+        'strategy_params': run['strategy_params'],
+        'universe_params': run['universe_params'],
+        'simulation_id': simulation_id,
+        'data_snapshot': snapshot,
+        'memoized': simulation_id is not None and 'prepared' not in marks,
+        'metrics': metrics,
+        'timings': timings,
+        'profile': profile_path,
+    }
+
+
+def _run_safe(run, options, index):
+    try:
+        return run_config(run, index=index, **options)
+    except Exception as e:
+        return {'name': run['name'], 'strategy_params': run['strategy_params'], 'universe_params': run['universe_params'],
+                'error': f"{type(e).__name__}: {e}"}
+
+
+def run_many(runs, jobs=1, **options):
+    """
+    여러 실행 설정을 jobs개 프로세스로 병렬 실행 (백테스트는 CPU 위주라 스레드 대신 프로세스).
+    실패한 설정은 'error' 항목으로 돌려주고 나머지는 계속 실행.
+    :param options: run_config 키워드 인자 (db_path, fresh, profile, profile_dir, log_dir)
+    Returns: 입력 순서대로 결과 dict 목록
+    """
+    if jobs <= 1 or len(runs) <= 1:
+        return [_run_safe(run, options, i) for i, run in enumerate(runs)]
+    with concurrent.futures.ProcessPoolExecutor(max_workers=min(jobs, len(runs))) as executor:
+        futures = [executor.submit(_run_safe, run, options, i) for i, run in enumerate(runs)]
+        return [f.result() for f in futures]
@@ -0,0 +1,239 @@
+import os
+import sys
+import time
+import json
+import pickle
+import sqlite3
+import hashlib
+import threading
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+
+# 기본 디스크 캐시 파일: 실행 위치(Streamlit/CLI/테스트)와 무관하게 프로젝트 루트
+DEFAULT_CACHE_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'cache.db')
+
+
+def make_key(name, *args):
+    """
+    캐시 키 생성: name + 인자(JSON 직렬화)의 해시
+    """
+    payload = json.dumps(args, sort_keys=True, default=str, ensure_ascii=False)
+    return f"{name}:{hashlib.sha1(payload.encode('utf-8')).hexdigest()}"
+
+
+class CacheBackend(ABC):
+    """
+    캐시 백엔드 공통 인터페이스.
+    get()은 (hit, value)를 반환하므로 None 값도 캐싱 가능.
+    """
+    @abstractmethod
+    def get(self, key):
+        ...
+
+    @abstractmethod
+    def set(self, key, value, ttl=None):
+        ...
+
+    @abstractmethod
+    def clear(self):
+        ...
+
+    def get_or_compute(self, key, compute, ttl=None):
+        """
+        캐시에 있으면 반환, 없으면 compute() 실행 후 저장.
+        빈 결과(None, [], {})는 일시적 실패일 수 있으므로 저장하지 않음.
+        """
+        hit, value = self.get(key)
+        if hit:
+            return value
+        value = compute()
+        if value is not None and not (hasattr(value, '__len__') and len(value) == 0):
+            self.set(key, value, ttl)
+        return value
+
+
+class NullCache(CacheBackend):
+    """
+    캐싱하지 않음 (테스트/디버깅용)
+    """
+    def get(self, key):
+        return False, None
+
+    def set(self, key, value, ttl=None):
+        pass
+
+    def clear(self):
+        pass
+
+
+class MemoryCache(CacheBackend):
+    def __init__(self, maxsize=256, default_ttl=3600):
+        """
+        프로세스 내 LRU 캐시
+        :param maxsize: 최대 항목 수 (초과 시 가장 오래 안 쓴 항목부터 제거)
+        :param default_ttl: 기본 유효 시간 (초). None이면 만료 없음
+        """
+        self.maxsize = maxsize
+        self.default_ttl = default_ttl
+        self._data = OrderedDict() # key -> (expires_at, value)
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return False, None
+            expires_at, value = entry
+            if expires_at is not None and expires_at < time.time():
+                del self._data[key]
+                return False, None
+            self._data.move_to_end(key)
+            return True, value
+
+    def set(self, key, value, ttl=None):
+        ttl = self.default_ttl if ttl is None else ttl
+        expires_at = time.time() + ttl if ttl is not None else None
+        with self._lock:
+            self._data[key] = (expires_at, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+
+class SQLiteCache(CacheBackend):
+    def __init__(self, path=None, default_ttl=3600):
+        """
+        디스크(SQLite) 캐시. 여러 프로세스(CLI, 워커, Streamlit)가 같은 파일을 공유.
+        값은 pickle로 저장.
+        :param path: 캐시 파일 경로 (기본: 프로젝트 루트의 cache.db)
+        """
+        self.path = path if path is not None else DEFAULT_CACHE_PATH
+        self.default_ttl = default_ttl
+        conn = self._connect()
+        try:
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS cache_entries (
+                    key TEXT PRIMARY KEY,
+                    value BLOB,
+                    expires_at REAL
+                )
+            ''')
+            conn.commit()
+        finally:
+            conn.close()
+
+    def _connect(self):
+        return sqlite3.connect(self.path, timeout=30)
+
+    def get(self, key):
+        conn = self._connect()
+        try:
+            row = conn.execute('SELECT value, expires_at FROM cache_entries WHERE key = ?', (key,)).fetchone()
+            if row is None:
+                return False, None
+            value, expires_at = row
+            if expires_at is not None and expires_at < time.time():
+                conn.execute('DELETE FROM cache_entries WHERE key = ?', (key,))
+                conn.commit()
+                return False, None
+            return True, pickle.loads(value)
+        except Exception as e:
+            print(f"[Cache] SQLite read error ({key}): {e}")
+            return False, None
+        finally:
+            conn.close()
+
+    def set(self, key, value, ttl=None):
+        ttl = self.default_ttl if ttl is None else ttl
+        expires_at = time.time() + ttl if ttl is not None else None
+        conn = self._connect()
+        try:
+            conn.execute('REPLACE INTO cache_entries (key, value, expires_at) VALUES (?, ?, ?)',
+                         (key, pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL), expires_at))
+            # 만료 항목 정리
+            conn.execute('DELETE FROM cache_entries WHERE expires_at IS NOT NULL AND expires_at < ?', (time.time(),))
+            conn.commit()
+        except Exception as e:
+            print(f"[Cache] SQLite write error ({key}): {e}")
+        finally:
+            conn.close()
+
+    def clear(self):
+        conn = self._connect()
+        try:
+            conn.execute('DELETE FROM cache_entries')
+            conn.commit()
+        finally:
+            conn.close()
+
+
+class StreamlitCache(CacheBackend):
+    def __init__(self, maxsize=256, default_ttl=3600):
+        """
+        Streamlit 어댑터: st.cache_resource로 관리되는 MemoryCache를 사용.
+        모든 세션이 공유하고, Streamlit의 'Clear cache' 메뉴로 함께 비워짐.
+        """
+        import streamlit as st
+
+        @st.cache_resource
+        def _shared_cache(maxsize, default_ttl):
+            return MemoryCache(maxsize=maxsize, default_ttl=default_ttl)
+
+        self._cache = _shared_cache(maxsize, default_ttl)
+
+    def get(self, key):
+        return self._cache.get(key)
+
+    def set(self, key, value, ttl=None):
+        self._cache.set(key, value, ttl)
+
+    def clear(self):
+        self._cache.clear()
+
+
+_DEFAULT_CACHES = {}
+_DEFAULT_LOCK = threading.Lock()
+
+
+def make_cache(backend):
+    """
+    backend 이름으로 프로세스 공유 캐시 인스턴스 생성
+    :param backend: 'memory' | 'sqlite' | 'none' | 'streamlit'
+    """
+    backend = backend.lower()
+    with _DEFAULT_LOCK:
+        if backend not in _DEFAULT_CACHES:
+            if backend == 'memory':
+                _DEFAULT_CACHES[backend] = MemoryCache()
+            elif backend == 'sqlite':
+                _DEFAULT_CACHES[backend] = SQLiteCache(os.getenv('JUDOJU_CACHE_PATH') or None)
+            elif backend == 'none':
+                _DEFAULT_CACHES[backend] = NullCache()
+            elif backend == 'streamlit':
+                _DEFAULT_CACHES[backend] = StreamlitCache()
+            else:
+                raise ValueError(f"Unknown cache backend: {backend}")
+        return _DEFAULT_CACHES[backend]
+
+
+def get_default_cache():
+    """
+    JUDOJU_CACHE_BACKEND 환경변수 > Streamlit 실행 중이면 streamlit > sqlite
+    """
+    backend = os.getenv('JUDOJU_CACHE_BACKEND')
+    if backend:
+        return make_cache(backend)
+
+    # streamlit을 새로 import하지 않고, 이미 Streamlit 런타임 안일 때만 어댑터 사용
+    if 'streamlit' in sys.modules:
+        try:
+            from streamlit import runtime
+            if runtime.exists():
+                return make_cache('streamlit')
+        except Exception:
+            pass
+    return make_cache('sqlite')
@@ -1,20 +1,20 @@
-import FinanceDataReader as fdr
 import pandas as pd
-import streamlit as st
-import requests
 from datetime import datetime, timedelta
-import os
 from .constants import TIGER_ETF_UNIVERSE
+from .cache import make_key, get_default_cache
 
 class DataLoader:
-    def __init__(self, start_date: str = '2023-01-01', end_date: str = '2024-06-30'):
+    def __init__(self, start_date: str = '2023-01-01', end_date: str = '2024-06-30', cache=None, db=None):
         """
         데이터 로더 초기화
         :param start_date: 백테스트 시작일 (YYYY-MM-DD)
         :param end_date: 백테스트 종료일 (YYYY-MM-DD)
+        :param cache: CacheBackend (리스팅 캐싱). None이면 실행 환경에 맞는 기본값
+        :param db: DBManager (기본: storage.db)
         """
         from .database import DBManager
-        self.db = DBManager()
+        self.db = db if db is not None else DBManager()
+        self.cache = cache if cache is not None else get_default_cache()
         
         self.target_start_date = pd.to_datetime(start_date)
         # Warm-up Period: 365일 전부터 데이터를 로드하여 이동평균/RS 계산의 안정성 확보
@@ -32,96 +32,23 @@ class DataLoader:
             return self.get_etf_universe()
             
         print(f"[DataLoader] 개별종목 유니버스 티커 선정 중 (KOSPI {kospi_n}, KOSDAQ {kosdaq_n})...")
-        return self._get_cached_stock_universe(kospi_n, kosdaq_n)
-
-    @st.cache_data(ttl=86400) # 24시간 캐싱
-    def _get_cached_stock_universe(_self, kospi_n, kosdaq_n):
-        universe_dict = {}
-        
-        # 1. KOSPI
-        try:
-            df_kospi = fdr.StockListing('KOSPI')
-            print("[DataLoader] FDR KOSPI Listing 성공")
-        except Exception as e:
-            print(f"[DataLoader] FDR KOSPI 실패: {e}. Naver Fallback 가동.")
-            df_kospi = _self._get_naver_listing(sosok=0) # 0: KOSPI
-            if df_kospi is None:
-                 print("[DataLoader] Naver Fallback(KOSPI) 실패")
-                 df_kospi = pd.DataFrame()
-
-        if not df_kospi.empty:
-            if 'Marcap' in df_kospi.columns:
-                df_kospi['Marcap'] = pd.to_numeric(df_kospi['Marcap'], errors='coerce')
-                df_kospi = df_kospi.sort_values(by='Marcap', ascending=False)
-            
-            for _, row in df_kospi.head(kospi_n).iterrows():
-                code = row.get('Code', row.get('Symbol'))
-                name = row.get('Name')
-                if code and name: universe_dict[code] = name
-
-        # 2. KOSDAQ
-        try:
-            df_kosdaq = fdr.StockListing('KOSDAQ')
-            print("[DataLoader] FDR KOSDAQ Listing 성공")
-        except Exception as e:
-            print(f"[DataLoader] FDR KOSDAQ 실패: {e}. Naver Fallback 가동.")
-            df_kosdaq = _self._get_naver_listing(sosok=1) # 1: KOSDAQ
-            if df_kosdaq is None:
-                 print("[DataLoader] Naver Fallback(KOSDAQ) 실패")
-                 df_kosdaq = pd.DataFrame()
-
-        if not df_kosdaq.empty:
-            if 'Marcap' in df_kosdaq.columns:
-                df_kosdaq['Marcap'] = pd.to_numeric(df_kosdaq['Marcap'], errors='coerce')
-                df_kosdaq = df_kosdaq.sort_values(by='Marcap', ascending=False)
-            
-            for _, row in df_kosdaq.head(kosdaq_n).iterrows():
-                code = row.get('Code', row.get('Symbol'))
-                name = row.get('Name')
-                if code and name: universe_dict[code] = name
+        return self.cache.get_or_compute(
+            make_key('stock_universe', kospi_n, kosdaq_n),
+            lambda: self._get_cached_stock_universe(kospi_n, kosdaq_n),
+            ttl=86400 # 24시간 캐싱
+        )
 
+    def _get_cached_stock_universe(self, kospi_n, kosdaq_n):
+        # KOSPI/KOSDAQ 동시 조회 + FDR/Naver Hedged 요청 + DB 캐시 (ListingService)
+        universe_dict = self.get_listing_service().get_universe(kospi_n, kosdaq_n)
         print(f"[DataLoader] 최종 선정된 개별종목 유니버스 크기: {len(universe_dict)}종목")
         return universe_dict
 
-    def _get_naver_listing(self, sosok=0):
-        """
-        KRX API 차단 시 Naver Finance 시가총액 페이지에서 리스팅을 가져옵니다.
-        :param sosok: 0 (KOSPI), 1 (KOSDAQ)
-        """
-        try:
-            url = f"https://finance.naver.com/sise/sise_market_sum.naver?sosok={sosok}&page=1"
-            # Naver는 브라우저 User-Agent가 필요함
-            headers = {'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'}
-            
-            # pandas.read_html은 가끔 불안정하므로 requests + BeautifulSoup 스타일로 필요한 컬럼만 추출
-            from bs4 import BeautifulSoup
-            res = requests.get(url, headers=headers, timeout=10)
-            soup = BeautifulSoup(res.text, 'html.parser')
-            
-            table = soup.find('table', {'class': 'type_2'})
-            if not table: return None
-            
-            stocks = []
-            for tr in table.find_all('tr'):
-                anchors = tr.find_all('a', {'class': 'tltle'})
-                if anchors:
-                    name = anchors[0].text
-                    href = anchors[0]['href']
-                    code = href.split('code=')[-1].strip()
-                    
-                    # 시총 값 추출 (단위: 억)
-                    tds = tr.find_all('td', {'class': 'number'})
-                    marcap = 0
-                    if len(tds) >= 2:
-                        marcap_str = tds[1].text.replace(',', '').strip()
-                        marcap = int(marcap_str) * 100_000_000 if marcap_str.isdigit() else 0
-                    
-                    stocks.append({'Code': code, 'Name': name, 'Marcap': marcap})
-            
-            return pd.DataFrame(stocks)
-        except Exception as e:
-            print(f"[DataLoader] Naver Listing Error: {e}")
-            return None
+    def get_listing_service(self):
+        from .listing_service import ListingService
+        if getattr(self, '_listing_service', None) is None:
+            self._listing_service = ListingService(self.db)
+        return self._listing_service
 
     def get_etf_universe(self):
         """
@@ -153,24 +80,59 @@ class DataLoader:
         if df is not None and not df.empty:
              # Basic staleness check omitted for brevity in single fetch fallback
              return df
-        return self._fetch_and_save(ticker)
 
-    def _fetch_and_save(self, ticker):
-        try:
-            df = fdr.DataReader(ticker, self.data_start_date, self.end_date)
-            if df is None or df.empty: return None
-            
-            if 'Comp' not in df.columns: df['Amount'] = df['Close'] * df['Volume']
-            df = df[(df['Open'] > 0) & (df['Close'] > 0)]
-            
-            self.db.save_market_data(ticker, df)
-            return df
-        except:
+        # 큐를 거쳐서 받으면 다른 로더가 이미 받고 있는 작업과 중복되지 않음
+        self.db.enqueue_download_jobs([ticker], self.data_start_date, self.end_date)
+        worker = self.get_download_worker()
+        worker.start()
+        status = worker.wait_for([ticker], self.data_start_date, self.end_date, timeout=15)
+        if status.get(ticker) != 'DONE':
             return None
+        return self.db.load_market_data(ticker, self.data_start_date, self.end_date)
 
-    def preload_data_concurrently(self, tickers):
+    def get_latest_bars(self, tickers, as_of=None):
+        """
+        N개 종목의 기준일 마지막 종가/날짜/경과일 (DB 쿼리 1회, 전체 이력 로드 없음)
+        DB에 없는 종목은 다운로드 큐에만 등록하고 기다리지 않음 (다음 조회 시 반영).
+        :param as_of: 기준일 (기본: 로더 종료일)
+        Returns: DataFrame (index=ticker, columns=[date, close, stale_days])
+        """
+        bars = self.db.get_latest_bars(tickers, as_of if as_of is not None else self.end_date)
+        missing = [t for t in tickers if t not in bars.index]
+        if missing:
+            self.db.enqueue_download_jobs(missing, self.data_start_date, self.end_date)
+            self.get_download_worker().start()
+        return bars
+
+    def _download_range(self, ticker, start_date, end_date):
+        """
+        FDR에서 [start_date, end_date] 구간을 받아 DB에 저장
+        Returns: DataFrame or None (데이터 없음)
         """
-        Load data for ALL tickers using bulk DB read + Parallel Download.
+        import FinanceDataReader as fdr # 무거운 의존성은 실제 다운로드 시점에 로드
+        df = fdr.DataReader(ticker, start_date, end_date)
+        if df is None or df.empty: return None
+
+        if 'Comp' not in df.columns: df['Amount'] = df['Close'] * df['Volume']
+        df = df[(df['Open'] > 0) & (df['Close'] > 0)]
+
+        self.db.save_market_data(ticker, df)
+        return df
+
+    def _run_download_job(self, ticker, start_date, end_date):
+        # DownloadWorker용 fetch_fn (예외는 워커가 재시도 처리)
+        df = self._download_range(ticker, start_date, end_date)
+        return df is not None and not df.empty
+
+    def get_download_worker(self):
+        from .download_queue import get_download_worker
+        return get_download_worker(self.db, self._run_download_job)
+
+    def preload_data_concurrently(self, tickers, timeout=30):
+        """
+        Load data for ALL tickers using bulk DB read + persistent download queue.
+        누락 티커는 download_jobs 큐에 등록되고 백그라운드 워커가 처리함.
+        timeout 안에 끝나지 않은 작업은 다음 실행(또는 rerun)에서 이어서 완료됨.
         Returns: {ticker: DataFrame}
         """
         print(f"[DataLoader] Pre-loading data for {len(tickers)} tickers...")
@@ -189,44 +151,62 @@ class DataLoader:
                 need_download = True
             else:
                 # Proper Staleness Check
-                first_date = df.index[0]
-                last_date = df.index[-1]
-                
-                if first_date.date() > (self.data_start_date + timedelta(days=7)).date():
-                    need_download = True
-                elif last_date.date() < (self.end_date - timedelta(days=5)).date():
-                    need_download = True
+                need_download = self._is_stale(df.index[0], df.index[-1])
             
             if need_download:
                 missing_tickers.append(ticker)
             else:
                 final_data[ticker] = df
                 
-        # 2. Parallel Download for Missing
+        # 2. Queue Download for Missing
         if missing_tickers:
-            print(f"[DataLoader] Downloading missing data for {len(missing_tickers)} tickers (Parallel)...")
-            
-            import concurrent.futures
-            
-            # Using threads is effective for I/O bound tasks like HTTP requests
-            with concurrent.futures.ThreadPoolExecutor(max_workers=10) as executor:
-                # Map tickers to futures
-                future_to_ticker = {executor.submit(self._fetch_and_save, t): t for t in missing_tickers}
-                
-                try:
-                    for future in concurrent.futures.as_completed(future_to_ticker, timeout=30):
-                        ticker = future_to_ticker[future]
-                        try:
-                            df = future.result()
-                            if df is not None:
-                                final_data[ticker] = df
-                        except Exception as exc:
-                            print(f"[DataLoader] Error downloading {ticker}: {exc}")
-                except concurrent.futures.TimeoutError:
-                    print("[DataLoader] Parallel download timed out. Proceeding with available data.")
+            done_tickers = self._download_missing(missing_tickers, timeout)
+            if done_tickers:
+                fresh = self.db.load_market_data_bulk(done_tickers, self.data_start_date, self.end_date)
+                for ticker in done_tickers:
+                    df = fresh.get(ticker)
+                    if df is not None and not df.empty:
+                        final_data[ticker] = df
                         
         return final_data
 
+    def _is_stale(self, first_date, last_date):
+        first_date, last_date = pd.to_datetime(first_date), pd.to_datetime(last_date)
+        if first_date.date() > (self.data_start_date + timedelta(days=7)).date():
+            return True
+        return last_date.date() < (self.end_date - timedelta(days=5)).date()
+
+    def _download_missing(self, missing_tickers, timeout):
+        """
+        누락 티커를 다운로드 큐에 넣고 timeout까지 대기.
+        Returns: 이번 구간 작업이 DONE인 티커 목록
+        """
+        print(f"[DataLoader] Queueing downloads for {len(missing_tickers)} tickers (Background)...")
+
+        # 이미 같은 구간으로 DONE 처리된 작업은 다시 받지 않음 (상장일이 늦은 종목 등).
+        # 단, 구간 마지막 날 이전에 받은 작업은 일정 시간 후 다시 받음 (enqueue_download_jobs)
+        self.db.enqueue_download_jobs(missing_tickers, self.data_start_date, self.end_date)
+        worker = self.get_download_worker()
+        worker.start()
+        status = worker.wait_for(missing_tickers, self.data_start_date, self.end_date, timeout=timeout)
+
+        remaining = sum(1 for t in missing_tickers if status.get(t) in ('PENDING', 'RUNNING'))
+        if remaining:
+            print(f"[DataLoader] Download wait timed out. {remaining} tickers continue in background.")
+        return [t for t in missing_tickers if status.get(t) == 'DONE']
+
+    def ensure_market_data(self, tickers, timeout=30):
+        """
+        Full-Market 모드용: 데이터를 메모리로 읽지 않고 DB 저장 구간만 확인하여 누락분 다운로드.
+        Returns: DB에 데이터가 있는 티커 목록 (입력 순서 유지)
+        """
+        coverage = self.db.get_market_data_coverage(tickers)
+        missing = [t for t in tickers if t not in coverage or self._is_stale(*coverage[t])]
+        if missing:
+            self._download_missing(missing, timeout)
+            coverage.update(self.db.get_market_data_coverage(missing))
+        return [t for t in tickers if t in coverage]
+
     def apply_liquidity_filter(self, df_dict, min_amount=10_000_000_000):
         """
         N일 평균 거래대금 기준 필터링
@@ -247,44 +227,13 @@ class DataLoader:
             
         return filtered_dict
 
-    @st.cache_data(ttl=3600) # 1시간 캐싱
-    def get_etf_pdf(_self, etf_ticker: str):
+    def get_etf_pdf(self, etf_ticker: str, top_n=10):
         """
-        TIGER ETF 공식 API를 통해 실시간 구성 종목(PDF) 리스트를 가져옵니다.
+        TIGER ETF 구성 종목(PDF) 상위 top_n (etf_holdings 테이블의 최근 수집분).
+        API를 기다리지 않으며, 없거나 오래되었으면 백그라운드에서 전체 ETF를 동시에 갱신.
         """
-        print(f"[DataLoader] ETF PDF 데이터 로드 중 (Ticker: {etf_ticker})...")
-        try:
-            # 미래에셋 TIGER ETF 공식 API
-            url = f"https://www.tigeretf.com/ko/api/etf/pdf.do?etfTicker={etf_ticker}"
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-                'Referer': f'https://www.tigeretf.com/ko/product/view.do?ticker={etf_ticker}'
-            }
-            
-            res = requests.get(url, headers=headers, timeout=10)
-            data = res.json()
-            
-            # API 응답 구조 분석 (data.pdfList 등)
-            pdf_list = data.get('data', {}).get('pdfList', [])
-            if not pdf_list:
-                print(f"[DataLoader] PDF 데이터를 찾을 수 없습니다: {etf_ticker}")
-                return []
-                
-            results = []
-            for item in pdf_list:
-                # 비중(weight)이 0 이상인 종목만 추출
-                weight = float(item.get('weight', 0))
-                if weight > 0:
-                    results.append({
-                        "ticker": item.get('isincode', '').strip()[-6:] if item.get('isincode') else "", # 보통 끝 6자리가 티커
-                        "name": item.get('stkname', '알수없음'),
-                        "weight": round(weight, 2)
-                    })
-            
-            # 비중 순 정렬 및 상위 10개 (UI 호환용)
-            results = sorted(results, key=lambda x: x['weight'], ascending=False)[:10]
-            print(f"[DataLoader] {etf_ticker} PDF 로드 완료 ({len(results)}종목)")
-            return results
-        except Exception as e:
-            print(f"[DataLoader] ETF PDF API 호출 실패: {e}")
-            return []
+        return self.get_etf_pdf_service().get_holdings(etf_ticker, top_n=top_n)
+
+    def get_etf_pdf_service(self):
+        from .etf_pdf_service import get_etf_pdf_service
+        return get_etf_pdf_service(self.db)
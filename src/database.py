@@ -1,9 +1,93 @@
 import sqlite3
 import json
+import io
+import hashlib
+import numpy as np
 import pandas as pd
 import datetime
+import time
 import os
 
+# 시뮬레이션 결과 블롭 형식 (Parquet + zstd)
+RESULT_BLOB_FORMAT = 'parquet-zstd'
+
+# simulations 테이블에 추가된 메타데이터 컬럼 (기존 DB 마이그레이션용)
+SIMULATION_META_COLUMNS = {
+    'fingerprint': 'TEXT',
+    'final_value': 'REAL',
+    'total_return': 'REAL',
+    'mdd': 'REAL',
+    'num_trades': 'INTEGER',
+    'data_snapshot_id': 'INTEGER',
+    'data_digest': 'TEXT',
+    'data_universe_digest': 'TEXT',
+}
+
+MARKET_DATA_FIELDS = ('open', 'high', 'low', 'close', 'volume', 'amount', 'change')
+HASH_MODULUS = 1 << 64
+# market_data.row_hash = 행 해시 상위 32비트 (기간별 SUM이 SQLite 정수 범위를 넘지 않도록)
+ROW_HASH_SHIFT = 32
+
+
+def market_row_hash(date, values):
+    """
+    market_data 1행의 64비트 해시. SQLite에 저장되는 값 기준 (NaN -> NULL, -0.0 -> 0.0)
+    :param date: 'YYYY-MM-DD'
+    :param values: MARKET_DATA_FIELDS 순서의 값
+    """
+    parts = [date] + ['' if v is None or v != v else repr(float(v) + 0.0) for v in values]
+    return int.from_bytes(hashlib.blake2b('|'.join(parts).encode(), digest_size=8).digest(), 'big')
+
+
+def combine_row_hashes(hashes, start=0):
+    """
+    행 해시의 합 (mod 2^64): 행 순서/저장 이력과 무관하게 내용이 같으면 같은 값 -> 일부 행만 바뀌어도 증분 갱신 가능
+    """
+    return (start + sum(hashes)) % HASH_MODULUS
+
+
+def df_to_blob(df):
+    """
+    DataFrame -> 압축 Parquet 바이트 (인덱스 포함)
+    """
+    buf = io.BytesIO()
+    df.to_parquet(buf, engine='pyarrow', compression='zstd', index=True)
+    return buf.getvalue()
+
+
+def blob_to_df(blob):
+    return pd.read_parquet(io.BytesIO(blob), engine='pyarrow')
+
+
+def portfolio_to_df(portfolio):
+    """
+    Backtester.portfolio dict -> DataFrame (index=ticker)
+    """
+    df = pd.DataFrame.from_dict(portfolio, orient='index', columns=['qty', 'avg_price', 'buy_date', 'cost'])
+    df.index.name = 'ticker'
+    return df
+
+
+def df_to_portfolio(df):
+    return {ticker: row for ticker, row in df.to_dict(orient='index').items()}
+
+
+def summarize_equity(equity_df, trades_df=None):
+    """
+    헤드라인 지표 (목록/비교용): 최종 평가액, 총 수익률(%), MDD(%), 거래 수
+    """
+    metrics = {'final_value': None, 'total_return': None, 'mdd': None,
+               'num_trades': 0 if trades_df is None else len(trades_df)}
+    if equity_df is None or equity_df.empty or 'TotalValue' not in equity_df.columns:
+        return metrics
+    values = equity_df['TotalValue'].astype(float)
+    peak = values.cummax()
+    metrics['final_value'] = float(values.iloc[-1])
+    metrics['total_return'] = float((values.iloc[-1] / values.iloc[0] - 1) * 100)
+    metrics['mdd'] = float(((values - peak) / peak).min() * 100)
+    return metrics
+
+
 class DBManager:
     def __init__(self, db_path='storage.db'):
         """
@@ -13,7 +97,8 @@ class DBManager:
         self.init_db()
 
     def get_connection(self):
-        return sqlite3.connect(self.db_path)
+        # 백그라운드 다운로드 워커와 동시에 쓰기가 발생하므로 lock 대기 시간을 넉넉히 둠
+        return sqlite3.connect(self.db_path, timeout=30)
 
     def init_db(self):
         """
@@ -32,8 +117,43 @@ class DBManager:
                 params_json TEXT
             )
         ''')
-        
-        # 2. Equity Curve Table
+        # 기존 DB: 메타데이터 컬럼 추가
+        existing = {row[1] for row in cursor.execute('PRAGMA table_info(simulations)')}
+        for col, col_type in SIMULATION_META_COLUMNS.items():
+            if col not in existing:
+                cursor.execute(f'ALTER TABLE simulations ADD COLUMN {col} {col_type}')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_simulations_fingerprint ON simulations (fingerprint)')
+
+        # 1-1. Simulation Result Table
+        # 시뮬레이션 1건 = 1행. 자산 곡선/거래 내역을 압축 Parquet 블롭으로 저장
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS simulation_results (
+                simulation_id INTEGER PRIMARY KEY,
+                format TEXT,
+                equity_blob BLOB,
+                trades_blob BLOB,
+                portfolio_blob BLOB,
+                FOREIGN KEY(simulation_id) REFERENCES simulations(id)
+            )
+        ''')
+        existing = {row[1] for row in cursor.execute('PRAGMA table_info(simulation_results)')}
+        if 'portfolio_blob' not in existing:
+            cursor.execute('ALTER TABLE simulation_results ADD COLUMN portfolio_blob BLOB')
+
+        # 1-2. Simulation Signal Table
+        # 거래/보유 종목별 엔진 지표 + 매수/매도 신호 (Analysis 화면이 종목당 1행 조회로 사용)
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS simulation_signals (
+                simulation_id INTEGER,
+                ticker TEXT,
+                format TEXT,
+                signals_blob BLOB,
+                PRIMARY KEY (simulation_id, ticker),
+                FOREIGN KEY(simulation_id) REFERENCES simulations(id)
+            )
+        ''')
+
+        # 2. Equity Curve Table (Legacy: 행 단위 저장분 조회용)
         cursor.execute('''
             CREATE TABLE IF NOT EXISTS equity (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -43,8 +163,9 @@ class DBManager:
                 FOREIGN KEY(simulation_id) REFERENCES simulations(id)
             )
         ''')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_equity_simulation ON equity (simulation_id)')
         
-        # 3. Trades Table
+        # 3. Trades Table (Legacy)
         cursor.execute('''
             CREATE TABLE IF NOT EXISTS trades (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -60,6 +181,7 @@ class DBManager:
                 FOREIGN KEY(simulation_id) REFERENCES simulations(id)
             )
         ''')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_trades_simulation ON trades (simulation_id)')
 
         # 4. Market Data Table (New)
         # Composite PK: ticker + date
@@ -74,66 +196,247 @@ class DBManager:
                 volume REAL,
                 amount REAL,
                 change REAL,
+                row_hash INTEGER,
                 PRIMARY KEY (ticker, date)
             )
         ''')
-        
+        # 기존 DB: 행 해시 컬럼 추가 (기간 단위 데이터 digest용)
+        if 'row_hash' not in {row[1] for row in cursor.execute('PRAGMA table_info(market_data)')}:
+            cursor.execute('ALTER TABLE market_data ADD COLUMN row_hash INTEGER')
+            self._backfill_market_row_hashes(cursor)
+
+        # 4-1. Market Data Versions Table
+        # 종목별 내용 해시 (행 해시 합, 순서 무관) + 행 수/기간 + 마지막 변경 시점.
+        # save_market_data와 같은 트랜잭션에서 증분 갱신 -> 캐시/결과 키를 실제 데이터 내용으로 만들 수 있음
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS market_data_versions (
+                ticker TEXT PRIMARY KEY,
+                content_hash TEXT,
+                rows INTEGER,
+                first_date TEXT,
+                last_date TEXT,
+                snapshot_id INTEGER,
+                modified_at TEXT
+            )
+        ''')
+
+        # 5. Download Queue Table
+        # 티커별 다운로드 작업 상태 (PENDING -> RUNNING -> DONE / FAILED)
+        # 프로세스가 종료되어도 남아 있으므로 다음 실행에서 이어서 처리
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS download_jobs (
+                ticker TEXT,
+                start_date TEXT,
+                end_date TEXT,
+                status TEXT,
+                attempts INTEGER DEFAULT 0,
+                has_data INTEGER DEFAULT 0,
+                error TEXT,
+                updated_at TEXT,
+                PRIMARY KEY (ticker, start_date, end_date)
+            )
+        ''')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_download_jobs_status ON download_jobs (status, updated_at)')
+
+        # 6. Stock Listing Cache Table
+        # 시장별 시총 순위 리스트 (FDR/Naver 결과). rank 순으로 읽어서 상위 N 선정
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS stock_listing (
+                market TEXT,
+                code TEXT,
+                name TEXT,
+                marcap REAL,
+                rank INTEGER,
+                source TEXT,
+                complete INTEGER,
+                fetched_at TEXT,
+                PRIMARY KEY (market, code)
+            )
+        ''')
+
+        # 6-1. ETF Holdings (PDF) Table
+        # TIGER ETF 구성 종목 이력 (ETF x 기준일 x 비중 순위)
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS etf_holdings (
+                etf_ticker TEXT,
+                as_of TEXT,
+                rank INTEGER,
+                ticker TEXT,
+                name TEXT,
+                weight REAL,
+                fetched_at TEXT,
+                PRIMARY KEY (etf_ticker, as_of, rank)
+            )
+        ''')
+
+        # 7. Meta Table (key-value)
+        # market_data_version: 시장 데이터가 바뀔 때마다 증가 (= 스냅샷 ID)
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS db_meta (
+                key TEXT PRIMARY KEY,
+                value TEXT
+            )
+        ''')
+        # 기존 DB: 종목별 내용 해시를 한 번 계산
+        if cursor.execute("SELECT 1 FROM db_meta WHERE key = 'market_data_hashes'").fetchone() is None:
+            self._backfill_market_data_versions(cursor)
+
+        # 8. Simulation Jobs Table
+        # 백그라운드 백테스트 작업 상태 (PENDING -> RUNNING -> DONE / FAILED)
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS simulation_jobs (
+                id TEXT PRIMARY KEY,
+                status TEXT,
+                stage TEXT,
+                done INTEGER DEFAULT 0,
+                total INTEGER DEFAULT 0,
+                params_json TEXT,
+                simulation_id INTEGER,
+                error TEXT,
+                created_at REAL,
+                started_at REAL,
+                updated_at REAL
+            )
+        ''')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_simulation_jobs_status ON simulation_jobs (status, created_at)')
+
+        # 9. Paper Trading Tables
+        # 계좌별 현금/마지막 처리 거래일 + 보유 종목 + 체결 + 일별 평가액. 거래일 단위로 한 트랜잭션에 저장
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS paper_accounts (
+                account TEXT PRIMARY KEY,
+                params_json TEXT,
+                initial_balance REAL,
+                balance REAL,
+                last_date TEXT,
+                created_at TEXT,
+                updated_at TEXT
+            )
+        ''')
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS paper_positions (
+                account TEXT,
+                ticker TEXT,
+                qty INTEGER,
+                avg_price REAL,
+                buy_date TEXT,
+                cost REAL,
+                PRIMARY KEY (account, ticker)
+            )
+        ''')
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS paper_fills (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                account TEXT,
+                date TEXT,
+                ticker TEXT,
+                name TEXT,
+                action TEXT,
+                price REAL,
+                qty INTEGER,
+                fee REAL,
+                note TEXT
+            )
+        ''')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_paper_fills_account ON paper_fills (account, date)')
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS paper_equity (
+                account TEXT,
+                date TEXT,
+                total_value REAL,
+                balance REAL,
+                positions INTEGER,
+                PRIMARY KEY (account, date)
+            )
+        ''')
+
+        # 10. EOD Pipeline Tables
+        # eod_indicators: 티커별 마지막 봉 랭킹/매수 지표 (지표 파라미터 키별, 새 봉이 들어온 티커만 다시 계산)
+        # eod_snapshots: 거래일별 랭킹 + 매수/매도/보유 판정 스냅샷
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS eod_indicators (
+                params_key TEXT,
+                ticker TEXT,
+                date TEXT,
+                close REAL,
+                amount_ma20 REAL,
+                rs_score REAL,
+                ma_short REAL,
+                ma_long REAL,
+                slope_prev REAL,
+                slope_now REAL,
+                buy_signal INTEGER,
+                PRIMARY KEY (params_key, ticker)
+            )
+        ''')
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS eod_snapshots (
+                date TEXT,
+                ticker TEXT,
+                rank INTEGER,
+                rs_score REAL,
+                amount_ma20 REAL,
+                close REAL,
+                signal TEXT,
+                reason TEXT,
+                created_at TEXT,
+                PRIMARY KEY (date, ticker)
+            )
+        ''')
+
         conn.commit()
         conn.close()
 
-    def save_simulation(self, config, equity_df, trades_df):
+    def save_simulation(self, config, equity_df, trades_df, fingerprint=None, portfolio=None, signals=None, data_snapshot=None):
         """
         Save a full simulation result to DB.
+        메타데이터/지표는 simulations 테이블, 자산 곡선/거래 내역은 압축 Parquet 블롭 1행으로 저장.
+        :param fingerprint: 같은 조건의 재실행을 찾기 위한 식별 해시 (선택)
+        :param data_snapshot: 실행에 사용한 데이터 스냅샷 (Backtester.take_data_snapshot, 선택)
+        :param portfolio: 종료 시점 보유 종목 {ticker: {'qty', 'avg_price', 'buy_date', 'cost'}} (선택)
+        :param signals: 종목별 지표/신호 {ticker: DataFrame} (Backtester.get_signal_frames, 선택)
         """
+        trades_df = trades_df if trades_df is not None else pd.DataFrame()
         conn = self.get_connection()
         cursor = conn.cursor()
         
         try:
+            equity_blob = df_to_blob(equity_df)
+            trades_blob = df_to_blob(trades_df)
+            portfolio_blob = df_to_blob(portfolio_to_df(portfolio)) if portfolio is not None else None
+            metrics = summarize_equity(equity_df, trades_df)
+
             # 1. Insert Simulation Metadata
-            params_json = json.dumps(config, ensure_ascii=False)
+            params_json = json.dumps(config, ensure_ascii=False, default=str)
             timestamp = datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+            data_snapshot = data_snapshot or {}
             
             cursor.execute('''
-                INSERT INTO simulations (timestamp, start_date, end_date, params_json)
-                VALUES (?, ?, ?, ?)
-            ''', (timestamp, config.get('start_date'), config.get('end_date'), params_json))
+                INSERT INTO simulations (timestamp, start_date, end_date, params_json,
+                                         fingerprint, final_value, total_return, mdd, num_trades,
+                                         data_snapshot_id, data_digest, data_universe_digest)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ''', (timestamp, config.get('start_date'), config.get('end_date'), params_json,
+                  fingerprint, metrics['final_value'], metrics['total_return'], metrics['mdd'], metrics['num_trades'],
+                  data_snapshot.get('id'), data_snapshot.get('digest'), data_snapshot.get('universe_digest')))
             
             simulation_id = cursor.lastrowid
             
-            # 2. Insert Equity Curve
-            equity_data = []
-            for idx, row in equity_df.iterrows():
-                date_str = str(idx.date()) if hasattr(idx, 'date') else str(idx).split()[0]
-                equity_data.append((simulation_id, date_str, float(row['TotalValue'])))
-            
-            cursor.executemany('''
-                INSERT INTO equity (simulation_id, date, total_value)
-                VALUES (?, ?, ?)
-            ''', equity_data)
-            
-            # 3. Insert Trades
-            trades_data = []
-            if not trades_df.empty:
-                for _, row in trades_df.iterrows():
-                    trades_data.append((
-                        simulation_id,
-                        str(row['Date']),
-                        str(row['Ticker']),
-                        str(row['Name']),
-                        str(row['Action']),
-                        float(row['Price']),
-                        int(row['Qty']),
-                        float(row['Fee']),
-                        str(row['Note'])
-                    ))
-                
+            # 2. Insert Result Blobs
+            cursor.execute('''
+                INSERT INTO simulation_results (simulation_id, format, equity_blob, trades_blob, portfolio_blob)
+                VALUES (?, ?, ?, ?, ?)
+            ''', (simulation_id, RESULT_BLOB_FORMAT, equity_blob, trades_blob, portfolio_blob))
+
+            # 3. Insert Per-Ticker Signal Blobs
+            if signals:
                 cursor.executemany('''
-                    INSERT INTO trades (simulation_id, date, ticker, name, action, price, qty, fee, note)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-                ''', trades_data)
+                    INSERT INTO simulation_signals (simulation_id, ticker, format, signals_blob)
+                    VALUES (?, ?, ?, ?)
+                ''', [(simulation_id, ticker, RESULT_BLOB_FORMAT, df_to_blob(df)) for ticker, df in signals.items()])
             
             conn.commit()
-            print(f"[DB] Simulation saved. ID: {simulation_id}")
+            print(f"[DB] Simulation saved. ID: {simulation_id} ({(len(equity_blob) + len(trades_blob)) / 1024:,.1f}KB)")
             return simulation_id
             
         except Exception as e:
@@ -143,9 +446,9 @@ class DBManager:
         finally:
             conn.close()
 
-    def get_latest_simulation(self):
+    def get_simulation(self, simulation_id):
         """
-        Retrieve the latest simulation data.
+        Retrieve one simulation by id (PK 조회 + 블롭 1행 -> 실행 크기에 비례).
         Returns: (config_dict, equity_df, trades_df)
         """
         conn = self.get_connection()
@@ -153,27 +456,19 @@ class DBManager:
         cursor = conn.cursor()
         
         try:
-            cursor.execute('SELECT * FROM simulations ORDER BY id DESC LIMIT 1')
+            cursor.execute('SELECT params_json FROM simulations WHERE id = ?', (simulation_id,))
             sim_row = cursor.fetchone()
-            
             if not sim_row:
                 return None, None, None
-            
-            simulation_id = sim_row['id']
             config = json.loads(sim_row['params_json'])
-            
-            cursor.execute('SELECT date, total_value as TotalValue FROM equity WHERE simulation_id = ? ORDER BY date', (simulation_id,))
-            equity_rows = cursor.fetchall()
-            equity_df = pd.DataFrame([dict(row) for row in equity_rows])
-            if not equity_df.empty:
-                equity_df['Date'] = pd.to_datetime(equity_df['date'])
-                equity_df.set_index('Date', inplace=True)
-                equity_df.drop(columns=['date'], inplace=True)
-            
-            cursor.execute('SELECT date as Date, ticker as Ticker, name as Name, action as Action, price as Price, qty as Qty, fee as Fee, note as Note FROM trades WHERE simulation_id = ? ORDER BY date', (simulation_id,))
-            trades_rows = cursor.fetchall()
-            trades_df = pd.DataFrame([dict(row) for row in trades_rows])
-            
+
+            cursor.execute('SELECT equity_blob, trades_blob FROM simulation_results WHERE simulation_id = ?', (simulation_id,))
+            blob_row = cursor.fetchone()
+            if blob_row is not None:
+                return config, blob_to_df(blob_row['equity_blob']), blob_to_df(blob_row['trades_blob'])
+
+            # 이전 버전에서 행 단위로 저장된 시뮬레이션
+            equity_df, trades_df = self._load_legacy_simulation(cursor, simulation_id)
             return config, equity_df, trades_df
             
         except Exception as e:
@@ -182,6 +477,420 @@ class DBManager:
         finally:
             conn.close()
 
+    def get_simulation_portfolio(self, simulation_id):
+        """
+        종료 시점 보유 종목 dict (저장되지 않았으면 None)
+        """
+        conn = self.get_connection()
+        try:
+            row = conn.execute('SELECT portfolio_blob FROM simulation_results WHERE simulation_id = ?', (simulation_id,)).fetchone()
+            if row is None or row[0] is None:
+                return None
+            return df_to_portfolio(blob_to_df(row[0]))
+        except Exception as e:
+            print(f"[DB] Error loading simulation portfolio: {e}")
+            return None
+        finally:
+            conn.close()
+
+    def get_simulation_signals(self, simulation_id, ticker):
+        """
+        시뮬레이션에 저장된 종목의 엔진 지표/신호 DataFrame (저장되지 않았으면 None)
+        """
+        conn = self.get_connection()
+        try:
+            row = conn.execute('SELECT signals_blob FROM simulation_signals WHERE simulation_id = ? AND ticker = ?',
+                               (simulation_id, ticker)).fetchone()
+            return blob_to_df(row[0]) if row is not None else None
+        except Exception as e:
+            print(f"[DB] Error loading simulation signals: {e}")
+            return None
+        finally:
+            conn.close()
+
+    def get_latest_simulation(self):
+        """
+        Retrieve the latest simulation data.
+        Returns: (config_dict, equity_df, trades_df)
+        """
+        conn = self.get_connection()
+        try:
+            simulation_id = conn.execute('SELECT MAX(id) FROM simulations').fetchone()[0]
+        finally:
+            conn.close()
+
+        if simulation_id is None:
+            return None, None, None
+        return self.get_simulation(simulation_id)
+
+    def get_simulation_snapshot(self, simulation_id):
+        """
+        시뮬레이션이 사용한 데이터 스냅샷 {'id', 'digest', 'universe_digest'} (기록되지 않았으면 None).
+        digest = 유니버스 종목의 실행 기간 데이터, universe_digest = 유니버스 리스팅 (Backtester.take_data_snapshot)
+        """
+        conn = self.get_connection()
+        try:
+            row = conn.execute('SELECT data_snapshot_id, data_digest, data_universe_digest FROM simulations WHERE id = ?',
+                               (simulation_id,)).fetchone()
+        finally:
+            conn.close()
+        if row is None or row[1] is None:
+            return None
+        return {'id': row[0], 'digest': row[1], 'universe_digest': row[2]}
+
+    def find_simulation(self, fingerprint):
+        """
+        fingerprint가 같은 가장 최근 시뮬레이션 ID (없으면 None)
+        """
+        conn = self.get_connection()
+        try:
+            row = conn.execute('''
+                SELECT s.id FROM simulations s
+                JOIN simulation_results r ON r.simulation_id = s.id
+                WHERE s.fingerprint = ? ORDER BY s.id DESC LIMIT 1
+            ''', (fingerprint,)).fetchone()
+            return row[0] if row else None
+        finally:
+            conn.close()
+
+    def list_simulations(self, limit=100):
+        """
+        시뮬레이션 메타데이터/지표 목록 (블롭은 읽지 않음)
+        """
+        conn = self.get_connection()
+        try:
+            return pd.read_sql('''
+                SELECT id, timestamp, start_date, end_date, fingerprint,
+                       final_value, total_return, mdd, num_trades, data_snapshot_id, data_digest,
+                       data_universe_digest, params_json
+                FROM simulations ORDER BY id DESC LIMIT ?
+            ''', conn, params=(int(limit),))
+        except Exception as e:
+            print(f"[DB] Error listing simulations: {e}")
+            return pd.DataFrame()
+        finally:
+            conn.close()
+
+    def _load_legacy_simulation(self, cursor, simulation_id):
+        cursor.execute('SELECT date, total_value as TotalValue FROM equity WHERE simulation_id = ? ORDER BY date', (simulation_id,))
+        equity_rows = cursor.fetchall()
+        equity_df = pd.DataFrame([dict(row) for row in equity_rows])
+        if not equity_df.empty:
+            equity_df['Date'] = pd.to_datetime(equity_df['date'])
+            equity_df.set_index('Date', inplace=True)
+            equity_df.drop(columns=['date'], inplace=True)
+        
+        cursor.execute('SELECT date as Date, ticker as Ticker, name as Name, action as Action, price as Price, qty as Qty, fee as Fee, note as Note FROM trades WHERE simulation_id = ? ORDER BY date', (simulation_id,))
+        trades_rows = cursor.fetchall()
+        trades_df = pd.DataFrame([dict(row) for row in trades_rows])
+        return equity_df, trades_df
+
+    # -------------------------------------------------------------------------
+    # Simulation Job Methods
+    # -------------------------------------------------------------------------
+
+    def create_simulation_job(self, job_id, params):
+        conn = self.get_connection()
+        try:
+            now = time.time()
+            conn.execute('''
+                INSERT INTO simulation_jobs (id, status, stage, params_json, created_at, updated_at)
+                VALUES (?, 'PENDING', 'Queued', ?, ?, ?)
+            ''', (job_id, json.dumps(params, ensure_ascii=False, default=str), now, now))
+            conn.commit()
+        finally:
+            conn.close()
+
+    def update_simulation_job(self, job_id, **fields):
+        """
+        :param fields: status, stage, done, total, simulation_id, error, started_at 중 일부
+        """
+        allowed = {'status', 'stage', 'done', 'total', 'simulation_id', 'error', 'started_at'}
+        unknown = set(fields) - allowed
+        if unknown:
+            raise ValueError(f"Unknown simulation job fields: {sorted(unknown)}")
+
+        fields['updated_at'] = time.time()
+        assignments = ', '.join(f"{key} = ?" for key in fields)
+        conn = self.get_connection()
+        try:
+            conn.execute(f'UPDATE simulation_jobs SET {assignments} WHERE id = ?', (*fields.values(), job_id))
+            conn.commit()
+        except Exception as e:
+            print(f"[DB] Error updating simulation job {job_id}: {e}")
+        finally:
+            conn.close()
+
+    def get_simulation_job(self, job_id):
+        """
+        Returns: 작업 정보 dict (없으면 None)
+        """
+        conn = self.get_connection()
+        conn.row_factory = sqlite3.Row
+        try:
+            row = conn.execute('SELECT * FROM simulation_jobs WHERE id = ?', (job_id,)).fetchone()
+            if row is None:
+                return None
+            job = dict(row)
+            job['params'] = json.loads(job.pop('params_json') or '{}')
+            return job
+        finally:
+            conn.close()
+
+    def list_simulation_jobs(self, statuses=None, limit=20):
+        conn = self.get_connection()
+        try:
+            query = 'SELECT id, status, stage, done, total, simulation_id, error, created_at, started_at, updated_at FROM simulation_jobs'
+            params = []
+            if statuses:
+                query += f" WHERE status IN ({','.join(['?'] * len(statuses))})"
+                params.extend(statuses)
+            query += ' ORDER BY created_at DESC LIMIT ?'
+            params.append(int(limit))
+            return pd.read_sql(query, conn, params=params)
+        finally:
+            conn.close()
+
+    def touch_simulation_jobs(self, job_ids):
+        """
+        실행 중인 작업의 updated_at 갱신 (heartbeat - 데이터 로딩처럼 진행률 기록이 없는 구간에도 살아 있음을 표시)
+        """
+        if not job_ids:
+            return
+        conn = self.get_connection()
+        try:
+            conn.executemany('UPDATE simulation_jobs SET updated_at = ? WHERE id = ?', [(time.time(), j) for j in job_ids])
+            conn.commit()
+        except Exception as e:
+            print(f"[DB] Error touching simulation jobs: {e}")
+        finally:
+            conn.close()
+
+    def fail_interrupted_simulation_jobs(self, stale_seconds=120):
+        """
+        죽은 프로세스가 남긴 PENDING/RUNNING 작업(`stale_seconds` 동안 heartbeat 없음)을 FAILED로 정리.
+        다른 살아 있는 프로세스(다른 Streamlit 서버, CLI)가 실행 중인 작업은 heartbeat가 계속 갱신되므로 건드리지 않음
+        """
+        conn = self.get_connection()
+        try:
+            now = time.time()
+            cursor = conn.execute('''
+                UPDATE simulation_jobs SET status = 'FAILED', error = 'Interrupted (process restarted)', updated_at = ?
+                WHERE status IN ('PENDING', 'RUNNING') AND updated_at < ?
+            ''', (now, now - stale_seconds))
+            conn.commit()
+            return cursor.rowcount
+        finally:
+            conn.close()
+
+    # -------------------------------------------------------------------------
+    # Paper Trading Methods
+    # -------------------------------------------------------------------------
+
+    def create_paper_account(self, account, params, initial_balance, last_date):
+        """
+        :param last_date: 이미 처리된 것으로 간주할 마지막 거래일 (다음 거래일부터 처리)
+        Returns: 새로 만들었으면 True (이미 있으면 False)
+        """
+        now = datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        conn = self.get_connection()
+        try:
+            cursor = conn.execute('''
+                INSERT OR IGNORE INTO paper_accounts (account, params_json, initial_balance, balance, last_date, created_at, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+            ''', (account, json.dumps(params, ensure_ascii=False, default=str), initial_balance, initial_balance,
+                  last_date, now, now))
+            conn.commit()
+            return cursor.rowcount > 0
+        finally:
+            conn.close()
+
+    def get_paper_account(self, account):
+        """
+        Returns: {'account', 'params', 'initial_balance', 'balance', 'last_date', 'portfolio'} (없으면 None)
+                 portfolio: {ticker: {'qty', 'avg_price', 'buy_date': Timestamp, 'cost'}}
+        """
+        conn = self.get_connection()
+        conn.row_factory = sqlite3.Row
+        try:
+            row = conn.execute('SELECT * FROM paper_accounts WHERE account = ?', (account,)).fetchone()
+            if row is None:
+                return None
+            info = dict(row)
+            info['params'] = json.loads(info.pop('params_json') or '{}')
+            info['portfolio'] = {
+                r['ticker']: {'qty': r['qty'], 'avg_price': r['avg_price'],
+                              'buy_date': pd.Timestamp(r['buy_date']), 'cost': r['cost']}
+                for r in conn.execute('SELECT * FROM paper_positions WHERE account = ? ORDER BY ticker', (account,))
+            }
+            return info
+        finally:
+            conn.close()
+
+    def save_paper_day(self, account, date, balance, portfolio, fills, total_value):
+        """
+        거래일 1일 처리 결과를 한 트랜잭션으로 저장 (중간에 종료되면 그 날 전체가 롤백되어 재시작 시 다시 처리)
+        :param portfolio: 처리 후 보유 종목 {ticker: {'qty', 'avg_price', 'buy_date', 'cost'}}
+        :param fills: 그 날 체결 [Backtester.trade_log 형식 dict]
+        """
+        date = str(pd.Timestamp(date).date())
+        now = datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        conn = self.get_connection()
+        try:
+            cursor = conn.cursor()
+            cursor.execute('DELETE FROM paper_positions WHERE account = ?', (account,))
+            cursor.executemany('''
+                INSERT INTO paper_positions (account, ticker, qty, avg_price, buy_date, cost) VALUES (?, ?, ?, ?, ?, ?)
+            ''', [(account, ticker, int(p['qty']), float(p['avg_price']), str(pd.Timestamp(p['buy_date']).date()), float(p['cost']))
+                  for ticker, p in portfolio.items()])
+            cursor.executemany('''
+                INSERT INTO paper_fills (account, date, ticker, name, action, price, qty, fee, note)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ''', [(account, str(pd.Timestamp(f['Date']).date()), f['Ticker'], f['Name'], f['Action'],
+                   float(f['Price']), int(f['Qty']), float(f['Fee']), f['Note']) for f in fills])
+            cursor.execute('''
+                INSERT OR REPLACE INTO paper_equity (account, date, total_value, balance, positions) VALUES (?, ?, ?, ?, ?)
+            ''', (account, date, float(total_value), float(balance), len(portfolio)))
+            cursor.execute('UPDATE paper_accounts SET balance = ?, last_date = ?, updated_at = ? WHERE account = ?',
+                           (float(balance), date, now, account))
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            conn.close()
+
+    def load_paper_fills(self, account):
+        """
+        Returns: DataFrame (Backtester.trade_log 형식: Date, Ticker, Name, Action, Price, Qty, Fee, Note)
+        """
+        conn = self.get_connection()
+        try:
+            df = pd.read_sql('''
+                SELECT date AS Date, ticker AS Ticker, name AS Name, action AS Action,
+                       price AS Price, qty AS Qty, fee AS Fee, note AS Note
+                FROM paper_fills WHERE account = ? ORDER BY id
+            ''', conn, params=(account,))
+        finally:
+            conn.close()
+        df['Date'] = pd.to_datetime(df['Date'])
+        return df
+
+    def load_paper_equity(self, account):
+        """
+        Returns: DataFrame (index=Date, columns=[TotalValue, Balance, Positions])
+        """
+        conn = self.get_connection()
+        try:
+            df = pd.read_sql('''
+                SELECT date AS Date, total_value AS TotalValue, balance AS Balance, positions AS Positions
+                FROM paper_equity WHERE account = ? ORDER BY date
+            ''', conn, params=(account,))
+        finally:
+            conn.close()
+        df['Date'] = pd.to_datetime(df['Date'])
+        return df.set_index('Date')
+
+    def delete_paper_account(self, account):
+        conn = self.get_connection()
+        try:
+            for table in ('paper_positions', 'paper_fills', 'paper_equity', 'paper_accounts'):
+                conn.execute(f'DELETE FROM {table} WHERE account = ?', (account,))
+            conn.commit()
+        finally:
+            conn.close()
+
+    # -------------------------------------------------------------------------
+    # EOD Pipeline Methods
+    # -------------------------------------------------------------------------
+
+    # eod_indicators 컬럼 <-> SignalScanner.latest_indicators 컬럼
+    EOD_INDICATOR_COLUMNS = {
+        'date': 'Date', 'close': 'Close', 'amount_ma20': 'Amount_MA20', 'rs_score': 'RS Score',
+        'ma_short': 'MA_Short', 'ma_long': 'MA_Long', 'slope_prev': 'Slope_Prev', 'slope_now': 'Slope_Now',
+        'buy_signal': 'Buy_Signal',
+    }
+
+    def load_eod_indicators(self, params_key):
+        """
+        Returns: DataFrame (index=ticker, latest_indicators 형식 컬럼)
+        """
+        conn = self.get_connection()
+        try:
+            df = pd.read_sql(f"SELECT ticker, {', '.join(self.EOD_INDICATOR_COLUMNS)} FROM eod_indicators WHERE params_key = ?",
+                             conn, params=(params_key,))
+        finally:
+            conn.close()
+        df = df.rename(columns=self.EOD_INDICATOR_COLUMNS).set_index('ticker')
+        df['Date'] = pd.to_datetime(df['Date'])
+        df['Buy_Signal'] = df['Buy_Signal'].astype(bool)
+        return df
+
+    def save_eod_indicators(self, params_key, indicators):
+        """
+        :param indicators: SignalScanner.latest_indicators 결과 (티커별 UPSERT)
+        """
+        if indicators.empty:
+            return
+        df = indicators[list(self.EOD_INDICATOR_COLUMNS.values())]
+        rows = [
+            (params_key, ticker, str(pd.Timestamp(r[0]).date()), *(None if pd.isna(v) else float(v) for v in r[1:-1]), int(bool(r[-1])))
+            for ticker, r in zip(df.index, df.itertuples(index=False))
+        ]
+        conn = self.get_connection()
+        try:
+            conn.executemany(f'''
+                INSERT OR REPLACE INTO eod_indicators (params_key, ticker, {', '.join(self.EOD_INDICATOR_COLUMNS)})
+                VALUES ({', '.join(['?'] * (len(self.EOD_INDICATOR_COLUMNS) + 2))})
+            ''', rows)
+            conn.commit()
+        finally:
+            conn.close()
+
+    def save_eod_snapshot(self, date, snapshot):
+        """
+        거래일 스냅샷 저장 (같은 날 다시 실행하면 그 날 행 전체 교체)
+        :param snapshot: DataFrame[Rank, RS Score, Amount_MA20, Close, Signal, Reason] index=ticker
+        """
+        date = str(pd.Timestamp(date).date())
+        now = datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        rows = [
+            (date, ticker, None if pd.isna(r['Rank']) else int(r['Rank']),
+             *(None if pd.isna(r[c]) else float(r[c]) for c in ('RS Score', 'Amount_MA20', 'Close')),
+             r['Signal'], r['Reason'], now)
+            for ticker, r in snapshot.iterrows()
+        ]
+        conn = self.get_connection()
+        try:
+            conn.execute('DELETE FROM eod_snapshots WHERE date = ?', (date,))
+            conn.executemany('''
+                INSERT INTO eod_snapshots (date, ticker, rank, rs_score, amount_ma20, close, signal, reason, created_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ''', rows)
+            conn.commit()
+        finally:
+            conn.close()
+
+    def load_eod_snapshot(self, date=None):
+        """
+        :param date: 거래일 (기본: 가장 최근 스냅샷)
+        Returns: DataFrame (index=ticker, columns=[Rank, RS Score, Amount_MA20, Close, Signal, Reason])
+        """
+        conn = self.get_connection()
+        try:
+            if date is None:
+                date = conn.execute('SELECT MAX(date) FROM eod_snapshots').fetchone()[0]
+            else:
+                date = str(pd.Timestamp(date).date())
+            df = pd.read_sql('''
+                SELECT ticker AS Ticker, rank AS Rank, rs_score AS "RS Score", amount_ma20 AS Amount_MA20,
+                       close AS Close, signal AS Signal, reason AS Reason
+                FROM eod_snapshots WHERE date = ? ORDER BY rank IS NULL, rank, ticker
+            ''', conn, params=(date,))
+        finally:
+            conn.close()
+        return df.set_index('Ticker')
+
     # -------------------------------------------------------------------------
     # Market Data Methods (New)
     # -------------------------------------------------------------------------
@@ -218,11 +927,34 @@ class DBManager:
                     vol_val, amt_val, chg_val
                 ))
             
-            # Use REPLACE INTO for upsert behavior (requires PK on ticker, date)
+            # 같은 종목 동시 저장 시 내용 해시가 어긋나지 않도록 기존 행 조회부터 쓰기 잠금
+            cursor.execute('BEGIN IMMEDIATE')
+            dates = [row[1] for row in data_tuples]
+            old_rows = cursor.execute(f'''
+                SELECT date, {', '.join(MARKET_DATA_FIELDS)} FROM market_data
+                WHERE ticker = ? AND date >= ? AND date <= ?
+            ''', (ticker, min(dates), max(dates))).fetchall()
+            saved = set(dates)
+            old_hashes = [market_row_hash(row[0], row[1:]) for row in old_rows if row[0] in saved]
+            new_hashes = [market_row_hash(row[1], row[2:]) for row in data_tuples]
+            data_tuples = [(*row, h >> ROW_HASH_SHIFT) for row, h in zip(data_tuples, new_hashes)]
+
+            # Upsert: 값이 실제로 바뀐 행만 갱신 (동일 데이터 재저장 시 데이터 버전 유지)
+            changes_before = conn.total_changes
             cursor.executemany('''
-                REPLACE INTO market_data (ticker, date, open, high, low, close, volume, amount, change)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                INSERT INTO market_data (ticker, date, open, high, low, close, volume, amount, change, row_hash)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(ticker, date) DO UPDATE SET
+                    open = excluded.open, high = excluded.high, low = excluded.low, close = excluded.close,
+                    volume = excluded.volume, amount = excluded.amount, change = excluded.change,
+                    row_hash = excluded.row_hash
+                WHERE open IS NOT excluded.open OR high IS NOT excluded.high OR low IS NOT excluded.low
+                   OR close IS NOT excluded.close OR volume IS NOT excluded.volume
+                   OR amount IS NOT excluded.amount OR change IS NOT excluded.change
             ''', data_tuples)
+            if conn.total_changes != changes_before:
+                self._bump_market_data_version(cursor)
+                self._update_market_data_version(cursor, ticker, new_hashes, old_hashes)
             
             conn.commit()
             
@@ -278,6 +1010,21 @@ class DBManager:
         finally:
             conn.close()
 
+    def load_market_tail(self, ticker, as_of, bars):
+        """
+        as_of 이전(포함) 최근 bars개 봉 (PK 인덱스로 시작일만 찾은 뒤 load_market_data)
+        Returns DataFrame with DatetimeIndex or None.
+        """
+        as_of = str(pd.to_datetime(as_of).date())
+        conn = self.get_connection()
+        try:
+            row = conn.execute(f'''
+                SELECT date FROM market_data WHERE ticker = ? AND date <= ? ORDER BY date DESC LIMIT 1 OFFSET {int(bars) - 1}
+            ''', (ticker, as_of)).fetchone()
+        finally:
+            conn.close()
+        return self.load_market_data(ticker, row[0] if row else None, as_of)
+
     def load_market_data_bulk(self, tickers, start_date=None, end_date=None):
         """
         Load OHLCV data for multiple tickers in ONE query.
@@ -341,9 +1088,689 @@ class DBManager:
         try:
             cursor = conn.cursor()
             cursor.execute("DELETE FROM market_data")
+            cursor.execute("DELETE FROM market_data_versions")
+            self._bump_market_data_version(cursor)
             conn.commit()
             print("[DB] All market data cleared.")
         except Exception as e:
             print(f"[DB] Error clearing market data: {e}")
         finally:
             conn.close()
+
+    def get_market_data_version(self):
+        """
+        시장 데이터 버전 (save_market_data로 값이 바뀌거나 clear할 때마다 증가)
+        """
+        conn = self.get_connection()
+        try:
+            row = conn.execute("SELECT value FROM db_meta WHERE key = 'market_data_version'").fetchone()
+            return int(row[0]) if row else 0
+        finally:
+            conn.close()
+
+    def _bump_market_data_version(self, cursor):
+        cursor.execute('''
+            INSERT INTO db_meta (key, value) VALUES ('market_data_version', 1)
+            ON CONFLICT(key) DO UPDATE SET value = CAST(value AS INTEGER) + 1
+        ''')
+
+    def _update_market_data_version(self, cursor, ticker, added, removed=()):
+        """
+        종목 내용 해시 증분 갱신: 기존 해시 + 새로 쓴 행 해시 - 덮어쓴 기존 행 해시. 행 수/기간/변경 시점도 갱신
+        (_bump_market_data_version 다음에 호출 -> snapshot_id = 이 변경이 포함된 스냅샷)
+        """
+        row = cursor.execute('SELECT content_hash FROM market_data_versions WHERE ticker = ?', (ticker,)).fetchone()
+        current = int(row[0], 16) if row else 0
+        content_hash = combine_row_hashes(added, current - sum(removed))
+        rows, first_date, last_date = cursor.execute(
+            'SELECT COUNT(*), MIN(date), MAX(date) FROM market_data WHERE ticker = ?', (ticker,)).fetchone()
+        snapshot_id = cursor.execute("SELECT value FROM db_meta WHERE key = 'market_data_version'").fetchone()
+        cursor.execute('''
+            INSERT OR REPLACE INTO market_data_versions
+                (ticker, content_hash, rows, first_date, last_date, snapshot_id, modified_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+        ''', (ticker, f"{content_hash:016x}", rows, first_date, last_date,
+              int(snapshot_id[0]) if snapshot_id else 0, datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')))
+
+    def _backfill_market_data_versions(self, cursor):
+        """
+        market_data_versions 도입 이전 DB: 저장된 전 종목의 내용 해시를 한 번 계산 (티커 순 스트리밍)
+        """
+        count = 0
+        ticker, hashes = None, []
+        rows = cursor.connection.execute(f'SELECT ticker, date, {", ".join(MARKET_DATA_FIELDS)} FROM market_data ORDER BY ticker, date')
+        for row in rows:
+            if row[0] != ticker:
+                if hashes:
+                    self._update_market_data_version(cursor, ticker, hashes)
+                    count += 1
+                ticker, hashes = row[0], []
+            hashes.append(market_row_hash(row[1], row[2:]))
+        if hashes:
+            self._update_market_data_version(cursor, ticker, hashes)
+            count += 1
+        if count:
+            print(f"[DB] Market data content hashes computed for {count} tickers")
+        cursor.execute("INSERT OR REPLACE INTO db_meta (key, value) VALUES ('market_data_hashes', 1)")
+
+    def _backfill_market_row_hashes(self, cursor):
+        """
+        row_hash 컬럼 도입 이전 DB: 저장된 행의 row_hash를 한 번 계산 (rowid 순 묶음 단위)
+        """
+        conn = cursor.connection
+        last, count = 0, 0
+        while True:
+            rows = conn.execute(f'''
+                SELECT rowid, date, {", ".join(MARKET_DATA_FIELDS)} FROM market_data
+                WHERE rowid > ? AND row_hash IS NULL ORDER BY rowid LIMIT 50000
+            ''', (last,)).fetchall()
+            if not rows:
+                break
+            cursor.executemany('UPDATE market_data SET row_hash = ? WHERE rowid = ?',
+                               [(market_row_hash(row[1], row[2:]) >> ROW_HASH_SHIFT, row[0]) for row in rows])
+            last, count = rows[-1][0], count + len(rows)
+        if count:
+            print(f"[DB] Market data row hashes computed for {count} rows")
+
+    def get_ticker_versions(self, tickers=None):
+        """
+        종목별 데이터 버전 정보
+        Returns: DataFrame[content_hash, rows, first_date, last_date, snapshot_id, modified_at] index=ticker
+        """
+        conn = self.get_connection()
+        try:
+            query = 'SELECT * FROM market_data_versions'
+            params = []
+            if tickers is not None:
+                tickers = list(tickers)
+                query += f" WHERE ticker IN ({','.join('?' * len(tickers))})"
+                params = tickers
+            df = pd.read_sql(query + ' ORDER BY ticker', conn, params=params)
+        finally:
+            conn.close()
+        return df.set_index('ticker')
+
+    def get_data_snapshot(self, tickers=None, start_date=None, end_date=None):
+        """
+        시장 데이터 스냅샷: {'id': market_data_version, 'digest': 종목별 내용 해시를 합친 해시, 'tickers': 데이터가 있는 종목 수}
+        id는 변경 순서 확인용, digest는 내용 기준 (같은 데이터면 DB/저장 이력이 달라도 같은 값)
+        :param tickers: 지정하면 해당 종목만으로 digest 계산 (DB에 없는 종목도 반영 -> 나중에 받으면 digest가 바뀜)
+        :param start_date, end_date: 지정하면 이 기간의 행만으로 digest 계산 (기간 밖에 새 봉이 추가되어도 유지)
+        """
+        ranged = start_date is not None or end_date is not None
+        start = str(pd.to_datetime(start_date).date()) if start_date is not None else '0000-01-01'
+        end = str(pd.to_datetime(end_date).date()) if end_date is not None else '9999-12-31'
+        names = None if tickers is None else sorted(set(tickers))
+        conn = self.get_connection()
+        try:
+            conn.execute('BEGIN')  # 버전 번호와 해시를 같은 읽기 스냅샷에서
+            row = conn.execute("SELECT value FROM db_meta WHERE key = 'market_data_version'").fetchone()
+            if not ranged:
+                hashes = dict(conn.execute('SELECT ticker, content_hash FROM market_data_versions').fetchall())
+            else:
+                # 기간 내 행 수 + row_hash 합 (순서/저장 이력 무관)
+                query = 'SELECT ticker, COUNT(*), SUM(row_hash) FROM market_data WHERE date >= ? AND date <= ?'
+                hashes = {}
+                chunks = [None] if names is None else [names[i:i + 500] for i in range(0, len(names), 500)]
+                for chunk in chunks:
+                    if chunk is None:
+                        rows = conn.execute(query + ' GROUP BY ticker', (start, end))
+                    else:
+                        rows = conn.execute(query + f" AND ticker IN ({','.join('?' * len(chunk))}) GROUP BY ticker",
+                                            [start, end, *chunk])
+                    hashes.update({t: f"{count}:{total or 0:x}" for t, count, total in rows})
+            conn.commit()
+        finally:
+            conn.close()
+
+        if names is None:
+            names = sorted(hashes)
+        text = '\n'.join(f"{t}:{hashes.get(t, '-')}" for t in names)
+        return {
+            'id': int(row[0]) if row else 0,
+            'digest': hashlib.sha256(text.encode('utf-8')).hexdigest(),
+            'tickers': sum(t in hashes for t in names),
+        }
+
+    # -------------------------------------------------------------------------
+    # Download Queue Methods
+    # -------------------------------------------------------------------------
+
+    def enqueue_download_jobs(self, tickers, start_date, end_date, refresh_seconds=3600):
+        """
+        Register fetch jobs for tickers. Existing jobs for the same range are kept
+        as-is (DONE jobs are not redone, PENDING/RUNNING jobs are not duplicated).
+        FAILED jobs are re-queued.
+        DONE jobs that finished on or before their end date (the last day may have
+        been partial or not yet published) are re-queued once they are older than
+        `refresh_seconds`.
+        """
+        if not tickers:
+            return
+
+        conn = self.get_connection()
+        try:
+            now = datetime.datetime.now()
+            cutoff = (now - datetime.timedelta(seconds=refresh_seconds)).strftime('%Y-%m-%d %H:%M:%S')
+            now = now.strftime('%Y-%m-%d %H:%M:%S')
+            start_str, end_str = str(start_date)[:10], str(end_date)[:10]
+            cursor = conn.cursor()
+            cursor.executemany('''
+                INSERT INTO download_jobs (ticker, start_date, end_date, status, attempts, updated_at)
+                VALUES (?, ?, ?, 'PENDING', 0, ?)
+                ON CONFLICT(ticker, start_date, end_date) DO UPDATE SET
+                    status = 'PENDING', attempts = 0, error = NULL, updated_at = excluded.updated_at
+                WHERE download_jobs.status = 'FAILED'
+                   OR (download_jobs.status = 'DONE' AND download_jobs.end_date >= substr(download_jobs.updated_at, 1, 10)
+                       AND download_jobs.updated_at < ?)
+            ''', [(t, start_str, end_str, now, cutoff) for t in tickers])
+            conn.commit()
+        except Exception as e:
+            print(f"[DB] Error enqueuing download jobs: {e}")
+            conn.rollback()
+        finally:
+            conn.close()
+
+    def claim_download_jobs(self, limit=10):
+        """
+        Atomically pick up to `limit` PENDING jobs and mark them RUNNING.
+        Returns: [(ticker, start_date, end_date)]
+        """
+        conn = self.get_connection()
+        try:
+            cursor = conn.cursor()
+            cursor.execute('BEGIN IMMEDIATE')
+            cursor.execute('''
+                SELECT ticker, start_date, end_date FROM download_jobs
+                WHERE status = 'PENDING'
+                ORDER BY updated_at, ticker
+                LIMIT ?
+            ''', (limit,))
+            jobs = cursor.fetchall()
+
+            now = datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+            cursor.executemany('''
+                UPDATE download_jobs SET status = 'RUNNING', attempts = attempts + 1, updated_at = ?
+                WHERE ticker = ? AND start_date = ? AND end_date = ?
+            ''', [(now, *job) for job in jobs])
+            conn.commit()
+            return jobs
+        except Exception as e:
+            print(f"[DB] Error claiming download jobs: {e}")
+            conn.rollback()
+            return []
+        finally:
+            conn.close()
+
+    def finish_download_job(self, ticker, start_date, end_date, has_data=False, error=None, max_attempts=3):
+        """
+        Mark a RUNNING job as DONE, or on error send it back to PENDING until
+        `max_attempts` is reached (then FAILED).
+        """
+        conn = self.get_connection()
+        try:
+            now = datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+            cursor = conn.cursor()
+            if error is None:
+                cursor.execute('''
+                    UPDATE download_jobs SET status = 'DONE', has_data = ?, error = NULL, updated_at = ?
+                    WHERE ticker = ? AND start_date = ? AND end_date = ?
+                ''', (int(bool(has_data)), now, ticker, start_date, end_date))
+            else:
+                cursor.execute('''
+                    UPDATE download_jobs
+                    SET status = CASE WHEN attempts >= ? THEN 'FAILED' ELSE 'PENDING' END,
+                        error = ?, updated_at = ?
+                    WHERE ticker = ? AND start_date = ? AND end_date = ?
+                ''', (max_attempts, str(error)[:500], now, ticker, start_date, end_date))
+            conn.commit()
+        except Exception as e:
+            print(f"[DB] Error finishing download job for {ticker}: {e}")
+            conn.rollback()
+        finally:
+            conn.close()
+
+    def requeue_stale_download_jobs(self, stale_seconds=300):
+        """
+        RUNNING jobs left behind by a dead process (no update for `stale_seconds`)
+        are put back to PENDING.
+        """
+        conn = self.get_connection()
+        try:
+            cutoff = (datetime.datetime.now() - datetime.timedelta(seconds=stale_seconds)).strftime('%Y-%m-%d %H:%M:%S')
+            cursor = conn.cursor()
+            cursor.execute('''
+                UPDATE download_jobs SET status = 'PENDING'
+                WHERE status = 'RUNNING' AND updated_at < ?
+            ''', (cutoff,))
+            conn.commit()
+            return cursor.rowcount
+        except Exception as e:
+            print(f"[DB] Error requeuing stale download jobs: {e}")
+            conn.rollback()
+            return 0
+        finally:
+            conn.close()
+
+    def get_download_job_status(self, tickers, start_date, end_date):
+        """
+        Returns: {ticker: status} for jobs of the given range.
+        """
+        if not tickers:
+            return {}
+
+        conn = self.get_connection()
+        try:
+            placeholders = ','.join(['?'] * len(tickers))
+            cursor = conn.cursor()
+            cursor.execute(f'''
+                SELECT ticker, status FROM download_jobs
+                WHERE start_date = ? AND end_date = ? AND ticker IN ({placeholders})
+            ''', [str(start_date)[:10], str(end_date)[:10], *tickers])
+            return dict(cursor.fetchall())
+        except Exception as e:
+            print(f"[DB] Error loading download job status: {e}")
+            return {}
+        finally:
+            conn.close()
+
+    def count_pending_download_jobs(self):
+        """
+        Number of jobs still waiting or in progress (all ranges).
+        """
+        conn = self.get_connection()
+        try:
+            cursor = conn.cursor()
+            cursor.execute("SELECT COUNT(*) FROM download_jobs WHERE status IN ('PENDING', 'RUNNING')")
+            return cursor.fetchone()[0]
+        except Exception as e:
+            print(f"[DB] Error counting download jobs: {e}")
+            return 0
+        finally:
+            conn.close()
+
+    # -------------------------------------------------------------------------
+    # Stock Listing Cache Methods
+    # -------------------------------------------------------------------------
+
+    def save_stock_listing(self, market, df, source, complete=True):
+        """
+        Replace the cached listing of a market. df must be sorted by market cap (desc).
+        """
+        if df is None or df.empty:
+            return
+
+        conn = self.get_connection()
+        try:
+            fetched_at = datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+            rows = [
+                (market, str(code), str(name), None if pd.isna(marcap) else float(marcap), rank, source, int(bool(complete)), fetched_at)
+                for rank, (code, name, marcap) in enumerate(zip(df['Code'], df['Name'], df['Marcap']))
+            ]
+            cursor = conn.cursor()
+            cursor.execute("DELETE FROM stock_listing WHERE market = ?", (market,))
+            cursor.executemany('''
+                INSERT OR REPLACE INTO stock_listing (market, code, name, marcap, rank, source, complete, fetched_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            ''', rows)
+            conn.commit()
+        except Exception as e:
+            print(f"[DB] Error saving stock listing for {market}: {e}")
+            conn.rollback()
+        finally:
+            conn.close()
+
+    def load_stock_listing(self, market, max_age_hours=24):
+        """
+        Load the cached listing of a market.
+        Returns: (DataFrame[Code, Name, Marcap] or None, is_fresh)
+        df.attrs['complete'] tells whether the whole market was stored.
+        """
+        conn = self.get_connection()
+        try:
+            df = pd.read_sql('''
+                SELECT code AS Code, name AS Name, marcap AS Marcap, complete, fetched_at
+                FROM stock_listing WHERE market = ? ORDER BY rank
+            ''', conn, params=[market])
+            if df.empty:
+                return None, False
+
+            fetched_at = pd.to_datetime(df['fetched_at'].iloc[0])
+            is_fresh = (datetime.datetime.now() - fetched_at) < datetime.timedelta(hours=max_age_hours)
+            complete = bool(df['complete'].iloc[0])
+
+            df = df[['Code', 'Name', 'Marcap']]
+            df.attrs['complete'] = complete
+            return df, is_fresh
+        except Exception as e:
+            print(f"[DB] Error loading stock listing for {market}: {e}")
+            return None, False
+        finally:
+            conn.close()
+
+    def save_etf_holdings(self, etf_ticker, as_of, holdings):
+        """
+        Replace the holdings of an ETF on a given date. holdings must be sorted by weight (desc).
+        :param holdings: [{'ticker', 'name', 'weight'}]
+        """
+        conn = self.get_connection()
+        try:
+            fetched_at = datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+            rows = [
+                (etf_ticker, str(as_of), rank, h['ticker'], h['name'], float(h['weight']), fetched_at)
+                for rank, h in enumerate(holdings)
+            ]
+            cursor = conn.cursor()
+            cursor.execute("DELETE FROM etf_holdings WHERE etf_ticker = ? AND as_of = ?", (etf_ticker, str(as_of)))
+            cursor.executemany('''
+                INSERT INTO etf_holdings (etf_ticker, as_of, rank, ticker, name, weight, fetched_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+            ''', rows)
+            conn.commit()
+        except Exception as e:
+            print(f"[DB] Error saving ETF holdings for {etf_ticker}: {e}")
+            conn.rollback()
+        finally:
+            conn.close()
+
+    def load_etf_holdings(self, etf_ticker, as_of=None):
+        """
+        as_of 이전(포함) 가장 최근 기준일의 ETF 구성 종목.
+        Returns: (DataFrame[ticker, name, weight] (비중 내림차순) or None, fetched_at datetime or None)
+        df.attrs['as_of'] is the holdings date.
+        """
+        conn = self.get_connection()
+        try:
+            df = pd.read_sql('''
+                SELECT ticker, name, weight, as_of, fetched_at FROM etf_holdings
+                WHERE etf_ticker = ? AND as_of = (
+                    SELECT MAX(as_of) FROM etf_holdings WHERE etf_ticker = ? AND as_of <= ?
+                )
+                ORDER BY rank
+            ''', conn, params=[etf_ticker, etf_ticker, str(as_of) if as_of is not None else '9999-12-31'])
+            if df.empty:
+                return None, None
+
+            fetched_at = pd.to_datetime(df['fetched_at'].iloc[0]).to_pydatetime()
+            as_of_date = df['as_of'].iloc[0]
+            df = df[['ticker', 'name', 'weight']]
+            df.attrs['as_of'] = as_of_date
+            return df, fetched_at
+        except Exception as e:
+            print(f"[DB] Error loading ETF holdings for {etf_ticker}: {e}")
+            return None, None
+        finally:
+            conn.close()
+
+    def get_etf_holdings_fetched_at(self):
+        """
+        ETF별 마지막 PDF 수집 시각 {etf_ticker: datetime}
+        """
+        conn = self.get_connection()
+        try:
+            rows = conn.execute("SELECT etf_ticker, MAX(fetched_at) FROM etf_holdings GROUP BY etf_ticker").fetchall()
+            return {etf: pd.to_datetime(ts).to_pydatetime() for etf, ts in rows}
+        except Exception as e:
+            print(f"[DB] Error loading ETF holdings status: {e}")
+            return {}
+        finally:
+            conn.close()
+
+    # -------------------------------------------------------------------------
+    # Full-Market (Columnar) Methods
+    # -------------------------------------------------------------------------
+
+    def get_market_data_coverage(self, tickers=None):
+        """
+        티커별 저장 구간 (전체 데이터를 읽지 않고 staleness 판단용)
+        Returns: {ticker: (first_date, last_date)} (YYYY-MM-DD 문자열)
+        """
+        conn = self.get_connection()
+        try:
+            cursor = conn.cursor()
+            if tickers is None:
+                cursor.execute("SELECT ticker, MIN(date), MAX(date) FROM market_data GROUP BY ticker")
+                return {t: (first, last) for t, first, last in cursor.fetchall()}
+
+            coverage = {}
+            tickers = list(tickers)
+            for i in range(0, len(tickers), 500):
+                chunk = tickers[i:i + 500]
+                placeholders = ','.join(['?'] * len(chunk))
+                cursor.execute(f'''
+                    SELECT ticker, MIN(date), MAX(date) FROM market_data
+                    WHERE ticker IN ({placeholders}) GROUP BY ticker
+                ''', chunk)
+                coverage.update({t: (first, last) for t, first, last in cursor.fetchall()})
+            return coverage
+        except Exception as e:
+            print(f"[DB] Error loading market data coverage: {e}")
+            return {}
+        finally:
+            conn.close()
+
+    def get_latest_bars(self, tickers, as_of=None):
+        """
+        티커별 as_of 이전(포함) 마지막 봉. 티커마다 (ticker, date) PK 인덱스에서 MAX(date) 1건만 찾으므로
+        저장된 기간 길이와 무관하게 빠름.
+        :param as_of: 기준일 (None이면 저장된 마지막 봉)
+        Returns: DataFrame (index=ticker, columns=[date, close, stale_days]). 데이터 없는 티커는 제외
+        """
+        as_of = str(pd.to_datetime(as_of).date()) if as_of is not None else '9999-12-31'
+        conn = self.get_connection()
+        try:
+            rows = []
+            tickers = list(dict.fromkeys(tickers))
+            for i in range(0, len(tickers), 500):
+                chunk = tickers[i:i + 500]
+                values = ','.join(['(?)'] * len(chunk))
+                rows += conn.execute(f'''
+                    WITH t(ticker) AS (VALUES {values})
+                    SELECT m.ticker, m.date, m.close FROM t
+                    JOIN market_data m ON m.ticker = t.ticker
+                     AND m.date = (SELECT MAX(date) FROM market_data WHERE ticker = t.ticker AND date <= ?)
+                ''', [*chunk, as_of]).fetchall()
+        except Exception as e:
+            print(f"[DB] Error loading latest bars: {e}")
+            rows = []
+        finally:
+            conn.close()
+
+        df = pd.DataFrame(rows, columns=['ticker', 'date', 'close']).set_index('ticker')
+        df['date'] = pd.to_datetime(df['date'])
+        reference = pd.Timestamp(as_of) if as_of != '9999-12-31' else pd.Timestamp(datetime.date.today())
+        df['stale_days'] = (reference - df['date']).dt.days
+        return df
+
+    def list_market_tickers(self):
+        """
+        market_data에 저장된 전체 티커 (PK 인덱스 skip-scan, 티커 수만큼만 탐색)
+        """
+        conn = self.get_connection()
+        try:
+            rows = conn.execute('''
+                WITH RECURSIVE t(ticker) AS (
+                    SELECT MIN(ticker) FROM market_data
+                    UNION ALL
+                    SELECT (SELECT MIN(ticker) FROM market_data WHERE ticker > t.ticker) FROM t WHERE t.ticker IS NOT NULL
+                )
+                SELECT ticker FROM t WHERE ticker IS NOT NULL
+            ''').fetchall()
+            return [r[0] for r in rows]
+        finally:
+            conn.close()
+
+    def get_trading_days(self, after, until=None, tickers=None):
+        """
+        after < date <= until 구간에 봉이 있는 거래일 (티커별 PK 인덱스 범위 탐색 -> 저장된 전체 이력 길이와 무관)
+        :param tickers: 대상 티커 (기본: 저장된 전체 티커)
+        Returns: DatetimeIndex (오름차순)
+        """
+        after = str(pd.to_datetime(after).date()) if after is not None else ''
+        until = str(pd.to_datetime(until).date()) if until is not None else '9999-12-31'
+        tickers = list(dict.fromkeys(tickers)) if tickers is not None else self.list_market_tickers()
+        conn = self.get_connection()
+        try:
+            dates = set()
+            for i in range(0, len(tickers), 500):
+                chunk = tickers[i:i + 500]
+                values = ','.join(['(?)'] * len(chunk))
+                dates.update(r[0] for r in conn.execute(f'''
+                    WITH t(ticker) AS (VALUES {values})
+                    SELECT DISTINCT m.date FROM t
+                    JOIN market_data m ON m.ticker = t.ticker AND m.date > ? AND m.date <= ?
+                ''', [*chunk, after, until]))
+        finally:
+            conn.close()
+        return pd.DatetimeIndex(sorted(dates))
+
+    def load_tail_window(self, tickers, as_of, depth, offsets=()):
+        """
+        티커별 as_of 이전(포함) 최근 depth개 봉 + 더 과거 offsets번째 봉의 종가만 로드 (스캐너용).
+        티커마다 PK 인덱스에서 자기 거래일 기준으로 찾으므로 전체 이력/패널을 읽지 않음.
+        :param depth: 최근 봉 수
+        :param offsets: 추가로 필요한 과거 종가 위치 (0 = 마지막 봉, k = iloc[-1-k])
+        Returns: {'close', 'amount': DataFrame(index=위치 -depth+1..0, columns=tickers),
+                  'last_date': Series(ticker -> 마지막 봉 날짜), 'close_at': DataFrame(index=tickers, columns=offsets)}
+                 데이터 없는 티커는 제외, 이력이 짧으면 앞쪽이 NaN
+        """
+        as_of = str(pd.to_datetime(as_of).date())
+        tickers = list(dict.fromkeys(tickers))
+        offsets = [int(k) for k in offsets]
+        conn = self.get_connection()
+        try:
+            rows, extra = [], []
+            offset_cols = ''.join(
+                f", (SELECT close FROM market_data WHERE ticker = t.ticker AND date <= ? ORDER BY date DESC LIMIT 1 OFFSET {k})"
+                for k in offsets
+            )
+            for i in range(0, len(tickers), 500):
+                chunk = tickers[i:i + 500]
+                values = ','.join(['(?)'] * len(chunk))
+                rows += conn.execute(f'''
+                    WITH t(ticker) AS (VALUES {values}),
+                    b AS (
+                        SELECT ticker, (SELECT date FROM market_data WHERE ticker = t.ticker AND date <= ?
+                                        ORDER BY date DESC LIMIT 1 OFFSET {int(depth) - 1}) AS first FROM t
+                    )
+                    SELECT m.ticker, m.date, m.close, m.amount FROM b
+                    JOIN market_data m ON m.ticker = b.ticker AND m.date >= COALESCE(b.first, '') AND m.date <= ?
+                ''', [*chunk, as_of, as_of]).fetchall()
+                if offsets:
+                    extra += conn.execute(f"WITH t(ticker) AS (VALUES {values}) SELECT ticker{offset_cols} FROM t",
+                                          [*chunk, *([as_of] * len(offsets))]).fetchall()
+        finally:
+            conn.close()
+
+        # 티커/날짜 순 정렬 후 티커별 끝에서부터의 위치로 배열에 채움 (문자열 Series 연산 없이 numpy로)
+        window = {}
+        if rows:
+            row_tickers, row_dates, row_close, row_amount = zip(*rows)
+        else:
+            row_tickers, row_dates, row_close, row_amount = (), (), (), ()
+        codes = pd.Index(tickers).get_indexer(list(row_tickers))
+        dates = np.array(row_dates, dtype='datetime64[D]')
+        order = np.lexsort((dates, codes))
+        codes, dates = codes[order], dates[order]
+        counts = np.bincount(codes, minlength=len(tickers))
+        group_start = np.concatenate([[0], np.cumsum(counts)[:-1]])
+        # 0 = 마지막 봉, -1 = 그 전 봉 ...
+        pos = depth - counts[codes] + (np.arange(len(codes)) - group_start[codes])
+        has_data = counts > 0
+        present = [t for t, ok in zip(tickers, has_data) if ok]
+        col = np.cumsum(has_data)[codes] - 1
+        for name, values in (('close', row_close), ('amount', row_amount)):
+            grid = np.full((depth, len(present)), np.nan)
+            grid[pos, col] = np.asarray(values, dtype=float)[order]
+            window[name] = pd.DataFrame(grid, index=range(-depth + 1, 1), columns=present)
+        last_idx = (group_start + counts - 1)[has_data]
+        window['last_date'] = pd.Series(pd.to_datetime(dates[last_idx]), index=present, name='date')
+        close_at = pd.DataFrame(extra, columns=['ticker', *offsets]).set_index('ticker') if offsets else pd.DataFrame(index=present)
+        window['close_at'] = close_at.reindex(present).astype(float)
+        return window
+
+    def filter_liquid_tickers(self, tickers, start_date, end_date, min_amount, window=20, from_date=None):
+        """
+        SQL 단계 유동성 사전 필터.
+        [from_date, end_date] 안에서 window일 평균 거래대금이 한 번이라도 min_amount 이상인 티커만 반환.
+        (한 번도 통과하지 못하는 종목은 랭킹 후보가 될 수 없으므로 백테스트 결과에 영향 없음)
+        입력 순서를 유지하여 반환.
+        """
+        conn = self.get_connection()
+        try:
+            cursor = conn.cursor()
+            liquid = set()
+            tickers = list(tickers)
+            from_str = str(from_date or start_date)[:10]
+            # 부동소수 합산 순서 차이로 경계값이 빠지지 않도록 약간 느슨하게 (사전 필터이므로 안전)
+            threshold = min_amount * (1 - 1e-9)
+            for i in range(0, len(tickers), 500):
+                chunk = tickers[i:i + 500]
+                placeholders = ','.join(['?'] * len(chunk))
+                cursor.execute(f'''
+                    SELECT DISTINCT ticker FROM (
+                        SELECT ticker, date,
+                               AVG(amount) OVER w AS amount_ma,
+                               COUNT(amount) OVER w AS n
+                        FROM market_data
+                        WHERE ticker IN ({placeholders}) AND date >= ? AND date <= ?
+                        WINDOW w AS (PARTITION BY ticker ORDER BY date ROWS BETWEEN {int(window) - 1} PRECEDING AND CURRENT ROW)
+                    )
+                    WHERE n = ? AND amount_ma >= ? AND date >= ?
+                ''', [*chunk, str(start_date), str(end_date), int(window), threshold, from_str])
+                liquid.update(row[0] for row in cursor.fetchall())
+            return [t for t in tickers if t in liquid]
+        except Exception as e:
+            print(f"[DB] Error filtering liquid tickers: {e}")
+            return list(tickers)
+        finally:
+            conn.close()
+
+    def load_market_panel(self, tickers, start_date=None, end_date=None, columns=('close', 'amount'), chunk_size=250):
+        """
+        여러 티커의 특정 컬럼을 (날짜 x 티커) 와이드 패널로 로드.
+        티커별 DataFrame을 만들지 않고 청크 단위로 pivot하여 메모리 피크를 제한.
+        Returns: {column: DataFrame(index=Date, columns=tickers)}
+        """
+        conn = self.get_connection()
+        try:
+            pieces = {col: [] for col in columns}
+            tickers = list(tickers)
+            select_cols = ', '.join(columns)
+            for i in range(0, len(tickers), chunk_size):
+                chunk = tickers[i:i + chunk_size]
+                placeholders = ','.join(['?'] * len(chunk))
+                query = f"SELECT ticker, date, {select_cols} FROM market_data WHERE ticker IN ({placeholders})"
+                params = list(chunk)
+                # 구간 비교는 load_market_data_bulk와 동일하게 (같은 행 집합을 보장)
+                if start_date:
+                    query += " AND date >= ?"
+                    params.append(str(start_date))
+                if end_date:
+                    query += " AND date <= ?"
+                    params.append(str(end_date))
+
+                df = pd.read_sql(query, conn, params=params)
+                if df.empty:
+                    continue
+                df['date'] = pd.to_datetime(df['date'])
+                for col in columns:
+                    pieces[col].append(df.pivot(index='date', columns='ticker', values=col))
+
+            panels = {}
+            for col in columns:
+                if pieces[col]:
+                    panel = pd.concat(pieces[col], axis=1).sort_index()
+                    # 입력 티커 순서 유지 (랭킹 동점 처리 순서)
+                    panel = panel[[t for t in tickers if t in panel.columns]]
+                else:
+                    panel = pd.DataFrame()
+                panel.index.name = 'Date'
+                panel.columns.name = None
+                panels[col] = panel
+            return panels
+        except Exception as e:
+            print(f"[DB] Error loading market panel: {e}")
+            return {col: pd.DataFrame() for col in columns}
+        finally:
+            conn.close()
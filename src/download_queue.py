@@ -0,0 +1,115 @@
+import threading
+import time
+import concurrent.futures
+
+
+class DownloadWorker:
+    def __init__(self, db, fetch_fn, max_workers=10, poll_interval=1.0, idle_timeout=60.0):
+        """
+        download_jobs 테이블을 계속 비워 나가는 백그라운드 워커.
+        프로세스 안에서 하나만 떠 있으면 되므로 get_download_worker()로 얻어서 사용.
+        :param db: DBManager
+        :param fetch_fn: fetch_fn(ticker, start_date, end_date) -> bool (데이터 저장 여부)
+        :param max_workers: 동시 다운로드 스레드 수
+        :param poll_interval: 큐가 비었을 때 재확인 주기 (초)
+        :param idle_timeout: 큐가 이 시간 동안 비어 있으면 스레드 종료 (다음 enqueue 시 재시작)
+        """
+        self.db = db
+        self.fetch_fn = fetch_fn
+        self.max_workers = max_workers
+        self.poll_interval = poll_interval
+        self.idle_timeout = idle_timeout
+
+        self._thread = None
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+
+    def start(self):
+        """
+        워커 스레드 기동 (이미 동작 중이면 깨우기만 함)
+        """
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                self._wake.set()
+                return
+            # 이전 프로세스가 죽으면서 남긴 RUNNING 작업 회수
+            self.db.requeue_stale_download_jobs()
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="download-worker", daemon=True)
+            self._thread.start()
+
+    def stop(self, timeout=None):
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def is_running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def _run(self):
+        idle_since = time.monotonic()
+        in_flight = set()
+        with concurrent.futures.ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            while not self._stop.is_set():
+                # 빈 슬롯만큼만 새 작업을 가져옴 (느린 티커 하나가 배치 전체를 막지 않도록)
+                free_slots = self.max_workers - len(in_flight)
+                if free_slots > 0:
+                    for job in self.db.claim_download_jobs(limit=free_slots):
+                        in_flight.add(executor.submit(self._process, job))
+
+                if in_flight:
+                    _, in_flight = concurrent.futures.wait(
+                        in_flight, timeout=self.poll_interval,
+                        return_when=concurrent.futures.FIRST_COMPLETED
+                    )
+                    idle_since = time.monotonic()
+                    continue
+
+                if time.monotonic() - idle_since > self.idle_timeout:
+                    break
+                self._wake.wait(self.poll_interval)
+                self._wake.clear()
+
+    def _process(self, job):
+        ticker, start_date, end_date = job
+        try:
+            has_data = self.fetch_fn(ticker, start_date, end_date)
+            self.db.finish_download_job(ticker, start_date, end_date, has_data=has_data)
+        except Exception as e:
+            print(f"[DownloadWorker] Error downloading {ticker}: {e}")
+            self.db.finish_download_job(ticker, start_date, end_date, error=e)
+
+    def wait_for(self, tickers, start_date, end_date, timeout=30.0, poll_interval=0.5):
+        """
+        주어진 티커들의 작업이 모두 끝날 때까지(또는 timeout까지) 대기.
+        timeout 후에도 작업은 백그라운드에서 계속 진행됨.
+        Returns: {ticker: status}
+        """
+        deadline = time.monotonic() + timeout
+        while True:
+            status = self.db.get_download_job_status(tickers, start_date, end_date)
+            pending = [t for t in tickers if status.get(t) in ('PENDING', 'RUNNING')]
+            if not pending or time.monotonic() >= deadline:
+                return status
+            if not self.is_running():
+                self.start()
+            time.sleep(min(poll_interval, max(deadline - time.monotonic(), 0)))
+
+
+# 프로세스 전역 워커 레지스트리 (Streamlit rerun 사이에도 모듈 상태는 유지됨)
+_WORKERS = {}
+_WORKERS_LOCK = threading.Lock()
+
+
+def get_download_worker(db, fetch_fn, max_workers=10):
+    """
+    DB 파일 경로별로 하나의 DownloadWorker를 공유
+    """
+    with _WORKERS_LOCK:
+        worker = _WORKERS.get(db.db_path)
+        if worker is None:
+            worker = DownloadWorker(db, fetch_fn, max_workers=max_workers)
+            _WORKERS[db.db_path] = worker
+        return worker
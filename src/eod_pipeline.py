@@ -0,0 +1,235 @@
+import os
+import json
+import time
+import queue
+import threading
+import contextlib
+import concurrent.futures
+import pandas as pd
+from datetime import timedelta
+from .cache import make_key
+from .backtester import Backtester
+from .scanner import SignalScanner, scan_result_to_dict, RS_PERIODS
+
+
+class EODPipeline:
+    def __init__(self, loader, tickers=None, strategy_params=None, universe_params=None, portfolio=None,
+                 report_dir='reports', max_workers=8, batch_size=200):
+        """
+        장 마감 후 일괄 처리: 유니버스 -> 누락분(delta) 다운로드 -> 증분 지표 -> 랭킹 -> 신호 스캔 -> 리포트/스냅샷.
+        - 다운로드(스레드 풀)와 지표 계산(별도 스레드, 티커 묶음 벡터 연산)이 큐로 연결되어 겹쳐서 진행
+        - 지표는 eod_indicators 테이블에 티커별 마지막 봉 기준으로 유지하고, 새 봉이 들어온 티커만 다시 계산
+        - 랭킹/매수 판정은 SignalScanner(= Backtester와 같은 기준), 매도는 check_sell_signal 그대로
+        :param loader: DataLoader (db, get_universe_tickers, _download_range 사용)
+        :param tickers: 대상 종목 (기본: universe_params로 loader.get_universe_tickers)
+        :param universe_params: {'mode', 'kospi_n', 'kosdaq_n', 'full_market'} (Backtester와 동일)
+        :param portfolio: 보유 종목 {ticker: {'qty', 'avg_price', 'buy_date'}} (매도 판정용)
+        :param report_dir: 리포트 저장 폴더 (None이면 파일 저장 안 함)
+        :param max_workers: 동시 다운로드 수
+        :param batch_size: 지표 계산 한 번에 묶는 최대 티커 수
+        """
+        self.loader = loader
+        self.db = loader.db
+        self.tickers = list(tickers) if tickers is not None else None
+        self.names = {}
+        self.universe_params = universe_params or {'kospi_n': 200, 'kosdaq_n': 50}
+        self.portfolio = portfolio or {}
+        self.report_dir = report_dir
+        self.max_workers = max_workers
+        self.batch_size = batch_size
+        self.scanner = SignalScanner(self.db, strategy_params, {'mode': self.universe_params.get('mode', 'STOCK')})
+        # latest_indicators 결과에 영향을 주는 파라미터
+        self.params_key = make_key('eod_indicators', {k: getattr(self.scanner.strategy, k) for k in Backtester.INDICATOR_PARAMS})
+
+    def history_days(self):
+        """
+        신규 종목 첫 다운로드 기간 (달력일). 12개월 RS(RS_PERIODS[-1] + 1봉)와 매도 판정에 필요한 봉 수를
+        공휴일 여유를 두고 달력일로 환산 (연 ~245거래일 -> 1.5배 + 30일, 최소 400일)
+        """
+        s = self.scanner.strategy
+        bars = max(RS_PERIODS[-1] + 1, s.ma_long, s.ma_short + 2, s.signal_lookback_bars())
+        return max(400, int(bars * 1.5) + 30)
+
+    @contextlib.contextmanager
+    def _stage(self, name, timings):
+        t0 = time.perf_counter()
+        yield
+        timings[name] = time.perf_counter() - t0
+        print(f"[EOD] {name}: {timings[name]:.2f}s")
+
+    def _universe(self):
+        if self.tickers is not None:
+            return self.tickers
+        mode = self.universe_params.get('mode', 'STOCK')
+        kospi_n = self.universe_params.get('kospi_n', 200)
+        kosdaq_n = self.universe_params.get('kosdaq_n', 50)
+        if mode == 'STOCK' and self.universe_params.get('full_market', False):
+            kospi_n, kosdaq_n = None, None
+        self.names = self.loader.get_universe_tickers(kospi_n=kospi_n, kosdaq_n=kosdaq_n, mode=mode)
+        return list(self.names)
+
+    def run(self, as_of=None):
+        """
+        :param as_of: 기준일 (기본: 오늘)
+        Returns: scan() 결과 dict + {'timings', 'fetched', 'computed', 'errors', 'report_path'}
+        """
+        timings = {}
+        t_start = time.perf_counter()
+        as_of = pd.Timestamp(as_of if as_of is not None else pd.Timestamp.today()).normalize()
+
+        with self._stage('universe', timings):
+            tickers = self._universe()
+
+        with self._stage('delta_check', timings):
+            latest = self.db.get_latest_bars(tickers, as_of)['date']
+            cached = self.db.load_eod_indicators(self.params_key)
+            # 주말 실행 시 직전 금요일까지 있으면 최신으로 간주 (공휴일은 다운로드 결과가 비어서 그대로 넘어감)
+            target = pd.offsets.BDay().rollback(as_of)
+            # 로더 웜업(시작일 - 365일)은 250거래일이 안 되므로 랭킹에 필요한 이력 기준으로 받음
+            history_start = min(pd.Timestamp(self.loader.data_start_date), as_of - timedelta(days=self.history_days()))
+            fetch = {}
+            for t in tickers:
+                if t not in latest.index:
+                    fetch[t] = history_start
+                elif latest[t] < target:
+                    fetch[t] = latest[t] + timedelta(days=1)
+            # 저장된 지표가 현재 마지막 봉 기준인 티커 (새 봉이 없으면 다시 계산하지 않음)
+            fresh = {t for t in latest.index.intersection(cached.index) if cached.at[t, 'Date'] == latest[t]}
+            outdated = [t for t in tickers if t not in fetch and t not in fresh]
+            print(f"[EOD] {len(tickers)} tickers: fetch {len(fetch)}, recompute {len(outdated)} (+ fetched)")
+
+        with self._stage('fetch+indicators', timings):
+            computed, fetched, errors = self._fetch_and_compute(fetch, outdated, fresh, as_of, timings)
+
+        with self._stage('rank', timings):
+            if not computed.empty:
+                self.db.save_eod_indicators(self.params_key, computed)
+            indicators = pd.concat([cached.drop(index=computed.index, errors='ignore'), computed])
+            indicators = indicators.reindex([t for t in tickers if t in indicators.index])
+            as_of, ranking = self.scanner.rank_indicators(indicators, as_of)
+
+        with self._stage('scan', timings):
+            holdings = self.scanner.check_holdings(self.portfolio, as_of, ranking)
+            buy = self.scanner.buy_from_indicators(ranking, indicators, exclude=self.portfolio)
+            result = self.scanner.combine(as_of, ranking, holdings, buy)
+
+        with self._stage('report', timings):
+            self.db.save_eod_snapshot(as_of, self.snapshot_frame(result))
+            result['report_path'] = self.write_report(result, timings) if self.report_dir else None
+
+        timings['total'] = time.perf_counter() - t_start
+        print(f"[EOD] total: {timings['total']:.2f}s ({as_of.date()}, ranked {len(ranking)}, "
+              f"buy {len(result['buy'])}, sell {len(result['sell'])})")
+        result.update({'timings': timings, 'fetched': fetched, 'computed': len(computed), 'errors': errors})
+        return result
+
+    def _fetch_and_compute(self, fetch, outdated, fresh, as_of, timings):
+        """
+        다운로드 스레드 풀 -> 큐 -> 지표 계산 스레드. 계산 스레드는 큐에 쌓인 티커를 batch_size까지 묶어 처리.
+        Returns: (계산된 지표 DataFrame, 새 봉을 받은 티커 목록, {ticker: 오류 메시지})
+        """
+        ready = queue.Queue()
+        parts, failure = [], []
+        busy = [0.0]
+
+        def compute():
+            done = False
+            while not done:
+                batch = [ready.get()]
+                while len(batch) < self.batch_size:
+                    try:
+                        batch.append(ready.get_nowait())
+                    except queue.Empty:
+                        break
+                done = None in batch
+                batch = [t for t in batch if t is not None]
+                if not batch or failure:
+                    continue
+                t0 = time.perf_counter()
+                try:
+                    parts.append(self.scanner.latest_indicators(batch, as_of))
+                except Exception as e:
+                    failure.append(e)
+                busy[0] += time.perf_counter() - t0
+
+        worker = threading.Thread(target=compute, name="eod-indicators", daemon=True)
+        worker.start()
+        for t in outdated:
+            ready.put(t)
+
+        fetched, errors = [], {}
+        t0 = time.perf_counter()
+        if fetch:
+            with concurrent.futures.ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                futures = {executor.submit(self.loader._download_range, t, start, as_of): t for t, start in fetch.items()}
+                for future in concurrent.futures.as_completed(futures):
+                    ticker = futures[future]
+                    try:
+                        df = future.result()
+                    except Exception as e:
+                        errors[ticker] = str(e)
+                        df = None
+                    if df is not None and not df.empty:
+                        fetched.append(ticker)
+                        ready.put(ticker)
+                    elif ticker not in fresh:
+                        # 새 봉은 없지만 저장된 지표가 없거나 오래된 티커
+                        ready.put(ticker)
+        timings['fetch'] = time.perf_counter() - t0
+        print(f"[EOD] fetch: {timings['fetch']:.2f}s ({len(fetched)} updated, {len(errors)} errors)")
+
+        ready.put(None)
+        worker.join()
+        timings['indicators'] = busy[0]
+        print(f"[EOD] indicators: {busy[0]:.2f}s")
+        if failure:
+            raise failure[0]
+        computed = pd.concat(parts) if parts else pd.DataFrame(columns=list(self.db.EOD_INDICATOR_COLUMNS.values()))
+        return computed, fetched, errors
+
+    @staticmethod
+    def snapshot_frame(result):
+        """
+        scan 결과 -> eod_snapshots 행 (랭킹 종목 + 랭킹 밖 보유 종목)
+        Returns: DataFrame[Rank, RS Score, Amount_MA20, Close, Signal, Reason] index=ticker
+        """
+        snapshot = result['ranking'][['Rank', 'RS Score', 'Amount_MA20', 'Close']].copy()
+        snapshot['Signal'] = ''
+        snapshot['Reason'] = ''
+        holdings = pd.concat([result['sell'], result['hold']])
+        extra = holdings.index.difference(snapshot.index)
+        if len(extra):
+            snapshot = pd.concat([snapshot, pd.DataFrame({'Close': holdings.loc[extra, 'Close'], 'Signal': '', 'Reason': ''}, index=extra)])
+        for ticker, row in result['buy'].iterrows():
+            snapshot.loc[ticker, ['Signal', 'Reason']] = ['BUY', row['Reason']]
+        for ticker, row in result['sell'].iterrows():
+            snapshot.loc[ticker, ['Signal', 'Reason']] = ['SELL', row['Reason']]
+        for ticker in result['hold'].index:
+            snapshot.loc[ticker, 'Signal'] = 'HOLD'
+        return snapshot
+
+    def write_report(self, result, timings):
+        """
+        report_dir/eod_YYYY-MM-DD.json (scan_result_to_dict + 단계별 시간) + .txt (사람이 읽는 요약)
+        Returns: JSON 파일 경로
+        """
+        os.makedirs(self.report_dir, exist_ok=True)
+        date = str(pd.Timestamp(result['as_of']).date())
+        base = os.path.join(self.report_dir, f"eod_{date}")
+        payload = {**scan_result_to_dict(result), 'timings': {k: round(v, 3) for k, v in timings.items()}}
+        with open(base + '.json', 'w', encoding='utf-8') as f:
+            json.dump(payload, f, ensure_ascii=False, indent=2)
+
+        fmt = lambda v: f"{v:,.2f}"
+        lines = [f"=== EOD Report {date} ===",
+                 f"RS 상위 {len(result['ranking'])}종목, 보유 {len(self.portfolio)}종목, 매도 후 빈 슬롯 {result['slots']}개"]
+        for title in ('sell', 'hold', 'buy'):
+            df = result[title]
+            lines.append(f"\n[{title.upper()}] {len(df)}건")
+            if not df.empty:
+                names = df.index.map(lambda t: self.names.get(t, ''))
+                lines.append(df.assign(Name=names).to_string(float_format=fmt))
+        lines.append("\n" + ", ".join(f"{k} {v:.2f}s" for k, v in timings.items()))
+        with open(base + '.txt', 'w', encoding='utf-8') as f:
+            f.write("\n".join(lines) + "\n")
+        return base + '.json'
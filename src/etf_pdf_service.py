@@ -0,0 +1,163 @@
+import time
+import datetime
+import threading
+import concurrent.futures
+from .constants import TIGER_ETF_UNIVERSE
+
+TIGER_PDF_URL = "https://www.tigeretf.com/ko/api/etf/pdf.do?etfTicker={ticker}"
+TIGER_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+}
+
+
+def isin_to_code(isin):
+    """
+    한국 ISIN(KR7005930003) -> 종목코드(005930). 그 외 형식은 끝 6자리
+    """
+    isin = (isin or '').strip()
+    if len(isin) == 12 and isin.startswith('KR'):
+        return isin[3:9]
+    return isin[-6:]
+
+
+def universe_etf_tickers():
+    return [item['ticker'] for items in TIGER_ETF_UNIVERSE.values() for item in items]
+
+
+class EtfPdfService:
+    def __init__(self, db, max_age_hours=24, max_workers=8, request_timeout=10, retry_interval=300):
+        """
+        TIGER ETF 구성 종목(PDF) 서비스.
+        - 유니버스 전체 ETF를 동시에 조회하여 etf_holdings 테이블에 날짜별로 저장 (이력 유지)
+        - 조회는 항상 DB에서 즉시 반환. 없거나 오래된 경우 백그라운드 갱신만 요청
+        :param db: DBManager
+        :param max_age_hours: 저장된 PDF 유효 시간. 지나면 백그라운드에서 갱신
+        :param max_workers: 동시 API 요청 수
+        :param request_timeout: 개별 HTTP 요청 timeout (초)
+        :param retry_interval: 백그라운드 갱신 최소 간격 (초). API 장애 시 rerun마다 재요청하지 않도록
+        """
+        self.db = db
+        self.max_age_hours = max_age_hours
+        self.max_workers = max_workers
+        self.request_timeout = request_timeout
+        self.retry_interval = retry_interval
+        self._last_refresh = None # time.monotonic()
+        self._refresh_thread = None
+        self._lock = threading.Lock()
+
+    def get_holdings(self, etf_ticker, top_n=10):
+        """
+        가장 최근 저장된 구성 종목 (비중 내림차순). API를 기다리지 않음.
+        Returns: [{'ticker', 'name', 'weight'}] (아직 수집 전이면 [])
+        """
+        df, fetched_at = self.db.load_etf_holdings(etf_ticker)
+        if df is None or self._is_expired(fetched_at):
+            self.refresh_in_background()
+        if df is None:
+            return []
+        rows = df if top_n is None else df.head(top_n)
+        return rows[['ticker', 'name', 'weight']].to_dict(orient='records')
+
+    def ensure_fresh(self):
+        """
+        저장된 PDF가 없거나 오래된 ETF가 있으면 백그라운드 갱신 시작 (화면 진입 시 호출)
+        """
+        fetched = self.db.get_etf_holdings_fetched_at()
+        if any(t not in fetched or self._is_expired(fetched[t]) for t in universe_etf_tickers()):
+            self.refresh_in_background()
+
+    def is_refreshing(self):
+        return self._refresh_thread is not None and self._refresh_thread.is_alive()
+
+    def _is_expired(self, fetched_at):
+        if fetched_at is None:
+            return True
+        return datetime.datetime.now() - fetched_at >= datetime.timedelta(hours=self.max_age_hours)
+
+    def refresh_in_background(self, etf_tickers=None, force=False):
+        """
+        전체(또는 지정) ETF PDF 갱신을 백그라운드 스레드로 실행
+        (이미 실행 중이거나 retry_interval 안에 시도했으면 무시, force=True면 간격 무시)
+        """
+        with self._lock:
+            if self.is_refreshing():
+                return
+            now = time.monotonic()
+            if not force and self._last_refresh is not None and now - self._last_refresh < self.retry_interval:
+                return
+            self._last_refresh = now
+            self._refresh_thread = threading.Thread(
+                target=self.refresh_all, args=(etf_tickers,), name="etf-pdf-refresh", daemon=True
+            )
+            self._refresh_thread.start()
+
+    def refresh_all(self, etf_tickers=None):
+        """
+        ETF PDF를 동시에 조회하여 오늘 날짜로 저장. 실패한 ETF는 기존 저장분 유지.
+        Returns: {etf_ticker: 저장한 종목 수 (실패 시 None)}
+        """
+        etf_tickers = list(etf_tickers) if etf_tickers is not None else universe_etf_tickers()
+        as_of = datetime.date.today().isoformat()
+        results = {}
+        with concurrent.futures.ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = {executor.submit(self.fetch_pdf, t): t for t in etf_tickers}
+            for future in concurrent.futures.as_completed(futures):
+                etf_ticker = futures[future]
+                holdings = future.result()
+                if holdings is None:
+                    results[etf_ticker] = None
+                    continue
+                self.db.save_etf_holdings(etf_ticker, as_of, holdings)
+                results[etf_ticker] = len(holdings)
+
+        ok = sum(1 for v in results.values() if v is not None)
+        print(f"[EtfPdfService] PDF 갱신 완료 ({ok}/{len(etf_tickers)} ETF)")
+        return results
+
+    def fetch_pdf(self, etf_ticker):
+        """
+        TIGER ETF 공식 API에서 구성 종목 전체 조회 (비중 내림차순).
+        Returns: [{'ticker', 'name', 'weight'}] 또는 None (요청 실패/빈 응답)
+        """
+        try:
+            import requests
+            headers = dict(TIGER_HEADERS, Referer=f'https://www.tigeretf.com/ko/product/view.do?ticker={etf_ticker}')
+            res = requests.get(TIGER_PDF_URL.format(ticker=etf_ticker), headers=headers, timeout=self.request_timeout)
+            data = res.json()
+        except Exception as e:
+            print(f"[EtfPdfService] ETF PDF API 호출 실패 ({etf_ticker}): {e}")
+            return None
+
+        pdf_list = (data.get('data') or {}).get('pdfList') or []
+        results = []
+        for item in pdf_list:
+            # 비중(weight)이 0 이상인 종목만 추출
+            weight = float(item.get('weight') or 0)
+            if weight > 0:
+                results.append({
+                    "ticker": isin_to_code(item.get('isincode')),
+                    "name": item.get('stkname', '알수없음'),
+                    "weight": round(weight, 2)
+                })
+        if not results:
+            # 빈 응답은 저장하지 않음 (이전 수집분 유지)
+            print(f"[EtfPdfService] PDF 데이터를 찾을 수 없습니다: {etf_ticker}")
+            return None
+        return sorted(results, key=lambda x: x['weight'], reverse=True)
+
+
+# 프로세스 전역 서비스 레지스트리 (여러 DataLoader/세션이 같은 갱신 스레드를 공유)
+_SERVICES = {}
+_SERVICES_LOCK = threading.Lock()
+
+
+def get_etf_pdf_service(db):
+    """
+    DB 파일 경로별로 하나의 EtfPdfService를 공유
+    """
+    with _SERVICES_LOCK:
+        service = _SERVICES.get(db.db_path)
+        if service is None:
+            service = EtfPdfService(db)
+            _SERVICES[db.db_path] = service
+        return service
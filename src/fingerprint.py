@@ -0,0 +1,66 @@
+import json
+import hashlib
+
+# 백테스트 로직(매매 규칙/지표 계산)이 바뀌면 증가 -> 이전 결과 재사용 방지
+BACKTEST_LOGIC_VERSION = 1
+
+
+def _canonical(obj):
+    """
+    키 순서/튜플-리스트 차이와 무관하게 같은 설정이면 같은 JSON이 되도록 정규화
+    """
+    if isinstance(obj, dict):
+        return {str(k): _canonical(v) for k, v in sorted(obj.items(), key=lambda kv: str(kv[0]))}
+    if isinstance(obj, (list, tuple)):
+        return [_canonical(v) for v in obj]
+    if isinstance(obj, float) and obj.is_integer():
+        return int(obj)
+    if hasattr(obj, 'item'): # numpy scalar
+        return _canonical(obj.item())
+    return obj
+
+
+def universe_digest(names):
+    """
+    유니버스 리스팅 {ticker: name}의 해시. 순서와 종목명도 결과(처리 순서, 거래 내역)에 반영되므로 포함
+    """
+    text = json.dumps([[str(t), str(n)] for t, n in names.items()], ensure_ascii=False)
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+def snapshot_version(snapshot):
+    """
+    fingerprint용 데이터 식별값: 실행이 의존하는 데이터 digest + 유니버스 리스팅 digest (Backtester.take_data_snapshot)
+    """
+    return [snapshot['digest'], snapshot['universe_digest']]
+
+
+def simulation_fingerprint(start_date, end_date, strategy_params, universe_params, data_version):
+    """
+    시뮬레이션 결과를 결정하는 입력(전략/유니버스 파라미터, 기간, 데이터 버전)의 결정적 해시.
+    :param data_version: 데이터 식별값 (snapshot_version - 내용 기준)
+    """
+    payload = {
+        'logic_version': BACKTEST_LOGIC_VERSION,
+        'start_date': str(start_date)[:10],
+        'end_date': str(end_date)[:10],
+        'strategy_params': _canonical(strategy_params or {}),
+        'universe_params': _canonical(universe_params or {}),
+        'data_version': _canonical(data_version),
+    }
+    text = json.dumps(payload, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+def load_memoized_simulation(db, fingerprint):
+    """
+    같은 fingerprint로 저장된 결과가 있으면 (simulation_id, equity_df, trades_df, portfolio) 반환, 없으면 None
+    """
+    simulation_id = db.find_simulation(fingerprint)
+    if simulation_id is None:
+        return None
+    _, equity_df, trades_df = db.get_simulation(simulation_id)
+    if equity_df is None:
+        return None
+    print(f"[Memo] Reusing stored simulation #{simulation_id} ({fingerprint[:12]})")
+    return simulation_id, equity_df, trades_df, db.get_simulation_portfolio(simulation_id)
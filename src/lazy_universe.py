@@ -0,0 +1,161 @@
+import threading
+from collections import OrderedDict
+import numpy as np
+import pandas as pd
+
+
+class FrameLRU:
+    def __init__(self, load_fn, budget_mb=256):
+        """
+        티커별 전체 DataFrame(지표 포함)을 메모리 예산 안에서만 보관하는 LRU.
+        :param load_fn: load_fn(ticker) -> DataFrame or None (캐시 miss 시 호출)
+        :param budget_mb: 보관할 DataFrame 총 크기 상한 (MB)
+        """
+        self.load_fn = load_fn
+        self.budget_bytes = int(budget_mb * 1024 * 1024)
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._frames = OrderedDict() # ticker -> (df, nbytes)
+        self._lock = threading.Lock()
+
+    def get(self, ticker):
+        with self._lock:
+            entry = self._frames.get(ticker)
+            if entry is not None:
+                self._frames.move_to_end(ticker)
+                self.hits += 1
+                return entry[0]
+
+        self.misses += 1
+        df = self.load_fn(ticker)
+        if df is not None:
+            self.put(ticker, df)
+        return df
+
+    def put(self, ticker, df):
+        size = int(df.memory_usage(deep=True).sum())
+        with self._lock:
+            if ticker in self._frames:
+                self.nbytes -= self._frames.pop(ticker)[1]
+            self._frames[ticker] = (df, size)
+            self.nbytes += size
+            # 방금 넣은 항목 하나는 예산을 넘더라도 유지
+            while self.nbytes > self.budget_bytes and len(self._frames) > 1:
+                _, (_, evicted) = self._frames.popitem(last=False)
+                self.nbytes -= evicted
+
+    def __len__(self):
+        return len(self._frames)
+
+
+class LazyUniverse:
+    # 랭킹/평가에 필요한 컬럼만 (날짜 x 티커) 패널로 상주
+    RESIDENT_COLUMNS = ('RS_Score_Pre', 'Amount_MA20', 'Close')
+
+    def __init__(self, load_frame_fn, buy_signal_fn, frame_cache_mb=256):
+        """
+        대규모 유니버스용 메모리 절약 모드.
+        전체 DataFrame은 보유/후보 종목만 필요할 때 load_frame_fn으로 다시 만들어 LRU에 보관.
+        :param load_frame_fn: load_frame_fn(ticker) -> 지표가 계산된 DataFrame or None
+        :param buy_signal_fn: buy_signal_fn(df) -> 날짜별 매수 신호 bool Series
+                              (신호가 없는 후보는 전체 DataFrame을 로드하지 않기 위함)
+        :param frame_cache_mb: 전체 DataFrame LRU 메모리 예산 (MB)
+        """
+        self.frames = FrameLRU(load_frame_fn, budget_mb=frame_cache_mb)
+        self.buy_signal_fn = buy_signal_fn
+        self.rs = pd.DataFrame()
+        self.amount = pd.DataFrame()
+        self.close = pd.DataFrame()
+        self.buy_flag = pd.DataFrame()
+        self._rankings = {}
+        self._rankings_key = None
+
+    def build(self, frames_iter):
+        """
+        (ticker, 지표 DataFrame) 스트림에서 상주 패널만 추출.
+        전체 DataFrame은 LRU 예산 안에서만 남고 나머지는 버려짐.
+        """
+        columns = {col: {} for col in self.RESIDENT_COLUMNS}
+        buy_flags = {}
+        for ticker, df in frames_iter:
+            for col in self.RESIDENT_COLUMNS:
+                columns[col][ticker] = df[col]
+            buy_flags[ticker] = self.buy_signal_fn(df)
+            self.frames.put(ticker, df)
+
+        self.rs = pd.DataFrame(columns['RS_Score_Pre'])
+        self.amount = pd.DataFrame(columns['Amount_MA20'])
+        self.close = pd.DataFrame(columns['Close'])
+        # 1 byte/cell 매수 신호 패널 (데이터 없는 날짜는 False)
+        self.buy_flag = pd.DataFrame(buy_flags).reindex(self.close.index).fillna(False).astype(bool)
+        return len(self.rs.columns)
+
+    def build_from_panels(self, close, rs, amount_ma20, buy_flag):
+        """
+        이미 계산된 (날짜 x 티커) 패널로 구성 (Full-Market 모드, src.panel 참고)
+        """
+        self.close = close
+        self.rs = rs
+        self.amount = amount_ma20
+        self.buy_flag = buy_flag.reindex(close.index).fillna(False).astype(bool)
+        return len(self.close.columns)
+
+    def set_rankings(self, rankings, min_amount, top_n):
+        """
+        precompute_rankings 결과 등록. 같은 조건의 rank() 호출은 사전 계산값을 사용.
+        """
+        self._rankings = rankings
+        self._rankings_key = (min_amount, top_n)
+
+    @property
+    def tickers(self):
+        return list(self.close.columns)
+
+    def __contains__(self, ticker):
+        return ticker in self.close.columns
+
+    def __len__(self):
+        return len(self.close.columns)
+
+    def get_frame(self, ticker):
+        return self.frames.get(ticker)
+
+    def trading_days(self):
+        return self.close.index
+
+    def rank(self, today, min_amount, top_n=50):
+        """
+        당일 유동성 필터 + RS 내림차순 상위 top_n 티커 (Backtester.update_universe와 동일 규칙)
+        """
+        if self._rankings_key == (min_amount, top_n):
+            return self._rankings.get(today, [])
+        if today not in self.rs.index:
+            return []
+        rs = self.rs.loc[today].to_numpy(dtype=float)
+        amount = self.amount.loc[today].to_numpy(dtype=float)
+
+        valid = ~np.isnan(rs) & ~np.isnan(amount) & (amount >= min_amount)
+        idx = np.flatnonzero(valid)
+        # 동점은 원래 순서 유지 (list.sort(reverse=True)와 동일)
+        order = idx[np.argsort(-rs[idx], kind='stable')][:top_n]
+        return self.rs.columns[order].tolist()
+
+    def has_buy_signal(self, ticker, date):
+        try:
+            return bool(self.buy_flag.at[date, ticker])
+        except KeyError:
+            return False
+
+    def close_at(self, ticker, date):
+        """
+        해당일 종가. 데이터가 없으면 NaN
+        """
+        try:
+            return self.close.at[date, ticker]
+        except KeyError:
+            return np.nan
+
+    def memory_bytes(self):
+        panels = sum(int(p.memory_usage(deep=True).sum()) for p in (self.rs, self.amount, self.close, self.buy_flag))
+        return panels + self.frames.nbytes
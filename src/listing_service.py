@@ -0,0 +1,223 @@
+import threading
+import concurrent.futures
+import pandas as pd
+
+NAVER_HEADERS = {'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'}
+NAVER_PAGE_SIZE = 50
+
+# market -> Naver sosok 코드
+NAVER_SOSOK = {'KOSPI': 0, 'KOSDAQ': 1}
+
+
+class ListingService:
+    def __init__(self, db, max_age_hours=24, hedge_delay=1.0, request_timeout=10):
+        """
+        KOSPI/KOSDAQ 시가총액 순 종목 리스트 조회 서비스.
+        - 두 시장을 동시에 조회
+        - FDR 요청 후 hedge_delay 안에 응답이 없으면 Naver 다중 페이지 크롤링을 함께 띄워
+          먼저 완성된 결과를 사용 (Hedged Request)
+        - 결과는 stock_listing 테이블에 저장하여 콜드 스타트 시 재사용
+        :param db: DBManager
+        :param max_age_hours: DB 캐시 유효 시간. 만료된 캐시는 즉시 반환하고 백그라운드에서 갱신
+        :param hedge_delay: FDR 단독 대기 시간 (초). 0이면 처음부터 동시에 요청
+        :param request_timeout: 개별 HTTP 요청 timeout (초)
+        """
+        self.db = db
+        self.max_age_hours = max_age_hours
+        self.hedge_delay = hedge_delay
+        self.request_timeout = request_timeout
+        self._refreshing = set()
+        self._lock = threading.Lock()
+
+    def get_universe(self, kospi_n=200, kosdaq_n=50):
+        """
+        시총 상위 종목 {code: name}. n이 None이면 시장 전체.
+        """
+        requests_by_market = {'KOSPI': kospi_n, 'KOSDAQ': kosdaq_n}
+        with concurrent.futures.ThreadPoolExecutor(max_workers=2) as executor:
+            futures = {m: executor.submit(self.get_listing, m, n) for m, n in requests_by_market.items() if n != 0}
+            listings = {m: f.result() for m, f in futures.items()}
+
+        universe_dict = {}
+        for market in ('KOSPI', 'KOSDAQ'):
+            df = listings.get(market)
+            if df is None or df.empty:
+                continue
+            n = requests_by_market[market]
+            rows = df if n is None else df.head(n)
+            for code, name in zip(rows['Code'], rows['Name']):
+                if code and name: universe_dict[code] = name
+        return universe_dict
+
+    def get_listing(self, market, n=None):
+        """
+        시총 내림차순 DataFrame[Code, Name, Marcap]
+        """
+        cached, is_fresh = self.db.load_stock_listing(market, self.max_age_hours)
+        # 시장 전체(n=None)는 완전한 리스팅만 인정 (Naver 상위 N 부분 결과로 대체되지 않도록)
+        covers = cached is not None and (self._is_complete(cached) or (n is not None and len(cached) >= n))
+        if covers:
+            if not is_fresh:
+                self._refresh_in_background(market, n)
+            return cached
+
+        df, source = self.fetch_listing(market, n)
+        if df is None or df.empty:
+            print(f"[ListingService] {market} 리스팅 실패")
+            return cached if cached is not None else pd.DataFrame(columns=['Code', 'Name', 'Marcap'])
+
+        self.db.save_stock_listing(market, df, source, complete=(source == 'FDR' or n is None))
+        return df
+
+    def _is_complete(self, cached):
+        return bool(cached.attrs.get('complete', False))
+
+    def _refresh_in_background(self, market, n):
+        with self._lock:
+            if market in self._refreshing:
+                return
+            self._refreshing.add(market)
+
+        def _refresh():
+            try:
+                df, source = self.fetch_listing(market, n)
+                if df is not None and not df.empty:
+                    self.db.save_stock_listing(market, df, source, complete=(source == 'FDR' or n is None))
+            finally:
+                with self._lock:
+                    self._refreshing.discard(market)
+
+        threading.Thread(target=_refresh, name=f"listing-refresh-{market}", daemon=True).start()
+
+    def fetch_listing(self, market, n=None):
+        """
+        FDR과 Naver를 hedged 방식으로 경쟁시켜 먼저 완성된 결과를 반환.
+        Returns: (DataFrame or None, source)
+        """
+        executor = concurrent.futures.ThreadPoolExecutor(max_workers=2)
+        try:
+            futures = {executor.submit(self._fetch_fdr, market): 'FDR'}
+            done, _ = concurrent.futures.wait(futures, timeout=self.hedge_delay)
+
+            first = next(iter(futures))
+            if first in done and first.result() is not None:
+                return first.result(), 'FDR'
+
+            # FDR이 느리거나 실패 -> Naver 크롤링 동시 가동
+            futures[executor.submit(self._fetch_naver, market, n)] = 'NAVER'
+            pending = set(futures)
+            while pending:
+                done, pending = concurrent.futures.wait(pending, return_when=concurrent.futures.FIRST_COMPLETED)
+                for future in done:
+                    df = future.result()
+                    if df is not None and not df.empty:
+                        print(f"[ListingService] {market} Listing 확보 ({futures[future]}, {len(df)}종목)")
+                        return df, futures[future]
+            return None, None
+        finally:
+            # 늦게 끝나는 쪽은 기다리지 않음
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def _fetch_fdr(self, market):
+        try:
+            import FinanceDataReader as fdr
+            df = fdr.StockListing(market)
+            return normalize_listing(df)
+        except Exception as e:
+            print(f"[ListingService] FDR {market} 실패: {e}")
+            return None
+
+    def _fetch_naver(self, market, n=None):
+        """
+        Naver 시가총액 페이지를 여러 페이지 동시에 크롤링.
+        n이 주어지면 필요한 페이지까지만, 아니면 마지막 페이지까지.
+        한 페이지라도 실패하면 불완전한 결과로 보고 None 반환.
+        """
+        sosok = NAVER_SOSOK[market]
+        try:
+            first_page, last_page = fetch_naver_page(sosok, 1, self.request_timeout)
+            if first_page is None:
+                return None
+
+            if n is not None:
+                last_page = min(last_page, -(-n // NAVER_PAGE_SIZE))
+
+            pages = {1: first_page}
+            if last_page > 1:
+                with concurrent.futures.ThreadPoolExecutor(max_workers=8) as executor:
+                    futures = {executor.submit(fetch_naver_page, sosok, p, self.request_timeout): p for p in range(2, last_page + 1)}
+                    for future in concurrent.futures.as_completed(futures):
+                        page_df, _ = future.result()
+                        if page_df is None:
+                            return None
+                        pages[futures[future]] = page_df
+
+            df = pd.concat([pages[p] for p in sorted(pages)], ignore_index=True)
+            return normalize_listing(df.drop_duplicates(subset='Code'))
+        except Exception as e:
+            print(f"[ListingService] Naver {market} 실패: {e}")
+            return None
+
+
+def fetch_naver_page(sosok, page, timeout=10):
+    """
+    Naver 시가총액 페이지 한 장 파싱.
+    Returns: (DataFrame[Code, Name, Marcap] or None, last_page)
+    """
+    import requests
+    from bs4 import BeautifulSoup
+
+    url = f"https://finance.naver.com/sise/sise_market_sum.naver?sosok={sosok}&page={page}"
+    try:
+        res = requests.get(url, headers=NAVER_HEADERS, timeout=timeout)
+        soup = BeautifulSoup(res.text, 'html.parser')
+    except Exception as e:
+        print(f"[ListingService] Naver page {page} Error: {e}")
+        return None, page
+
+    table = soup.find('table', {'class': 'type_2'})
+    if not table: return None, page
+
+    stocks = []
+    for tr in table.find_all('tr'):
+        anchors = tr.find_all('a', {'class': 'tltle'})
+        if anchors:
+            name = anchors[0].text
+            code = anchors[0]['href'].split('code=')[-1].strip()
+
+            # 시총 값 추출 (단위: 억)
+            tds = tr.find_all('td', {'class': 'number'})
+            marcap = 0
+            if len(tds) >= 2:
+                marcap_str = tds[1].text.replace(',', '').strip()
+                marcap = int(marcap_str) * 100_000_000 if marcap_str.isdigit() else 0
+
+            stocks.append({'Code': code, 'Name': name, 'Marcap': marcap})
+
+    # 맨뒤 링크(pgRR)에서 마지막 페이지 번호 확인
+    last_page = page
+    last_link = soup.find('td', {'class': 'pgRR'})
+    if last_link and last_link.find('a'):
+        href = last_link.find('a')['href']
+        try:
+            last_page = int(href.split('page=')[-1])
+        except ValueError:
+            pass
+
+    return pd.DataFrame(stocks, columns=['Code', 'Name', 'Marcap']), last_page
+
+
+def normalize_listing(df):
+    """
+    FDR/Naver 리스팅을 [Code, Name, Marcap] 시총 내림차순으로 정규화
+    """
+    if df is None or df.empty:
+        return None
+    df = df.copy()
+    if 'Code' not in df.columns and 'Symbol' in df.columns:
+        df['Code'] = df['Symbol']
+    if 'Marcap' not in df.columns:
+        df['Marcap'] = 0
+    df['Marcap'] = pd.to_numeric(df['Marcap'], errors='coerce')
+    df = df.dropna(subset=['Code', 'Name']).sort_values(by='Marcap', ascending=False, kind='stable')
+    return df[['Code', 'Name', 'Marcap']].reset_index(drop=True)
@@ -0,0 +1,126 @@
+import numpy as np
+import pandas as pd
+from scipy import sparse
+from .constants import TIGER_ETF_UNIVERSE
+
+
+def etf_categories():
+    """
+    {etf_ticker: category} (TIGER_ETF_UNIVERSE 기준)
+    """
+    return {item['ticker']: category for category, items in TIGER_ETF_UNIVERSE.items() for item in items}
+
+
+class LookThroughEngine:
+    def __init__(self, holdings, categories=None):
+        """
+        ETF 구성 종목(PDF)을 통해 ETF 포트폴리오를 기초 종목/카테고리 노출도로 환산.
+        - weights: ETF x 종목 희소 행렬 (PDF 비중 %, 1.0 = 100%)
+        - category_matrix: ETF x 카테고리 희소 지시 행렬
+        날짜별 노출도는 (날짜 x ETF) 평가액 행렬과의 희소 곱 한 번으로 전체 기간을 계산.
+        :param holdings: {etf_ticker: DataFrame[ticker, name, weight]} (DBManager.load_etf_holdings 형식)
+        :param categories: {etf_ticker: category} (기본: TIGER_ETF_UNIVERSE)
+        """
+        categories = categories if categories is not None else etf_categories()
+        # PDF가 없는 ETF도 카테고리 노출도에는 포함 (기초 종목은 미확인 잔여분으로 처리)
+        self.etfs = list(dict.fromkeys([*categories, *holdings]))
+        self.etf_index = {t: i for i, t in enumerate(self.etfs)}
+
+        frames = [df.assign(etf=etf) for etf, df in holdings.items() if df is not None and not df.empty]
+        pdf = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=['etf', 'ticker', 'name', 'weight'])
+        # 코드가 없는 항목(현금/선물 등)은 잔여분으로 남김
+        pdf = pdf[pdf['ticker'].astype(str).str.len() > 0]
+
+        codes, self.stocks = pd.factorize(pdf['ticker'])
+        self.stocks = list(self.stocks)
+        self.stock_names = dict(zip(pdf['ticker'], pdf['name']))
+        rows = pdf['etf'].map(self.etf_index).to_numpy()
+        # 같은 ETF 안의 중복 코드는 합산됨 (csr 생성 시 중복 좌표 합산)
+        self.weights = sparse.csr_matrix(
+            (pdf['weight'].to_numpy(dtype=float) / 100.0, (rows, codes)),
+            shape=(len(self.etfs), len(self.stocks))
+        )
+
+        self.categories = list(dict.fromkeys(categories.get(t, '기타') for t in self.etfs))
+        cat_index = {c: i for i, c in enumerate(self.categories)}
+        self.category_matrix = sparse.csr_matrix(
+            (np.ones(len(self.etfs)), (np.arange(len(self.etfs)), [cat_index[categories.get(t, '기타')] for t in self.etfs])),
+            shape=(len(self.etfs), len(self.categories))
+        )
+
+    @classmethod
+    def from_db(cls, db, etf_tickers=None, as_of=None, categories=None):
+        """
+        DB에 저장된 PDF(as_of 이전 최신)로 엔진 생성
+        """
+        categories = categories if categories is not None else etf_categories()
+        holdings = {}
+        for etf in (etf_tickers if etf_tickers is not None else list(categories)):
+            df, _ = db.load_etf_holdings(etf, as_of=as_of)
+            if df is not None:
+                holdings[etf] = df
+        return cls(holdings, categories)
+
+    def _etf_matrix(self, etf_values):
+        # (날짜 x ETF) 평가액 -> 엔진 ETF 순서의 희소 행렬 (모르는 ETF 컬럼은 제외)
+        known = [c for c in etf_values.columns if c in self.etf_index]
+        values = etf_values[known].fillna(0).to_numpy(dtype=float)
+        coo = sparse.coo_matrix(values)
+        cols = np.array([self.etf_index[c] for c in known], dtype=np.int64)
+        return sparse.csr_matrix((coo.data, (coo.row, cols[coo.col])), shape=(len(etf_values), len(self.etfs)))
+
+    def stock_exposure(self, etf_values):
+        """
+        날짜별 기초 종목 노출 금액
+        :param etf_values: DataFrame (index=날짜, columns=ETF 티커, 값=평가액)
+        Returns: DataFrame (index=날짜, columns=종목코드)
+        """
+        exposure = self._etf_matrix(etf_values) @ self.weights
+        return pd.DataFrame(exposure.toarray(), index=etf_values.index, columns=self.stocks)
+
+    def category_exposure(self, etf_values):
+        """
+        날짜별 카테고리 노출 금액. Returns: DataFrame (index=날짜, columns=카테고리)
+        """
+        exposure = self._etf_matrix(etf_values) @ self.category_matrix
+        return pd.DataFrame(exposure.toarray(), index=etf_values.index, columns=self.categories)
+
+    def coverage(self, etf_values):
+        """
+        날짜별 PDF로 확인된 비율 (기초 종목 노출 합 / ETF 평가액 합)
+        """
+        total = etf_values.fillna(0).sum(axis=1)
+        looked_through = np.asarray((self._etf_matrix(etf_values) @ self.weights).sum(axis=1)).ravel()
+        return pd.Series(np.where(total > 0, looked_through / total.where(total > 0, 1), 0.0), index=etf_values.index)
+
+    def overlap(self):
+        """
+        ETF 쌍별 구성 종목 중복도 (공통 종목의 min(비중) 합, 0~1)
+        Returns: DataFrame (ETF x ETF, PDF가 있는 ETF만)
+        """
+        has_pdf = np.flatnonzero(np.diff(self.weights.indptr) > 0)
+        w = self.weights[has_pdf].toarray()
+        overlap = np.minimum(w[:, None, :], w[None, :, :]).sum(axis=2)
+        names = [self.etfs[i] for i in has_pdf]
+        return pd.DataFrame(overlap, index=names, columns=names)
+
+
+def daily_position_values(trades, close, dates):
+    """
+    거래 내역으로 날짜별 보유 수량을 복원하여 평가액 계산 (매도는 전량 매도)
+    :param trades: DataFrame[Date, Ticker, Action, Qty]
+    :param close: DataFrame (index=날짜, columns=티커) 종가 패널
+    :param dates: 평가 날짜 (자산 곡선 인덱스)
+    Returns: DataFrame (index=dates, columns=티커) 평가액
+    """
+    dates = pd.DatetimeIndex(dates)
+    if trades is None or trades.empty:
+        return pd.DataFrame(index=dates)
+
+    signed_qty = np.where(trades['Action'] == 'BUY', trades['Qty'], -trades['Qty']).astype(float)
+    changes = pd.DataFrame({'Date': pd.to_datetime(trades['Date']), 'Ticker': trades['Ticker'], 'Qty': signed_qty})
+    qty = changes.pivot_table(index='Date', columns='Ticker', values='Qty', aggfunc='sum')
+    qty = qty.reindex(qty.index.union(dates)).fillna(0).cumsum().reindex(dates)
+
+    prices = close.reindex(columns=qty.columns).reindex(close.index.union(dates)).ffill().reindex(dates)
+    return (qty * prices).fillna(0)
@@ -0,0 +1,102 @@
+import numpy as np
+import pandas as pd
+
+PRICE_COLUMNS = ('Open', 'High', 'Low', 'Close')
+INDICATOR_COLUMNS = ('MA_Short', 'MA_Long', 'Slope_Pct', 'Max_Slope_60d', 'Amount_MA20', 'RS_Score_Pre')
+
+# RS_Score_Pre / Slope_Pct / Amount_MA20 계산 후에는 다시 읽지 않는 컬럼
+INTERMEDIATE_COLUMNS = ('R_1m', 'R_3m', 'R_6m', 'R_12m', 'Slope', 'Amount', 'Change')
+
+INT32_MAX = np.iinfo(np.int32).max
+
+
+class MemoryPolicy:
+    def __init__(self, float32_prices=True, float32_indicators=False, drop_intermediates=True, downcast_volume=True):
+        """
+        지표 계산이 끝난 DataFrame의 상주 메모리 축소 정책
+        :param float32_prices: OHLC를 float32로 저장 (원 단위 정수 가격처럼 손실 없이 변환되는 경우에만)
+        :param float32_indicators: 이평선/기울기/RS 등 지표도 float32로 저장 (근소한 반올림 오차 허용)
+        :param drop_intermediates: R_1m~R_12m, Slope, Amount, Change 등 중간 컬럼 제거
+        :param downcast_volume: 정수 거래량이 int32 범위 안이면 int32로 저장
+        """
+        self.float32_prices = float32_prices
+        self.float32_indicators = float32_indicators
+        self.drop_intermediates = drop_intermediates
+        self.downcast_volume = downcast_volume
+
+    @classmethod
+    def from_name(cls, name):
+        """
+        :param name: 'none' (변경 없음, 기본) | 'safe' (결과 동일) | 'compact' (지표까지 float32)
+        """
+        if name is None or name == 'none':
+            return None
+        if name == 'safe':
+            return cls()
+        if name == 'compact':
+            return cls(float32_indicators=True)
+        raise ValueError(f"Unknown memory policy: {name}")
+
+    def apply(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        정책을 적용한 새 DataFrame 반환
+        """
+        if self.drop_intermediates:
+            df = df.drop(columns=[c for c in INTERMEDIATE_COLUMNS if c in df.columns])
+
+        converted = {}
+        if self.float32_prices:
+            for col in PRICE_COLUMNS:
+                if col in df.columns and _is_float32_exact(df[col]):
+                    converted[col] = df[col].astype(np.float32)
+
+        if self.float32_indicators:
+            for col in INDICATOR_COLUMNS:
+                if col in df.columns:
+                    converted[col] = df[col].astype(np.float32)
+
+        if self.downcast_volume and 'Volume' in df.columns:
+            vol = df['Volume']
+            values = vol.to_numpy()
+            if not vol.isna().any() and (values == np.round(values)).all() and values.min() >= 0 and values.max() <= INT32_MAX:
+                converted['Volume'] = vol.astype(np.int32)
+
+        if converted:
+            df = df.assign(**converted)
+        return df
+
+
+def _is_float32_exact(series):
+    values = series.to_numpy(dtype=np.float64)
+    return bool(np.array_equal(values.astype(np.float32).astype(np.float64), values, equal_nan=True))
+
+
+def frame_nbytes(df):
+    return int(df.memory_usage(deep=True).sum())
+
+
+class MemoryReport:
+    """
+    정책 적용 전/후 티커별 메모리 사용량 집계
+    """
+    def __init__(self):
+        self.before = {}
+        self.after = {}
+
+    def record(self, ticker, before_bytes, after_bytes):
+        self.before[ticker] = before_bytes
+        self.after[ticker] = after_bytes
+
+    def to_frame(self):
+        df = pd.DataFrame({'before_bytes': pd.Series(self.before), 'after_bytes': pd.Series(self.after)})
+        df['ratio'] = df['before_bytes'] / df['after_bytes']
+        return df
+
+    def summary(self):
+        n = len(self.before)
+        if n == 0:
+            return "[MemoryPolicy] No tickers recorded."
+        before = sum(self.before.values())
+        after = sum(self.after.values())
+        return (f"[MemoryPolicy] {n}종목, 종목당 {before / n / 1024:,.1f}KB -> {after / n / 1024:,.1f}KB "
+                f"(총 {before / 1024**2:,.1f}MB -> {after / 1024**2:,.1f}MB, {before / max(after, 1):.1f}x)")
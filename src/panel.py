@@ -0,0 +1,191 @@
+import numpy as np
+import pandas as pd
+
+
+def contiguous_columns(panel: pd.DataFrame) -> np.ndarray:
+    """
+    각 컬럼의 유효값이 중간에 끊기지 않는지 (상장 전/상폐 후 NaN만 있는지) 여부.
+    중간 공백(거래정지 등)이 있으면 패널 단위 rolling이 티커별 계산과 달라지므로 따로 처리해야 함.
+    """
+    valid = panel.notna().to_numpy()
+    if valid.size == 0:
+        return np.ones(panel.shape[1], dtype=bool)
+    counts = valid.sum(axis=0)
+    first = valid.argmax(axis=0)
+    last = len(panel) - 1 - valid[::-1].argmax(axis=0)
+    return (counts == 0) | (counts == (last - first + 1))
+
+
+def _indicators(strategy, close, amount):
+    """
+    Strategy.prepare_indicators 중 랭킹/매수 후보 선정에 필요한 부분을 (날짜 x 티커) 패널로 계산.
+    컬럼별 연산 순서가 prepare_indicators와 같으므로 티커별 계산과 동일한 값이 나옴.
+    """
+    ma_short = close.rolling(window=strategy.ma_short).mean()
+    ma_long = close.rolling(window=strategy.ma_long).mean()
+    amount_ma20 = amount.rolling(window=20).mean()
+
+    r_1m = close.pct_change(periods=20)
+    r_3m = close.pct_change(periods=60)
+    r_6m = close.pct_change(periods=120)
+    r_12m = close.pct_change(periods=250)
+
+    w3, w6, w12, w1 = strategy.rs_weights
+    rs = (w3 * r_3m) + (w6 * r_6m) + (w12 * r_12m) + (w1 * r_1m)
+    rs = rs * 100
+
+    buy = strategy.buy_signal_from(close, ma_short, ma_long)
+
+    # 데이터가 없는 날(상장 전/상폐 후)은 값이 없어야 함
+    has_data = close.notna()
+    return {
+        'RS_Score_Pre': rs.where(has_data),
+        'Amount_MA20': amount_ma20.where(has_data),
+        'Buy_Signal': buy & has_data,
+    }
+
+
+def compute_panel_indicators(strategy, close, amount, chunk_size=500):
+    """
+    전체 유니버스 지표를 패널 단위로 벡터화 계산.
+    :param close: 종가 패널 (날짜 x 티커)
+    :param amount: 거래대금 패널 (close와 같은 모양)
+    :param chunk_size: 한 번에 계산할 티커 수 (중간 패널 메모리 피크 제한)
+    Returns: {'RS_Score_Pre', 'Amount_MA20', 'Buy_Signal': 패널}
+    """
+    amount = amount.reindex(index=close.index, columns=close.columns)
+    contiguous = contiguous_columns(close)
+    columns = close.columns
+
+    parts = {'RS_Score_Pre': [], 'Amount_MA20': [], 'Buy_Signal': []}
+
+    # 1. 공백 없는 컬럼: 청크 단위 벡터 연산
+    fast_cols = columns[contiguous]
+    for i in range(0, len(fast_cols), chunk_size):
+        chunk = fast_cols[i:i + chunk_size]
+        result = _indicators(strategy, close[chunk], amount[chunk])
+        for key in parts:
+            parts[key].append(result[key])
+
+    # 2. 중간 공백이 있는 컬럼: 티커 자신의 거래일만으로 계산 후 패널 날짜로 재정렬
+    for col in columns[~contiguous]:
+        c = close[[col]].dropna()
+        result = _indicators(strategy, c, amount[[col]].reindex(c.index))
+        for key in parts:
+            fill = False if key == 'Buy_Signal' else np.nan
+            parts[key].append(result[key].reindex(close.index, fill_value=fill))
+
+    panels = {}
+    for key, pieces in parts.items():
+        if pieces:
+            panel = pd.concat(pieces, axis=1)[columns]
+        else:
+            panel = pd.DataFrame(index=close.index, columns=columns, dtype=bool if key == 'Buy_Signal' else float)
+        panels[key] = panel.astype(bool) if key == 'Buy_Signal' else panel
+    return panels
+
+
+def precompute_rankings(rs, amount_ma20, min_amount, top_n=50):
+    """
+    모든 날짜의 유동성 필터 + RS 내림차순 상위 top_n을 한 번에 계산.
+    Returns: {date: [ticker, ...]}
+    """
+    rs_values = rs.to_numpy(dtype=float)
+    amount_values = amount_ma20.to_numpy(dtype=float)
+    valid = ~np.isnan(rs_values) & ~np.isnan(amount_values) & (amount_values >= min_amount)
+
+    # 무효값은 +inf로 보내고 -RS 오름차순 (stable) -> 동점은 컬럼 순서 유지
+    key = np.where(valid, -rs_values, np.inf)
+    order = np.argsort(key, axis=1, kind='stable')[:, :top_n]
+    n_valid = np.minimum(valid.sum(axis=1), top_n)
+
+    columns = np.asarray(rs.columns)
+    return {
+        date: columns[order[i, :n_valid[i]]].tolist()
+        for i, date in enumerate(rs.index)
+    }
+
+
+# 주 단위 수익률 기간 (영업일 기준: 1주=5일, 2주=10일, 4주=20일, 8주=40일, 12주=60일)
+HORIZON_DAYS = {1: 5, 2: 10, 4: 20, 8: 40, 12: 60}
+
+
+def _tail_aligned(panel: pd.DataFrame, valid: np.ndarray) -> np.ndarray:
+    """
+    컬럼별 유효값을 원래 순서대로 아래쪽에 모은 배열 (위쪽은 NaN).
+    각 티커의 자기 거래일 기준 iloc[-k]를 패널 전체에서 한 번에 꺼낼 수 있음.
+    """
+    values = panel.to_numpy(dtype=float)
+    order = np.argsort(valid, axis=0, kind='stable')  # False(결측) 먼저, 유효값은 순서 유지
+    return np.take_along_axis(values, order, axis=0)
+
+
+def horizon_returns(close: pd.DataFrame, horizons=None, min_history=60) -> pd.DataFrame:
+    """
+    여러 기간 수익률(%)을 종가 패널에서 벡터 연산으로 계산.
+    티커별로 마지막 종가와 자기 거래일 기준 days일 전 종가를 비교 (소수 첫째 자리 반올림).
+    이력이 min_history일 미만이거나 기간보다 짧으면 0.0.
+    :param close: 종가 패널 (날짜 x 티커)
+    :param horizons: {주: 영업일} (기본 HORIZON_DAYS)
+    Returns: DataFrame (index=티커, columns=주)
+    """
+    horizons = horizons if horizons is not None else HORIZON_DAYS
+    valid = close.notna().to_numpy()
+    counts = valid.sum(axis=0)
+    if len(close) == 0:
+        return pd.DataFrame(0.0, index=close.columns, columns=list(horizons))
+
+    values = _tail_aligned(close, valid)
+    last = values[-1]
+    result = {}
+    for weeks, days in horizons.items():
+        if days + 1 > len(values):
+            result[weeks] = np.zeros(len(last))
+            continue
+        base = values[-(days + 1)]
+        ok = (counts >= min_history) & (counts > days)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            pct = np.round((last - base) / base * 100, 1)
+        result[weeks] = np.where(ok, pct, 0.0)
+    return pd.DataFrame(result, index=close.columns)
+
+
+def latest_rankings(strategy, close: pd.DataFrame, amount: pd.DataFrame) -> pd.DataFrame:
+    """
+    티커별 마지막 거래일 기준 RS 점수 / 5일 기울기 / 20일 평균 거래대금을 패널에서 한 번에 계산.
+    Strategy.calculate_rs_score (250일 미만은 0) / prepare_indicators의 Slope / Amount_MA20과 같은 값.
+    :param close: 종가 패널 (날짜 x 티커)
+    :param amount: 거래대금 패널 (close와 같은 모양)
+    Returns: DataFrame (index=티커, columns=[RS Score, Slope, Amount_MA20]) - 데이터 없는 티커 제외
+    """
+    amount = amount.reindex(index=close.index, columns=close.columns)
+    valid = close.notna().to_numpy()
+    counts = valid.sum(axis=0)
+    n = len(close)
+    c = _tail_aligned(close, valid)
+    a = _tail_aligned(amount.where(close.notna()), valid)
+
+    def tail(values, k, min_count):
+        # 티커별 iloc[-k] (이력이 부족하면 NaN)
+        if k > n:
+            return np.full(values.shape[1], np.nan)
+        return np.where(counts >= min_count, values[-k], np.nan)
+
+    p_now = c[-1] if n else np.full(close.shape[1], np.nan)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        r_1m, r_3m, r_6m, r_12m = ((p_now - p) / p for p in (tail(c, k, 250) for k in (20, 60, 120, 250)))
+        w3, w6, w12, w1 = strategy.rs_weights
+        rs = ((w3 * r_3m) + (w6 * r_6m) + (w12 * r_12m) + (w1 * r_1m)) * 100
+    rs = np.where(counts >= 250, rs, 0.0)
+
+    # 5일 선형회귀 기울기 (prepare_indicators와 같은 식)
+    if n >= 5:
+        window = np.where(counts >= 5, c[-5:], np.nan)
+        slope = (5 * (np.arange(5) @ window) - 10 * window.sum(axis=0)) / 50.0
+    else:
+        slope = np.full(close.shape[1], np.nan)
+
+    amount_ma20 = np.where(counts >= 20, a[-20:].mean(axis=0), np.nan) if n >= 20 else np.full(close.shape[1], np.nan)
+
+    table = pd.DataFrame({'RS Score': rs, 'Slope': slope, 'Amount_MA20': amount_ma20}, index=close.columns)
+    return table[counts > 0]
@@ -0,0 +1,145 @@
+import json
+import pandas as pd
+from datetime import timedelta
+from .backtester import Backtester
+from .scanner import SignalScanner
+
+
+class PaperTrader(Backtester):
+    def __init__(self, db, account='default', strategy_params=None, universe_params=None, tickers=None,
+                 start_date=None, names=None):
+        """
+        페이퍼 트레이딩: storage.db에 계좌(현금/보유 종목/체결/일별 평가액)를 유지하면서
+        새 거래일마다 Backtester.step()과 같은 매수/매도 경로(ATR 비중, 10% 상한, 10슬롯, 수수료)로 처리.
+        - 하루 처리는 그 날 랭킹(종목별 최근 봉 몇 개) + 보유/후보 종목의 최근 signal_lookback_bars개 봉만 읽으므로
+          저장된 이력 길이와 무관 (O(새 거래일))
+        - 거래일마다 한 트랜잭션으로 저장 -> 중간에 종료돼도 다음 실행이 마지막 저장 거래일 다음부터 이어서 처리
+        :param db: DBManager
+        :param account: 계좌 이름 (계좌마다 파라미터/상태를 따로 저장)
+        :param strategy_params: Strategy 파라미터. 기존 계좌는 저장된 값 사용 (다른 값을 주면 ValueError)
+        :param universe_params: {'mode': 'STOCK' | 'ETF'} (유동성 기준)
+        :param tickers: 랭킹 대상 종목 (기본: DB에 저장된 전체 종목)
+        :param start_date: 새 계좌의 첫 처리일 (기본: 현재 저장된 마지막 거래일 다음 거래일부터)
+        :param names: {ticker: name} 체결 기록용 종목명 (선택)
+        """
+        requested = {
+            'strategy_params': strategy_params,
+            'universe_params': universe_params,
+            'tickers': sorted(tickers) if tickers is not None else None,
+        }
+        info = db.get_paper_account(account)
+        if info is None:
+            params = dict(requested)
+            params['strategy_params'] = params['strategy_params'] or {}
+            params['universe_params'] = params['universe_params'] or {'mode': 'STOCK'}
+            if start_date is not None:
+                last_date = pd.to_datetime(start_date) - timedelta(days=1)
+            else:
+                latest = db.get_latest_bars(params['tickers'] or db.list_market_tickers())
+                last_date = latest['date'].max() if not latest.empty else pd.Timestamp.today().normalize()
+            db.create_paper_account(account, params, self.INITIAL_BALANCE, str(last_date.date()))
+            info = db.get_paper_account(account)
+        else:
+            # 저장된 파라미터와 다른 값으로 이어서 실행하면 기록이 섞이므로 거부
+            stored = info['params']
+            for key, value in requested.items():
+                if value is not None and json.loads(json.dumps(value, default=str)) != stored.get(key):
+                    raise ValueError(f"Paper account '{account}' was created with different {key}: {stored.get(key)}")
+
+        params = info['params']
+        super().__init__(None, strategy_params=params['strategy_params'], universe_params=params['universe_params'])
+        self.db = db
+        self.account = account
+        self.tickers = params['tickers']
+        self.universe_names = dict(names or {})
+        self.initial_balance = info['initial_balance']
+        self.balance = info['balance']
+        self.portfolio = info['portfolio']
+        self.last_date = pd.Timestamp(info['last_date'])
+
+        self.scanner = SignalScanner(db, params['strategy_params'], params['universe_params'])
+        self.frame_bars = self.strategy.signal_lookback_bars()
+        self._today = None
+        self._buy_candidates = set()
+
+    # --- Backtester.step()이 사용하는 데이터 접근: 그 날 필요한 종목만 최근 구간 로드 ---
+
+    def update_universe(self, today):
+        self._today = today
+        self.universe_data = {}  # 하루 단위 캐시
+        as_of, ranking = self.scanner.rank(self.tickers, as_of=today)
+        self.target_universe = ranking.index.tolist() if as_of == today else []
+        # 매도 후 같은 날 재매수도 Backtester와 같게 허용하므로 보유 종목도 후보 계산에 포함
+        buy = self.scanner.buy_candidates(ranking, today) if self.target_universe else pd.DataFrame()
+        self._buy_candidates = set(buy.index)
+
+    def may_have_buy_signal(self, ticker, today):
+        return ticker in self._buy_candidates
+
+    def has_ticker(self, ticker):
+        return self.get_ticker_frame(ticker) is not None
+
+    def get_ticker_frame(self, ticker):
+        if ticker not in self.universe_data:
+            df = self.db.load_market_tail(ticker, self._today, self.frame_bars)
+            if df is not None and not df.empty:
+                self.strategy.prepare_indicators(df)
+            else:
+                df = None
+            self.universe_data[ticker] = df
+        return self.universe_data[ticker]
+
+    def update_equity(self, date):
+        # 보유 종목 프레임은 매도 체크/매수 시 이미 로드됨 (없는 종목은 Backtester처럼 평가에서 제외)
+        self.universe_data = {t: df for t, df in self.universe_data.items() if df is not None}
+        super().update_equity(date)
+
+    # --- 실행 ---
+
+    def pending_days(self, until=None):
+        """
+        아직 처리하지 않은 거래일 (마지막 처리일 < date <= until)
+        """
+        return self.db.get_trading_days(self.last_date, until, self.tickers)
+
+    def run(self, until=None, progress_callback=None):
+        """
+        새 거래일을 순서대로 처리하고 거래일마다 계좌 상태를 저장
+        :param until: 마지막 처리일 (기본: 저장된 마지막 거래일)
+        :param progress_callback: progress_callback(done_days, total_days)
+        Returns: {'days', 'fills': DataFrame, 'equity': DataFrame} (이번 실행분)
+        """
+        days = self.pending_days(until)
+        fills, equity = [], []
+        for day_idx, today in enumerate(days):
+            if progress_callback is not None:
+                progress_callback(day_idx, len(days))
+            self.trade_log, self.equity_curve = [], []
+            self.step(today)
+            total_value = self.equity_curve[-1]['TotalValue']
+            self.db.save_paper_day(self.account, today, self.balance, self.portfolio, self.trade_log, total_value)
+            self.last_date = today
+            fills.extend(self.trade_log)
+            equity.extend(self.equity_curve)
+        if progress_callback is not None:
+            progress_callback(len(days), len(days))
+
+        self.universe_data = {}
+        return {
+            'days': len(days),
+            'fills': pd.DataFrame(fills, columns=['Date', 'Ticker', 'Name', 'Action', 'Price', 'Qty', 'Fee', 'Note']),
+            'equity': pd.DataFrame(equity, columns=['Date', 'TotalValue']).set_index('Date'),
+        }
+
+    def status(self):
+        """
+        현재 계좌 상태: 현금, 보유 종목, 마지막 처리일, 마지막 평가액
+        """
+        equity = self.db.load_paper_equity(self.account)
+        return {
+            'account': self.account,
+            'last_date': self.last_date,
+            'balance': self.balance,
+            'total_value': float(equity['TotalValue'].iloc[-1]) if not equity.empty else self.balance,
+            'portfolio': self.portfolio,
+        }
@@ -0,0 +1,121 @@
+import os
+import threading
+from collections import OrderedDict
+
+
+class PreparedUniverse:
+    """
+    지표 계산까지 끝난 유니버스 데이터 (여러 Backtester가 읽기 전용으로 공유)
+    """
+    def __init__(self, universe_data=None, lazy_universe=None):
+        self.universe_data = universe_data or {}
+        self.lazy_universe = lazy_universe
+
+    def nbytes(self):
+        if self.lazy_universe is not None:
+            return self.lazy_universe.memory_bytes()
+        return sum(int(df.memory_usage(deep=True).sum()) for df in self.universe_data.values())
+
+
+class _Entry:
+    def __init__(self, key, value, nbytes):
+        self.key = key
+        self.value = value
+        self.nbytes = nbytes
+        self.refcount = 0
+
+
+class PreparedUniverseCache:
+    def __init__(self, budget_mb=2048):
+        """
+        프로세스 전역 PreparedUniverse 캐시 (참조 카운트 + 메모리 예산 LRU).
+        사용 중(refcount > 0)인 항목은 제거하지 않으므로 예산을 일시적으로 넘을 수 있음.
+        :param budget_mb: 사용하지 않는 항목을 포함한 총 메모리 상한 (MB)
+        """
+        self.budget_bytes = int(budget_mb * 1024 * 1024)
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict() # key -> _Entry
+        self._build_locks = {} # key -> Lock (같은 키를 동시에 두 번 만들지 않음)
+        self._lock = threading.Lock()
+
+    def acquire(self, key, build_fn):
+        """
+        key의 PreparedUniverse를 참조 카운트를 올려서 반환. 없으면 build_fn()으로 생성.
+        사용이 끝나면 release(entry) 호출.
+        Returns: _Entry (entry.value가 PreparedUniverse)
+        """
+        with self._lock:
+            entry = self._hit(key)
+            if entry is not None:
+                return entry
+            build_lock = self._build_locks.setdefault(key, threading.Lock())
+
+        with build_lock:
+            with self._lock:
+                # 대기하는 동안 다른 스레드가 만들었으면 재사용
+                entry = self._hit(key)
+                if entry is not None:
+                    return entry
+
+            value = build_fn()
+
+            with self._lock:
+                self.misses += 1
+                entry = _Entry(key, value, value.nbytes())
+                entry.refcount = 1
+                self._entries[key] = entry
+                self.nbytes += entry.nbytes
+                self._build_locks.pop(key, None)
+                self._evict()
+                return entry
+
+    def release(self, entry):
+        with self._lock:
+            entry.refcount = max(entry.refcount - 1, 0)
+            self._evict()
+
+    def _hit(self, key):
+        entry = self._entries.get(key)
+        if entry is not None:
+            entry.refcount += 1
+            self._entries.move_to_end(key)
+            self.hits += 1
+        return entry
+
+    def _evict(self):
+        # 오래 안 쓴 순서로, 사용 중이 아닌 항목만 제거
+        for key in list(self._entries):
+            if self.nbytes <= self.budget_bytes:
+                break
+            entry = self._entries[key]
+            if entry.refcount == 0:
+                del self._entries[key]
+                self.nbytes -= entry.nbytes
+
+    def clear(self):
+        with self._lock:
+            for key in [k for k, e in self._entries.items() if e.refcount == 0]:
+                self.nbytes -= self._entries.pop(key).nbytes
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+
+_DEFAULT_CACHE = None
+_DEFAULT_LOCK = threading.Lock()
+
+
+def get_prepared_cache():
+    """
+    프로세스 공유 인스턴스 (예산: JUDOJU_PREPARED_CACHE_MB, 기본 2048MB)
+    """
+    global _DEFAULT_CACHE
+    with _DEFAULT_LOCK:
+        if _DEFAULT_CACHE is None:
+            _DEFAULT_CACHE = PreparedUniverseCache(budget_mb=float(os.getenv('JUDOJU_PREPARED_CACHE_MB', 2048)))
+        return _DEFAULT_CACHE
@@ -0,0 +1,255 @@
+import json
+import datetime
+import numpy as np
+import pandas as pd
+from .strategy import Strategy
+from .backtester import Backtester
+from .panel import precompute_rankings
+
+# RS 점수 수익률 기간 (영업일): 1개월, 3개월, 6개월, 12개월
+RS_PERIODS = (20, 60, 120, 250)
+
+
+def load_portfolio_file(path):
+    """
+    보유 종목 파일 로드 -> {ticker: {'qty', 'avg_price', 'buy_date'}}
+    - JSON: {ticker: {qty, avg_price, buy_date}} 또는 [{ticker, qty, avg_price, buy_date}, ...]
+    - CSV: ticker, qty, avg_price[, buy_date] 컬럼
+    """
+    if path.lower().endswith('.csv'):
+        records = pd.read_csv(path, dtype={'ticker': str}).to_dict(orient='records')
+    else:
+        with open(path, encoding='utf-8') as f:
+            data = json.load(f)
+        records = [{'ticker': t, **info} for t, info in data.items()] if isinstance(data, dict) else data
+
+    portfolio = {}
+    for r in records:
+        ticker = str(r['ticker']).zfill(6) if str(r['ticker']).isdigit() else str(r['ticker'])
+        buy_date = r.get('buy_date')
+        portfolio[ticker] = {
+            'qty': int(r.get('qty', 0)),
+            'avg_price': float(r.get('avg_price', 0)),
+            'buy_date': None if buy_date is None or pd.isna(buy_date) else str(buy_date),
+        }
+    return portfolio
+
+
+class SignalScanner:
+    def __init__(self, db, strategy_params=None, universe_params=None):
+        """
+        "오늘 백테스터라면 무엇을 사고 팔까?"를 전체 기간 백테스트 없이 최신 거래일 하루만 평가.
+        - 랭킹: update_universe와 같은 유동성 필터 + RS_Score_Pre 내림차순 상위 TOP_N
+        - 매수: 랭킹 순서대로 check_buy_signal과 같은 조건 (미보유 종목)
+        - 매도: 보유 종목마다 check_sell_signal 그대로 적용 (사유 포함)
+        DB(market_data)에서 티커별 최근 봉 몇 개와 RS 기준일 종가만 읽으므로 전체 유니버스도 1초 안에 끝남.
+        :param db: DBManager
+        :param strategy_params: Strategy 파라미터 (Backtester와 동일)
+        :param universe_params: {'mode': 'STOCK' | 'ETF'} (유동성 기준)
+        """
+        self.db = db
+        self.strategy = Strategy(**(strategy_params or {}))
+        self.universe_params = universe_params or {}
+        mode = self.universe_params.get('mode', 'STOCK')
+        self.min_amount = Backtester.MIN_AMOUNT.get(mode, Backtester.MIN_AMOUNT['ETF'])
+
+    def rank(self, tickers=None, as_of=None):
+        """
+        기준일 RS 랭킹 (기준일에 봉이 있는 종목만)
+        :param as_of: 기준일 (기본: 저장된 마지막 거래일)
+        Returns: (기준일 Timestamp, DataFrame[Rank, RS Score, Amount_MA20, Close] index=ticker, 랭킹 순)
+        """
+        tickers = list(tickers) if tickers is not None else self.db.list_market_tickers()
+        as_of = pd.Timestamp(as_of) if as_of is not None else pd.Timestamp(datetime.date.today())
+
+        # 최근 21개 봉(1개월 수익률 + 20일 평균 거래대금) + 3/6/12개월 전 종가
+        window = self.db.load_tail_window(tickers, as_of, depth=RS_PERIODS[0] + 1, offsets=RS_PERIODS[1:])
+        indicators = pd.DataFrame({
+            'Date': window['last_date'],
+            'Close': window['close'].loc[0],
+            # rolling(20).mean(): 20개가 모두 있어야 값이 있음
+            'Amount_MA20': window['amount'].iloc[-20:].mean(skipna=False),
+            'RS Score': self._rs_scores(window),
+        }, index=window['close'].columns)
+        return self.rank_indicators(indicators, as_of)
+
+    def rank_indicators(self, indicators, as_of=None):
+        """
+        티커별 마지막 봉 지표(latest_indicators 형식)로 랭킹 (행 순서 = 동점 시 우선순위)
+        Returns: (기준일 Timestamp, 랭킹 DataFrame) - rank()와 같은 형식
+        """
+        if indicators.empty:
+            return pd.Timestamp(as_of), pd.DataFrame(columns=['Rank', 'RS Score', 'Amount_MA20', 'Close'])
+
+        # update_universe처럼 기준일(마지막 거래일)에 거래된 종목만
+        last_date = pd.to_datetime(indicators['Date'])
+        as_of = last_date.max()
+        rs = np.where((last_date == as_of).to_numpy(), indicators['RS Score'].to_numpy(dtype=float), np.nan)
+        amount_ma20 = indicators['Amount_MA20'].to_numpy(dtype=float)
+        columns = indicators.index
+        ranked = precompute_rankings(
+            pd.DataFrame([rs], index=[as_of], columns=columns),
+            pd.DataFrame([amount_ma20], index=[as_of], columns=columns),
+            self.min_amount, top_n=Backtester.TOP_N
+        )[as_of]
+
+        idx = columns.get_indexer(ranked)
+        ranking = pd.DataFrame({
+            'Rank': np.arange(1, len(ranked) + 1),
+            'RS Score': rs[idx],
+            'Amount_MA20': amount_ma20[idx],
+            'Close': indicators['Close'].to_numpy(dtype=float)[idx],
+        }, index=pd.Index(ranked, name='Ticker'))
+        return as_of, ranking
+
+    def _rs_scores(self, window):
+        """
+        load_tail_window 결과(offsets=RS_PERIODS[1:])의 마지막 봉 RS 점수
+        prepare_indicators와 같은 식/순서 (pct_change = close / close.shift(k) - 1)
+        """
+        close = window['close']
+        p_now = close.loc[0].to_numpy()
+        base = {RS_PERIODS[0]: close.loc[-RS_PERIODS[0]].to_numpy()}
+        base.update({k: window['close_at'][k].to_numpy() for k in RS_PERIODS[1:]})
+        r_1m, r_3m, r_6m, r_12m = (p_now / base[k] - 1 for k in RS_PERIODS)
+        w3, w6, w12, w1 = self.strategy.rs_weights
+        return ((w3 * r_3m) + (w6 * r_6m) + (w12 * r_12m) + (w1 * r_1m)) * 100
+
+    def latest_indicators(self, tickers, as_of):
+        """
+        티커별 as_of 이전(포함) 마지막 봉의 랭킹/매수 지표 (EOD 파이프라인의 증분 갱신용, 티커 묶음 단위 벡터 연산)
+        Returns: DataFrame[Date, Close, Amount_MA20, RS Score, MA_Short, MA_Long, Slope_Prev, Slope_Now, Buy_Signal]
+                 index=ticker (데이터 없는 티커 제외)
+        """
+        s = self.strategy
+        depth = max(s.ma_long, s.ma_short + 2, RS_PERIODS[0] + 1)
+        window = self.db.load_tail_window(tickers, as_of, depth=depth, offsets=RS_PERIODS[1:])
+        close = window['close']
+        ma_short = close.rolling(window=s.ma_short).mean()
+        ma_long = close.rolling(window=s.ma_long).mean()
+        return pd.DataFrame({
+            'Date': window['last_date'],
+            'Close': close.loc[0],
+            'Amount_MA20': window['amount'].iloc[-20:].mean(skipna=False),
+            'RS Score': self._rs_scores(window),
+            'MA_Short': ma_short.loc[0],
+            'MA_Long': ma_long.loc[0],
+            'Slope_Prev': ma_short.loc[-1] - ma_short.loc[-2],
+            'Slope_Now': ma_short.loc[0] - ma_short.loc[-1],
+            'Buy_Signal': s.buy_signal_from(close, ma_short, ma_long).loc[0],
+        }, index=close.columns)
+
+    def buy_reason(self, rank, rs_score, slope_prev, slope_now):
+        s = self.strategy
+        return (f"RS #{int(rank)} ({rs_score:.1f}), MA{s.ma_short} slope turned up "
+                f"({slope_prev:+.1f} -> {slope_now:+.1f}), Close > MA{s.ma_long}")
+
+    def buy_candidates(self, ranking, as_of, exclude=()):
+        """
+        랭킹 종목 중 기준일 매수 신호가 있는 종목 (랭킹 순)
+        Returns: DataFrame[Rank, RS Score, Close, MA_Short, MA_Long, Reason] index=ticker
+        """
+        tickers = [t for t in ranking.index if t not in set(exclude)]
+        indicators = self.latest_indicators(tickers, as_of) if tickers else None
+        return self.buy_from_indicators(ranking, indicators, exclude)
+
+    def buy_from_indicators(self, ranking, indicators, exclude=()):
+        """
+        랭킹 순서대로 Buy_Signal이 있는 종목 (indicators: latest_indicators 형식)
+        """
+        columns = ['Rank', 'RS Score', 'Close', 'MA_Short', 'MA_Long', 'Reason']
+        exclude = set(exclude)
+        rows = []
+        for ticker, item in ranking.iterrows():
+            if ticker in exclude or indicators is None or ticker not in indicators.index:
+                continue
+            ind = indicators.loc[ticker]
+            if not ind['Buy_Signal']:
+                continue
+            rows.append({
+                'Ticker': ticker,
+                'Rank': int(item['Rank']),
+                'RS Score': item['RS Score'],
+                'Close': ind['Close'],
+                'MA_Short': ind['MA_Short'],
+                'MA_Long': ind['MA_Long'],
+                'Reason': self.buy_reason(item['Rank'], item['RS Score'], ind['Slope_Prev'], ind['Slope_Now']),
+            })
+        return pd.DataFrame(rows, columns=['Ticker', *columns]).set_index('Ticker')
+
+    def check_holdings(self, portfolio, as_of, ranking=None):
+        """
+        보유 종목별 check_sell_signal 결과 (백테스터와 같은 함수로 판정)
+        Returns: DataFrame[Qty, Avg Price, Close, Return(%), Sell, Reason, In Ranking, Last Date] index=ticker
+        """
+        columns = ['Qty', 'Avg Price', 'Close', 'Return(%)', 'Sell', 'Reason', 'In Ranking', 'Last Date']
+        rows = []
+        # 마지막 봉의 MA/Max_Slope가 전체 이력 기준과 같아지는 구간만 로드
+        bars = self.strategy.signal_lookback_bars()
+        for ticker, info in portfolio.items():
+            df = self.db.load_market_tail(ticker, as_of, bars)
+            item = {'Ticker': ticker, 'Qty': info.get('qty', 0), 'Avg Price': info.get('avg_price', 0.0),
+                    'In Ranking': ranking is not None and ticker in ranking.index}
+            if df is None or df.empty:
+                rows.append({**item, 'Close': np.nan, 'Return(%)': np.nan, 'Sell': False, 'Reason': 'No data', 'Last Date': None})
+                continue
+
+            self.strategy.prepare_indicators(df)
+            is_sell, reason = self.strategy.check_sell_signal(df, buy_price=info.get('avg_price'))
+            curr_price = float(df['Close'].iloc[-1])
+            avg_price = float(info.get('avg_price') or 0)
+            # 기준일에 봉이 없으면(거래정지 등) 백테스터처럼 마지막 봉으로 판정 -> Last Date로 확인
+            rows.append({
+                **item,
+                'Close': curr_price,
+                'Return(%)': (curr_price / avg_price - 1) * 100 if avg_price else np.nan,
+                'Sell': bool(is_sell),
+                'Reason': reason,
+                'Last Date': df.index[-1],
+            })
+        return pd.DataFrame(rows, columns=['Ticker', *columns]).set_index('Ticker')
+
+    def scan(self, portfolio=None, tickers=None, as_of=None):
+        """
+        기준일 하루 신호 스캔 (Backtester의 하루 순서: 랭킹 -> 매도 -> 빈 슬롯만큼 매수)
+        Returns: {'as_of', 'ranking', 'sell', 'hold', 'buy', 'slots'}
+            buy['Within Slots']: 매도 후 남는 슬롯(MAX_POSITIONS) 안에 드는 후보
+        """
+        portfolio = portfolio or {}
+        as_of, ranking = self.rank(tickers, as_of)
+        holdings = self.check_holdings(portfolio, as_of, ranking)
+        buy = self.buy_candidates(ranking, as_of, exclude=portfolio)
+        return self.combine(as_of, ranking, holdings, buy)
+
+    @staticmethod
+    def combine(as_of, ranking, holdings, buy):
+        """
+        랭킹/보유 종목 판정/매수 후보 -> scan() 결과 형식 (매도 후 남는 슬롯 표시)
+        """
+        sell = holdings[holdings['Sell']]
+        hold = holdings[~holdings['Sell']]
+        slots = max(0, Backtester.MAX_POSITIONS - len(hold))
+        buy = buy.copy()
+        buy['Within Slots'] = np.arange(len(buy)) < slots
+        return {'as_of': as_of, 'ranking': ranking, 'sell': sell, 'hold': hold, 'buy': buy, 'slots': slots}
+
+
+def scan_result_to_dict(result):
+    """
+    scan() 결과를 JSON 직렬화 가능한 dict로 변환
+    """
+    def records(df):
+        out = df.reset_index().replace({np.nan: None})
+        for col in out.columns:
+            if pd.api.types.is_datetime64_any_dtype(out[col]):
+                out[col] = out[col].dt.strftime('%Y-%m-%d')
+        return out.to_dict(orient='records')
+
+    return {
+        'as_of': str(pd.Timestamp(result['as_of']).date()),
+        'slots': result['slots'],
+        'buy': records(result['buy']),
+        'sell': records(result['sell']),
+        'hold': records(result['hold']),
+        'ranking': records(result['ranking']),
+    }
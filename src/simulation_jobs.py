@@ -0,0 +1,192 @@
+import time
+import uuid
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import pandas as pd
+from .fingerprint import simulation_fingerprint, snapshot_version, load_memoized_simulation
+from .prepared_cache import get_prepared_cache
+
+ACTIVE_STATUSES = ('PENDING', 'RUNNING')
+
+
+def execute_simulation(db, start_date, end_date, strategy_params, universe_params, progress_callback=None, loader_factory=None, prepared_cache=None):
+    """
+    같은 fingerprint의 결과가 있으면 재사용, 없으면 백테스트 실행 후 저장.
+    :param loader_factory: loader_factory(start_date, end_date) -> DataLoader 호환 객체 (기본 DataLoader)
+    :param prepared_cache: PreparedUniverseCache (선택, 지표 계산된 유니버스 공유)
+    Returns: (simulation_id, equity_df, trades_df, portfolio). 결과가 비어 있으면 저장하지 않고 simulation_id=None
+    """
+    from .backtester import Backtester
+    if loader_factory is None:
+        from .data_loader import DataLoader
+        loader_factory = lambda start, end: DataLoader(start_date=start, end_date=end)
+
+    backtester = Backtester(
+        data_loader=loader_factory(start_date, end_date),
+        start_date=start_date,
+        end_date=end_date,
+        strategy_params=strategy_params,
+        universe_params=universe_params,
+        prepared_cache=prepared_cache
+    )
+    # 전체 DB가 아니라 이 실행이 쓰는 데이터(유니버스 종목 x 로드 기간 + 리스팅) 기준
+    # (백그라운드 다운로드가 다른 종목을 써도 재사용됨). 조회와 저장에 같은 스냅샷 사용
+    snapshot = backtester.take_data_snapshot()
+    fingerprint = simulation_fingerprint(start_date, end_date, strategy_params, universe_params, snapshot_version(snapshot))
+    memoized = load_memoized_simulation(db, fingerprint)
+    if memoized is not None:
+        return memoized
+
+    result_df = backtester.run(progress_callback=progress_callback)
+    trades_df = pd.DataFrame(backtester.trade_log)
+    if result_df.empty:
+        return None, result_df, trades_df, backtester.portfolio
+
+    sim_config = {
+        'start_date': start_date,
+        'end_date': end_date,
+        **strategy_params,
+        **universe_params
+    }
+    simulation_id = db.save_simulation(
+        sim_config, result_df, trades_df, fingerprint=fingerprint, portfolio=backtester.portfolio,
+        signals=backtester.get_signal_frames(), data_snapshot=snapshot
+    )
+    return simulation_id, result_df, trades_df, backtester.portfolio
+
+
+class SimulationJobManager:
+    def __init__(self, db, max_workers=2, loader_factory=None, progress_interval=0.5, prepared_cache=None,
+                 heartbeat_interval=30):
+        """
+        백테스트를 백그라운드 스레드 풀에서 실행하고 진행 상황을 simulation_jobs 테이블에 기록.
+        Streamlit 스크립트는 작업을 제출한 뒤 상태만 조회하므로 위젯 조작/새로고침에 영향받지 않음.
+        :param max_workers: 동시 실행 백테스트 수
+        :param loader_factory: execute_simulation 참고
+        :param progress_interval: 진행률 DB 기록 최소 간격 (초)
+        :param prepared_cache: 작업 간 공유할 PreparedUniverseCache (기본: 프로세스 공유 인스턴스)
+        :param heartbeat_interval: 대기/실행 중 작업의 updated_at 갱신 주기 (초). 이 주기의 4배 동안 갱신이 없는 작업은
+                                   죽은 프로세스의 작업으로 보고 다음 관리자 생성 시 FAILED 처리
+        """
+        self.db = db
+        self.prepared_cache = prepared_cache if prepared_cache is not None else get_prepared_cache()
+        self.loader_factory = loader_factory
+        self.progress_interval = progress_interval
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='simulation-job')
+        self._active = {} # 설정 키 -> job_id (같은 설정 중복 제출 방지)
+        self._lock = threading.Lock()
+        # 죽은 프로세스에서 실행 중이던 작업은 스레드와 함께 사라졌으므로 정리 (heartbeat가 끊긴 작업만)
+        self.db.fail_interrupted_simulation_jobs(stale_seconds=heartbeat_interval * 4)
+
+        self.heartbeat_interval = heartbeat_interval
+        self._stop = threading.Event()
+        self._heartbeat = threading.Thread(target=self._heartbeat_loop, name='simulation-job-heartbeat', daemon=True)
+        self._heartbeat.start()
+
+    def _heartbeat_loop(self):
+        while not self._stop.wait(self.heartbeat_interval):
+            with self._lock:
+                job_ids = list(self._active.values())
+            self.db.touch_simulation_jobs(job_ids)
+
+    def submit(self, start_date, end_date, strategy_params, universe_params):
+        """
+        Returns: job_id (같은 설정의 작업이 실행 중이면 그 작업 ID)
+        """
+        key = simulation_fingerprint(start_date, end_date, strategy_params, universe_params, None)
+        with self._lock:
+            job_id = self._active.get(key)
+            if job_id is not None:
+                return job_id
+
+            job_id = uuid.uuid4().hex
+            self.db.create_simulation_job(job_id, {
+                'start_date': start_date,
+                'end_date': end_date,
+                'strategy_params': strategy_params,
+                'universe_params': universe_params
+            })
+            self._active[key] = job_id
+
+        self._executor.submit(self._run_job, job_id, key, start_date, end_date, strategy_params, universe_params)
+        return job_id
+
+    def _run_job(self, job_id, key, start_date, end_date, strategy_params, universe_params):
+        self.db.update_simulation_job(job_id, status='RUNNING', stage='Loading data')
+        last_write = [0.0]
+
+        def on_progress(done, total):
+            now = time.time()
+            if done == 0:
+                # ETA는 데이터 준비를 제외한 일별 루프 속도로 계산
+                self.db.update_simulation_job(job_id, stage='Backtesting', done=0, total=total, started_at=now)
+                last_write[0] = now
+            elif done >= total or now - last_write[0] >= self.progress_interval:
+                self.db.update_simulation_job(job_id, done=done, total=total)
+                last_write[0] = now
+
+        try:
+            simulation_id, _, _, _ = execute_simulation(
+                self.db, start_date, end_date, strategy_params, universe_params,
+                progress_callback=on_progress, loader_factory=self.loader_factory,
+                prepared_cache=self.prepared_cache
+            )
+            if simulation_id is None:
+                raise RuntimeError("No result (no trading days or the result could not be saved)")
+            self.db.update_simulation_job(job_id, status='DONE', stage='Done', simulation_id=simulation_id)
+        except Exception as e:
+            print(f"[SimulationJob] {job_id} failed: {e}")
+            self.db.update_simulation_job(job_id, status='FAILED', stage='Failed', error=str(e))
+        finally:
+            with self._lock:
+                self._active.pop(key, None)
+
+    def get_status(self, job_id):
+        """
+        작업 상태 + 진행률(progress: 0~1) + 남은 시간 추정(eta_sec, 알 수 없으면 None)
+        """
+        job = self.db.get_simulation_job(job_id)
+        if job is None:
+            return None
+
+        done, total = job['done'] or 0, job['total'] or 0
+        job['progress'] = 1.0 if job['status'] == 'DONE' else (done / total if total else 0.0)
+        job['eta_sec'] = None
+        if job['status'] == 'RUNNING' and job['started_at'] and 0 < done < total:
+            elapsed = time.time() - job['started_at']
+            job['eta_sec'] = elapsed / done * (total - done)
+        return job
+
+    def wait(self, job_id, timeout=None, poll_interval=0.2):
+        """
+        작업 종료(DONE/FAILED)까지 대기 (CLI/테스트용). Returns: 최종 상태 dict
+        """
+        deadline = None if timeout is None else time.time() + timeout
+        while True:
+            job = self.get_status(job_id)
+            if job is None or job['status'] not in ACTIVE_STATUSES:
+                return job
+            if deadline is not None and time.time() >= deadline:
+                return job
+            time.sleep(poll_interval)
+
+    def shutdown(self, wait=True):
+        self._executor.shutdown(wait=wait)
+        self._stop.set()
+
+
+# 프로세스 전역 작업 관리자 레지스트리 (Streamlit 세션/rerun 사이에서 공유)
+_MANAGERS = {}
+_MANAGERS_LOCK = threading.Lock()
+
+
+def get_simulation_job_manager(db, max_workers=2):
+    """
+    DB 파일 경로별로 하나의 SimulationJobManager를 공유
+    """
+    with _MANAGERS_LOCK:
+        manager = _MANAGERS.get(db.db_path)
+        if manager is None:
+            manager = SimulationJobManager(db, max_workers=max_workers)
+            _MANAGERS[db.db_path] = manager
+        return manager
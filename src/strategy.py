@@ -1,6 +1,5 @@
 import numpy as np
 import pandas as pd
-from scipy.stats import linregress
 
 class Strategy:
     def __init__(self, ma_short=20, ma_long=60, sell_slope_multiplier=1.5, rs_weights=(0.4, 0.3, 0.2, 0.1), slope_lookback=60, use_trend_break=True):
@@ -63,6 +62,13 @@ class Strategy:
         df['RS_Score_Pre'] = (w3 * df['R_3m']) + (w6 * df['R_6m']) + (w12 * df['R_12m']) + (w1 * df['R_1m'])
         df['RS_Score_Pre'] = df['RS_Score_Pre'] * 100
 
+    def signal_lookback_bars(self) -> int:
+        """
+        마지막 봉의 check_buy_signal / check_sell_signal / ATR(14)이 전체 이력으로 계산한 값과 같아지는 최소 봉 수
+        (MA_Long, MA_Short 기울기 3일, 5일 Slope + Max_Slope 구간)
+        """
+        return max(self.ma_long, self.ma_short + 2, self.slope_lookback + 5, 15)
+
     def get_slope(self, series: pd.Series, window: int = 5) -> float:
          # Deprecated
          pass
@@ -129,6 +135,39 @@ class Strategy:
         # Fallback
         return False
 
+    def compute_buy_signal_series(self, df: pd.DataFrame) -> pd.Series:
+        """
+        check_buy_signal을 전체 기간에 대해 벡터화한 버전 (각 날짜까지 슬라이싱했을 때와 동일한 결과)
+        """
+        return self.buy_signal_from(df['Close'], df['MA_Short'], df['MA_Long'])
+
+    @staticmethod
+    def buy_signal_from(close, ma_short, ma_long):
+        """
+        매수 신호 벡터 연산 (Series 또는 날짜 x 티커 패널 모두 지원)
+        """
+        slope_now = ma_short - ma_short.shift(1)
+        slope_prev = ma_short.shift(1) - ma_short.shift(2)
+
+        # MA_Long이 NaN이면 check_buy_signal처럼 추세 조건은 통과로 취급
+        above_long = ~(close <= ma_long)
+        return above_long & (slope_prev <= 0) & (slope_now > 0)
+
+    def compute_sell_signal_series(self, df: pd.DataFrame) -> pd.Series:
+        """
+        check_sell_signal을 전체 기간에 대해 벡터화한 버전 (매도 사유 문자열 제외)
+        """
+        sell = pd.Series(False, index=df.index)
+        if self.use_trend_break and 'MA_Short' in df.columns:
+            sell |= df['Close'] < df['MA_Short']
+
+        if 'Slope_Pct' in df.columns and 'Max_Slope_60d' in df.columns:
+            slope_current = df['Slope_Pct']
+            max_up_slope = df['Max_Slope_60d']
+            # NaN 비교는 False이므로 check_sell_signal의 NaN 처리와 동일
+            sell |= (slope_current < 0) & (max_up_slope != 0) & (slope_current.abs() > max_up_slope * self.sell_slope_multiplier)
+        return sell
+
     def check_sell_signal(self, df: pd.DataFrame, buy_price: float = None) -> tuple:
         """
         매도 신호:
@@ -1,11 +1,83 @@
 import streamlit as st
+import numpy as np
 import pandas as pd
 from plotly.subplots import make_subplots
 import plotly.graph_objects as go
 from src.data_loader import DataLoader
 from src.strategy import Strategy
+from src.ui.chart_utils import DEFAULT_MAX_POINTS, downsample_indices, downsample_series, ohlc_for_budget
 
-def render_analysis(trades, portfolio, start_dt, end_dt, strategy_params, selected_from_table, selected_from_table_name, loader):
+# trace당 최대 점 개수 (10년 일봉 ≈ 2,500개 -> 주봉/LTTB로 축소)
+MAX_POINTS = DEFAULT_MAX_POINTS
+
+@st.cache_data(ttl=600, show_spinner=False, max_entries=50)
+def load_analysis_frame(_loader, ticker, strategy_params, start_dt, end_dt, data_version):
+    """
+    종목 OHLCV + 지표 (시뮬레이션 기간만). 같은 종목/파라미터 재선택 시 재계산하지 않음
+    data_version: 시장 데이터가 바뀌면 캐시 무효화
+    """
+    df_stock = _loader.get_stock_data(ticker)
+    if df_stock is None:
+        return None
+
+    # 1. Calc Indicators on FULL Data (incl. Warm-up)
+    temp_strategy = Strategy(**strategy_params)
+    temp_strategy.prepare_indicators(df_stock) # Calculate on full history
+
+    # Calculate MA Slope / engine signals on FULL data to exist before slicing
+    if 'MA_Short' in df_stock.columns:
+        df_stock['MA_Slope'] = df_stock['MA_Short'].diff()
+        df_stock['Buy_Signal'] = temp_strategy.compute_buy_signal_series(df_stock)
+    df_stock['Sell_Signal'] = temp_strategy.compute_sell_signal_series(df_stock)
+
+    # Filter df_stock to the actual simulation period for visualization
+    return df_stock[(df_stock.index >= pd.to_datetime(start_dt)) & (df_stock.index <= pd.to_datetime(end_dt))].copy()
+
+def build_signal_frame(df_view, strategy_params):
+    """
+    일별 매수/매도 조건과 차트 색상/툴팁 값을 벡터 연산으로 계산 (PASS/FAIL 표기).
+    최종 신호는 엔진이 계산한 Buy_Signal/Sell_Signal 컬럼을 그대로 사용.
+    Returns: DataFrame [Slope_Pct, Threshold, MA_Slope, Trend, Turn, RS, Signal, Color, HoverColor]
+    """
+    n = len(df_view)
+    nan = np.full(n, np.nan)
+    close = df_view['Close'].to_numpy(dtype=float)
+    ma_long = df_view['MA_Long'].to_numpy(dtype=float) if 'MA_Long' in df_view.columns else nan
+    slope_pct = df_view['Slope_Pct'].to_numpy(dtype=float) if 'Slope_Pct' in df_view.columns else nan
+    max_slope = df_view['Max_Slope_60d'].to_numpy(dtype=float) if 'Max_Slope_60d' in df_view.columns else nan
+    ma_slope = df_view['MA_Slope'].to_numpy(dtype=float) if 'MA_Slope' in df_view.columns else np.zeros(n)
+    rs = df_view['RS_Score_Pre'].fillna(0).to_numpy(dtype=float) if 'RS_Score_Pre' in df_view.columns else np.zeros(n)
+
+    is_buy = df_view['Buy_Signal'].to_numpy(dtype=bool) if 'Buy_Signal' in df_view.columns else np.zeros(n, dtype=bool)
+    is_sell = df_view['Sell_Signal'].to_numpy(dtype=bool) if 'Sell_Signal' in df_view.columns else np.zeros(n, dtype=bool)
+
+    if 'Sell_Threshold' in df_view.columns:
+        threshold = df_view['Sell_Threshold'].to_numpy(dtype=float)
+    else:
+        threshold = -(max_slope * strategy_params['sell_slope_multiplier'])
+    # Strategy.buy_signal_from과 동일: MA_Long이 NaN이면 추세 조건 통과
+    trend_ok = ~(close <= ma_long)
+    # 음수/0 -> 양수 전환 (첫날은 이전 값 0 기준, NaN 비교는 False)
+    prev_slope = np.concatenate([[0.0], ma_slope[:-1]])
+    turn_ok = (ma_slope > 0) & (prev_slope <= 0)
+
+    signal = np.where(is_buy, 'BUY', np.where(is_sell, 'SELL', '-'))
+    return pd.DataFrame({
+        'Slope_Pct': slope_pct,
+        'Threshold': threshold,
+        'MA_Slope': ma_slope,
+        'Trend': np.where(trend_ok, 'PASS', 'FAIL'),
+        'Turn': np.where(turn_ok, 'PASS', 'FAIL'),
+        'RS': np.char.mod('%.1f', rs),
+        'Signal': signal,
+        'Color': np.where(ma_slope > 0, '#EF5350', '#2962FF'),
+        'HoverColor': np.select([signal == 'BUY', signal == 'SELL'], ['#EF5350', '#2962FF'], '#FFFFFF'),
+    }, index=df_view.index)
+
+def render_analysis(trades, portfolio, start_dt, end_dt, strategy_params, selected_from_table, selected_from_table_name, loader, simulation_id=None):
+    """
+    :param simulation_id: 표시 중인 시뮬레이션 ID. 저장된 엔진 지표/신호가 있으면 재계산 없이 사용
+    """
     st.markdown("<br>", unsafe_allow_html=True)
     st.markdown("#### Individual Stock Analysis")
     # st.caption("Select a stock from the menu below or click a row in the Portfolio tab.")
@@ -76,29 +148,36 @@ def render_analysis(trades, portfolio, start_dt, end_dt, strategy_params, select
         if selected_option:
             selected_ticker = selected_option.split(" | ")[0]
             
-            # Load OHLCV Data
-            # Use passed loader from app.py
-            df_stock = loader.get_stock_data(selected_ticker)
+            # 1) 시뮬레이션에 저장된 엔진 지표/신호 (백테스트가 실제로 본 값)
+            df_view = loader.db.get_simulation_signals(simulation_id, selected_ticker) if simulation_id is not None else None
+            if df_view is None:
+                # 2) 이전 버전 결과: OHLCV + 지표 재계산 (cached per ticker/params)
+                df_view = load_analysis_frame(loader, selected_ticker, strategy_params, str(start_dt), str(end_dt), loader.db.get_market_data_version())
             
-            if df_stock is not None:
-                # 1. Calc Indicators on FULL Data (incl. Warm-up)
-                # Ensure strategy_params has correct keys
-                # strategy_params passed from main should be dict
-                temp_strategy = Strategy(**strategy_params)
-                temp_strategy.prepare_indicators(df_stock) # Calculate on full history
-                
-                # Calculate MA Slope on FULL data to exist before slicing
-                if 'MA_Short' in df_stock.columns:
-                    df_stock['MA_Slope'] = df_stock['MA_Short'].diff()
-                
-                # Filter df_stock to the actual simulation period for visualization
-                df_view = df_stock[(df_stock.index >= pd.to_datetime(start_dt)) & (df_stock.index <= pd.to_datetime(end_dt))].copy()
-
+            if df_view is not None:
                 if not df_view.empty:
-                    # Strategy Indicator Calculation for Visualization
-                    slope_pct = df_view['Slope_Pct']
-                    threshold = - (df_view['Max_Slope_60d'] * strategy_params['sell_slope_multiplier'])
-                    ma_slope = df_view.get('MA_Slope', pd.Series([0]*len(df_view), index=df_view.index))
+                    # Zoom: 보이는 구간만 점 예산(MAX_POINTS) 내에서 그리므로 좁힐수록 일봉 해상도로 복원
+                    if len(df_view) > MAX_POINTS:
+                        first_day, last_day = df_view.index[0].date(), df_view.index[-1].date()
+                        window = st.slider(
+                            "Zoom (date range)",
+                            min_value=first_day, max_value=last_day,
+                            value=(first_day, last_day),
+                            format="YYYY-MM-DD",
+                            key=f"analysis_window_{selected_ticker}"
+                        )
+                        in_window = (df_view.index >= pd.Timestamp(window[0])) & (df_view.index < pd.Timestamp(window[1]) + pd.Timedelta(days=1))
+                        df_view = df_view[in_window]
+                        if df_view.empty:
+                            st.warning("No trading days in the selected range.")
+                            return
+
+                    # Strategy Indicator Calculation for Visualization (daily resolution, vectorized)
+                    signals = build_signal_frame(df_view, strategy_params)
+
+                    # 긴 구간은 캔들을 주봉/월봉으로, 라인은 LTTB로 축소 (매매 신호가 난 날은 유지)
+                    df_ohlc, candle_unit = ohlc_for_budget(df_view, MAX_POINTS)
+                    is_signal = signals['Signal'].to_numpy() != '-'
 
                     # Create Subplots (Price + Indicators)
                     
@@ -108,7 +187,7 @@ def render_analysis(trades, portfolio, start_dt, end_dt, strategy_params, select
                         vertical_spacing=0.05,
                         row_heights=[0.5, 0.25, 0.25],
                         subplot_titles=(
-                            f"{selected_option} Price", 
+                            f"{selected_option} Price" + ("" if candle_unit == 'Daily' else f" ({candle_unit})"),
                             "Sell Logic (Price Slope vs Threshold)",
                             "Buy Logic (MA20 Slope Turn)"
                         )
@@ -116,11 +195,11 @@ def render_analysis(trades, portfolio, start_dt, end_dt, strategy_params, select
 
                     # 1. Price Chart (Row 1)
                     fig_stock.add_trace(go.Candlestick(
-                        x=df_view.index,
-                        open=df_view['Open'],
-                        high=df_view['High'],
-                        low=df_view['Low'],
-                        close=df_view['Close'],
+                        x=df_ohlc.index,
+                        open=df_ohlc['Open'],
+                        high=df_ohlc['High'],
+                        low=df_ohlc['Low'],
+                        close=df_ohlc['Close'],
                         name='OHLC',
                         increasing=dict(line=dict(color='#EF5350', width=1), fillcolor='#FFFFFF'),
                         decreasing=dict(line=dict(color='#2962FF', width=1), fillcolor='#FFFFFF')
@@ -128,17 +207,20 @@ def render_analysis(trades, portfolio, start_dt, end_dt, strategy_params, select
 
                     # Add MA Long (Trend Filter)
                     if 'MA_Long' in df_view.columns:
-                        fig_stock.add_trace(go.Scatter(
-                            x=df_view.index, y=df_view['MA_Long'],
+                        ma_long = downsample_series(df_view['MA_Long'], MAX_POINTS)
+                        fig_stock.add_trace(go.Scattergl(
+                            x=ma_long.index, y=ma_long.values,
                             mode='lines', line=dict(color='#9C27B0', width=1),
                             name=f"MA {strategy_params['ma_long']} (Trend)"
                         ), row=1, col=1)
 
                     # Trades (Row 1)
                     stock_trades = trades[trades['Ticker'] == selected_ticker]
+                    trade_dates = pd.to_datetime(stock_trades['Date'])
+                    stock_trades = stock_trades[(trade_dates >= df_view.index[0]) & (trade_dates <= df_view.index[-1])]
                     buys = stock_trades[stock_trades['Action'] == 'BUY']
                     if not buys.empty:
-                        fig_stock.add_trace(go.Scatter(
+                        fig_stock.add_trace(go.Scattergl(
                             x=buys['Date'], y=buys['Price'] * 0.98,
                             mode='markers', marker=dict(symbol='triangle-up', size=12, color='#E91E63'),
                             name='Buy'
@@ -146,76 +228,36 @@ def render_analysis(trades, portfolio, start_dt, end_dt, strategy_params, select
                     
                     sells = stock_trades[stock_trades['Action'] == 'SELL']
                     if not sells.empty:
-                        fig_stock.add_trace(go.Scatter(
+                        fig_stock.add_trace(go.Scattergl(
                             x=sells['Date'], y=sells['Price'] * 1.02,
                             mode='markers', marker=dict(symbol='triangle-down', size=12, color='#2196F3'),
                             name='Sell'
                         ), row=1, col=1)
 
                     # 2. Sell Indicator Chart (Row 2)
-                    fig_stock.add_trace(go.Scatter(
-                        x=df_view.index, y=slope_pct,
+                    slope_pct = downsample_series(signals['Slope_Pct'], MAX_POINTS, keep=is_signal)
+                    fig_stock.add_trace(go.Scattergl(
+                        x=slope_pct.index, y=slope_pct.values,
                         mode='lines', line=dict(color='#607D8B', width=1),
                         name='Price Slope (%)'
                     ), row=2, col=1)
                     
-                    fig_stock.add_trace(go.Scatter(
-                        x=df_view.index, y=threshold,
+                    threshold = downsample_series(signals['Threshold'], MAX_POINTS, keep=is_signal)
+                    fig_stock.add_trace(go.Scattergl(
+                        x=threshold.index, y=threshold.values,
                         mode='lines', line=dict(color='#FF5252', width=1, dash='dash'),
                         name='Sell Threshold'
                     ), row=2, col=1)
                     
                     # 3. Buy Indicator Chart (Row 3)
-                    # Prepare Tooltip Data (Standardized to PASS/FAIL)
-                    cond_trend = [
-                        "PASS" if (p > m) else "FAIL" 
-                        for p, m in zip(df_view['Close'], df_view['MA_Long'])
-                    ]
-                    
-                    cond_turn = []
-                    prev_val = 0
-                    for curr in ma_slope:
-                        if curr > 0 and prev_val <= 0:
-                            cond_turn.append("PASS")
-                        else:
-                            cond_turn.append("FAIL")
-                        prev_val = curr
-
-                    rs_scores = df_view.get('RS_Score_Pre', pd.Series([0]*len(df_view))).fillna(0).tolist()
-                    rs_display = [f"{r:.1f}" for r in rs_scores]
-
-                    is_sell_vector = [s < t for s, t in zip(slope_pct, threshold)] 
-                    
-                    final_signal = []
-                    for t, tr, is_sell in zip(cond_trend, cond_turn, is_sell_vector):
-                        if t == "PASS" and tr == "PASS":
-                            final_signal.append("BUY")
-                        elif is_sell:
-                            final_signal.append("SELL")
-                        else:
-                            final_signal.append("-")
-                    
-                    colors = ['#EF5350' if v > 0 else '#2962FF' for v in ma_slope]
-                    
-                    hover_bg_colors = []
-                    for sig in final_signal:
-                        if sig == "BUY":
-                            hover_bg_colors.append("#EF5350") 
-                        elif sig == "SELL": 
-                            hover_bg_colors.append("#2962FF") 
-                        else:
-                            hover_bg_colors.append("#FFFFFF") 
-
-                    custom_data = [
-                        [t, tr, r, sig] 
-                        for t, tr, r, sig in zip(cond_trend, cond_turn, rs_display, final_signal)
-                    ]
+                    # Tooltip/colour arrays are built once for the whole window, then sliced to the plotted points
+                    bars = signals.iloc[downsample_indices(signals.index, signals['MA_Slope'].to_numpy(dtype=float), MAX_POINTS, keep=is_signal)]
 
                     fig_stock.add_trace(go.Bar(
-                        x=df_view.index, y=ma_slope,
-                        marker_color=colors,
+                        x=bars.index, y=bars['MA_Slope'],
+                        marker_color=bars['Color'].to_numpy(),
                         name='MA20 Slope',
-                        customdata=custom_data,
+                        customdata=bars[['Trend', 'Turn', 'RS', 'Signal']].to_numpy(),
                         hovertemplate=(
                             "<b>Date</b>: %{x|%Y-%m-%d}<br>" +
                             "<b>MA Slope</b>: %{y:.4f}<br><br>" +
@@ -224,16 +266,12 @@ def render_analysis(trades, portfolio, start_dt, end_dt, strategy_params, select
                             "<b>3. RS Score</b>: %{customdata[2]}<br>" +
                             "<b>4. Final Signal</b>: %{customdata[3]}<br>" +
                             "<extra></extra>"
-                        )
-                    ), row=3, col=1)
-
-                    fig_stock.update_traces(
-                        selector=dict(name='MA20 Slope'),
+                        ),
                         hoverlabel=dict(
-                            bgcolor=hover_bg_colors,
+                            bgcolor=bars['HoverColor'].to_numpy(),
                             font=dict(color='black') 
                         )
-                    )
+                    ), row=3, col=1)
 
                     fig_stock.update_layout(
                         height=800, 
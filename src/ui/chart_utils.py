@@ -0,0 +1,109 @@
+import numpy as np
+import pandas as pd
+
+# 브라우저로 보내는 trace당 최대 점 개수 (넘으면 라인은 LTTB, 캔들은 주봉/월봉으로 축소)
+DEFAULT_MAX_POINTS = 1500
+
+# 캔들 집계 단계: (표시 이름, resample 규칙)
+OHLC_RULES = [('Daily', None), ('Weekly', 'W-FRI'), ('Monthly', 'ME')]
+
+
+def _as_float_x(x):
+    # DatetimeIndex는 정수 타임스탬프로 (LTTB 면적 비교는 x 스케일과 무관)
+    if isinstance(x, pd.DatetimeIndex):
+        return x.asi8.astype(float)
+    return np.asarray(x, dtype=float)
+
+
+def lttb_indices(x, y, n_out):
+    """
+    Largest-Triangle-Three-Buckets 다운샘플링. 첫/마지막 점은 항상 포함.
+    :param x: 정렬된 x 값 (숫자 배열 또는 DatetimeIndex)
+    :param y: y 값 (NaN 없음)
+    :param n_out: 남길 점 개수
+    Returns: 선택된 위치 인덱스 (오름차순 np.ndarray)
+    """
+    x = _as_float_x(x)
+    y = np.asarray(y, dtype=float)
+    n = len(y)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    # 첫/마지막 점을 제외한 n-2개 점을 n_out-2개 버킷으로 분할
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    selected = np.empty(n_out, dtype=np.int64)
+    selected[0] = 0
+    selected[-1] = n - 1
+
+    a = 0
+    for i in range(n_out - 2):
+        lo, hi = edges[i], edges[i + 1]
+        if i + 2 < len(edges):
+            next_lo, next_hi = edges[i + 1], edges[i + 2]
+        else:
+            next_lo, next_hi = n - 1, n
+        cx = x[next_lo:next_hi].mean()
+        cy = y[next_lo:next_hi].mean()
+
+        # 이전 선택점 a, 다음 버킷 평균 c와 만드는 삼각형 넓이가 최대인 점 선택
+        area = np.abs((x[a] - cx) * (y[lo:hi] - y[a]) - (x[a] - x[lo:hi]) * (cy - y[a]))
+        a = lo + int(np.argmax(area))
+        selected[i + 1] = a
+    return selected
+
+
+def downsample_indices(x, y, max_points=DEFAULT_MAX_POINTS, keep=None):
+    """
+    라인 trace용 표시 인덱스. NaN 구간은 LTTB 대상에서 제외하고 keep 위치(매매 신호 등)는 항상 포함.
+    :param keep: 반드시 남길 위치의 bool 마스크 (선택)
+    Returns: 위치 인덱스 (오름차순 np.ndarray)
+    """
+    y = np.asarray(y, dtype=float)
+    n = len(y)
+    if n <= max_points:
+        return np.arange(n)
+
+    finite = np.flatnonzero(np.isfinite(y))
+    x = _as_float_x(x)
+    picked = finite[lttb_indices(x[finite], y[finite], max_points)] if len(finite) else finite
+    if keep is not None:
+        picked = np.union1d(picked, np.flatnonzero(np.asarray(keep, dtype=bool)))
+    return picked
+
+
+def downsample_series(series, max_points=DEFAULT_MAX_POINTS, keep=None):
+    """
+    downsample_indices를 적용한 Series 반환 (인덱스 유지)
+    """
+    if len(series) <= max_points:
+        return series
+    return series.iloc[downsample_indices(series.index, series.to_numpy(dtype=float), max_points, keep)]
+
+
+def aggregate_ohlc(df, rule):
+    """
+    일봉 OHLCV를 주봉/월봉으로 집계. 각 봉의 날짜는 해당 기간의 마지막 거래일
+    (같은 차트의 라인/매매 마커와 x축이 어긋나지 않도록).
+    :param rule: pandas resample 규칙 (예: 'W-FRI', 'ME')
+    """
+    agg = {'Open': 'first', 'High': 'max', 'Low': 'min', 'Close': 'last'}
+    if 'Volume' in df.columns:
+        agg['Volume'] = 'sum'
+    resampler = df[list(agg)].resample(rule)
+    out = resampler.agg(agg)
+    out.index = pd.Series(df.index, index=df.index).resample(rule).last()
+    return out[out.index.notna()].dropna(subset=['Close'])
+
+
+def ohlc_for_budget(df, max_points=DEFAULT_MAX_POINTS):
+    """
+    봉 개수가 max_points 이하가 되는 가장 세밀한 단위로 집계 (월봉도 넘으면 월봉 사용).
+    Returns: (집계된 DataFrame, 단위 이름)
+    """
+    if len(df) <= max_points:
+        return df, OHLC_RULES[0][0]
+    for label, rule in OHLC_RULES[1:]:
+        out = aggregate_ohlc(df, rule)
+        if len(out) <= max_points:
+            return out, label
+    return out, label
@@ -1,50 +1,75 @@
 import streamlit as st
 import pandas as pd
 import plotly.express as px
-from datetime import datetime, timedelta
+import plotly.graph_objects as go
+from datetime import timedelta
 from src.constants import TIGER_ETF_UNIVERSE
+from src.lookthrough import LookThroughEngine, daily_position_values, etf_categories
+from src.panel import HORIZON_DAYS, horizon_returns, latest_rankings
+from src.ui.chart_utils import DEFAULT_MAX_POINTS, downsample_indices
 
-@st.cache_data(ttl=3600)
-def get_cached_etf_ranking(_data_loader, _strategy, tickers):
+def load_close_amount_panel(_data_loader, tickers):
     """
-    ETF 랭킹 분석 결과를 캐싱합니다. (1시간 유효)
+    누락/오래된 티커만 다운로드한 뒤 (날짜 x 티커) 종가/거래대금 패널을 한 번에 로드.
+    티커별 전체 DataFrame을 만들지 않음.
     """
-    # 실제 데이터 로드 및 RS 계산
-    df_dict = _data_loader.preload_data_concurrently(tickers)
-    # ETF는 10억 기준 유동성 필터 적용 가능
-    df_dict = _data_loader.apply_liquidity_filter(df_dict, min_amount=1_000_000_000)
-    return df_dict
-
-@st.cache_data(ttl=3600)
-def calculate_component_performance(_data_loader, pdf_tickers):
+    # 중복/코드 없는 항목(현금 등) 제외
+    available = _data_loader.ensure_market_data([t for t in dict.fromkeys(tickers) if t])
+    start, end = str(_data_loader.data_start_date.date()), str(_data_loader.end_date.date())
+    panels = _data_loader.db.load_market_panel(available, start, end, columns=('close', 'amount'))
+    return panels['close'], panels['amount']
+
+def panel_period(data_loader):
     """
-    ETF 구성 종목의 기간별 수익률을 계산합니다.
+    load_close_amount_panel이 읽는 기간 (캐시 키용 - _data_loader는 해시되지 않으므로 기간을 따로 넘김)
     """
-    df_dict = _data_loader.preload_data_concurrently(pdf_tickers)
-    results = {}
-    
-    for ticker, df in df_dict.items():
-        if df is None or len(df) < 60:
-            results[ticker] = {w: 0.0 for w in [1, 2, 4, 8, 12]}
-            continue
-            
-        last_price = df['Close'].iloc[-1]
-        
-        # 주 단위 영업일 기준 (1주=5일, 2주=10일, 4주=20일, 8주=40일, 12주=60일)
-        perf = {}
-        for weeks, days in [(1, 5), (2, 10), (4, 20), (8, 40), (12, 60)]:
-            try:
-                base_price = df['Close'].iloc[-(days + 1)]
-                perf[weeks] = round(((last_price - base_price) / base_price) * 100, 1)
-            except IndexError:
-                perf[weeks] = 0.0
-        results[ticker] = perf
-    return results
+    return str(data_loader.data_start_date.date()), str(data_loader.end_date.date())
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def calculate_component_performance(_data_loader, pdf_tickers, period, data_version):
+    """
+    ETF 구성 종목의 기간별 수익률(1/2/4/8/12주)을 종가 패널에서 벡터 연산으로 계산합니다.
+    캐시 키는 티커 튜플 + period(panel_period) + data_version (기간/데이터가 바뀌면 무효화)
+    Returns: DataFrame (index=티커, columns=주) - 데이터 없는 종목은 0.0
+    """
+    close, _ = load_close_amount_panel(_data_loader, pdf_tickers)
+    return horizon_returns(close).reindex(list(pdf_tickers), fill_value=0.0)
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def build_etf_rs_table(_data_loader, _strategy, strategy_key, tickers, period, data_version):
+    """
+    ETF RS 랭킹 테이블 (카테고리/전략 파라미터별 캐싱)
+    캐시 키는 작은 값만 사용: strategy_key(지표 파라미터), 티커 튜플, period(panel_period), data_version
+    """
+    universe = _data_loader.get_etf_universe()
+    cat_info = _data_loader.get_etf_category_info()
+    close, amount = load_close_amount_panel(_data_loader, tickers)
+    if close.empty:
+        return pd.DataFrame()
+
+    # 티커별 마지막 거래일 기준 RS/슬로프/거래대금
+    latest = latest_rankings(_strategy, close, amount)
+    if latest.empty:
+        return pd.DataFrame()
+
+    rs_df = pd.DataFrame({
+        "Ticker": latest.index,
+        "Name": [universe[t] for t in latest.index],
+        "Category": [cat_info[t] for t in latest.index],
+        "RS Score": latest['RS Score'].round(2).to_numpy(),
+        "Slope(Up)": latest['Slope'].round(4).to_numpy(),
+        "MA20_Amount": (latest['Amount_MA20'] / 1e8).round(1).to_numpy() # 억 단위
+    })
+    return rs_df.sort_values(by="RS Score", ascending=False)
 
 def render_etf_analysis(data_loader, strategy):
     st.markdown("## ETF Drill-down Analysis")
     st.caption("TIGER ETF 유니버스 기반 모멘텀 분석 및 상위 구성 종목 성과 추적")
 
+    # 구성 종목(PDF)은 DB에서 바로 읽고, 없거나 오래되었으면 백그라운드에서만 갱신
+    pdf_service = data_loader.get_etf_pdf_service()
+    pdf_service.ensure_fresh()
+
     # 1. 카테고리 선택
     categories = ["전체"] + list(TIGER_ETF_UNIVERSE.keys())
     sel_cat = st.selectbox("카테고리 선택", categories)
@@ -63,37 +88,14 @@ def render_etf_analysis(data_loader, strategy):
     st.markdown("### ETF RS Ranking")
     
     with st.spinner("Analyzing ETF Momentum..."):
-        df_dict = get_cached_etf_ranking(data_loader, strategy, display_tickers)
-        
-        # 최신 날짜 기준 RS 계산
-        rs_results = []
-        for ticker in display_tickers:
-            df = df_dict.get(ticker)
-            if df is None or df.empty: continue
-            
-            # 마지막 거래일 기준
-            last_idx = df.index[-1]
-            rs_score = strategy.calculate_rs_score(df)
+        strategy_key = (strategy.ma_short, strategy.ma_long, tuple(strategy.rs_weights), strategy.slope_lookback)
+        rs_df = build_etf_rs_table(data_loader, strategy, strategy_key, tuple(display_tickers), panel_period(data_loader),
+                                   data_loader.db.get_market_data_version())
             
-            # 슬로프 계산
-            up_slope, slope_pct, max_up = strategy.calculate_slopes(df, last_idx, lookback=60)
-            
-            item = {
-                "Ticker": ticker,
-                "Name": universe[ticker],
-                "Category": cat_info[ticker],
-                "RS Score": round(rs_score, 2),
-                "Slope(Up)": round(up_slope, 4),
-                "MA20_Amount": round(df.at[last_idx, 'Amount_MA20'] / 1e8, 1) # 억 단위
-            }
-            rs_results.append(item)
-            
-        if not rs_results:
+        if rs_df.empty:
              st.warning("데이터가 부족하거나 유동성 조건에 부합하는 ETF가 없습니다.")
              return
 
-        rs_df = pd.DataFrame(rs_results).sort_values(by="RS Score", ascending=False)
-
     # 테이블 표시
     st.dataframe(
         rs_df,
@@ -119,34 +121,22 @@ def render_etf_analysis(data_loader, strategy):
         
         st.caption(f"**{selected_etf} ({etf_ticker})** 의 상위 10개 종목 성과 (1주~12주)")
         
-        # 실제 구성 종목 수익률 계산
-        pdf_tickers = [stock['ticker'] for stock in pdf]
-        perf_data = calculate_component_performance(data_loader, pdf_tickers)
-        
-        pdf_results = []
-        for stock in pdf:
-            ticker = stock['ticker']
-            perf = perf_data.get(ticker, {1:0, 2:0, 4:0, 8:0, 12:0})
-            
-            pdf_results.append({
-                "종목": stock['name'],
-                "비중(%)": stock['weight'],
-                "1주": perf.get(1, 0.0),
-                "2주": perf.get(2, 0.0),
-                "4주": perf.get(4, 0.0),
-                "8주": perf.get(8, 0.0),
-                "12주": perf.get(12, 0.0)
-            })
-            
-        if not pdf_results:
-             st.warning("선택한 ETF의 구성 종목 정보를 가져올 수 없습니다. (API 응답 없음)")
+        if not pdf:
+             if pdf_service.is_refreshing():
+                 st.info("ETF 구성 종목을 백그라운드에서 수집 중입니다. 잠시 후 다시 확인하세요.")
+             else:
+                 st.warning("선택한 ETF의 구성 종목 정보를 가져올 수 없습니다. (API 응답 없음)")
              return
 
-        pdf_df = pd.DataFrame(pdf_results)
-        
-        # 컬럼 존재 여부 최종 확인
-        required_cols = ['1주', '2주', '4주', '8주', '12주']
-        existing_cols = [c for c in required_cols if c in pdf_df.columns]
+        # 실제 구성 종목 수익률 계산
+        pdf_tickers = tuple(stock['ticker'] for stock in pdf)
+        perf_data = calculate_component_performance(data_loader, pdf_tickers, panel_period(data_loader),
+                                                    data_loader.db.get_market_data_version())
+
+        pdf_df = pd.DataFrame({"종목": [stock['name'] for stock in pdf], "비중(%)": [stock['weight'] for stock in pdf]})
+        perf_cols = [f"{w}주" for w in HORIZON_DAYS]
+        pdf_df[perf_cols] = perf_data.loc[list(pdf_tickers), list(HORIZON_DAYS)].to_numpy()
+        existing_cols = perf_cols
         
         # Heatmap 스타일 적용
         def color_bg(val):
@@ -159,10 +149,94 @@ def render_etf_analysis(data_loader, strategy):
                 return f'background-color: {color}'
             return ''
 
-        st.table(pdf_df.style.applymap(color_bg, subset=existing_cols))
+        st.table(pdf_df.style.map(color_bg, subset=existing_cols))
         
         # 비중 차트
         fig = px.pie(pdf_df, values='비중(%)', names='종목', title=f"{selected_etf} 구성 비중",
                      color_discrete_sequence=px.colors.sequential.RdBu)
         fig.update_layout(margin=dict(t=50, b=0, l=0, r=0), height=300)
         st.plotly_chart(fig, use_container_width=True)
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def build_lookthrough(_db, trades, equity, holdings_key, data_version):
+    """
+    ETF 포트폴리오 look-through 준비: 날짜별 ETF 평가액 + 희소 PDF 행렬 엔진
+    holdings_key: ETF별 PDF 수집 시각 (새 PDF 저장 시 캐시 무효화)
+    data_version: 시장 데이터가 바뀌면 캐시 무효화
+    """
+    etf_tickers = sorted(trades['Ticker'].unique())
+    start = (equity.index[0] - timedelta(days=14)).date()
+    close = _db.load_market_panel(etf_tickers, str(start), str(equity.index[-1].date()), columns=('close',))['close']
+    values = daily_position_values(trades, close, equity.index)
+    engine = LookThroughEngine.from_db(_db)
+    return values, engine
+
+def render_lookthrough(db, equity, trades):
+    """
+    시뮬레이션 보유 ETF를 구성 종목 기준으로 환산한 노출도 (ETF 모드 결과일 때만 표시)
+    """
+    if equity is None or equity.empty or trades is None or trades.empty:
+        return
+    etf_trades = trades[trades['Ticker'].isin(etf_categories())]
+    if etf_trades.empty:
+        return
+
+    st.divider()
+    st.markdown("### Portfolio Look-through Exposure")
+    st.caption("보유 ETF를 저장된 구성 종목(PDF) 기준으로 펼친 기초 종목/카테고리 노출도 (총자산 대비 %)")
+
+    holdings_key = tuple(sorted((etf, str(ts)) for etf, ts in db.get_etf_holdings_fetched_at().items()))
+    values, engine = build_lookthrough(db, etf_trades, equity, holdings_key, db.get_market_data_version())
+    total = equity['TotalValue'].reindex(values.index)
+
+    # 1. 카테고리 노출도 (전체 기간, 희소 곱 1회)
+    categories = engine.category_exposure(values).div(total, axis=0) * 100
+    categories = categories.loc[:, categories.abs().sum() > 0]
+    if not categories.empty:
+        # 누적 영역이 어긋나지 않도록 모든 카테고리에 같은 표시 인덱스 사용
+        idx = downsample_indices(categories.index, categories.sum(axis=1).to_numpy(), DEFAULT_MAX_POINTS)
+        shown = categories.iloc[idx]
+        fig_cat = go.Figure()
+        for category in shown.columns:
+            fig_cat.add_trace(go.Scatter(x=shown.index, y=shown[category], name=category, mode='lines', stackgroup='exposure'))
+        fig_cat.update_layout(
+            template="plotly_white", height=320, margin=dict(l=10, r=10, t=40, b=10),
+            title=dict(text="Category Exposure (%)", font=dict(size=14)), hovermode="x unified"
+        )
+        st.plotly_chart(fig_cat, use_container_width=True)
+
+    # 2. 기준일 기초 종목 노출도 (해당 날짜 mat-vec 1회)
+    invested_days = values.index[values.sum(axis=1) > 0]
+    if invested_days.empty:
+        return
+    first_day, last_day = invested_days[0].date(), invested_days[-1].date()
+    as_of = last_day
+    if first_day < last_day:
+        as_of = st.slider("기준일", min_value=first_day, max_value=last_day, value=last_day, format="YYYY-MM-DD", key="lookthrough_date")
+    day = values.index[values.index <= pd.Timestamp(as_of)][-1]
+
+    stocks = engine.stock_exposure(values.loc[[day]]).iloc[0] / total.loc[day] * 100
+    stocks = stocks[stocks > 0].sort_values(ascending=False)
+    coverage = engine.coverage(values.loc[[day]]).iloc[0] * 100
+    st.caption(f"{day.date()} 기준: ETF 평가액 중 PDF로 확인된 비율 {coverage:.1f}% (나머지는 현금/PDF 미수집)")
+
+    if stocks.empty:
+        st.info("보유 ETF의 구성 종목(PDF)이 아직 수집되지 않았습니다.")
+        return
+    top = stocks.head(15).rename(index=lambda code: f"{engine.stock_names.get(code, code)} ({code})")
+    fig_stock = px.bar(
+        x=top.values[::-1], y=top.index[::-1], orientation='h',
+        labels={'x': '총자산 대비 (%)', 'y': ''}, title="Top Underlying Stocks"
+    )
+    fig_stock.update_layout(template="plotly_white", height=420, margin=dict(l=10, r=10, t=40, b=10))
+    st.plotly_chart(fig_stock, use_container_width=True)
+
+    # 3. 보유 ETF 간 구성 종목 중복도
+    held = [t for t in values.columns if values.at[day, t] > 0]
+    overlap = engine.overlap()
+    held = [t for t in held if t in overlap.index]
+    if len(held) >= 2:
+        with st.expander("보유 ETF 구성 종목 중복도"):
+            names = {item['ticker']: item['name'] for items in TIGER_ETF_UNIVERSE.values() for item in items}
+            matrix = (overlap.loc[held, held] * 100).rename(index=names, columns=names)
+            st.dataframe(matrix.style.format("{:.1f}%"), use_container_width=True)
@@ -5,6 +5,7 @@ import datetime
 import plotly.graph_objects as go
 import plotly.express as px
 from plotly.subplots import make_subplots
+from src.ui.chart_utils import DEFAULT_MAX_POINTS, downsample_series
 
 def render_overview(equity, trades, start_dt, end_dt):
     # Calculate Key Metrics
@@ -80,16 +81,20 @@ def render_overview(equity, trades, start_dt, end_dt):
         # Dual Axis Chart: Equity + MDD (skipping unchanged lines...)
         fig = make_subplots(specs=[[{"secondary_y": True}]])
         
+        # 긴 기간은 LTTB로 점 수 축소 (최고점/최저점 등 형태는 유지), WebGL로 렌더링
+        equity_line = downsample_series(equity['TotalValue'], DEFAULT_MAX_POINTS)
+        drawdown_line = downsample_series(drawdown * 100, DEFAULT_MAX_POINTS)
+
         # Trace 1: Equity Curve
         fig.add_trace(
-            go.Scatter(x=equity.index, y=equity['TotalValue'], name="Portfolio Value", 
+            go.Scattergl(x=equity_line.index, y=equity_line.values, name="Portfolio Value", 
                         line=dict(color='#2C3E50', width=2)),
             secondary_y=False
         )
         
         # Trace 2: Drawdown (Filled Area)
         fig.add_trace(
-            go.Scatter(x=equity.index, y=drawdown * 100, name="Drawdown %", 
+            go.Scattergl(x=drawdown_line.index, y=drawdown_line.values, name="Drawdown %", 
                         fill='tozeroy', line=dict(color='#E74C3C', width=1), 
                         opacity=0.3), # Semi-transparent red
             secondary_y=True
@@ -3,6 +3,15 @@ import pandas as pd
 import datetime
 from src.data_loader import DataLoader
 
+@st.cache_data(ttl=600, show_spinner=False)
+def get_latest_prices(_loader, tickers, end_date, data_version):
+    """
+    보유 종목의 end_date 기준 마지막 봉 (DB 쿼리 1회, 화면 재실행마다 다시 읽지 않도록 캐싱)
+    data_version: 시장 데이터가 바뀌면 캐시 무효화 (누락 종목 다운로드 완료 시 포함)
+    Returns: DataFrame (index=ticker, columns=[date, close, stale_days])
+    """
+    return _loader.get_latest_bars(list(tickers), as_of=end_date)
+
 def render_portfolio(portfolio, trades, end_dt, loader_p):
     st.markdown("<br>", unsafe_allow_html=True)
     st.markdown("#### Current Holdings")
@@ -24,6 +33,7 @@ def render_portfolio(portfolio, trades, end_dt, loader_p):
             total_p_value = 0
             
             # Use passed loader instead of creating a new one
+            latest_prices = get_latest_prices(loader_p, tuple(sorted(portfolio)), str(end_dt), loader_p.db.get_market_data_version())
             
             for ticker, info in portfolio.items():
                 name = name_map.get(ticker, ticker)
@@ -56,14 +66,12 @@ def render_portfolio(portfolio, trades, end_dt, loader_p):
                     if isinstance(buy_date, datetime.date) and isinstance(curr_date_obj, datetime.date):
                         duration_days = (curr_date_obj - buy_date).days
                 
-                # Fetch current price
-                curr_price = avg_price # fallback
-                try:
-                    df_temp = loader_p.get_stock_data(ticker)
-                    if df_temp is not None and not df_temp.empty:
-                            curr_price = df_temp['Close'].iloc[-1]
-                except:
-                    pass
+                # Fetch current price (fallback: avg price when no bar is stored yet)
+                if ticker in latest_prices.index:
+                    curr_price = float(latest_prices.at[ticker, 'close'])
+                    price_date = latest_prices.at[ticker, 'date'].date()
+                else:
+                    curr_price, price_date = avg_price, None
                     
                 val = qty * curr_price
                 profit = (curr_price - avg_price) / avg_price * 100
@@ -76,6 +84,7 @@ def render_portfolio(portfolio, trades, end_dt, loader_p):
                     'Qty': qty,
                     'Avg Price': avg_price,
                     'Current Price': curr_price,
+                    'Price Date': price_date,
                     'Value': val,
                     'Profit %': profit
                 })
@@ -102,6 +111,7 @@ def render_portfolio(portfolio, trades, end_dt, loader_p):
                     "Qty": st.column_config.NumberColumn("Qty"),
                     "Avg Price": st.column_config.NumberColumn("Avg Price (₩)"), 
                     "Current Price": st.column_config.NumberColumn("Current Price (₩)"), 
+                    "Price Date": st.column_config.DateColumn("Price Date", format="YYYY-MM-DD"),
                     "Value": st.column_config.NumberColumn("Value (₩)"),
                     "Profit %": st.column_config.NumberColumn("Profit %"),
                 }
@@ -1,4 +1,6 @@
 import os
+import sys
+import time
 import pandas as pd
 from datetime import datetime
 
@@ -22,3 +24,29 @@ def save_csv_safe(df, filepath):
     except Exception as e:
         print(f"[Error] 파일 저장 중 알 수 없는 오류 발생: {e}")
         raise e
+
+
+class ConsoleProgress:
+    """
+    Backtester.run(progress_callback=...)용 콘솔 진행률 표시 (CLI)
+    """
+    def __init__(self, desc="Running Backtest", interval=1.0, stream=None):
+        self.desc = desc
+        self.interval = interval
+        self.stream = stream or sys.stderr
+        self.started_at = None
+        self._last = 0.0
+
+    def __call__(self, done, total):
+        now = time.time()
+        if self.started_at is None:
+            self.started_at = now
+        if done < total and now - self._last < self.interval:
+            return
+        self._last = now
+        elapsed = now - self.started_at
+        pct = done / total * 100 if total else 100.0
+        eta = elapsed / done * (total - done) if done else 0.0
+        end = "\n" if done >= total else ""
+        self.stream.write(f"\r{self.desc}: {pct:5.1f}% ({done}/{total}) elapsed {elapsed:,.0f}s, ETA {eta:,.0f}s{end}")
+        self.stream.flush()
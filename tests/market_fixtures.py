@@ -0,0 +1,49 @@
+import numpy as np
+import pandas as pd
+
+
+def make_ohlcv(n_days=600, start='2022-01-03', seed=0, base_price=50_000, volume=1_000_000):
+    """
+    테스트용 합성 OHLCV (랜덤워크). 기본값은 거래대금 100억 이상이 되도록 설정.
+    """
+    rng = np.random.default_rng(seed)
+    dates = pd.bdate_range(start=start, periods=n_days)
+    close = base_price * np.exp(np.cumsum(rng.normal(0.0005, 0.02, n_days)))
+    close = np.round(close)
+    # KRX 가격처럼 원 단위 정수
+    high = np.round(close * (1 + rng.uniform(0, 0.02, n_days)))
+    low = np.round(close * (1 - rng.uniform(0, 0.02, n_days)))
+    open_ = np.round((high + low) / 2)
+    vol = (volume * rng.uniform(0.5, 1.5, n_days)).round()
+    df = pd.DataFrame({
+        'Open': open_, 'High': high, 'Low': low, 'Close': close,
+        'Volume': vol, 'Amount': close * vol, 'Change': pd.Series(close).pct_change().fillna(0).values
+    }, index=dates)
+    df.index.name = 'Date'
+    return df
+
+
+def make_universe(n_tickers=20, n_days=600, start='2022-01-03'):
+    return {f"{i:06d}": make_ohlcv(n_days=n_days, start=start, seed=i) for i in range(1, n_tickers + 1)}
+
+
+class FakeLoader:
+    """
+    네트워크 없이 DB에 저장된 데이터만 사용하는 DataLoader 대체품 (테스트 + scripts/bench_full_market.py)
+    """
+    def __init__(self, db, tickers, start_date, end_date):
+        self.db = db
+        self.tickers = list(tickers)
+        self.target_start_date = pd.to_datetime(start_date)
+        self.data_start_date = self.target_start_date - pd.Timedelta(days=365)
+        self.end_date = pd.to_datetime(end_date)
+
+    def get_universe_tickers(self, date=None, kospi_n=200, kosdaq_n=50, mode='STOCK'):
+        return {t: f"Stock {t}" for t in self.tickers}
+
+    def preload_data_concurrently(self, tickers, timeout=30):
+        return self.db.load_market_data_bulk(tickers, self.data_start_date, self.end_date)
+
+    def ensure_market_data(self, tickers, timeout=30):
+        coverage = self.db.get_market_data_coverage(tickers)
+        return [t for t in tickers if t in coverage]
@@ -0,0 +1,122 @@
+import unittest
+import os
+import sys
+import json
+import shutil
+import tempfile
+import subprocess
+import pandas as pd
+
+# 프로젝트 루트 경로 추가
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT)
+
+from src.database import DBManager, summarize_equity
+from src.backtester import Backtester
+from src.batch_runner import normalize_config, load_run_configs, run_config, run_many
+import run_backtest
+from market_fixtures import FakeLoader, make_universe
+
+
+class TestBatchRunner(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.tmp = tempfile.TemporaryDirectory()
+        cls.db_path = os.path.join(cls.tmp.name, 'test.db')
+        db = DBManager(db_path=cls.db_path)
+        frames = make_universe(n_tickers=20, n_days=650)
+        for ticker, df in frames.items():
+            db.save_market_data(ticker, df)
+        cls.tickers = sorted(frames)
+        dates = frames['000001'].index
+        # 웜업(시작일 - 365일)이 저장 구간 안에 들어가도록 시작일 선택 -> 다운로드 시도 없음
+        cls.start, cls.end = str(dates[300].date()), str(dates[-1].date())
+
+        bt = Backtester(FakeLoader(db, cls.tickers, cls.start, cls.end), cls.start, cls.end,
+                        universe_params={'tickers': cls.tickers})
+        cls.expected = summarize_equity(bt.run(), pd.DataFrame(bt.trade_log))
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.tmp.cleanup()
+
+    def make_run(self, **config):
+        return normalize_config({'start_date': self.start, 'end_date': self.end, 'tickers': self.tickers, **config})
+
+    def test_normalize_config(self):
+        run = normalize_config({'ma_short': 10, 'sell_slope_mult': 1.3, 'weights': [0.25] * 4, 'market_mode': 'ETF',
+                                'kospi_n': 50, 'memory_policy': 'compact', 'tickers': '000001, 000002',
+                                'universe_params': {'lazy': True}})
+        self.assertEqual(run['strategy_params'], {'ma_short': 10, 'sell_slope_multiplier': 1.3, 'rs_weights': (0.25,) * 4})
+        self.assertEqual(run['universe_params'], {'lazy': True, 'mode': 'ETF', 'kospi_n': 50, 'memory_policy': 'compact',
+                                                  'tickers': ['000001', '000002']})
+        self.assertEqual((run['start_date'], run['end_date']), ('2019-01-01', '2024-12-20'))
+        # 오타는 기본값으로 조용히 넘어가지 않음
+        with self.assertRaises(ValueError):
+            normalize_config({'ma_shrot': 10})
+        self.assertEqual(normalize_config({'ma_shrot': 10}, strict=False)['strategy_params'], {})
+
+    def test_load_run_configs_merges_shared_keys(self):
+        path = os.path.join(self.tmp.name, 'sweep.json')
+        with open(path, 'w') as f:
+            json.dump({'kospi_n': 100, 'strategy_params': {'ma_short': 10},
+                       'runs': [{'name': 'a'}, {'name': 'b', 'strategy_params': {'ma_long': 40}}]}, f)
+        configs = load_run_configs(path)
+        self.assertEqual([c['name'] for c in configs], ['a', 'b'])
+        self.assertEqual(configs[1]['strategy_params'], {'ma_short': 10, 'ma_long': 40})
+        self.assertEqual(configs[0]['kospi_n'], 100)
+
+    def test_metrics_match_backtester_and_memoize(self):
+        db_path = os.path.join(self.tmp.name, 'memo.db')
+        shutil.copy(self.db_path, db_path)  # 저장 결과가 다른 테스트와 섞이지 않도록 복사본 사용
+
+        first = run_config(self.make_run(), db_path=db_path)
+        self.assertGreater(first['metrics']['num_trades'], 0)
+        for key, value in self.expected.items():
+            self.assertAlmostEqual(first['metrics'][key], value)
+        self.assertFalse(first['memoized'])
+        self.assertIn('prepare', first['timings'])
+        json.dumps(first, default=str)
+
+        second = run_config(self.make_run(), db_path=db_path)
+        self.assertTrue(second['memoized'])
+        self.assertEqual(second['simulation_id'], first['simulation_id'])
+        self.assertEqual(second['metrics'], first['metrics'])
+
+    def test_parallel_jobs_and_profile(self):
+        runs = [self.make_run(name='base'), self.make_run(name='short', ma_short=10),
+                dict(self.make_run(name='bad'), start_date='not-a-date')]
+        serial = run_many(runs, jobs=1, db_path=self.db_path, fresh=True)
+        parallel = run_many(runs, jobs=2, db_path=self.db_path, fresh=True)
+        self.assertEqual([r['metrics'] for r in parallel[:2]], [r['metrics'] for r in serial[:2]])
+        self.assertEqual(serial[0]['metrics'], self.expected | {'cagr': serial[0]['metrics']['cagr']})
+        self.assertIsNone(serial[0]['simulation_id'])
+        self.assertIn('error', serial[2])
+
+        profile_dir = os.path.join(self.tmp.name, 'profiles')
+        result = run_config(runs[0], db_path=self.db_path, profile='cprofile', profile_dir=profile_dir)
+        self.assertTrue(result['profile'].endswith('.prof'))
+        self.assertTrue(os.path.exists(result['profile']))
+        self.assertEqual(result['metrics'], serial[0]['metrics'])
+
+    def test_cli_writes_json_with_flag_overrides(self):
+        out = os.path.join(self.tmp.name, 'out.json')
+        config = os.path.join(self.tmp.name, 'cli.json')
+        with open(config, 'w') as f:
+            json.dump({'ma_short': 10, 'tickers': self.tickers}, f)
+        code = run_backtest.main(['--config', config, '--ma-short', '20', '--start', self.start, '--end', self.end,
+                                  '--db', self.db_path, '--fresh', '--output', out])
+        self.assertEqual(code, 0)
+        with open(out) as f:
+            result = json.load(f)
+        self.assertEqual(result['strategy_params'], {'ma_short': 20})
+        self.assertAlmostEqual(result['metrics']['final_value'], self.expected['final_value'])
+
+    def test_cli_does_not_import_streamlit(self):
+        code = "import sys, run_backtest; print(sorted(m for m in ('streamlit', 'plotly') if m in sys.modules))"
+        out = subprocess.run([sys.executable, '-c', code], cwd=ROOT, capture_output=True, text=True, check=True)
+        self.assertEqual(out.stdout.strip(), '[]')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,70 @@
+import unittest
+import os
+import sys
+import time
+import tempfile
+
+# 프로젝트 루트 경로 추가
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.cache import MemoryCache, SQLiteCache, NullCache, make_key, DEFAULT_CACHE_PATH
+
+
+class TestCacheBackends(unittest.TestCase):
+    def test_memory_lru_eviction(self):
+        cache = MemoryCache(maxsize=2)
+        cache.set('a', 1)
+        cache.set('b', 2)
+        cache.get('a')  # a 최근 사용 -> b가 제거 대상
+        cache.set('c', 3)
+
+        self.assertEqual(cache.get('a'), (True, 1))
+        self.assertEqual(cache.get('b'), (False, None))
+        self.assertEqual(cache.get('c'), (True, 3))
+
+    def test_memory_ttl_expiry(self):
+        cache = MemoryCache()
+        cache.set('a', 1, ttl=0.05)
+        self.assertEqual(cache.get('a'), (True, 1))
+        time.sleep(0.1)
+        self.assertEqual(cache.get('a'), (False, None))
+
+    def test_sqlite_shared_between_instances(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'cache.db')
+            key = make_key('etf_pdf', '133690')
+            SQLiteCache(path).set(key, [{'ticker': 'AAPL', 'weight': 10.0}])
+
+            # 다른 프로세스를 흉내: 새 인스턴스에서 조회
+            hit, value = SQLiteCache(path).get(key)
+            self.assertTrue(hit)
+            self.assertEqual(value[0]['ticker'], 'AAPL')
+
+    def test_sqlite_default_path_is_project_root(self):
+        # 실행 위치(cwd)와 무관하게 프로젝트 루트의 cache.db
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        self.assertEqual(DEFAULT_CACHE_PATH, os.path.join(root, 'cache.db'))
+
+    def test_get_or_compute_skips_empty_results(self):
+        calls = []
+        cache = MemoryCache()
+
+        def compute():
+            calls.append(1)
+            return []
+
+        cache.get_or_compute('k', compute)
+        cache.get_or_compute('k', compute)
+        self.assertEqual(len(calls), 2)
+
+        cache.get_or_compute('k2', lambda: {'005930': '삼성전자'})
+        self.assertEqual(cache.get_or_compute('k2', compute), {'005930': '삼성전자'})
+
+    def test_null_cache(self):
+        cache = NullCache()
+        cache.set('a', 1)
+        self.assertEqual(cache.get('a'), (False, None))
+
+
+if __name__ == '__main__':
+    unittest.main()
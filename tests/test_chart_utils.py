@@ -0,0 +1,102 @@
+import unittest
+import os
+import sys
+import numpy as np
+import pandas as pd
+
+# 프로젝트 루트 경로 추가
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.ui.chart_utils import lttb_indices, downsample_indices, downsample_series, aggregate_ohlc, ohlc_for_budget
+from src.ui.analysis import build_signal_frame
+from market_fixtures import make_universe
+
+
+class TestLTTB(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        self.index = pd.bdate_range('2014-01-01', periods=2500)
+        self.values = np.cumsum(rng.normal(0, 1, len(self.index)))
+
+    def test_keeps_endpoints_and_count(self):
+        idx = lttb_indices(self.index, self.values, 500)
+        self.assertEqual(len(idx), 500)
+        self.assertEqual(idx[0], 0)
+        self.assertEqual(idx[-1], len(self.values) - 1)
+        self.assertTrue(np.all(np.diff(idx) > 0))
+
+    def test_keeps_extremes(self):
+        idx = lttb_indices(self.index, self.values, 500)
+        self.assertIn(int(np.argmax(self.values)), idx)
+        self.assertIn(int(np.argmin(self.values)), idx)
+
+    def test_short_series_unchanged(self):
+        series = pd.Series(self.values[:100], index=self.index[:100])
+        self.assertIs(downsample_series(series, 1500), series)
+
+    def test_nan_and_keep(self):
+        values = self.values.copy()
+        values[:60] = np.nan # 지표 warm-up 구간
+        keep = np.zeros(len(values), dtype=bool)
+        keep[[100, 1234, 2001]] = True
+        idx = downsample_indices(self.index, values, 300, keep=keep)
+        self.assertTrue(np.all(np.isfinite(values[idx])))
+        for pos in (100, 1234, 2001):
+            self.assertIn(pos, idx)
+        self.assertLessEqual(len(idx), 303)
+
+
+class TestOHLCAggregation(unittest.TestCase):
+    def setUp(self):
+        self.df = make_universe(n_tickers=1, n_days=2500)['000001']
+
+    def test_weekly_values(self):
+        weekly = aggregate_ohlc(self.df, 'W-FRI')
+        first_week = self.df.loc[:weekly.index[0]]
+        row = weekly.iloc[0]
+        self.assertEqual(row['Open'], first_week['Open'].iloc[0])
+        self.assertEqual(row['High'], first_week['High'].max())
+        self.assertEqual(row['Low'], first_week['Low'].min())
+        self.assertEqual(row['Close'], first_week['Close'].iloc[-1])
+        self.assertEqual(row['Volume'], first_week['Volume'].sum())
+        # 봉 날짜는 실제 거래일
+        self.assertTrue(weekly.index.isin(self.df.index).all())
+
+    def test_budget_picks_coarser_unit(self):
+        out, unit = ohlc_for_budget(self.df, 1500)
+        self.assertEqual(unit, 'Weekly')
+        self.assertLessEqual(len(out), 1500)
+
+        out, unit = ohlc_for_budget(self.df, 200)
+        self.assertEqual(unit, 'Monthly')
+
+        out, unit = ohlc_for_budget(self.df.iloc[:300], 1500)
+        self.assertEqual(unit, 'Daily')
+        self.assertEqual(len(out), 300)
+
+
+class TestSignalFrame(unittest.TestCase):
+    def test_display_arrays(self):
+        index = pd.bdate_range('2024-01-01', periods=6)
+        df = pd.DataFrame({
+            'Close': [10, 12, 12, 9, 13, 14],
+            'MA_Long': [11, 11, 11, 11, 11, np.nan],
+            'Slope_Pct': [0.0, 1.0, -5.0, -5.0, 1.0, 1.0],
+            'Max_Slope_60d': [2.0] * 6,
+            'MA_Slope': [-1.0, 0.5, 0.7, -0.2, 0.3, 0.4],
+            'RS_Score_Pre': [np.nan, 50, 60, 70, 80, 90],
+            'Buy_Signal': [False, True, False, False, True, False],
+            'Sell_Signal': [False, False, True, True, False, False],
+        }, index=index)
+        signals = build_signal_frame(df, {'sell_slope_multiplier': 1.5})
+
+        # MA_Long NaN이면 엔진과 같이 추세 조건 통과
+        self.assertEqual(signals['Trend'].tolist(), ['FAIL', 'PASS', 'PASS', 'FAIL', 'PASS', 'PASS'])
+        self.assertEqual(signals['Turn'].tolist(), ['FAIL', 'PASS', 'FAIL', 'FAIL', 'PASS', 'FAIL'])
+        self.assertEqual(signals['Signal'].tolist(), ['-', 'BUY', 'SELL', 'SELL', 'BUY', '-'])
+        self.assertEqual(signals['RS'].iloc[0], '0.0')
+        self.assertEqual(signals['HoverColor'].tolist()[:3], ['#FFFFFF', '#EF5350', '#2962FF'])
+
+
+if __name__ == '__main__':
+    unittest.main()
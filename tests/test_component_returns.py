@@ -0,0 +1,76 @@
+import unittest
+import os
+import sys
+import numpy as np
+import pandas as pd
+
+# 프로젝트 루트 경로 추가
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.strategy import Strategy
+from src.panel import HORIZON_DAYS, horizon_returns, latest_rankings
+from market_fixtures import make_ohlcv
+
+
+def loop_component_performance(df_dict):
+    # 기존 티커/기간별 루프 구현 (비교 기준)
+    results = {}
+    for ticker, df in df_dict.items():
+        if len(df) < 60:
+            results[ticker] = {w: 0.0 for w in HORIZON_DAYS}
+            continue
+        last_price = df['Close'].iloc[-1]
+        perf = {}
+        for weeks, days in HORIZON_DAYS.items():
+            try:
+                base_price = df['Close'].iloc[-(days + 1)]
+                perf[weeks] = round(((last_price - base_price) / base_price) * 100, 1)
+            except IndexError:
+                perf[weeks] = 0.0
+        results[ticker] = perf
+    return results
+
+
+class TestComponentReturns(unittest.TestCase):
+    def setUp(self):
+        self.df_dict = {
+            'AAA': make_ohlcv(n_days=400, seed=1),
+            'BBB': make_ohlcv(n_days=300, seed=2).iloc[50:],      # 늦게 상장
+            'CCC': make_ohlcv(n_days=400, seed=3).iloc[:-30],     # 일찍 끝남
+            'DDD': make_ohlcv(n_days=55, seed=4),                 # 이력 부족
+        }
+        # 거래정지 구간 (티커 자기 거래일 기준으로 계산되어야 함)
+        gap = make_ohlcv(n_days=400, seed=5)
+        self.df_dict['EEE'] = gap.drop(gap.index[-40:-25])
+        self.close = pd.DataFrame({t: df['Close'] for t, df in self.df_dict.items()})
+        self.amount = pd.DataFrame({t: df['Amount'] for t, df in self.df_dict.items()})
+
+    def test_horizon_returns_match_loop(self):
+        expected = loop_component_performance(self.df_dict)
+        result = horizon_returns(self.close)
+        self.assertEqual(list(result.columns), list(HORIZON_DAYS))
+        for ticker, perf in expected.items():
+            for weeks, value in perf.items():
+                self.assertAlmostEqual(result.at[ticker, weeks], value, places=6, msg=(ticker, weeks))
+        self.assertTrue((result.loc['DDD'] == 0.0).all())
+
+    def test_latest_rankings_match_strategy(self):
+        strategy = Strategy()
+        table = latest_rankings(strategy, self.close, self.amount)
+        for ticker, df in self.df_dict.items():
+            df = df.copy()
+            df['Amount_MA20'] = df['Amount'].rolling(window=20).mean()
+            rs = strategy.calculate_rs_score(df)
+            slope, _, _ = strategy.calculate_slopes(df, df.index[-1])
+            self.assertAlmostEqual(table.at[ticker, 'RS Score'], rs, places=6, msg=ticker)
+            self.assertAlmostEqual(table.at[ticker, 'Slope'], slope, places=6, msg=ticker)
+            np.testing.assert_allclose(table.at[ticker, 'Amount_MA20'], df['Amount_MA20'].iloc[-1], rtol=1e-9)
+
+    def test_empty_panel(self):
+        empty = pd.DataFrame(columns=['AAA'], dtype=float)
+        self.assertEqual(horizon_returns(empty).loc['AAA'].tolist(), [0.0] * len(HORIZON_DAYS))
+        self.assertTrue(latest_rankings(Strategy(), empty, empty).empty)
+
+
+if __name__ == '__main__':
+    unittest.main()
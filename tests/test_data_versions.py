@@ -0,0 +1,244 @@
+import unittest
+import os
+import sys
+import sqlite3
+import tempfile
+import numpy as np
+import pandas as pd
+
+# 프로젝트 루트 경로 추가
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.database import DBManager
+from src.simulation_jobs import execute_simulation
+from src.fingerprint import universe_digest
+from market_fixtures import FakeLoader, make_ohlcv, make_universe
+
+
+class DownloadingLoader(FakeLoader):
+    """
+    DB에 없는 유니버스 종목은 ensure_market_data에서 '다운로드'(DB 저장),
+    로드 직전에는 백그라운드 워커가 유니버스 밖 종목을 저장
+    """
+    def __init__(self, db, frames, start_date, end_date, background):
+        super().__init__(db, frames, start_date, end_date)
+        self.frames = frames
+        self.background = background
+        self.preloads = 0
+
+    def ensure_market_data(self, tickers, timeout=30):
+        coverage = self.db.get_market_data_coverage(tickers)
+        for ticker in tickers:
+            if ticker not in coverage:
+                self.db.save_market_data(ticker, self.frames[ticker])
+        return super().ensure_market_data(tickers, timeout)
+
+    def preload_data_concurrently(self, tickers, timeout=30):
+        self.preloads += 1
+        self.db.save_market_data(self.background, make_ohlcv(n_days=300, seed=100 + self.preloads))
+        return super().preload_data_concurrently(tickers, timeout)
+
+
+class TestDataVersions(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.frame = make_ohlcv(n_days=300, seed=7)
+        self.frame.iloc[5, self.frame.columns.get_loc('Change')] = np.nan  # DB에는 NULL로 저장됨
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def make_db(self, name):
+        return DBManager(db_path=os.path.join(self.tmp.name, name))
+
+    def run_snapshot(self, db, frames, start, end):
+        # Backtester.take_data_snapshot과 같은 정의 (유니버스 종목 x 로드 기간 + 리스팅)
+        loader = FakeLoader(db, frames, start, end)
+        snapshot = db.get_data_snapshot(list(frames), loader.data_start_date, loader.end_date)
+        return {'id': snapshot['id'], 'digest': snapshot['digest'],
+                'universe_digest': universe_digest(loader.get_universe_tickers())}
+
+    def test_content_hash_is_independent_of_write_history(self):
+        full = self.make_db('full.db')
+        full.save_market_data('000001', self.frame)
+
+        # 나눠서 저장 + 다른 값으로 덮어썼다가 되돌림
+        pieces = self.make_db('pieces.db')
+        pieces.save_market_data('000001', self.frame.iloc[150:])
+        changed = self.frame.iloc[100:200].copy()
+        changed['Close'] += 1
+        pieces.save_market_data('000001', changed)
+        self.assertNotEqual(pieces.get_ticker_versions().at['000001', 'content_hash'],
+                            full.get_ticker_versions().at['000001', 'content_hash'])
+        pieces.save_market_data('000001', self.frame.iloc[:200])
+
+        a, b = full.get_ticker_versions().loc['000001'], pieces.get_ticker_versions().loc['000001']
+        self.assertEqual(a['content_hash'], b['content_hash'])
+        self.assertEqual((b['rows'], b['first_date'], b['last_date']),
+                         (300, str(self.frame.index[0].date()), str(self.frame.index[-1].date())))
+        self.assertEqual(full.get_data_snapshot()['digest'], pieces.get_data_snapshot()['digest'])
+        # 스냅샷 ID는 변경 이력 (저장 횟수가 다르면 다름)
+        self.assertEqual(full.get_data_snapshot()['id'], 1)
+        self.assertEqual(pieces.get_data_snapshot()['id'], 3)
+
+    def test_snapshot_tracks_changes(self):
+        db = self.make_db('test.db')
+        db.save_market_data('000001', self.frame)
+        db.save_market_data('000002', make_ohlcv(n_days=300, seed=8))
+        before = db.get_data_snapshot()
+        subset = db.get_data_snapshot(['000001'])
+        self.assertEqual(before['tickers'], 2)
+        stamp = db.get_ticker_versions(['000001']).loc['000001', ['snapshot_id', 'modified_at']].tolist()
+
+        # 같은 데이터 재저장: 변화 없음
+        db.save_market_data('000001', self.frame)
+        self.assertEqual(db.get_data_snapshot(), before)
+        self.assertEqual(db.get_ticker_versions(['000001']).loc['000001', ['snapshot_id', 'modified_at']].tolist(), stamp)
+
+        # 다른 종목 변경: 전체 digest만 바뀌고 000001 기준 digest는 유지
+        other = make_ohlcv(n_days=301, seed=8)
+        db.save_market_data('000002', other)
+        after = db.get_data_snapshot()
+        self.assertNotEqual(after['digest'], before['digest'])
+        self.assertEqual(after['id'], before['id'] + 1)
+        self.assertEqual(db.get_data_snapshot(['000001']), subset | {'id': after['id']})
+        self.assertEqual(db.get_ticker_versions().at['000002', 'snapshot_id'], after['id'])
+
+        # DB에 없는 종목도 digest에 반영
+        missing = db.get_data_snapshot(['000001', '999999'])
+        self.assertEqual(missing['tickers'], 1)
+        self.assertNotEqual(missing['digest'], db.get_data_snapshot(['000001'])['digest'])
+
+        # 기간 지정: 기간 밖 봉 추가/변경은 digest에 반영되지 않음
+        window = ('2022-03-01', '2022-06-30')
+        ranged = db.get_data_snapshot(['000001'], *window)
+        self.assertEqual(ranged['tickers'], 1)
+        later = self.frame.iloc[-10:].copy()
+        later['Close'] += 1
+        db.save_market_data('000001', later)
+        self.assertEqual(db.get_data_snapshot(['000001'], *window)['digest'], ranged['digest'])
+        inside = self.frame.loc['2022-04-01':'2022-04-05'].copy()
+        inside['Close'] += 1
+        db.save_market_data('000001', inside)
+        self.assertNotEqual(db.get_data_snapshot(['000001'], *window)['digest'], ranged['digest'])
+
+        db.clear_market_data()
+        self.assertTrue(db.get_ticker_versions().empty)
+        self.assertEqual(db.get_data_snapshot()['tickers'], 0)
+
+    def test_existing_db_is_backfilled(self):
+        db = self.make_db('test.db')
+        db.save_market_data('000001', self.frame)
+        expected = db.get_ticker_versions()[['content_hash', 'rows', 'first_date', 'last_date']]
+        ranged = db.get_data_snapshot(['000001'], '2022-03-01', '2022-06-30')
+
+        # 해시 테이블/행 해시 도입 이전 DB 상태로 되돌림
+        conn = sqlite3.connect(db.db_path)
+        conn.execute('DELETE FROM market_data_versions')
+        conn.execute("DELETE FROM db_meta WHERE key = 'market_data_hashes'")
+        conn.execute('ALTER TABLE market_data DROP COLUMN row_hash')
+        conn.commit()
+        conn.close()
+
+        reopened = self.make_db('test.db')
+        pd.testing.assert_frame_equal(reopened.get_ticker_versions()[expected.columns], expected)
+        self.assertEqual(reopened.get_data_snapshot(['000001'], '2022-03-01', '2022-06-30')['digest'], ranged['digest'])
+
+    def test_simulation_records_snapshot(self):
+        db = self.make_db('test.db')
+        frames = make_universe(n_tickers=8, n_days=500)
+        for ticker, df in frames.items():
+            db.save_market_data(ticker, df)
+        start, end = '2023-01-02', '2023-12-29'
+        loader_factory = lambda s, e: FakeLoader(db, frames, s, e)
+
+        simulation_id, _, _, _ = execute_simulation(db, start, end, {}, {'mode': 'STOCK'}, loader_factory=loader_factory)
+        snapshot = self.run_snapshot(db, frames, start, end)
+        self.assertEqual(db.get_simulation_snapshot(simulation_id), snapshot)
+        listed = db.list_simulations().set_index('id')
+        self.assertEqual(listed.at[simulation_id, 'data_digest'], snapshot['digest'])
+
+        # 데이터가 바뀌었다가 원래 내용으로 돌아오면 저장된 결과 재사용
+        ticker = next(iter(frames))
+        changed = frames[ticker].copy()
+        changed['Close'] += 1
+        db.save_market_data(ticker, changed)
+        db.save_market_data(ticker, frames[ticker])
+        self.assertEqual(self.run_snapshot(db, frames, start, end)['digest'], snapshot['digest'])
+        reused, _, _, _ = execute_simulation(db, start, end, {}, {'mode': 'STOCK'}, loader_factory=loader_factory)
+        self.assertEqual(reused, simulation_id)
+
+    def test_simulation_snapshot_is_taken_at_load_time(self):
+        db = self.make_db('test.db')
+        frames = make_universe(n_tickers=8, n_days=500)
+        for ticker, df in frames.items():
+            db.save_market_data(ticker, df)
+        start, end = '2023-01-02', '2023-12-29'
+        loaded = self.run_snapshot(db, frames, start, end)
+        ticker = next(iter(frames))
+        changed = frames[ticker].copy()
+        changed['Close'] += 1
+
+        def write_during_run(done, total):
+            # 백그라운드 다운로드 워커가 실행 도중 데이터를 쓴 경우
+            if done == 10:
+                db.save_market_data(ticker, changed)
+
+        simulation_id, _, _, _ = execute_simulation(db, start, end, {}, {'mode': 'STOCK'}, progress_callback=write_during_run,
+                                                    loader_factory=lambda s, e: FakeLoader(db, frames, s, e))
+        self.assertNotEqual(self.run_snapshot(db, frames, start, end)['digest'], loaded['digest'])
+        self.assertEqual(db.get_simulation_snapshot(simulation_id), loaded)
+
+    def test_memo_lookup_and_save_use_one_snapshot(self):
+        db = self.make_db('test.db')
+        frames = make_universe(n_tickers=8, n_days=500)
+        late = list(frames)[-1]
+        for ticker, df in frames.items():
+            if ticker != late:
+                db.save_market_data(ticker, df)
+        start, end = '2023-01-02', '2023-12-29'
+        loaders = []
+
+        def loader_factory(s, e):
+            loaders.append(DownloadingLoader(db, frames, s, e, background='900001'))
+            return loaders[-1]
+
+        # 조회 전에 누락 종목 다운로드, 조회 후 로드 전에 백그라운드 쓰기
+        simulation_id, _, _, _ = execute_simulation(db, start, end, {}, {'mode': 'STOCK'}, loader_factory=loader_factory)
+        self.assertEqual(loaders[0].preloads, 1)
+        stored, current = db.get_simulation_snapshot(simulation_id), self.run_snapshot(db, frames, start, end)
+        self.assertEqual(stored['id'], current['id'] - 1)  # 조회 시점 (다운로드 후, 백그라운드 쓰기 전)
+        self.assertEqual((stored['digest'], stored['universe_digest']), (current['digest'], current['universe_digest']))
+
+        reused, _, _, _ = execute_simulation(db, start, end, {}, {'mode': 'STOCK'}, loader_factory=loader_factory)
+        self.assertEqual(reused, simulation_id)
+        self.assertEqual(loaders[1].preloads, 0)
+        self.assertEqual(len(db.list_simulations()), 1)
+
+    def test_memo_ignores_writes_outside_the_run(self):
+        db = self.make_db('test.db')
+        frames = make_universe(n_tickers=8, n_days=500)
+        for ticker, df in frames.items():
+            db.save_market_data(ticker, df)
+        start, end = '2023-01-02', '2023-12-29'
+        loader_factory = lambda s, e: FakeLoader(db, frames, s, e)
+        simulation_id, _, _, _ = execute_simulation(db, start, end, {}, {'mode': 'STOCK'}, loader_factory=loader_factory)
+
+        # 백그라운드 다운로드: 유니버스 밖 종목 + 유니버스 종목의 기간 이후 봉
+        db.save_market_data('900001', make_ohlcv(n_days=300, seed=9))
+        ticker = next(iter(frames))
+        db.save_market_data(ticker, make_ohlcv(n_days=5, start='2024-01-08', seed=10))
+        reused, _, _, _ = execute_simulation(db, start, end, {}, {'mode': 'STOCK'}, loader_factory=loader_factory)
+        self.assertEqual(reused, simulation_id)
+        self.assertEqual(len(db.list_simulations()), 1)
+
+        # 유니버스 종목의 기간 내 데이터가 바뀌면 재계산
+        changed = frames[ticker].copy()
+        changed['Close'] += 1
+        db.save_market_data(ticker, changed)
+        rerun, _, _, _ = execute_simulation(db, start, end, {}, {'mode': 'STOCK'}, loader_factory=loader_factory)
+        self.assertNotEqual(rerun, simulation_id)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,96 @@
+import unittest
+import os
+import sys
+import sqlite3
+import datetime
+import tempfile
+import threading
+
+# 프로젝트 루트 경로 추가
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.database import DBManager
+from src.download_queue import DownloadWorker
+
+
+class TestDownloadQueue(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.db = DBManager(db_path=os.path.join(self.tmp.name, 'test.db'))
+        self.fetched = []
+        self.lock = threading.Lock()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def fake_fetch(self, ticker, start_date, end_date):
+        with self.lock:
+            self.fetched.append(ticker)
+        if ticker == 'BAD':
+            raise RuntimeError("network error")
+        return ticker != 'EMPTY'
+
+    def test_worker_drains_queue(self):
+        tickers = ['000001', '000002', 'EMPTY', 'BAD']
+        self.db.enqueue_download_jobs(tickers, '2023-01-01', '2023-12-31')
+
+        worker = DownloadWorker(self.db, self.fake_fetch, max_workers=2, poll_interval=0.05)
+        worker.start()
+        status = worker.wait_for(tickers, '2023-01-01', '2023-12-31', timeout=10, poll_interval=0.05)
+        worker.stop(timeout=5)
+
+        self.assertEqual(status['000001'], 'DONE')
+        self.assertEqual(status['EMPTY'], 'DONE')
+        # 3회 재시도 후 FAILED
+        self.assertEqual(status['BAD'], 'FAILED')
+        self.assertEqual(self.fetched.count('BAD'), 3)
+        self.assertEqual(self.db.count_pending_download_jobs(), 0)
+
+    def test_done_jobs_are_not_redone(self):
+        self.db.enqueue_download_jobs(['000001'], '2023-01-01', '2023-12-31')
+        worker = DownloadWorker(self.db, self.fake_fetch, poll_interval=0.05)
+        worker.start()
+        worker.wait_for(['000001'], '2023-01-01', '2023-12-31', timeout=10, poll_interval=0.05)
+
+        # 같은 구간 재등록 -> DONE 유지
+        self.db.enqueue_download_jobs(['000001'], '2023-01-01', '2023-12-31')
+        status = worker.wait_for(['000001'], '2023-01-01', '2023-12-31', timeout=10, poll_interval=0.05)
+        worker.stop(timeout=5)
+
+        self.assertEqual(status['000001'], 'DONE')
+        self.assertEqual(self.fetched.count('000001'), 1)
+
+    def test_open_range_done_jobs_are_refreshed(self):
+        today = str(datetime.date.today())
+        self.db.enqueue_download_jobs(['000001'], '2023-01-01', today)
+        self.db.enqueue_download_jobs(['000002', '000003'], '2023-01-01', '2023-12-29')
+        for job in self.db.claim_download_jobs():
+            self.db.finish_download_job(*job, has_data=True)
+
+        # 방금 받은 작업은 유지
+        self.db.enqueue_download_jobs(['000001'], '2023-01-01', today)
+        self.assertEqual(self.db.get_download_job_status(['000001'], '2023-01-01', today)['000001'], 'DONE')
+
+        # 000002: 마지막 날 장중에 받은 작업 -> 다시 받음, 000003: 구간이 끝난 뒤 받은 작업 -> 그대로
+        conn = sqlite3.connect(self.db.db_path)
+        conn.execute("UPDATE download_jobs SET updated_at = '2023-12-29 10:00:00' WHERE ticker = '000002'")
+        conn.commit()
+        conn.close()
+        self.db.enqueue_download_jobs(['000001'], '2023-01-01', today, refresh_seconds=-1)
+        self.db.enqueue_download_jobs(['000002', '000003'], '2023-01-01', '2023-12-29', refresh_seconds=-1)
+        self.assertEqual(self.db.get_download_job_status(['000001'], '2023-01-01', today)['000001'], 'PENDING')
+        self.assertEqual(self.db.get_download_job_status(['000002', '000003'], '2023-01-01', '2023-12-29'),
+                         {'000002': 'PENDING', '000003': 'DONE'})
+
+    def test_stale_running_jobs_are_resumed(self):
+        # 이전 프로세스가 RUNNING 상태로 죽은 상황
+        self.db.enqueue_download_jobs(['000001'], '2023-01-01', '2023-12-31')
+        self.assertEqual(len(self.db.claim_download_jobs()), 1)
+        self.assertEqual(self.db.requeue_stale_download_jobs(stale_seconds=-1), 1)
+
+        status = self.db.get_download_job_status(['000001'], '2023-01-01', '2023-12-31')
+        self.assertEqual(status['000001'], 'PENDING')
+
+
+if __name__ == '__main__':
+    unittest.main()
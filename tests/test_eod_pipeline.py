@@ -0,0 +1,148 @@
+import unittest
+import os
+import sys
+import json
+import time
+import tempfile
+import pandas as pd
+
+# 프로젝트 루트 경로 추가
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.database import DBManager
+from src.data_loader import DataLoader
+from src.eod_pipeline import EODPipeline
+from src.scanner import SignalScanner
+from market_fixtures import make_ohlcv, make_universe
+
+
+class DeltaLoader:
+    """
+    네트워크 대신 미리 만든 전체 시세에서 요청 구간만 DB에 저장하는 로더 (요청 기록)
+    """
+    def __init__(self, db, frames, latency=0.0):
+        self.db = db
+        self.frames = frames
+        self.latency = latency
+        self.data_start_date = pd.Timestamp('2021-01-01')
+        self.requests = []
+
+    def _download_range(self, ticker, start_date, end_date):
+        self.requests.append((ticker, pd.Timestamp(start_date), pd.Timestamp(end_date)))
+        time.sleep(self.latency)
+        df = self.frames[ticker].loc[start_date:end_date]
+        if df.empty:
+            return None
+        self.db.save_market_data(ticker, df)
+        return df
+
+
+class FrameDataLoader(DataLoader):
+    """
+    실제 DataLoader(웜업 = 시작일 - 365일)에서 다운로드만 미리 만든 시세로 대체
+    """
+    def __init__(self, db, frames, as_of):
+        super().__init__(start_date=str(as_of.date()), end_date=str(as_of.date()), db=db)
+        self.frames = frames
+        self.requests = []
+
+    def _download_range(self, ticker, start_date, end_date):
+        self.requests.append((ticker, pd.Timestamp(start_date)))
+        df = self.frames[ticker].loc[start_date:end_date]
+        if df.empty:
+            return None
+        self.db.save_market_data(ticker, df)
+        return df
+
+
+class TestEODPipeline(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.db = DBManager(db_path=os.path.join(self.tmp.name, 'test.db'))
+        self.frames = make_universe(n_tickers=40, n_days=400)
+        self.frames['000041'] = make_ohlcv(n_days=400, seed=41).iloc[:390]  # 거래정지로 봉이 없는 종목
+        self.dates = self.frames['000001'].index
+        # 3일 전까지만 저장된 상태 + 아직 한 번도 받지 않은 종목
+        for ticker, df in self.frames.items():
+            if ticker == '000041':
+                self.db.save_market_data(ticker, df)
+            elif ticker != '000040':
+                self.db.save_market_data(ticker, df.iloc[:-3])
+        self.loader = DeltaLoader(self.db, self.frames, latency=0.01)
+        self.portfolio = {'000001': {'qty': 10, 'avg_price': 50_000.0, 'buy_date': '2023-01-02'},
+                          '000041': {'qty': 5, 'avg_price': 50_000.0, 'buy_date': '2023-01-02'}}
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def make_pipeline(self, **kwargs):
+        return EODPipeline(self.loader, tickers=list(self.frames), portfolio=self.portfolio,
+                           report_dir=os.path.join(self.tmp.name, 'reports'), max_workers=4, batch_size=8, **kwargs)
+
+    def test_delta_fetch_and_scan_match_scanner(self):
+        as_of = self.dates[-1]
+        result = self.make_pipeline().run(as_of=as_of)
+
+        # 누락 구간만 요청 (신규 종목은 전체)
+        requests = {t: start for t, start, _ in self.loader.requests}
+        self.assertEqual(requests['000001'], self.dates[-3])
+        self.assertEqual(requests['000040'], self.loader.data_start_date)
+        self.assertEqual(len(requests), len(self.frames))
+        self.assertEqual(result['errors'], {})
+        self.assertNotIn('000041', result['fetched'])
+
+        expected = SignalScanner(self.db).scan(self.portfolio, tickers=list(self.frames), as_of=as_of)
+        self.assertEqual(result['as_of'], as_of)
+        pd.testing.assert_frame_equal(result['ranking'], expected['ranking'], check_dtype=False)
+        pd.testing.assert_frame_equal(result['buy'], expected['buy'], check_dtype=False)
+        pd.testing.assert_frame_equal(result['sell'], expected['sell'])
+        pd.testing.assert_frame_equal(result['hold'], expected['hold'])
+        for stage in ('universe', 'delta_check', 'fetch', 'indicators', 'rank', 'scan', 'report', 'total'):
+            self.assertIn(stage, result['timings'])
+
+        snapshot = self.db.load_eod_snapshot()
+        self.assertEqual(snapshot.index[:len(result['ranking'])].tolist(), result['ranking'].index.tolist())
+        self.assertIn('000041', snapshot.index)
+        for ticker in result['buy'].index:
+            self.assertEqual(snapshot.at[ticker, 'Signal'], 'BUY')
+        with open(result['report_path'], encoding='utf-8') as f:
+            self.assertEqual(json.load(f)['as_of'], str(as_of.date()))
+
+    def test_second_run_is_incremental(self):
+        as_of = self.dates[-1]
+        first = self.make_pipeline().run(as_of=as_of)
+        self.assertEqual(first['computed'], len(self.frames))
+
+        self.loader.requests.clear()
+        second = self.make_pipeline().run(as_of=as_of)
+        # 거래정지 종목만 다시 요청하고, 새 봉이 없으므로 지표 재계산 없음
+        self.assertEqual([r[0] for r in self.loader.requests], ['000041'])
+        self.assertEqual(second['computed'], 0)
+        pd.testing.assert_frame_equal(second['ranking'], first['ranking'])
+        pd.testing.assert_frame_equal(second['buy'], first['buy'])
+
+        # 지표 파라미터가 바뀌면 저장된 지표를 쓰지 않음
+        third = self.make_pipeline(strategy_params={'ma_short': 10}).run(as_of=as_of)
+        self.assertEqual(third['computed'], len(self.frames))
+
+    def test_first_run_fetches_enough_history_for_rs(self):
+        # 공휴일이 있는 달력: 연 ~245거래일 -> 365일 웜업으로는 12개월 RS(251봉)가 안 됨
+        frames = {}
+        for ticker, df in make_universe(n_tickers=12, n_days=700).items():
+            frames[ticker] = df[[i % 17 != 0 for i in range(len(df))]]
+        as_of = frames['000001'].index[-1]
+        db = DBManager(db_path=os.path.join(self.tmp.name, 'fresh.db'))
+        loader = FrameDataLoader(db, frames, as_of)
+        self.assertLess(len(frames['000001'].loc[loader.data_start_date:]), 251)
+
+        result = EODPipeline(loader, tickers=list(frames), report_dir=None).run(as_of=as_of)
+        self.assertEqual(len(result['fetched']), len(frames))
+        for _, start in loader.requests:
+            self.assertLessEqual(start, as_of - pd.Timedelta(days=400))
+        self.assertEqual(len(result['ranking']), len(frames))
+        expected = SignalScanner(db).scan({}, tickers=list(frames), as_of=as_of)
+        pd.testing.assert_frame_equal(result['ranking'], expected['ranking'], check_dtype=False)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,89 @@
+import unittest
+import os
+import sys
+import time
+import datetime
+import tempfile
+
+# 프로젝트 루트 경로 추가
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.database import DBManager
+from src.etf_pdf_service import EtfPdfService, isin_to_code, universe_etf_tickers
+
+
+def make_holdings(etf_ticker, n=15):
+    return [{'ticker': f"{i:06d}", 'name': f"{etf_ticker} 종목{i}", 'weight': float(n - i)} for i in range(n)]
+
+
+class TestEtfPdfService(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.db = DBManager(db_path=os.path.join(self.tmp.name, 'test.db'))
+        self.service = EtfPdfService(self.db, retry_interval=0)
+        self.calls = []
+
+    def tearDown(self):
+        if self.service._refresh_thread is not None:
+            self.service._refresh_thread.join(10)
+        self.tmp.cleanup()
+
+    def test_refresh_all_is_concurrent(self):
+        def slow_fetch(etf_ticker):
+            self.calls.append(etf_ticker)
+            time.sleep(0.3)
+            return make_holdings(etf_ticker)
+        self.service.fetch_pdf = slow_fetch
+
+        tickers = universe_etf_tickers()
+        start = time.monotonic()
+        results = self.service.refresh_all()
+        elapsed = time.monotonic() - start
+
+        self.assertEqual(sorted(self.calls), sorted(tickers))
+        self.assertLess(elapsed, 0.3 * len(tickers) / 2)
+        self.assertTrue(all(v == 15 for v in results.values()))
+
+        top = self.service.get_holdings(tickers[0], top_n=10)
+        self.assertEqual(len(top), 10)
+        self.assertEqual([h['weight'] for h in top], sorted((h['weight'] for h in top), reverse=True))
+
+    def test_get_holdings_never_waits_on_api(self):
+        def slow_fetch(etf_ticker):
+            time.sleep(1.0)
+            return make_holdings(etf_ticker)
+        self.service.fetch_pdf = slow_fetch
+
+        start = time.monotonic()
+        self.assertEqual(self.service.get_holdings('133690'), [])
+        self.assertLess(time.monotonic() - start, 0.5)
+        self.assertTrue(self.service.is_refreshing())
+
+        self.service._refresh_thread.join(10)
+        self.assertEqual(len(self.service.get_holdings('133690')), 10)
+
+    def test_history_and_failed_refresh_keeps_previous(self):
+        self.db.save_etf_holdings('133690', '2024-01-02', make_holdings('old', 3))
+        self.service.fetch_pdf = lambda etf_ticker: None
+        self.service.refresh_all(['133690'])
+
+        df, fetched_at = self.db.load_etf_holdings('133690')
+        self.assertEqual(df.attrs['as_of'], '2024-01-02')
+        self.assertEqual(len(df), 3)
+
+        self.db.save_etf_holdings('133690', '2024-02-01', make_holdings('new', 5))
+        self.assertEqual(len(self.db.load_etf_holdings('133690')[0]), 5)
+        # 과거 기준일 조회
+        self.assertEqual(len(self.db.load_etf_holdings('133690', as_of='2024-01-31')[0]), 3)
+        self.assertIsNone(self.db.load_etf_holdings('133690', as_of='2023-12-31')[0])
+        self.assertLess(datetime.datetime.now() - self.db.get_etf_holdings_fetched_at()['133690'], datetime.timedelta(minutes=1))
+
+    def test_isin_to_code(self):
+        self.assertEqual(isin_to_code('KR7005930003'), '005930')
+        self.assertEqual(isin_to_code(' KR7000660001 '), '000660')
+        self.assertEqual(isin_to_code('US0378331005'), '331005')
+        self.assertEqual(isin_to_code(None), '')
+
+
+if __name__ == '__main__':
+    unittest.main()
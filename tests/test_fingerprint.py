@@ -0,0 +1,77 @@
+import unittest
+import os
+import sys
+import tempfile
+import pandas as pd
+
+# 프로젝트 루트 경로 추가
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.database import DBManager
+from src.backtester import Backtester
+from src.fingerprint import simulation_fingerprint, load_memoized_simulation
+from market_fixtures import make_universe, FakeLoader
+
+START, END = '2023-01-02', '2023-12-29'
+
+
+class TestFingerprint(unittest.TestCase):
+    def test_deterministic_and_order_independent(self):
+        a = simulation_fingerprint(START, END, {'ma_short': 20, 'rs_weights': (0.4, 0.3, 0.2, 0.1)},
+                                   {'mode': 'STOCK', 'kospi_n': 200}, 3)
+        b = simulation_fingerprint(pd.Timestamp(START), END, {'rs_weights': [0.4, 0.3, 0.2, 0.1], 'ma_short': 20.0},
+                                   {'kospi_n': 200, 'mode': 'STOCK'}, 3)
+        self.assertEqual(a, b)
+
+    def test_changes_with_inputs(self):
+        base = simulation_fingerprint(START, END, {'ma_short': 20}, {'kospi_n': 200}, 1)
+        self.assertNotEqual(base, simulation_fingerprint(START, END, {'ma_short': 21}, {'kospi_n': 200}, 1))
+        self.assertNotEqual(base, simulation_fingerprint(START, END, {'ma_short': 20}, {'kospi_n': 100}, 1))
+        self.assertNotEqual(base, simulation_fingerprint(START, '2024-01-02', {'ma_short': 20}, {'kospi_n': 200}, 1))
+        self.assertNotEqual(base, simulation_fingerprint(START, END, {'ma_short': 20}, {'kospi_n': 200}, 2))
+
+
+class TestMemoizedSimulation(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.db = DBManager(db_path=os.path.join(self.tmp.name, 'test.db'))
+        self.frames = make_universe(n_tickers=8, n_days=500)
+        for ticker, df in self.frames.items():
+            self.db.save_market_data(ticker, df)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def fingerprint(self):
+        return simulation_fingerprint(START, END, {}, {'mode': 'STOCK'}, self.db.get_market_data_version())
+
+    def test_rerun_is_served_from_db_until_data_changes(self):
+        self.assertIsNone(load_memoized_simulation(self.db, self.fingerprint()))
+
+        bt = Backtester(FakeLoader(self.db, self.frames, START, END), start_date=START, end_date=END,
+                        universe_params={'mode': 'STOCK'})
+        equity = bt.run()
+        trades = pd.DataFrame(bt.trade_log)
+        self.db.save_simulation({'start_date': START, 'end_date': END}, equity, trades,
+                                fingerprint=self.fingerprint(), portfolio=bt.portfolio)
+
+        memoized = load_memoized_simulation(self.db, self.fingerprint())
+        self.assertIsNotNone(memoized)
+        pd.testing.assert_series_equal(memoized[1]['TotalValue'], equity['TotalValue'], check_freq=False)
+        self.assertEqual(len(memoized[2]), len(trades))
+        self.assertEqual(set(memoized[3]), set(bt.portfolio))
+
+        # 같은 데이터 재저장은 버전을 바꾸지 않음
+        ticker = next(iter(self.frames))
+        self.db.save_market_data(ticker, self.frames[ticker])
+        self.assertIsNotNone(load_memoized_simulation(self.db, self.fingerprint()))
+
+        # 값이 바뀌면 재계산 대상
+        changed = self.frames[ticker].copy()
+        changed.iloc[-1, changed.columns.get_loc('Close')] += 1
+        self.db.save_market_data(ticker, changed)
+        self.assertIsNone(load_memoized_simulation(self.db, self.fingerprint()))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,64 @@
+import unittest
+import os
+import sys
+import tempfile
+
+# 프로젝트 루트 경로 추가
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.database import DBManager
+from src.backtester import Backtester
+from market_fixtures import make_ohlcv, make_universe, FakeLoader
+
+START, END = '2023-01-02', '2024-04-30'
+
+
+class TestFullMarket(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.tmp = tempfile.TemporaryDirectory()
+        cls.db = DBManager(db_path=os.path.join(cls.tmp.name, 'test.db'))
+        cls.frames = make_universe(n_tickers=20, n_days=600)
+        # 유동성 기준 미달 종목 (사전 필터로 제외되어야 함)
+        cls.frames['900001'] = make_ohlcv(n_days=600, seed=101, volume=1_000)
+        # 거래정지로 중간 공백이 있는 종목
+        gapped = make_ohlcv(n_days=600, seed=102)
+        cls.frames['900002'] = gapped.drop(gapped.index[300:320])
+        # 기간 중간에 상장된 종목
+        cls.frames['900003'] = make_ohlcv(n_days=350, start='2023-03-01', seed=103)
+        for ticker, df in cls.frames.items():
+            cls.db.save_market_data(ticker, df)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.tmp.cleanup()
+
+    def run_backtest(self, **universe_params):
+        loader = FakeLoader(self.db, self.frames.keys(), START, END)
+        bt = Backtester(loader, start_date=START, end_date=END, universe_params={'mode': 'STOCK', **universe_params})
+        return bt, bt.run()
+
+    def test_liquidity_prefilter(self):
+        loader = FakeLoader(self.db, self.frames.keys(), START, END)
+        liquid = self.db.filter_liquid_tickers(
+            list(self.frames), loader.data_start_date, loader.end_date, 10_000_000_000, from_date=START
+        )
+        self.assertNotIn('900001', liquid)
+        self.assertIn('900002', liquid)
+        self.assertIn('900003', liquid)
+
+    def test_full_market_matches_eager_mode(self):
+        bt_eager, eager = self.run_backtest()
+        bt_full, full = self.run_backtest(full_market=True, frame_cache_mb=1.5)
+
+        self.assertGreater(len(bt_eager.trade_log), 0)
+        self.assertEqual(len(bt_eager.trade_log), len(bt_full.trade_log))
+        self.assertEqual(list(eager.index), list(full.index))
+        self.assertEqual(list(eager['TotalValue'].round(4)), list(full['TotalValue'].round(4)))
+
+        self.assertEqual(bt_full.universe_data, {})
+        self.assertNotIn('900001', bt_full.lazy_universe)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,46 @@
+import unittest
+import os
+import sys
+import subprocess
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# CLI/워커 진입점에서 import 되면 안 되는 무거운 의존성
+HEAVY_MODULES = ('streamlit', 'FinanceDataReader', 'requests', 'bs4', 'scipy', 'matplotlib', 'plotly', 'tqdm')
+
+# pandas/numpy를 제외한 src 패키지 자체 import 예산 (초)
+IMPORT_BUDGET_SEC = 0.5
+
+
+def run_python(code):
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', code],
+        cwd=ROOT, capture_output=True, text=True, timeout=120
+    )
+    if result.returncode != 0:
+        raise AssertionError(result.stderr)
+    return result
+
+
+class TestImportTime(unittest.TestCase):
+    def test_heavy_dependencies_are_lazy(self):
+        result = run_python("import src.data_loader, src.backtester, src.strategy, src.database")
+
+        # -X importtime 출력의 마지막 컬럼이 import된 모듈 이름
+        imported = {line.rsplit('|', 1)[-1].strip() for line in result.stderr.splitlines() if line.startswith('import time:')}
+        loaded = [m for m in HEAVY_MODULES if m in imported]
+        self.assertEqual(loaded, [], f"Heavy modules imported eagerly: {loaded}")
+
+    def test_import_time_budget(self):
+        result = run_python(
+            "import time, pandas, numpy\n"
+            "t = time.perf_counter()\n"
+            "import src.data_loader, src.backtester, src.strategy, src.database\n"
+            "print(time.perf_counter() - t)"
+        )
+        elapsed = float(result.stdout.strip().splitlines()[-1])
+        self.assertLess(elapsed, IMPORT_BUDGET_SEC)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,116 @@
+import unittest
+import os
+import sys
+import time
+import tempfile
+from datetime import datetime, timedelta
+
+# kis_mcp_server 모듈 경로 추가 (fastmcp 없이 클라이언트만 테스트)
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'kis_mcp_server'))
+
+from kis_client import KisClient, KisApiError, RateLimiter, TokenCache
+from stub_server import StubKisServer, stub_price
+
+TICKERS = [f"{i:06d}" for i in range(1, 21)]
+
+
+class TestKisClient(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.server = StubKisServer(rate_limit=10, latency=0.05,
+                                    holdings=[{'ticker': '005930', 'name': '삼성전자', 'qty': 10, 'avg_price': 50000.0}]).start()
+        self.client = self.make_client()
+
+    def tearDown(self):
+        self.client.close()
+        self.server.stop()
+        self.tmp.cleanup()
+
+    def make_client(self, **kwargs):
+        kwargs.setdefault('rate_limit', 10)
+        return KisClient('key', 'secret', account_no='12345678-01', base_url=self.server.base_url,
+                         token_cache=TokenCache(os.path.join(self.tmp.name, 'token.json')), **kwargs)
+
+    def test_current_price(self):
+        quote = self.client.get_current_price('005930')
+        self.assertEqual(quote['price'], stub_price('005930'))
+        self.assertEqual(quote['volume'], 100000)
+
+    def test_batch_is_concurrent_and_respects_rate_limit(self):
+        start = time.monotonic()
+        quotes, errors = self.client.get_current_prices(TICKERS + ['000001'])
+        elapsed = time.monotonic() - start
+
+        self.assertEqual(errors, {})
+        self.assertEqual(list(quotes), TICKERS)
+        self.assertTrue(all(q['price'] == stub_price(t) for t, q in quotes.items()))
+        # 20건 / 초당 10건 -> 1초 이상 걸리지만 서버 한도 초과 응답은 없어야 함
+        self.assertGreaterEqual(elapsed, 0.9)
+        self.assertEqual(self.server.rate_limited, 0)
+        self.assertEqual(self.server.token_requests, 1)
+        # keep-alive 풀 재사용: 연결 수는 동시 요청 수 이하
+        self.assertLessEqual(self.server.connections, self.client.max_workers + 1)
+
+    def test_rate_limited_response_is_retried(self):
+        # 클라이언트 한도를 서버보다 높게 잡으면 EGW00201 응답이 오지만 재시도로 모두 성공
+        client = self.make_client(rate_limit=100, max_retries=10)
+        try:
+            quotes, errors = client.get_current_prices(TICKERS)
+        finally:
+            client.close()
+        self.assertEqual(errors, {})
+        self.assertEqual(len(quotes), len(TICKERS))
+        self.assertGreater(self.server.rate_limited, 0)
+
+    def test_token_cache_reused_and_refreshed(self):
+        self.client.get_current_price('005930')
+        # 새 클라이언트(재시작)도 파일 캐시 토큰 재사용
+        client = self.make_client()
+        try:
+            client.get_current_price('005930')
+            self.assertEqual(self.server.token_requests, 1)
+
+            # 서버 측 만료 -> 재발급 후 재시도
+            self.server.expire_tokens()
+            client.get_current_price('005930')
+            self.assertEqual(self.server.token_requests, 2)
+        finally:
+            client.close()
+
+        # 만료 임박 토큰은 사용하지 않음
+        cache = TokenCache(refresh_margin=600)
+        cache.set('k', 'old', datetime.now() + timedelta(seconds=300))
+        self.assertIsNone(cache.get('k'))
+        cache.set('k', 'fresh', datetime.now() + timedelta(hours=1))
+        self.assertEqual(cache.get('k'), 'fresh')
+
+    def test_approval_key_cached(self):
+        key = self.client.get_approval_key()
+        self.assertEqual(self.client.get_approval_key(), key)
+        self.assertEqual(self.server.approval_requests, 1)
+
+    def test_account_balance(self):
+        balance = self.client.get_account_balance()
+        self.assertEqual(balance['cash'], 10_000_000)
+        self.assertEqual(balance['holdings'][0]['ticker'], '005930')
+        self.assertEqual(balance['holdings'][0]['qty'], 10)
+        with self.assertRaises(ValueError):
+            self.client.get_account_balance('123')
+
+    def test_error_response_raises(self):
+        with self.assertRaises(KisApiError) as ctx:
+            self.client.request('GET', '/unknown', 'X')
+        self.assertEqual(ctx.exception.msg_cd, 'NOT_FOUND')
+
+
+class TestRateLimiter(unittest.TestCase):
+    def test_window(self):
+        limiter = RateLimiter(5, period=0.2)
+        start = time.monotonic()
+        for _ in range(15):
+            limiter.acquire()
+        self.assertGreaterEqual(time.monotonic() - start, 0.39)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,109 @@
+import unittest
+import os
+import sys
+import time
+from datetime import datetime
+
+# kis_mcp_server 모듈 경로 추가 (fastmcp 없이 스트림/버퍼만 테스트)
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'kis_mcp_server'))
+
+from tick_buffer import TickRingBuffer, TickStore
+from kis_stream import KisPriceStream, parse_trade_frame, tick_timestamp
+from replay_server import ReplayServer, trade_frame
+
+
+def make_ticks():
+    # 09:00:00부터 2초 간격, 두 종목 교대 + 구독하지 않는 종목
+    ticks = []
+    for i in range(150):
+        hhmmss = f"09{(i * 2) // 60:02d}{(i * 2) % 60:02d}"
+        ticks.append(('005930', hhmmss, 70000 + i * 10, 10 + i))
+        ticks.append(('000660', hhmmss, 150000 - i * 10, 5))
+        ticks.append(('035420', hhmmss, 200000, 1))
+    return ticks
+
+
+class TestTickBuffer(unittest.TestCase):
+    def test_ring_buffer_wraps(self):
+        buf = TickRingBuffer(capacity=5)
+        for i in range(12):
+            buf.append(float(i), 100.0 + i, i)
+        ts, price, volume = buf.snapshot()
+        self.assertEqual(ts.tolist(), [7.0, 8.0, 9.0, 10.0, 11.0])
+        self.assertEqual(buf.snapshot(2)[2].tolist(), [10, 11])
+        self.assertEqual(buf.total, 12)
+
+    def test_latest_bar_aggregation(self):
+        store = TickStore(capacity=100, bar_seconds=60)
+        for ts, price, vol in [(0, 100, 1), (10, 105, 2), (59, 95, 3), (60, 101, 4), (70, 99, 5), (30, 1, 1)]:
+            store.add_tick('A', float(ts), float(price), vol)
+        bars = store.latest_bar('A')
+        self.assertEqual(bars['previous'], {'start': 0.0, 'open': 100.0, 'high': 105.0, 'low': 95.0, 'close': 95.0, 'volume': 6, 'ticks': 3})
+        self.assertEqual((bars['current']['open'], bars['current']['close'], bars['current']['volume']), (101.0, 99.0, 9))
+        self.assertIsNone(store.latest_bar('B'))
+
+
+class TestKisStream(unittest.TestCase):
+    def test_parse_multi_record_frame(self):
+        day = datetime(2024, 1, 2).date()
+        ticks = parse_trade_frame(trade_frame([('005930', '090001', 70000, 3), ('005930', '090002', 70100, 4)]), day)
+        self.assertEqual(ticks, [('005930', tick_timestamp('090001', day), 70000.0, 3), ('005930', tick_timestamp('090002', day), 70100.0, 4)])
+        self.assertEqual(parse_trade_frame('{"header": {"tr_id": "PINGPONG"}}'), [])
+
+    def test_replay_subscription(self):
+        ticks = make_ticks()
+        server = ReplayServer(ticks, batch=3).start()
+        stream = KisPriceStream(lambda: 'approval', server.url, TickStore(capacity=64, bar_seconds=60))
+        try:
+            stream.subscribe(['005930', '000660'])
+            self.assertTrue(server.finished.wait(10))
+            deadline = time.monotonic() + 5
+            while time.monotonic() < deadline and sum(stream.store.snapshot(t)['total'] for t in stream.store.tickers()) < 300:
+                time.sleep(0.05)
+        finally:
+            stream.stop()
+            server.stop()
+
+        store = stream.store
+        self.assertEqual(sorted(store.tickers()), ['000660', '005930'])
+        snap = store.snapshot('005930')
+        self.assertEqual(snap['total'], 150)
+        self.assertEqual(len(snap['price']), 64)
+        self.assertEqual(snap['price'][-1], 70000 + 149 * 10)
+
+        # 마지막 틱 09:04:58 -> 진행 중 봉 09:04, 직전 봉 09:03 (30틱)
+        bars = store.latest_bar('005930')
+        self.assertEqual(datetime.fromtimestamp(bars['current']['start']).strftime('%H%M'), '0904')
+        self.assertEqual(bars['previous']['ticks'], 30)
+        self.assertEqual(bars['previous']['open'], 70000 + 90 * 10)
+        self.assertEqual(bars['previous']['volume'], sum(10 + i for i in range(90, 120)))
+
+    def test_reconnects_after_approval_key_error(self):
+        ticks = make_ticks()
+        server = ReplayServer(ticks, batch=3).start()
+        calls = []
+
+        def flaky_approval_key():
+            calls.append(1)
+            if len(calls) <= 2:
+                raise RuntimeError("approval key request failed")  # KisApiError / requests 오류 대신
+            return 'approval'
+
+        stream = KisPriceStream(flaky_approval_key, server.url, TickStore(capacity=64, bar_seconds=60),
+                                reconnect_delay=0.05, max_reconnect_delay=0.1)
+        try:
+            with self.assertLogs('kis-mcp-server', level='ERROR'):
+                stream.subscribe(['005930'])
+                self.assertTrue(server.finished.wait(10))
+            deadline = time.monotonic() + 5
+            while time.monotonic() < deadline and stream.store.snapshot('005930')['total'] < 150:
+                time.sleep(0.05)
+        finally:
+            stream.stop()
+            server.stop()
+        self.assertGreaterEqual(len(calls), 3)
+        self.assertEqual(stream.store.snapshot('005930')['total'], 150)
+
+
+if __name__ == '__main__':
+    unittest.main()
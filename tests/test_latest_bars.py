@@ -0,0 +1,50 @@
+import unittest
+import os
+import sys
+import tempfile
+import pandas as pd
+
+# 프로젝트 루트 경로 추가
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.database import DBManager
+from market_fixtures import make_universe
+
+
+class TestLatestBars(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.tmp = tempfile.TemporaryDirectory()
+        cls.db = DBManager(db_path=os.path.join(cls.tmp.name, 'test.db'))
+        cls.frames = make_universe(n_tickers=5, n_days=300)
+        # 000005는 일찍 상장폐지(거래정지)된 종목처럼 앞부분만 저장
+        cls.frames['000005'] = cls.frames['000005'].iloc[:200]
+        for ticker, df in cls.frames.items():
+            cls.db.save_market_data(ticker, df)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.tmp.cleanup()
+
+    def test_matches_full_history_read(self):
+        as_of = self.frames['000001'].index[250]
+        bars = self.db.get_latest_bars(list(self.frames), as_of)
+        self.assertEqual(sorted(bars.index), sorted(self.frames))
+        for ticker, df in self.frames.items():
+            expected = df.loc[:as_of]
+            self.assertEqual(bars.at[ticker, 'date'], expected.index[-1])
+            self.assertEqual(bars.at[ticker, 'close'], expected['Close'].iloc[-1])
+            self.assertEqual(bars.at[ticker, 'stale_days'], (as_of - expected.index[-1]).days)
+        self.assertGreater(bars.at['000005', 'stale_days'], 0)
+
+    def test_missing_and_duplicate_tickers(self):
+        bars = self.db.get_latest_bars(['000001', 'UNKNOWN', '000001'])
+        self.assertEqual(list(bars.index), ['000001'])
+        self.assertEqual(bars.at['000001', 'date'], self.frames['000001'].index[-1])
+
+        # 기준일 이전 데이터가 없으면 제외
+        self.assertTrue(self.db.get_latest_bars(['000001'], pd.Timestamp('2000-01-01')).empty)
+
+
+if __name__ == '__main__':
+    unittest.main()
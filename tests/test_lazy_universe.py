@@ -0,0 +1,50 @@
+import unittest
+import os
+import sys
+import tempfile
+
+# 프로젝트 루트 경로 추가
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.database import DBManager
+from src.backtester import Backtester
+from market_fixtures import make_universe, FakeLoader
+
+START, END = '2023-01-02', '2024-04-30'
+
+
+class TestLazyUniverse(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.tmp = tempfile.TemporaryDirectory()
+        cls.db = DBManager(db_path=os.path.join(cls.tmp.name, 'test.db'))
+        cls.frames = make_universe(n_tickers=25, n_days=600)
+        for ticker, df in cls.frames.items():
+            cls.db.save_market_data(ticker, df)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.tmp.cleanup()
+
+    def run_backtest(self, **universe_params):
+        loader = FakeLoader(self.db, self.frames.keys(), START, END)
+        bt = Backtester(loader, start_date=START, end_date=END, universe_params={'mode': 'STOCK', **universe_params})
+        return bt, bt.run()
+
+    def test_lazy_mode_matches_eager_mode(self):
+        bt_eager, eager = self.run_backtest()
+        # 아주 작은 메모리 예산으로 LRU 재로딩 경로를 강제
+        bt_lazy, lazy = self.run_backtest(lazy=True, frame_cache_mb=1.5, chunk_size=7)
+
+        self.assertGreater(len(bt_eager.trade_log), 0)
+        self.assertEqual(len(bt_eager.trade_log), len(bt_lazy.trade_log))
+        self.assertEqual(list(eager['TotalValue'].round(4)), list(lazy['TotalValue'].round(4)))
+
+        # 전체 DataFrame은 상주하지 않음
+        self.assertEqual(bt_lazy.universe_data, {})
+        self.assertLessEqual(bt_lazy.lazy_universe.frames.nbytes, 1.5 * 1024 * 1024 + 200_000)
+        self.assertGreater(bt_lazy.lazy_universe.frames.misses, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
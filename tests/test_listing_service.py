@@ -0,0 +1,91 @@
+import unittest
+import os
+import sys
+import time
+import tempfile
+import pandas as pd
+
+# 프로젝트 루트 경로 추가
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.database import DBManager
+from src.listing_service import ListingService
+
+
+def make_listing(prefix, n):
+    return pd.DataFrame({
+        'Code': [f"{prefix}{i:04d}" for i in range(n)],
+        'Name': [f"Stock {prefix}{i}" for i in range(n)],
+        'Marcap': [float(n - i) for i in range(n)],
+    })
+
+
+class TestListingService(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.db = DBManager(db_path=os.path.join(self.tmp.name, 'test.db'))
+        self.service = ListingService(self.db, hedge_delay=0.05)
+        self.calls = []
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_hedged_request_takes_faster_source(self):
+        def slow_fdr(market):
+            self.calls.append(('FDR', market))
+            time.sleep(2)
+            return make_listing('FK' if market == 'KOSPI' else 'FQ', 300)
+
+        def fast_naver(market, n=None):
+            self.calls.append(('NAVER', market))
+            return make_listing('NK' if market == 'KOSPI' else 'NQ', n)
+
+        self.service._fetch_fdr = slow_fdr
+        self.service._fetch_naver = fast_naver
+
+        start = time.monotonic()
+        universe = self.service.get_universe(kospi_n=200, kosdaq_n=50)
+        elapsed = time.monotonic() - start
+
+        # 두 시장을 동시에, FDR 응답을 기다리지 않고 반환
+        self.assertLess(elapsed, 1.5)
+        # 두 시장 모두 빠른 소스(NAVER) 결과
+        self.assertEqual(len(universe), 250)
+        self.assertEqual(sum(code.startswith('NK') for code in universe), 200)
+        self.assertEqual(sum(code.startswith('NQ') for code in universe), 50)
+        self.assertIn(('NAVER', 'KOSPI'), self.calls)
+        self.assertIn(('NAVER', 'KOSDAQ'), self.calls)
+
+    def test_listing_is_served_from_db_cache(self):
+        self.service._fetch_fdr = lambda market: make_listing('K' if market == 'KOSPI' else 'Q', 100)
+        first = self.service.get_universe(kospi_n=10, kosdaq_n=5)
+
+        def fail_fdr(market):
+            raise AssertionError("cache miss")
+
+        self.service._fetch_fdr = fail_fdr
+        second = self.service.get_universe(kospi_n=20, kosdaq_n=5)
+
+        self.assertEqual(len(first), 15)
+        self.assertEqual(len(second), 25)
+        self.assertEqual(list(second)[:3], ['K0000', 'K0001', 'K0002'])
+
+    def test_full_market_request_ignores_partial_cache(self):
+        # FDR 실패 -> Naver 상위 N 페이지만 저장 (complete=0)
+        self.service._fetch_fdr = lambda market: None
+        self.service._fetch_naver = lambda market, n=None: make_listing('NK' if market == 'KOSPI' else 'NQ', n)
+        partial = self.service.get_universe(kospi_n=200, kosdaq_n=50)
+        self.assertEqual(len(partial), 250)
+
+        self.service._fetch_fdr = lambda market: make_listing('FK' if market == 'KOSPI' else 'FQ', 900)
+        full = self.service.get_universe(kospi_n=None, kosdaq_n=None)
+        self.assertEqual(len(full), 1800)
+        self.assertTrue(all(code.startswith('F') for code in full))
+
+        # 완전한 리스팅이 저장된 뒤에는 시장 전체 요청도 캐시에서 제공
+        self.service._fetch_fdr = self.service._fetch_naver = None
+        self.assertEqual(self.service.get_universe(kospi_n=None, kosdaq_n=None), full)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,87 @@
+import unittest
+import os
+import sys
+import tempfile
+import numpy as np
+import pandas as pd
+
+# 프로젝트 루트 경로 추가
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.database import DBManager
+from src.lookthrough import LookThroughEngine, daily_position_values
+
+CATEGORIES = {'AAA': '국내지수', 'BBB': '국내지수', 'CCC': '해외지수'}
+
+
+def pdf(rows):
+    return pd.DataFrame(rows, columns=['ticker', 'name', 'weight'])
+
+
+class TestLookThrough(unittest.TestCase):
+    def setUp(self):
+        self.holdings = {
+            'AAA': pdf([('005930', '삼성전자', 30.0), ('000660', 'SK하이닉스', 20.0), ('', '원화예금', 50.0)]),
+            'BBB': pdf([('005930', '삼성전자', 10.0), ('035420', 'NAVER', 90.0)]),
+            # CCC: PDF 미수집
+        }
+        self.engine = LookThroughEngine(self.holdings, CATEGORIES)
+        dates = pd.bdate_range('2024-01-01', periods=3)
+        self.values = pd.DataFrame({'AAA': [100.0, 0.0, 50.0], 'BBB': [0.0, 200.0, 50.0], 'CCC': [0.0, 0.0, 100.0]}, index=dates)
+
+    def test_stock_exposure_matches_loop(self):
+        exposure = self.engine.stock_exposure(self.values)
+        for day, row in self.values.iterrows():
+            expected = {}
+            for etf, value in row.items():
+                for code, _, weight in self.holdings.get(etf, pdf([])).itertuples(index=False):
+                    if code:
+                        expected[code] = expected.get(code, 0.0) + value * weight / 100
+            for code, amount in expected.items():
+                self.assertAlmostEqual(exposure.at[day, code], amount)
+
+        self.assertEqual(self.engine.stock_names['035420'], 'NAVER')
+        self.assertNotIn('', exposure.columns)
+
+    def test_category_exposure_and_coverage(self):
+        categories = self.engine.category_exposure(self.values)
+        np.testing.assert_allclose(categories.sum(axis=1), self.values.sum(axis=1))
+        self.assertEqual(categories.iloc[2]['해외지수'], 100.0)
+
+        coverage = self.engine.coverage(self.values)
+        self.assertAlmostEqual(coverage.iloc[0], 0.5)  # AAA 현금 50%
+        self.assertAlmostEqual(coverage.iloc[1], 1.0)
+        self.assertAlmostEqual(coverage.iloc[2], (25 + 50) / 200)
+
+    def test_overlap(self):
+        overlap = self.engine.overlap()
+        self.assertEqual(sorted(overlap.index), ['AAA', 'BBB'])
+        self.assertAlmostEqual(overlap.at['AAA', 'BBB'], 0.10)
+        self.assertAlmostEqual(overlap.at['AAA', 'AAA'], 0.50)
+
+    def test_from_db(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            db = DBManager(db_path=os.path.join(tmp, 'test.db'))
+            for etf, df in self.holdings.items():
+                db.save_etf_holdings(etf, '2024-01-02', df.to_dict(orient='records'))
+            engine = LookThroughEngine.from_db(db, categories=CATEGORIES)
+            pd.testing.assert_frame_equal(engine.stock_exposure(self.values), self.engine.stock_exposure(self.values)[engine.stocks])
+
+
+class TestDailyPositionValues(unittest.TestCase):
+    def test_reconstructs_holdings_from_trades(self):
+        dates = pd.bdate_range('2024-01-01', periods=6)
+        close = pd.DataFrame({'AAA': [10.0, 11, 12, np.nan, 14, 15], 'BBB': [5.0, 5, 5, 5, 5, 5]}, index=dates)
+        trades = pd.DataFrame({
+            'Date': [dates[1], dates[2], dates[4]],
+            'Ticker': ['AAA', 'BBB', 'AAA'],
+            'Action': ['BUY', 'BUY', 'SELL'],
+            'Qty': [10, 4, 10],
+        })
+        values = daily_position_values(trades, close, dates)
+        self.assertEqual(values['AAA'].tolist(), [0, 110, 120, 120, 0, 0])  # 결측 종가는 직전 값
+        self.assertEqual(values['BBB'].tolist(), [0, 0, 20, 20, 20, 20])
+
+
+if __name__ == '__main__':
+    unittest.main()
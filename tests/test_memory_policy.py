@@ -0,0 +1,57 @@
+import unittest
+import os
+import sys
+import tempfile
+import numpy as np
+
+# 프로젝트 루트 경로 추가
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.database import DBManager
+from src.backtester import Backtester
+from src.strategy import Strategy
+from src.memory_policy import MemoryPolicy, frame_nbytes
+from market_fixtures import make_ohlcv, make_universe, FakeLoader
+
+START, END = '2023-01-02', '2024-04-30'
+
+
+class TestMemoryPolicy(unittest.TestCase):
+    def test_compact_policy_shrinks_frame(self):
+        df = make_ohlcv(n_days=500)
+        Strategy().prepare_indicators(df)
+        before = frame_nbytes(df)
+
+        compact = MemoryPolicy.from_name('compact').apply(df)
+        self.assertNotIn('R_12m', compact.columns)
+        self.assertNotIn('Slope', compact.columns)
+        self.assertEqual(compact['Close'].dtype, np.float32)
+        self.assertEqual(compact['Volume'].dtype, np.int32)
+        # 18 x float64 -> 11 x 4byte (+ 8byte DatetimeIndex)
+        self.assertGreaterEqual(before / frame_nbytes(compact), 2.8)
+
+    def test_non_integer_prices_stay_float64(self):
+        df = make_ohlcv(n_days=100)
+        df['Close'] = df['Close'] + 0.123456789
+        safe = MemoryPolicy.from_name('safe').apply(df)
+        self.assertEqual(safe['Close'].dtype, np.float64)
+
+    def test_safe_policy_keeps_backtest_result(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            db = DBManager(db_path=os.path.join(tmp, 'test.db'))
+            frames = make_universe(n_tickers=15, n_days=600)
+            for ticker, df in frames.items():
+                db.save_market_data(ticker, df)
+
+            results = []
+            for params in ({}, {'memory_policy': 'safe'}, {'memory_policy': 'safe', 'lazy': True}):
+                loader = FakeLoader(db, frames.keys(), START, END)
+                bt = Backtester(loader, start_date=START, end_date=END, universe_params={'mode': 'STOCK', **params})
+                results.append(list(bt.run()['TotalValue'].round(4)))
+
+            self.assertEqual(results[0], results[1])
+            self.assertEqual(results[0], results[2])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,78 @@
+import unittest
+import os
+import sys
+import tempfile
+import pandas as pd
+
+# 프로젝트 루트 경로 추가
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.database import DBManager
+from src.backtester import Backtester
+from src.paper_trading import PaperTrader
+from market_fixtures import FakeLoader, make_ohlcv, make_universe
+
+
+class TestPaperTrader(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.tmp = tempfile.TemporaryDirectory()
+        cls.db = DBManager(db_path=os.path.join(cls.tmp.name, 'test.db'))
+        cls.frames = make_universe(n_tickers=30, n_days=650)
+        gap = make_ohlcv(n_days=650, seed=31)
+        cls.frames['000031'] = gap.drop(gap.index[500:510])
+        for ticker, df in cls.frames.items():
+            cls.db.save_market_data(ticker, df)
+        cls.dates = cls.frames['000001'].index
+        cls.names = {t: f"Stock {t}" for t in cls.frames}
+
+        # 기준: 같은 기간 전체 백테스트
+        start, end = cls.dates[400], cls.dates[-1]
+        bt = Backtester(FakeLoader(cls.db, list(cls.frames), start, end), start, end)
+        cls.expected_equity = bt.run()
+        cls.expected_trades = pd.DataFrame(bt.trade_log)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.tmp.cleanup()
+
+    def test_resumed_run_matches_backtest(self):
+        trader = PaperTrader(self.db, 'resume', start_date=self.dates[400], names=self.names)
+        first = trader.run(until=self.dates[520])
+        self.assertEqual(first['days'], 121)
+
+        # 재시작: 새 인스턴스가 DB 상태에서 이어서 처리
+        trader = PaperTrader(self.db, 'resume', names=self.names)
+        self.assertEqual(trader.last_date, self.dates[520])
+        second = trader.run()
+        self.assertEqual(second['days'], len(self.dates) - 521)
+        self.assertEqual(trader.run()['days'], 0)
+
+        self.assertGreater(len(self.expected_trades), 0)
+        fills = self.db.load_paper_fills('resume')
+        pd.testing.assert_frame_equal(fills, self.expected_trades, check_dtype=False)
+
+        equity = self.db.load_paper_equity('resume')
+        self.assertEqual(equity.index.tolist(), self.expected_equity.index.tolist())
+        pd.testing.assert_series_equal(equity['TotalValue'], self.expected_equity['TotalValue'], check_freq=False)
+
+        status = trader.status()
+        self.assertEqual(status['total_value'], self.expected_equity['TotalValue'].iloc[-1])
+        self.assertEqual(len(status['portfolio']), equity['Positions'].iloc[-1])
+
+    def test_params_are_fixed_per_account(self):
+        PaperTrader(self.db, 'fixed', strategy_params={'ma_short': 10}, start_date=self.dates[-5])
+        trader = PaperTrader(self.db, 'fixed')
+        self.assertEqual(trader.strategy.ma_short, 10)
+        with self.assertRaises(ValueError):
+            PaperTrader(self.db, 'fixed', strategy_params={'ma_short': 20})
+
+    def test_new_account_starts_after_latest_data(self):
+        trader = PaperTrader(self.db, 'forward')
+        self.assertEqual(trader.last_date, self.dates[-1])
+        self.assertEqual(trader.run()['days'], 0)
+        self.assertEqual(trader.status()['total_value'], Backtester.INITIAL_BALANCE)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,103 @@
+import unittest
+import os
+import sys
+import tempfile
+import threading
+import pandas as pd
+
+# 프로젝트 루트 경로 추가
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.database import DBManager
+from src.backtester import Backtester
+from src.prepared_cache import PreparedUniverse, PreparedUniverseCache
+from market_fixtures import make_universe, FakeLoader
+
+START, END = '2023-01-02', '2023-12-29'
+
+
+class TestPreparedUniverseCache(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.tmp = tempfile.TemporaryDirectory()
+        cls.db = DBManager(db_path=os.path.join(cls.tmp.name, 'test.db'))
+        cls.frames = make_universe(n_tickers=10, n_days=500)
+        for ticker, df in cls.frames.items():
+            cls.db.save_market_data(ticker, df)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.tmp.cleanup()
+
+    def run_backtest(self, cache=None, **strategy_params):
+        loader = FakeLoader(self.db, self.frames, START, END)
+        bt = Backtester(loader, start_date=START, end_date=END, strategy_params=strategy_params,
+                        universe_params={'mode': 'STOCK'}, prepared_cache=cache)
+        return bt, bt.run()
+
+    def test_reuse_across_sell_params(self):
+        cache = PreparedUniverseCache()
+        _, first = self.run_backtest(cache, sell_slope_multiplier=1.5)
+        _, second = self.run_backtest(cache, sell_slope_multiplier=3.0)
+        self.assertEqual((cache.misses, cache.hits), (1, 1))
+
+        # 공유 데이터를 써도 단독 실행과 결과 동일
+        _, fresh = self.run_backtest(None, sell_slope_multiplier=3.0)
+        pd.testing.assert_frame_equal(second, fresh)
+
+        # 지표 파라미터가 바뀌면 새로 계산
+        self.run_backtest(cache, ma_short=10)
+        self.assertEqual(cache.misses, 2)
+
+        # 실행이 끝나면 참조 반환
+        self.assertTrue(all(entry.refcount == 0 for entry in cache._entries.values()))
+
+    def test_data_version_invalidates(self):
+        cache = PreparedUniverseCache()
+        self.run_backtest(cache)
+        ticker = next(iter(self.frames))
+        changed = self.frames[ticker].copy()
+        changed.iloc[-1, changed.columns.get_loc('Close')] += 1
+        self.db.save_market_data(ticker, changed)
+        try:
+            self.run_backtest(cache)
+            self.assertEqual(cache.misses, 2)
+        finally:
+            self.db.save_market_data(ticker, self.frames[ticker])
+
+    def test_eviction_respects_refcount(self):
+        frame = pd.DataFrame({'Close': range(100_000)}, dtype=float) # ~0.8MB
+        cache = PreparedUniverseCache(budget_mb=1)
+        a = cache.acquire('a', lambda: PreparedUniverse({'x': frame}))
+        b = cache.acquire('b', lambda: PreparedUniverse({'x': frame.copy()}))
+        # 둘 다 사용 중이므로 예산 초과여도 유지
+        self.assertEqual(len(cache), 2)
+        cache.release(a)
+        self.assertNotIn('a', cache)
+        self.assertIn('b', cache)
+        cache.release(b)
+        self.assertIn('b', cache)
+
+    def test_concurrent_acquire_builds_once(self):
+        cache = PreparedUniverseCache()
+        calls = []
+        gate = threading.Event()
+
+        def build():
+            calls.append(1)
+            gate.wait(1)
+            return PreparedUniverse({})
+
+        entries = []
+        threads = [threading.Thread(target=lambda: entries.append(cache.acquire('k', build))) for _ in range(4)]
+        for t in threads:
+            t.start()
+        gate.set()
+        for t in threads:
+            t.join()
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(entries[0].refcount, 4)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,118 @@
+import unittest
+import os
+import sys
+import json
+import tempfile
+import pandas as pd
+
+# 프로젝트 루트 경로 추가
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.database import DBManager
+from src.backtester import Backtester
+from src.scanner import SignalScanner, load_portfolio_file, scan_result_to_dict
+from market_fixtures import FakeLoader, make_ohlcv, make_universe
+
+
+class TestSignalScanner(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.tmp = tempfile.TemporaryDirectory()
+        cls.db = DBManager(db_path=os.path.join(cls.tmp.name, 'test.db'))
+        cls.frames = make_universe(n_tickers=30, n_days=500)
+        # 유동성 미달 / 늦게 상장 / 거래정지 구간 / 일찍 끝난 종목
+        cls.frames['000031'] = make_ohlcv(n_days=500, seed=31, volume=10_000)
+        cls.frames['000032'] = make_ohlcv(n_days=500, seed=32).iloc[300:]
+        gap = make_ohlcv(n_days=500, seed=33)
+        cls.frames['000033'] = gap.drop(gap.index[420:430])
+        cls.frames['000034'] = make_ohlcv(n_days=500, seed=34).iloc[:450]
+        for ticker, df in cls.frames.items():
+            cls.db.save_market_data(ticker, df)
+
+        # 백테스터 기준: 티커별 전체 이력으로 지표 계산
+        dates = cls.frames['000001'].index
+        cls.backtester = Backtester(FakeLoader(cls.db, list(cls.frames), dates[0], dates[-1]), dates[0], dates[-1])
+        for ticker, df in cls.frames.items():
+            df = df.copy()
+            cls.backtester.strategy.prepare_indicators(df)
+            cls.backtester.universe_data[ticker] = df
+        cls.scanner = SignalScanner(cls.db)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.tmp.cleanup()
+
+    def test_matches_backtester_day(self):
+        strategy = self.backtester.strategy
+        dates = self.frames['000001'].index
+        n_buys = 0
+        for today in dates[260::6]:
+            as_of, ranking = self.scanner.rank(as_of=today)
+            self.assertEqual(as_of, today)
+            self.backtester.update_universe(today)
+            self.assertEqual(ranking.index.tolist(), self.backtester.target_universe, today)
+
+            expected = [t for t in self.backtester.target_universe
+                        if strategy.check_buy_signal(self.backtester.universe_data[t].loc[:today])]
+            buy = self.scanner.buy_candidates(ranking, as_of)
+            self.assertEqual(buy.index.tolist(), expected, today)
+            n_buys += len(buy)
+        self.assertGreater(n_buys, 0)
+
+    def test_scan_holdings(self):
+        today = self.frames['000001'].index[-1]
+        portfolio = {t: {'qty': 10, 'avg_price': 40_000.0, 'buy_date': '2023-01-02'} for t in ('000001', '000002', '000003', '000033', '000034')}
+        result = self.scanner.scan(portfolio)
+        self.assertEqual(result['as_of'], today)
+
+        holdings = pd.concat([result['sell'], result['hold']])
+        self.assertEqual(sorted(holdings.index), sorted(portfolio))
+        for ticker in portfolio:
+            df = self.backtester.universe_data[ticker].loc[:today]
+            is_sell, reason = self.backtester.strategy.check_sell_signal(df, buy_price=40_000.0)
+            self.assertEqual(bool(holdings.at[ticker, 'Sell']), is_sell, ticker)
+            self.assertEqual(holdings.at[ticker, 'Reason'], reason)
+        # 일찍 끝난 종목은 마지막 봉 날짜로 표시
+        self.assertLess(holdings.at['000034', 'Last Date'], today)
+
+        self.assertEqual(result['slots'], Backtester.MAX_POSITIONS - len(result['hold']))
+        self.assertNotIn('000001', result['buy'].index)
+        payload = json.dumps(scan_result_to_dict(result))
+        self.assertIn('"as_of"', payload)
+
+    def test_load_portfolio_file(self):
+        path = os.path.join(self.tmp.name, 'portfolio.csv')
+        pd.DataFrame({'ticker': ['5930', '000660'], 'qty': [10, 3], 'avg_price': [70000, 150000]}).to_csv(path, index=False)
+        portfolio = load_portfolio_file(path)
+        self.assertEqual(sorted(portfolio), ['000660', '005930'])
+        self.assertEqual(portfolio['005930']['qty'], 10)
+
+        path = os.path.join(self.tmp.name, 'portfolio.json')
+        with open(path, 'w') as f:
+            json.dump({'005930': {'qty': 1, 'avg_price': 70000, 'buy_date': '2024-01-02'}}, f)
+        self.assertEqual(load_portfolio_file(path)['005930']['buy_date'], '2024-01-02')
+
+
+class TestTailWindow(unittest.TestCase):
+    def test_matches_iloc_from_end(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            db = DBManager(db_path=os.path.join(tmp, 'test.db'))
+            frames = {'000001': make_ohlcv(n_days=100, seed=1), '000002': make_ohlcv(n_days=100, seed=2).iloc[:8]}
+            for ticker, df in frames.items():
+                db.save_market_data(ticker, df)
+            self.assertEqual(db.list_market_tickers(), ['000001', '000002'])
+
+            as_of = frames['000001'].index[-5]
+            window = db.load_tail_window(['000002', '000001', '999999'], as_of, depth=10, offsets=(30,))
+            self.assertEqual(window['close'].columns.tolist(), ['000002', '000001'])
+            expected = frames['000001'].loc[:as_of, 'Close']
+            self.assertEqual(window['close']['000001'].tolist(), expected.iloc[-10:].tolist())
+            self.assertEqual(window['close_at'].at['000001', 30], expected.iloc[-31])
+            # 이력이 짧은 종목은 앞쪽이 NaN
+            self.assertEqual(window['close']['000002'].isna().sum(), 2)
+            self.assertTrue(pd.isna(window['close_at'].at['000002', 30]))
+            self.assertEqual(window['last_date']['000002'], frames['000002'].index[-1])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,87 @@
+import unittest
+import os
+import sys
+import time
+import sqlite3
+import tempfile
+
+# 프로젝트 루트 경로 추가
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.database import DBManager
+from src.simulation_jobs import SimulationJobManager
+from market_fixtures import make_universe, FakeLoader
+
+START, END = '2023-01-02', '2023-12-29'
+
+
+class TestSimulationJobs(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.db = DBManager(db_path=os.path.join(self.tmp.name, 'test.db'))
+        self.frames = make_universe(n_tickers=8, n_days=500)
+        for ticker, df in self.frames.items():
+            self.db.save_market_data(ticker, df)
+        self.manager = SimulationJobManager(
+            self.db, loader_factory=lambda start, end: FakeLoader(self.db, self.frames, start, end), progress_interval=0
+        )
+
+    def tearDown(self):
+        self.manager.shutdown()
+        self.tmp.cleanup()
+
+    def test_job_runs_in_background_and_reports_progress(self):
+        job_id = self.manager.submit(START, END, {}, {'mode': 'STOCK'})
+        # 실행 중 같은 설정을 다시 제출하면 같은 작업
+        self.assertEqual(self.manager.submit(START, END, {}, {'mode': 'STOCK'}), job_id)
+
+        job = self.manager.wait(job_id, timeout=120)
+        self.assertEqual(job['status'], 'DONE', job.get('error'))
+        self.assertEqual(job['progress'], 1.0)
+        self.assertGreater(job['total'], 0)
+        self.assertEqual(job['done'], job['total'])
+
+        _, equity, _ = self.db.get_simulation(job['simulation_id'])
+        self.assertEqual(len(equity), job['total'])
+
+        # 같은 설정 재제출: 저장 결과 재사용 (같은 simulation_id)
+        rerun = self.manager.wait(self.manager.submit(START, END, {}, {'mode': 'STOCK'}), timeout=30)
+        self.assertEqual(rerun['status'], 'DONE')
+        self.assertEqual(rerun['simulation_id'], job['simulation_id'])
+
+    def test_failed_job(self):
+        job_id = self.manager.submit(START, END, {'unknown_param': 1}, {'mode': 'STOCK'})
+        job = self.manager.wait(job_id, timeout=30)
+        self.assertEqual(job['status'], 'FAILED')
+        self.assertIn('unknown_param', job['error'])
+
+    def test_interrupted_jobs_are_marked_failed(self):
+        self.db.create_simulation_job('stale', {})
+        self.db.update_simulation_job('stale', status='RUNNING')
+        # 다른 살아 있는 프로세스의 작업 (최근 heartbeat)
+        self.db.create_simulation_job('live', {})
+        self.db.update_simulation_job('live', status='RUNNING')
+        conn = sqlite3.connect(self.db.db_path)
+        conn.execute("UPDATE simulation_jobs SET updated_at = ? WHERE id = 'stale'", (time.time() - 600,))
+        conn.commit()
+        conn.close()
+
+        SimulationJobManager(self.db).shutdown()
+        self.assertEqual(self.db.get_simulation_job('stale')['status'], 'FAILED')
+        self.assertEqual(self.db.get_simulation_job('live')['status'], 'RUNNING')
+
+    def test_heartbeat_keeps_active_jobs_alive(self):
+        manager = SimulationJobManager(self.db, heartbeat_interval=0.05)
+        try:
+            self.db.create_simulation_job('mine', {})
+            with manager._lock:
+                manager._active['key'] = 'mine'
+            before = self.db.get_simulation_job('mine')['updated_at']
+            time.sleep(0.3)
+            self.assertGreater(self.db.get_simulation_job('mine')['updated_at'], before)
+        finally:
+            manager.shutdown()
+
+
+if __name__ == '__main__':
+    unittest.main()
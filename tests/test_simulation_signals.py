@@ -0,0 +1,67 @@
+import unittest
+import os
+import sys
+import tempfile
+import pandas as pd
+
+# 프로젝트 루트 경로 추가
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.database import DBManager
+from src.strategy import Strategy
+from src.simulation_jobs import execute_simulation
+from src.ui.analysis import build_signal_frame
+from market_fixtures import make_universe, FakeLoader
+
+START, END = '2023-01-02', '2023-12-29'
+PARAMS = {'sell_slope_multiplier': 1.5}
+
+
+class TestSimulationSignals(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.tmp = tempfile.TemporaryDirectory()
+        cls.db = DBManager(db_path=os.path.join(cls.tmp.name, 'test.db'))
+        cls.frames = make_universe(n_tickers=8, n_days=500)
+        for ticker, df in cls.frames.items():
+            cls.db.save_market_data(ticker, df)
+        cls.simulation_id, cls.equity, cls.trades, cls.portfolio = execute_simulation(
+            cls.db, START, END, PARAMS, {'mode': 'STOCK'},
+            loader_factory=lambda start, end: FakeLoader(cls.db, cls.frames, start, end)
+        )
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.tmp.cleanup()
+
+    def test_saved_for_traded_and_held_tickers(self):
+        self.assertFalse(self.trades.empty)
+        for ticker in set(self.trades['Ticker']) | set(self.portfolio):
+            df = self.db.get_simulation_signals(self.simulation_id, ticker)
+            self.assertIsNotNone(df, ticker)
+            self.assertEqual(df.index.min(), self.equity.index.min())
+            self.assertLessEqual(df.index.max(), self.equity.index.max())
+            for col in ('Close', 'MA_Long', 'Slope_Pct', 'MA_Slope', 'Buy_Signal', 'Sell_Signal', 'Sell_Threshold'):
+                self.assertIn(col, df.columns)
+
+        self.assertIsNone(self.db.get_simulation_signals(self.simulation_id, 'NOT_TRADED'))
+
+    def test_signals_match_engine_trades(self):
+        # 엔진이 실제로 매수/매도한 날에는 저장된 신호도 켜져 있어야 함
+        for ticker, trades in self.trades.groupby('Ticker'):
+            signals = build_signal_frame(self.db.get_simulation_signals(self.simulation_id, ticker), PARAMS)
+            for _, trade in trades.iterrows():
+                expected = 'BUY' if trade['Action'] == 'BUY' else 'SELL'
+                self.assertEqual(signals.at[pd.Timestamp(trade['Date']), 'Signal'], expected, (ticker, trade['Date']))
+
+    def test_vectorized_sell_matches_check_sell_signal(self):
+        strategy = Strategy(**PARAMS)
+        df = self.frames['000001'].copy()
+        strategy.prepare_indicators(df)
+        vectorized = strategy.compute_sell_signal_series(df)
+        for i in range(1, len(df), 7):
+            self.assertEqual(bool(vectorized.iloc[i]), strategy.check_sell_signal(df.iloc[:i + 1])[0], df.index[i])
+
+
+if __name__ == '__main__':
+    unittest.main()
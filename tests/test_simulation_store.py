@@ -0,0 +1,98 @@
+import unittest
+import os
+import sys
+import sqlite3
+import tempfile
+import pandas as pd
+
+# 프로젝트 루트 경로 추가
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.database import DBManager
+
+
+def make_result(n_days=300, n_trades=40):
+    dates = pd.bdate_range('2023-01-02', periods=n_days)
+    equity = pd.DataFrame({'TotalValue': [100_000_000 + i * 10_000.5 for i in range(n_days)]}, index=dates)
+    equity.index.name = 'Date'
+    trades = pd.DataFrame([{
+        'Date': dates[i], 'Ticker': f"{i % 7:06d}", 'Name': f"종목{i % 7}",
+        'Action': 'BUY' if i % 2 == 0 else 'SELL', 'Price': 10_000.0 + i, 'Qty': 10 + i,
+        'Fee': 1.5 * i, 'Note': f"Profit: {i / 10:.2f}%"
+    } for i in range(n_trades)])
+    return equity, trades
+
+
+class TestSimulationStore(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.tmp.name, 'test.db')
+        self.db = DBManager(db_path=self.db_path)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_round_trip_and_metrics(self):
+        equity, trades = make_result()
+        config = {'start_date': '2023-01-02', 'end_date': '2024-02-23', 'ma_short': 20}
+        sim_id = self.db.save_simulation(config, equity, trades, fingerprint='abc')
+
+        loaded_config, loaded_equity, loaded_trades = self.db.get_latest_simulation()
+        self.assertEqual(loaded_config, config)
+        pd.testing.assert_frame_equal(loaded_equity, equity, check_freq=False)
+        pd.testing.assert_frame_equal(loaded_trades, trades)
+
+        runs = self.db.list_simulations()
+        self.assertEqual(runs.loc[0, 'id'], sim_id)
+        self.assertEqual(runs.loc[0, 'num_trades'], len(trades))
+        self.assertAlmostEqual(runs.loc[0, 'final_value'], equity['TotalValue'].iloc[-1])
+        self.assertEqual(self.db.find_simulation('abc'), sim_id)
+        self.assertIsNone(self.db.find_simulation('missing'))
+
+        # 결과는 블롭 1행으로만 저장 (행 단위 테이블 사용 안 함)
+        conn = sqlite3.connect(self.db_path)
+        self.assertEqual(conn.execute('SELECT COUNT(*) FROM equity').fetchone()[0], 0)
+        self.assertEqual(conn.execute('SELECT COUNT(*) FROM simulation_results').fetchone()[0], 1)
+        conn.close()
+
+    def test_empty_trades(self):
+        equity, _ = make_result(n_days=5, n_trades=0)
+        self.db.save_simulation({'start_date': '2023-01-02'}, equity, pd.DataFrame())
+        _, loaded_equity, loaded_trades = self.db.get_latest_simulation()
+        self.assertEqual(len(loaded_equity), 5)
+        self.assertTrue(loaded_trades.empty)
+
+    def test_legacy_rows_are_still_readable(self):
+        conn = sqlite3.connect(self.db_path)
+        conn.execute("INSERT INTO simulations (timestamp, start_date, end_date, params_json) VALUES ('t', 's', 'e', '{\"a\": 1}')")
+        sim_id = conn.execute('SELECT MAX(id) FROM simulations').fetchone()[0]
+        conn.executemany('INSERT INTO equity (simulation_id, date, total_value) VALUES (?, ?, ?)',
+                         [(sim_id, '2023-01-02', 1.0), (sim_id, '2023-01-03', 2.0)])
+        conn.execute("INSERT INTO trades (simulation_id, date, ticker, name, action, price, qty, fee, note) "
+                     "VALUES (?, '2023-01-02', '005930', 'S', 'BUY', 1.0, 1, 0.0, '')", (sim_id,))
+        conn.commit()
+        conn.close()
+
+        config, equity, trades = self.db.get_simulation(sim_id)
+        self.assertEqual(config, {'a': 1})
+        self.assertEqual(list(equity['TotalValue']), [1.0, 2.0])
+        self.assertEqual(list(trades['Ticker']), ['005930'])
+
+    def test_legacy_tables_are_indexed(self):
+        conn = sqlite3.connect(self.db_path)
+        plan = conn.execute('EXPLAIN QUERY PLAN SELECT * FROM equity WHERE simulation_id = 1').fetchall()
+        conn.close()
+        self.assertIn('idx_equity_simulation', str(plan))
+
+    def test_compressed_size(self):
+        equity, trades = make_result(n_days=2500, n_trades=2000)
+        self.db.save_simulation({'start_date': '2014-01-01'}, equity, trades)
+        conn = sqlite3.connect(self.db_path)
+        size = conn.execute('SELECT LENGTH(equity_blob) + LENGTH(trades_blob) FROM simulation_results').fetchone()[0]
+        conn.close()
+        raw = equity.memory_usage(deep=True).sum() + trades.memory_usage(deep=True).sum()
+        self.assertLess(size, raw / 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
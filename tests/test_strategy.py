@@ -96,5 +96,14 @@ class TestStrategy(unittest.TestCase):
         # 여기서는 "에러 없이 실행됨"을 확인하는 걸로.
         print(f"[Test Buy Signal] Signal at end: {signal}")
 
+    def test_prepare_indicators_recomputes_amount_ma20(self):
+        # 이전 실행/캐시에서 남은 Amount_MA20 (기간이 바뀐 프레임)도 다시 계산해야 함
+        dates = pd.date_range(start='2023-01-01', periods=300)
+        df = pd.DataFrame({'Close': np.linspace(100, 200, 300), 'Volume': 1000.0}, index=dates)
+        df['Amount_MA20'] = -1.0
+        self.strategy.prepare_indicators(df)
+        expected = (df['Close'] * 1000.0).rolling(window=20).mean()
+        pd.testing.assert_series_equal(df['Amount_MA20'], expected, check_names=False)
+
 if __name__ == '__main__':
     unittest.main()